@@ -1,7 +1,14 @@
-from typing import Any, Callable, Union, final, Literal, Optional, Final
+from concurrent.futures import Future
+from typing import Any, Callable, Iterator, Union, final, Literal, Optional, Final, overload
 
 from aerospike_helpers.batch.records import BatchRecords
+from aerospike_helpers.batch.chunks import BatchOperateChunks, BatchWriteChunks
 from aerospike_helpers.metrics import MetricsPolicy, ClusterStats
+from aerospike_helpers.aio import RecordIterator
+from aerospike_helpers.stream import RecordStream
+from aerospike_helpers.parallel import PartitionWorkUnit
+from aerospike_helpers.columns import Columns
+from aerospike_helpers.arrow import RecordBatchStream
 
 AS_BOOL: Literal[1]
 AS_BYTES_BLOB: Literal[4]
@@ -347,6 +354,52 @@ class ConfigProvider:
     path: str
     interval: int
 
+@final
+class ReadPolicy(dict):
+    def __init__(self, *args, **kwargs) -> None: ...
+
+@final
+class WritePolicy(dict):
+    def __init__(self, *args, **kwargs) -> None: ...
+
+@final
+class OperatePolicy(dict):
+    def __init__(self, *args, **kwargs) -> None: ...
+
+@final
+class RemovePolicy(dict):
+    def __init__(self, *args, **kwargs) -> None: ...
+
+@final
+class ApplyPolicy(dict):
+    def __init__(self, *args, **kwargs) -> None: ...
+
+@final
+class BatchPolicy(dict):
+    def __init__(self, *args, **kwargs) -> None: ...
+
+@final
+class QueryPolicy(dict):
+    def __init__(self, *args, **kwargs) -> None: ...
+
+@final
+class ScanPolicy(dict):
+    def __init__(self, *args, **kwargs) -> None: ...
+
+@final
+class CompiledExpression:
+    size: int
+    params: tuple[str, ...]
+
+@final
+class Placeholder:
+    index: int
+    def __init__(self, index: int) -> None: ...
+
+@final
+class PreparedOperations:
+    values: int
+
 class Client:
     def __init__(self, *args, **kwargs) -> None: ...
     def admin_change_password(self, username: str, password: str, policy: dict = ...) -> None: ...
@@ -371,10 +424,24 @@ class Client:
     def append(self, key: tuple, bin: str, val: str, meta: dict = ..., policy: dict = ...) -> None: ...
     def apply(self, key: tuple, module: str, function: str, args: list, policy: dict = ...) -> Union[str, int, float, bytearray, list, dict]: ...
     def batch_apply(self, keys: list, module: str, function: str, args: list, policy_batch: dict = ..., policy_batch_apply: dict = ...) -> BatchRecords: ...
+    def batch_apply_future(self, keys: list, module: str, function: str, args: list, policy_batch: dict = ..., policy_batch_apply: dict = ...) -> Future[BatchRecords]: ...
+    @overload
     def batch_operate(self, keys: list, ops: list, policy_batch: dict = ..., policy_batch_write: dict = ..., ttl: int = ...) -> BatchRecords: ...
+    @overload
+    def batch_operate(self, keys: list, ops: list, policy_batch: dict = ..., policy_batch_write: dict = ..., ttl: int = ..., *, max_batch_size: int, max_inflight_batches: int = ...) -> BatchOperateChunks: ...
+    def batch_operate_future(self, keys: list, ops: list, policy_batch: dict = ..., policy_batch_write: dict = ..., ttl: int = ...) -> Future[BatchRecords]: ...
     def batch_remove(self, keys: list, policy_batch: dict = ..., policy_batch_remove: dict = ...) -> BatchRecords: ...
-    def batch_read(self, keys: list, bins: list[str] = ..., policy: dict = ...) -> BatchRecords: ...
+    def batch_remove_future(self, keys: list, policy_batch: dict = ..., policy_batch_remove: dict = ...) -> Future[BatchRecords]: ...
+    @overload
+    def batch_read(self, keys: list, bins: list[str] = ..., policy: dict = ..., output: None = ...) -> BatchRecords: ...
+    @overload
+    def batch_read(self, keys: list, bins: list[str] = ..., policy: dict = ..., *, output: Literal["numpy"]) -> Columns: ...
+    def batch_read_future(self, keys: list, bins: list[str] = ..., policy: dict = ..., output: Optional[Literal["numpy"]] = ...) -> Future[Union[BatchRecords, Columns]]: ...
+    @overload
     def batch_write(self, batch_records: BatchRecords, policy_batch: dict = ...) -> BatchRecords: ...
+    @overload
+    def batch_write(self, batch_records: BatchRecords, policy_batch: dict = ..., *, max_batch_size: int, max_inflight_batches: int = ...) -> BatchWriteChunks: ...
+    def batch_write_future(self, batch_records: BatchRecords, policy_batch: dict = ...) -> Future[BatchRecords]: ...
     def close(self) -> None: ...
     def connect(self, username: str = ..., password: str = ...) -> Client: ...
     def exists(self, key: tuple, policy: dict = ...) -> tuple: ...
@@ -412,14 +479,16 @@ class Client:
     def job_info(self, job_id: int, module, policy: dict = ...) -> dict: ...
     def enable_metrics(self, policy: Optional[MetricsPolicy] = None) -> None: ...
     def disable_metrics(self) -> None: ...
-    def operate(self, key: tuple, list: list, meta: dict = ..., policy: dict = ...) -> tuple: ...
+    def operate(self, key: tuple, list: Union[list, PreparedOperations], meta: dict = ..., policy: dict = ..., values: Optional[Union[tuple, list]] = ...) -> tuple: ...
     def operate_ordered(self, key: tuple, list: list, meta: dict = ..., policy: dict = ...) -> list: ...
+    def prepare_operations(self, list: list) -> PreparedOperations: ...
     def prepend(self, key: tuple, bin: str, val: str, meta: dict = ..., policy: dict = ...) -> None: ...
     def put(self, key: tuple, bins: dict, meta: dict = ..., policy: dict = ..., serializer = ...) -> None: ...
     def query(self, namespace: str, set: Optional[str] = None) -> Query: ...
     def query_apply(self, ns: str, set: str, predicate: tuple, module: str, function: str, args: list = ..., policy: dict = ...) -> int: ...
     def remove(self, key: tuple, meta: dict = ..., policy: dict = ...) -> None: ...
     def remove_bin(self, key: tuple, list: list, meta: dict = ..., policy: dict = ...) -> None: ...
+    def register_schema(self, namespace: str, set: str, schema: Optional[dict]) -> None: ...
     def scan(self, namespace: str, set: Optional[str] = None) -> Scan: ...
     def scan_apply(self, ns: str, set: str, module: str, function: str, args: list = ..., policy: dict = ..., options: dict = ...) -> int: ...
     def select(self, *args, **kwargs) -> tuple: ...
@@ -446,21 +515,42 @@ class GeoJSON:
 class KeyOrderedDict(dict):
     def __init__(self, *args, **kwargs) -> None: ...
 
+@final
+class Record:
+    def __contains__(self, bin: object) -> bool: ...
+    def __getitem__(self, bin: str) -> Any: ...
+    def __iter__(self) -> Iterator[str]: ...
+    def __len__(self) -> int: ...
+    def get(self, bin: str, default: Any = ...) -> Any: ...
+    def items(self) -> list[tuple[str, Any]]: ...
+    def keys(self) -> list[str]: ...
+    def to_dict(self) -> dict: ...
+    def values(self) -> list: ...
+
 class Query:
     max_records: int
     records_per_second: int
     ttl: int
     def __init__(self, *args, **kwargs) -> None: ...
+    def aiter(self, policy: dict = ..., options: dict = ..., buffer_size: int = ...) -> RecordIterator: ...
     def add_ops(self, ops: list) -> None: ...
     def apply(self, module: str, function: str, arguments: list = ...) -> Any: ...
     def execute_background(self, policy: dict = ...) -> int: ...
-    def foreach(self, callback: Callable, policy: dict = ..., options: dict = ...) -> None: ...
+    def foreach(self, callback: Callable, policy: dict = ..., options: dict = ..., *, chunk_size: int = ...) -> None: ...
     def get_partitions_status(self) -> tuple: ...
     def is_done(self) -> bool: ...
     def paginate(self) -> None: ...
-    def results(self, policy: dict = ..., options: dict = ...) -> list: ...
+    def parallel_results(self, n_procs: int, config: dict, policy: dict = ..., **kwargs) -> list: ...
+    @overload
+    def results(self, policy: dict = ..., options: dict = ..., output: None = ...) -> list: ...
+    @overload
+    def results(self, policy: dict = ..., options: dict = ..., *, output: Literal["numpy"]) -> Columns: ...
+    def results_future(self, policy: dict = ..., options: dict = ..., output: Optional[Literal["numpy"]] = ...) -> Future[Union[list, Columns]]: ...
     # TODO: this isn't an infinite list of bins
     def select(self, *args, **kwargs) -> None: ...
+    def split(self, n: int) -> list[PartitionWorkUnit]: ...
+    def stream(self, policy: dict = ..., options: dict = ..., buffer_size: int = ...) -> RecordStream: ...
+    def to_arrow(self, policy: dict = ..., options: dict = ..., schema: Any = ..., batch_size: int = ..., buffer_size: int = ...) -> RecordBatchStream: ...
     def where(self, predicate: tuple, ctx: list = ...) -> None: ...
     # We cannot use aerospike_helpers's TypeExpression type because mypy's stubtest will complain
     def where_with_expr(self, expr, predicate: tuple) -> Query: ...
@@ -469,16 +559,22 @@ class Query:
 class Scan:
     ttl: int
     def __init__(self, *args, **kwargs) -> None: ...
+    def aiter(self, policy: dict = ..., options: dict = ..., nodename: str = ..., buffer_size: int = ...) -> RecordIterator: ...
     def add_ops(self, ops: list) -> None: ...
     def apply(self, module: str, function: str, arguments: list = ...) -> Any: ...
-    def foreach(self, callback: Callable, policy: dict = ..., options: dict = ..., nodename: str = ...) -> None: ...
+    def foreach(self, callback: Callable, policy: dict = ..., options: dict = ..., nodename: str = ..., *, chunk_size: int = ...) -> None: ...
     def execute_background(self, policy: dict = ...) -> int: ...
     def get_partitions_status(self) -> tuple: ...
     def is_done(self) -> bool: ...
     def paginate(self) -> None: ...
+    def parallel_results(self, n_procs: int, config: dict, policy: dict = ..., **kwargs) -> list: ...
     def results(self, policy: dict = ..., nodename: str = ...) -> list: ...
+    def results_future(self, policy: dict = ..., nodename: str = ...) -> Future[list]: ...
     # TODO: this isn't an infinite list of bins
     def select(self, *args, **kwargs) -> None: ...
+    def split(self, n: int) -> list[PartitionWorkUnit]: ...
+    def stream(self, policy: dict = ..., options: dict = ..., nodename: str = ..., buffer_size: int = ...) -> RecordStream: ...
+    def to_arrow(self, policy: dict = ..., options: dict = ..., nodename: str = ..., schema: Any = ..., batch_size: int = ..., buffer_size: int = ...) -> RecordBatchStream: ...
 
 @final
 class null:
@@ -486,6 +582,7 @@ class null:
 
 def calc_digest(ns: str, set: str, key: Union[str, int, bytearray]) -> bytearray: ...
 def client(config: dict) -> Client: ...
+def compile_expression(expr: Union[list, CompiledExpression]) -> CompiledExpression: ...
 def geodata(geo_data: dict) -> GeoJSON: ...
 def geojson(geojson_str: str) -> GeoJSON: ...
 def get_partition_id(*args, **kwargs) -> Any: ...
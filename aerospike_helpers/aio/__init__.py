@@ -0,0 +1,105 @@
+##########################################################################
+# Copyright 2013-2024 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+
+"""Asynchronous iteration over the results of queries and scans.
+
+Query and scan results can be consumed with ``async for`` through :meth:`aerospike.Query.aiter` and
+:meth:`aerospike.Scan.aiter`, which return a :class:`RecordIterator`.
+
+.. note::
+
+    This module has no awaitable client. The C client is built without an event library, so its non-blocking
+    event-loop API is not available. Single-record commands of :class:`aerospike.Client` block the calling thread;
+    many records are read or written at once more cheaply with the batch commands, or their ``_future`` variants
+    such as :meth:`aerospike.Client.batch_read_future`.
+"""
+
+import asyncio
+import collections
+from concurrent.futures import Executor
+from typing import Optional
+
+from aerospike_helpers.stream import _DEFAULT_BUFFER_SIZE, _MAX_RECORDS_PER_FETCH, _RecordBuffer
+
+
+class RecordIterator:
+    """Asynchronous iterator over the records of a query or scan.
+
+    Returned by :meth:`aerospike.Query.aiter` and :meth:`aerospike.Scan.aiter`. The query or scan starts on the
+    first iteration and runs on a background thread. Records are passed to the event loop through a bounded buffer
+    of *buffer_size* records. When the buffer is full, the C client stops receiving more records until the
+    consumer catches up, so memory usage stays flat regardless of the size of the result set.
+
+    Args:
+        source (aerospike.Query | aerospike.Scan): the query or scan to run.
+        args: positional arguments passed to the source's ``foreach()`` after the callback.
+        buffer_size (int): maximum number of records buffered ahead of the consumer.
+        executor (concurrent.futures.Executor): executor used to wait on the buffer.
+            The event loop's default executor is used if not provided.
+        kwargs: keyword arguments passed to the source's ``foreach()``.
+
+    Closing the iterator with :meth:`aclose` stops the query or scan. An error raised by the query or scan
+    is raised by the iteration after all records received before the error have been returned.
+
+    >>> async def main():
+    ...     query = client.query("test", "demo")
+    ...     async for key, meta, bins in query.aiter(buffer_size=1000):
+    ...         print(bins)
+    """
+
+    def __init__(
+        self, source, *args, buffer_size: int = _DEFAULT_BUFFER_SIZE, executor: Optional[Executor] = None, **kwargs
+    ):
+        self._buffer = _RecordBuffer(source, args, kwargs, buffer_size)
+        self._executor = executor
+        self._pending = collections.deque()
+        self._exhausted = False
+
+    def __aiter__(self) -> "RecordIterator":
+        return self
+
+    async def __anext__(self) -> tuple:
+        if not self._pending:
+            if self._exhausted:
+                raise StopAsyncIteration
+            self._buffer.start()
+            loop = asyncio.get_running_loop()
+            try:
+                records = await loop.run_in_executor(self._executor, self._buffer.get_many, _MAX_RECORDS_PER_FETCH)
+            except BaseException:
+                self._exhausted = True
+                self._buffer.close()
+                raise
+            if not records:
+                self._exhausted = True
+                raise StopAsyncIteration
+            self._pending.extend(records)
+        return self._pending.popleft()
+
+    async def aclose(self) -> None:
+        """Stop the query or scan and discard the buffered records."""
+        self._exhausted = True
+        self._pending.clear()
+        self._buffer.close()
+
+    def __del__(self):
+        self._buffer.close()
+
+    async def __aenter__(self) -> "RecordIterator":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
@@ -0,0 +1,252 @@
+##########################################################################
+# Copyright 2013-2024 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+Export the records of a query or scan as Apache Arrow record batches.
+
+Instances of :class:`RecordBatchStream` are returned by :meth:`aerospike.Query.to_arrow` and
+:meth:`aerospike.Scan.to_arrow`. The client stores the bins of the records in the buffers of the Arrow columnar
+format, including the items of list and map bins, without creating a Python object for each value. This requires the
+`pyarrow <https://arrow.apache.org/docs/python/>`_ package.
+
+Example::
+
+    import aerospike
+    import pyarrow.parquet as pq
+
+    client = aerospike.client({"hosts": [("127.0.0.1", 3000)]})
+    scan = client.scan("test", "demo")
+
+    with scan.to_arrow(batch_size=50_000) as batches:
+        writer = None
+        for batch in batches:
+            if writer is None:
+                writer = pq.ParquetWriter("demo.parquet", batch.schema)
+            writer.write_batch(batch)
+        if writer is not None:
+            writer.close()
+
+    client.close()
+"""
+
+import threading
+from typing import Optional
+
+import pyarrow
+
+from aerospike import exception
+from aerospike_helpers.stream import _RecordBuffer
+
+_DEFAULT_BATCH_SIZE = 10000
+# Record batches converted ahead of the consumer
+_DEFAULT_BUFFER_SIZE = 2
+
+# Type codes set by the client for each bin, and for the items of lists and maps.
+# "l" is used for lists, "m" for maps and "n" for items that are all null
+_ARROW_TYPES = {
+    "q": pyarrow.int64(),
+    "d": pyarrow.float64(),
+    "?": pyarrow.bool_(),
+    "s": pyarrow.string(),
+    "b": pyarrow.binary(),
+}
+
+
+def _array(
+    n_rows: int,
+    type_code: str,
+    validity,
+    values,
+    data,
+    children: tuple,
+    arrow_type: Optional[pyarrow.DataType] = None,
+) -> pyarrow.Array:
+    if type_code == "n":
+        # Null arrays have no buffers
+        array = pyarrow.nulls(n_rows)
+    else:
+        # Each child is (length, type_code, validity, values, data, children)
+        child_arrays = [_array(*child) for child in children]
+        if type_code == "l":
+            array_type = pyarrow.list_(child_arrays[0].type)
+        elif type_code == "m":
+            keys, items = child_arrays
+            array_type = pyarrow.map_(keys.type, items.type)
+            entry_fields = [pyarrow.field("key", keys.type, nullable=False), pyarrow.field("value", items.type)]
+            child_arrays = [pyarrow.StructArray.from_arrays(child_arrays, fields=entry_fields)]
+        else:
+            array_type = _ARROW_TYPES[type_code]
+
+        # The arrays share the memory of the buffers
+        buffers = [pyarrow.py_buffer(buffer) for buffer in (validity, values, data) if buffer is not None]
+        array = pyarrow.Array.from_buffers(array_type, n_rows, buffers, children=child_arrays or None)
+
+    if arrow_type is not None and array.type != arrow_type:
+        array = array.cast(arrow_type)
+    return array
+
+
+def _record_batch(n_rows: int, buffers: dict, schema: Optional[pyarrow.Schema]) -> pyarrow.RecordBatch:
+    if schema is None:
+        arrays = [_array(n_rows, *buffer) for buffer in buffers.values()]
+        return pyarrow.RecordBatch.from_arrays(arrays, names=list(buffers))
+
+    arrays = []
+    for field in schema:
+        buffer = buffers.get(field.name)
+        if buffer is None:
+            arrays.append(pyarrow.nulls(n_rows, field.type))
+        else:
+            arrays.append(_array(n_rows, *buffer, arrow_type=field.type))
+    return pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _RecordBatchBuffer(_RecordBuffer):
+    """Runs ``source._foreach_columns()`` on a background thread and hands the record batches over through a
+    bounded queue."""
+
+    def __init__(self, source, args: tuple, kwargs: dict, buffer_size: int, batch_size: int, schema):
+        super().__init__(source, args, kwargs, buffer_size)
+        self._batch_size = batch_size
+        self.schema = schema
+        # The callback runs on several threads of the C client
+        self._schema_lock = threading.Lock()
+
+    def _foreach(self) -> None:
+        self._source._foreach_columns(self._on_columns, self._batch_size, *self._args, **self._kwargs)
+
+    def _on_columns(self, n_rows: int, buffers: dict) -> bool:
+        try:
+            batch = self._to_record_batch(n_rows, buffers)
+        except Exception as exc:
+            self._error = exc
+            return False
+        return self._put(batch)
+
+    def _to_record_batch(self, n_rows: int, buffers: dict) -> pyarrow.RecordBatch:
+        with self._schema_lock:
+            if self.schema is None:
+                # The first batch sets the schema of the stream
+                batch = _record_batch(n_rows, buffers, None)
+                self.schema = batch.schema
+                return batch
+            schema = self.schema
+
+        for bin_name in buffers:
+            if schema.get_field_index(bin_name) == -1:
+                raise exception.ClientError(
+                    -1,
+                    "Bin {} is not in the schema of the first record batch. Pass a schema to to_arrow()".format(
+                        bin_name
+                    ),
+                )
+        return _record_batch(n_rows, buffers, schema)
+
+
+class RecordBatchStream:
+    """Iterator over the records of a query or scan as :class:`pyarrow.RecordBatch` objects.
+
+    Returned by :meth:`aerospike.Query.to_arrow` and :meth:`aerospike.Scan.to_arrow`. Each record batch has the
+    bins of up to *batch_size* records, with one column per bin. The query or scan starts on the first iteration
+    and runs on a background thread. At most *buffer_size* record batches are buffered ahead of the consumer.
+
+    Bins are converted to these Arrow types:
+
+    * Integers to ``int64``, and floats to ``double``. A bin that has both is ``double``.
+    * Booleans to ``bool``.
+    * Strings and GeoJSON to ``string``, and bytes to ``binary``.
+    * Lists to ``list``, and maps to ``map``. The types of their items, and of the keys and values of maps, are
+      inferred from the values in the record batch the same way. Items that are all ``None`` or missing are
+      ``null``, and the keys of maps that are all empty are ``string``.
+
+    Records that don't have a bin are null in its column.
+
+    If *schema* is not passed, the schema of the first record batch is used for all of them, and a bin that is not
+    in it raises a :exc:`~aerospike.exception.ClientError`. Pass a schema to export sets whose records have
+    different bins. Columns are cast to the types of the schema, and bins that are not in the schema are not
+    exported.
+
+    Args:
+        source (aerospike.Query | aerospike.Scan): the query or scan to run.
+        args: the policy and options of the query or scan, and the node name of a scan.
+        schema (pyarrow.Schema): the schema of the record batches.
+        batch_size (int): maximum number of records in each record batch.
+        buffer_size (int): maximum number of record batches buffered ahead of the consumer.
+        kwargs: keyword arguments passed to the source's ``foreach()``.
+
+    Calling :meth:`close`, or leaving a ``with`` block, stops the query or scan. An error raised by the query or
+    scan is raised by the iteration after all record batches received before the error have been yielded.
+    """
+
+    def __init__(
+        self,
+        source,
+        *args,
+        schema: Optional[pyarrow.Schema] = None,
+        batch_size: int = _DEFAULT_BATCH_SIZE,
+        buffer_size: int = _DEFAULT_BUFFER_SIZE,
+        **kwargs
+    ):
+        if not isinstance(batch_size, int) or isinstance(batch_size, bool) or batch_size < 1:
+            raise exception.ParamError(-2, "batch_size must be an integer greater than 0")
+        if schema is not None and not isinstance(schema, pyarrow.Schema):
+            raise exception.ParamError(-2, "schema must be a pyarrow.Schema")
+        self._buffer = _RecordBatchBuffer(source, args, kwargs, buffer_size, batch_size, schema)
+        self._exhausted = False
+
+    @property
+    def schema(self) -> Optional[pyarrow.Schema]:
+        """The schema of the record batches. :py:obj:`None` until the first record batch if no schema was passed."""
+        return self._buffer.schema
+
+    def __iter__(self) -> "RecordBatchStream":
+        return self
+
+    def __next__(self) -> pyarrow.RecordBatch:
+        if self._exhausted:
+            raise StopIteration
+        self._buffer.start()
+        try:
+            batches = self._buffer.get_many(1)
+        except BaseException:
+            self.close()
+            raise
+        if not batches:
+            self._exhausted = True
+            raise StopIteration
+        return batches[0]
+
+    def read_all(self) -> pyarrow.Table:
+        """Return the remaining record batches as a :class:`pyarrow.Table`."""
+        batches = list(self)
+        schema = self.schema if self.schema is not None else pyarrow.schema([])
+        return pyarrow.Table.from_batches(batches, schema=schema)
+
+    def close(self) -> None:
+        """Stop the query or scan and discard the buffered record batches."""
+        self._exhausted = True
+        self._buffer.close()
+
+    def __enter__(self) -> "RecordBatchStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __del__(self):
+        # Not set if __init__() raised
+        buffer = getattr(self, "_buffer", None)
+        if buffer is not None:
+            buffer.close()
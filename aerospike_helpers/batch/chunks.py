@@ -0,0 +1,196 @@
+##########################################################################
+# Copyright 2013-2024 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+Send a large batch command in chunks of a bounded size.
+
+Instances of these classes are returned by :meth:`aerospike.Client.batch_write` and
+:meth:`aerospike.Client.batch_operate` when *max_batch_size* is passed.
+
+Example::
+
+    import aerospike
+    from aerospike_helpers.operations import operations as op
+
+    client = aerospike.client({"hosts": [("127.0.0.1", 3000)]})
+    keys = [("test", "demo", i) for i in range(1_000_000)]
+
+    for chunk in client.batch_operate(keys, [op.increment("count", 1)], max_batch_size=5000, max_inflight_batches=2):
+        for record in chunk.batch_records:
+            if record.result != 0:
+                print(record.key, record.result)
+
+    client.close()
+"""
+
+import collections
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Sequence
+
+from aerospike import exception
+from aerospike_helpers.batch.records import BatchRecords
+
+
+def _check_positive_int(name: str, value) -> None:
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        raise exception.ParamError(-2, "{} must be an integer greater than 0".format(name))
+
+
+class BatchChunks:
+    """Iterator over the results of a batch command that is sent in chunks.
+
+    Each iteration returns the :class:`~aerospike_helpers.batch.records.BatchRecords` of one chunk, in the same
+    order as the input. Chunks are sent on background threads, and up to *max_inflight_batches* chunks are sent at
+    the same time. The GIL is released while a chunk is on the wire, so the next chunk is converted meanwhile.
+    Only the chunks that are in flight or not consumed yet are held by the C client.
+
+    Args:
+        send (Callable[[list], BatchRecords]): sends one chunk of *items*.
+        items (Sequence): the items to split into chunks.
+        max_batch_size (int): maximum number of items in each chunk.
+        max_inflight_batches (int): maximum number of chunks sent at the same time.
+
+    An error raised by a chunk is raised by the iteration that would have returned it, and no more chunks are sent
+    after that. Calling :meth:`close`, or leaving a ``with`` block, stops sending chunks. Chunks that are
+    already in flight still complete.
+    """
+
+    _executor = None
+
+    def __init__(
+        self,
+        send: Callable[[list], BatchRecords],
+        items: Sequence,
+        max_batch_size: Optional[int],
+        max_inflight_batches: Optional[int],
+    ):
+        _check_positive_int("max_batch_size", max_batch_size)
+        if max_inflight_batches is None:
+            max_inflight_batches = 1
+        _check_positive_int("max_inflight_batches", max_inflight_batches)
+
+        self._send = send
+        self._items = items
+        self._max_batch_size = max_batch_size
+        self._max_inflight_batches = max_inflight_batches
+        self._next_start = 0
+        self._inflight = collections.deque()
+
+    def _submit_chunks(self) -> None:
+        while len(self._inflight) < self._max_inflight_batches and self._next_start < len(self._items):
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_inflight_batches, thread_name_prefix="aerospike-batch"
+                )
+            end = self._next_start + self._max_batch_size
+            chunk = self._items[self._next_start:end]
+            self._next_start = end
+            self._inflight.append(self._executor.submit(self._send, chunk))
+
+    def __iter__(self) -> "BatchChunks":
+        return self
+
+    def __next__(self) -> BatchRecords:
+        self._submit_chunks()
+        if not self._inflight:
+            self.close()
+            raise StopIteration
+        future = self._inflight.popleft()
+        try:
+            result = future.result()
+        except BaseException:
+            self.close()
+            raise
+        # Keeps the next chunk in flight while the caller handles this one
+        self._submit_chunks()
+        return result
+
+    def close(self) -> None:
+        """Stop sending chunks and discard the results that were not returned yet."""
+        self._next_start = len(self._items)
+        for future in self._inflight:
+            future.cancel()
+        self._inflight.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def __enter__(self) -> "BatchChunks":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __del__(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
+class BatchWriteChunks(BatchChunks):
+    """Returned by :meth:`aerospike.Client.batch_write` when *max_batch_size* is passed.
+
+    The :class:`~aerospike_helpers.batch.records.BatchRecord` objects of *batch_records* are split into chunks, and
+    each chunk is sent in its own :class:`~aerospike_helpers.batch.records.BatchRecords`. The results are set on
+    the same :class:`~aerospike_helpers.batch.records.BatchRecord` objects as without chunks, but the ``result``
+    of *batch_records* itself is not set. Check the ``result`` of each chunk instead.
+    """
+
+    def __init__(
+        self,
+        client,
+        batch_records: BatchRecords,
+        policy_batch: Optional[dict] = None,
+        *,
+        max_batch_size: Optional[int] = None,
+        max_inflight_batches: Optional[int] = None
+    ):
+        if not isinstance(batch_records, BatchRecords):
+            raise exception.ParamError(
+                -2, "batch_records must be an aerospike_helpers.batch.records.BatchRecords instance"
+            )
+
+        def send(chunk: list) -> BatchRecords:
+            return client.batch_write(BatchRecords(chunk), policy_batch)
+
+        super().__init__(send, batch_records.batch_records, max_batch_size, max_inflight_batches)
+
+
+class BatchOperateChunks(BatchChunks):
+    """Returned by :meth:`aerospike.Client.batch_operate` when *max_batch_size* is passed.
+
+    *keys* is split into chunks, and each chunk returns the
+    :class:`~aerospike_helpers.batch.records.BatchRecords` that :meth:`~aerospike.Client.batch_operate` returns for
+    those keys.
+    """
+
+    def __init__(
+        self,
+        client,
+        keys: list,
+        ops: list,
+        policy_batch: Optional[dict] = None,
+        policy_batch_write: Optional[dict] = None,
+        ttl: Optional[int] = None,
+        *,
+        max_batch_size: Optional[int] = None,
+        max_inflight_batches: Optional[int] = None
+    ):
+        if not isinstance(keys, list):
+            raise exception.ParamError(-2, "keys should be a list of aerospike key tuples")
+
+        def send(chunk: list) -> BatchRecords:
+            return client.batch_operate(chunk, ops, policy_batch, policy_batch_write, ttl)
+
+        super().__init__(send, keys, max_batch_size, max_inflight_batches)
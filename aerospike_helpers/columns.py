@@ -0,0 +1,94 @@
+##########################################################################
+# Copyright 2013-2024 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+Bins of records stored in NumPy arrays, one array per bin.
+
+Instances of :class:`Columns` are returned by :meth:`aerospike.Client.batch_read` and
+:meth:`aerospike.Query.results` when ``output="numpy"`` is passed. The arrays are filled by the client from the
+records received from the server, without creating a Python object for each value. This requires the
+`numpy <https://numpy.org/>`_ package.
+
+Example::
+
+    import aerospike
+
+    client = aerospike.client({"hosts": [("127.0.0.1", 3000)]})
+    keys = [("test", "demo", i) for i in range(100_000)]
+
+    columns = client.batch_read(keys, ["age", "score"], output="numpy")
+    # Mean of the scores of the records that have a score
+    print(columns["score"][columns.valid["score"]].mean())
+
+    client.close()
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy
+
+# Type codes set by the client for each bin
+_DTYPES = {
+    "q": numpy.int64,
+    "d": numpy.float64,
+    "?": numpy.bool_,
+}
+
+
+class Columns(dict):
+    """:class:`dict` of bin names to NumPy arrays of their values, with one row per record.
+
+    Integer bins are stored in :class:`numpy.int64` arrays, float bins in :class:`numpy.float64` arrays, and boolean
+    bins in :class:`numpy.bool_` arrays. A bin that has both integers and floats is stored in a
+    :class:`numpy.float64` array. Bins that have values of other types can't be stored, and raise a
+    :exc:`~aerospike.exception.ClientError`.
+
+    If a record does not have a bin, the value of the bin in that row is ``0`` and its validity is ``False``.
+
+    For :meth:`aerospike.Client.batch_read`, rows are in the same order as the keys, and all of the bins of a record
+    that was not read are invalid. For :meth:`aerospike.Query.results`, rows are in the order in which the records
+    were received.
+
+    Attributes:
+        valid (dict): bin names to :class:`numpy.bool_` arrays. ``True`` if the record of the row has the bin.
+        n_rows (int): the number of rows of each array.
+    """
+
+    def __init__(
+        self,
+        columns: Optional[Dict[str, numpy.ndarray]] = None,
+        valid: Optional[Dict[str, numpy.ndarray]] = None,
+        n_rows: int = 0,
+    ):
+        super().__init__(columns or {})
+        self.valid = valid if valid is not None else {}
+        self.n_rows = n_rows
+
+    @classmethod
+    def _from_buffers(cls, n_rows: int, buffers: Dict[str, Tuple[str, bytearray, bytearray]]) -> "Columns":
+        # The arrays share the memory of the buffers
+        columns = {}
+        valid = {}
+        for bin_name, (type_code, values, validity) in buffers.items():
+            columns[bin_name] = numpy.frombuffer(values, dtype=_DTYPES[type_code], count=n_rows)
+            valid[bin_name] = numpy.frombuffer(validity, dtype=numpy.bool_, count=n_rows)
+        return cls(columns, valid, n_rows)
+
+    def masked(self, bin_name: str) -> numpy.ma.MaskedArray:
+        """Return the values of *bin_name* as a :class:`numpy.ma.MaskedArray` that masks the invalid rows."""
+        return numpy.ma.MaskedArray(self[bin_name], mask=~self.valid[bin_name])
+
+    def __repr__(self) -> str:
+        return "{}({}, n_rows={})".format(type(self).__name__, dict.__repr__(self), self.n_rows)
@@ -56,6 +56,29 @@ class Val(_BaseExpr):
         super().__init__()
 
 
+class Param(_BaseExpr):
+    """
+    Create an expression that returns the value of a parameter. The value is passed with each command in the
+    ``"expression_params"`` field of the policy, so the expression only has to be compiled once.
+    """
+
+    _op = _ExprOp._AS_EXP_CODE_AS_VAL
+
+    def __init__(self, name: str):
+        """Args:
+            name (str): Name of the parameter.
+
+        :return: (value of the parameter)
+
+        Example::
+
+            # Records updated after a cutoff that changes between commands.
+            expr = exp.GT(exp.LastUpdateTime(), exp.Param("cutoff")).precompile()
+            policy = {"expressions": expr, "expression_params": {"cutoff": cutoff}}
+        """
+        self._fixed = {_Keys.PARAM_KEY: name}
+
+
 class Unknown(_BaseExpr):
     """Create an 'Unknown' expression, which allows an operation expression
     ('read expression' or 'write expression') to be aborted.
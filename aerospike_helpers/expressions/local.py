@@ -0,0 +1,1548 @@
+##########################################################################
+# Copyright 2013-2024 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+Evaluate expressions against records in the client process.
+
+A :class:`LocalExpression` runs an :mod:`aerospike_helpers.expressions` expression against records that the
+application already has, such as cached records or records read by a stream, with the semantics that the server
+uses for filter expressions. This avoids a round trip to the server, and lets filters be tested without a
+cluster.
+
+Records are tuples of ``(key, meta, bins)``, as returned by :meth:`aerospike.Client.get`. In addition to the
+``"ttl"`` field, *meta* can have a ``"last_update_time"`` field with the last update time of the record in
+nanoseconds since 1970-01-01, which is used by :class:`~aerospike_helpers.expressions.base.LastUpdateTime` and
+:class:`~aerospike_helpers.expressions.base.SinceUpdateTime`.
+
+These expressions are supported:
+
+* bins, record keys and the record metadata listed above, and :class:`~aerospike_helpers.expressions.base.SetName`
+* comparison, logical, conditional and variable expressions
+* arithmetic and integer bitwise expressions
+* list and map read expressions, such as :class:`~aerospike_helpers.expressions.list.ListGetByIndex` and
+  :class:`~aerospike_helpers.expressions.map.MapGetByKeyRange`
+* HyperLogLog read expressions, except :class:`~aerospike_helpers.expressions.hll.HLLMayContain`
+
+Other expressions, such as expressions that modify lists and maps, raise :exc:`~aerospike.exception.ParamError`
+when the :class:`LocalExpression` is created.
+
+Example::
+
+    import aerospike_helpers.expressions as exp
+    from aerospike_helpers.expressions.local import LocalExpression
+
+    adults = LocalExpression(exp.GE(exp.IntBin("age"), 18))
+    records = [
+        (None, {"ttl": 100}, {"age": 30}),
+        (None, {"ttl": 100}, {"age": 12}),
+    ]
+    # [(None, {'ttl': 100}, {'age': 30})]
+    print(list(adults.filter(records)))
+"""
+
+import math
+import re
+import time
+from functools import cmp_to_key
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import aerospike
+from aerospike import exception
+from aerospike_helpers import HyperLogLog
+from aerospike_helpers.expressions.resources import _BaseExpr
+from aerospike_helpers.expressions.resources import _ExprOp
+from aerospike_helpers.expressions.resources import _Keys
+from aerospike_helpers.expressions.resources import ResultType
+from aerospike_helpers.expressions.resources import ReturnType
+
+TypeRecord = Tuple[Any, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+_INT64_MIN = -(1 << 63)
+_UINT64_MASK = (1 << 64) - 1
+_NO_EXPIRE_TTLS = (-1, 0xFFFFFFFF)
+
+
+class _Unknown(Exception):
+    # Raised when an expression has the 'unknown' value, such as when a bin does not have the expected type
+    pass
+
+
+class _Context:
+    __slots__ = ("key", "meta", "bins", "params", "now", "vars")
+
+    def __init__(self, key, meta, bins, params, now, n_vars):
+        self.key = key
+        self.meta = meta
+        self.bins = bins
+        self.params = params
+        self.now = now
+        self.vars = [None] * n_vars
+
+
+def _unsupported(what) -> exception.ParamError:
+    return exception.ParamError(-2, "{} can't be evaluated locally".format(what))
+
+
+def _wrap(value: int) -> int:
+    # Signed 64 bit overflow, as on the server
+    return ((value - _INT64_MIN) & _UINT64_MASK) + _INT64_MIN
+
+
+###############
+# Value order
+###############
+
+# Order of the types of values in lists and maps
+_NIL, _BOOL, _INT, _STR, _LIST, _MAP, _BYTES, _FLOAT, _GEOJSON, _INF, _WILDCARD = range(11)
+
+_TYPE_ORDER = {
+    type(None): _NIL,
+    bool: _BOOL,
+    int: _INT,
+    str: _STR,
+    list: _LIST,
+    dict: _MAP,
+    bytes: _BYTES,
+    bytearray: _BYTES,
+    HyperLogLog: _BYTES,
+    float: _FLOAT,
+    aerospike.GeoJSON: _GEOJSON,
+    aerospike.CDTInfinite: _INF,
+    aerospike.CDTWildcard: _WILDCARD,
+}
+
+
+def _type_order(value) -> int:
+    order = _TYPE_ORDER.get(type(value))
+    if order is not None:
+        return order
+    for value_type, order in _TYPE_ORDER.items():
+        if isinstance(value, value_type) and value_type not in (bool, int):
+            return order
+    if isinstance(value, bool):
+        return _BOOL
+    if isinstance(value, int):
+        return _INT
+    raise _Unknown
+
+
+# Types that are compared by their Python values
+_SCALARS = frozenset((bool, int, str, bytes, float))
+
+
+def _compare(a, b) -> int:
+    value_type = type(a)
+    if value_type is type(b) and value_type in _SCALARS:
+        return (a > b) - (a < b)
+    order_a = _type_order(a)
+    order_b = _type_order(b)
+    if order_a == _WILDCARD or order_b == _WILDCARD:
+        return 0
+    if order_a != order_b:
+        return -1 if order_a < order_b else 1
+    if order_a == _LIST:
+        for item_a, item_b in zip(a, b):
+            if _type_order(item_b) == _WILDCARD or _type_order(item_a) == _WILDCARD:
+                # Matches the rest of the list
+                return 0
+            result = _compare(item_a, item_b)
+            if result:
+                return result
+        return (len(a) > len(b)) - (len(a) < len(b))
+    if order_a == _MAP:
+        if len(a) != len(b):
+            return -1 if len(a) < len(b) else 1
+        for (key_a, value_a), (key_b, value_b) in zip(_sorted_items(a), _sorted_items(b)):
+            result = _compare(key_a, key_b) or _compare(value_a, value_b)
+            if result:
+                return result
+        return 0
+    key_a = _sort_key(a)[1]
+    key_b = _sort_key(b)[1]
+    return (key_a > key_b) - (key_a < key_b)
+
+
+_CompareKey = cmp_to_key(_compare)
+
+
+def _sort_key(value) -> tuple:
+    # Values of the same type are compared by the second item only
+    order = _type_order(value)
+    if order == _LIST or order == _MAP:
+        return (order, _CompareKey(value))
+    if order == _GEOJSON:
+        return (order, value.dumps())
+    if order == _BYTES:
+        return (order, bytes(value))
+    if order in (_NIL, _INF, _WILDCARD):
+        return (order, 0)
+    return (order, value)
+
+
+def _sorted_items(value: dict) -> list:
+    return sorted(value.items(), key=lambda item: _sort_key(item[0]))
+
+
+def _rank_order(values) -> list:
+    # Indexes of the values from the lowest value to the highest value.
+    # Equal values are ordered by index.
+    return sorted(range(len(values)), key=lambda i: _sort_key(values[i]))
+
+
+def _ranks(values) -> list:
+    ranks = [0] * len(values)
+    for rank, i in enumerate(_rank_order(values)):
+        ranks[i] = rank
+    return ranks
+
+
+def _same_type(a, b) -> bool:
+    return (type(a) is type(b) and type(a) in _SCALARS) or _type_order(a) == _type_order(b)
+
+
+###############
+# Types
+###############
+
+_TYPE_CHECKS = {
+    ResultType.NIL: lambda v: v is None,
+    ResultType.BOOLEAN: lambda v: type(v) is bool,
+    ResultType.INTEGER: lambda v: type(v) is int,
+    ResultType.STRING: lambda v: isinstance(v, str),
+    ResultType.LIST: lambda v: isinstance(v, list),
+    ResultType.MAP: lambda v: isinstance(v, dict),
+    ResultType.BLOB: lambda v: isinstance(v, (bytes, bytearray)) and not isinstance(v, HyperLogLog),
+    ResultType.FLOAT: lambda v: type(v) is float,
+    ResultType.GEOJSON: lambda v: isinstance(v, aerospike.GeoJSON),
+    ResultType.HLL: lambda v: isinstance(v, HyperLogLog),
+}
+
+
+def _bin_type(value) -> int:
+    if value is None:
+        return aerospike.AS_BYTES_UNDEF
+    if isinstance(value, bool):
+        return aerospike.AS_BYTES_BOOL
+    if isinstance(value, int):
+        return aerospike.AS_BYTES_INTEGER
+    if isinstance(value, float):
+        return aerospike.AS_BYTES_DOUBLE
+    if isinstance(value, str):
+        return aerospike.AS_BYTES_STRING
+    if isinstance(value, HyperLogLog):
+        return aerospike.AS_BYTES_HLL
+    if isinstance(value, (bytes, bytearray)):
+        return aerospike.AS_BYTES_BLOB
+    if isinstance(value, list):
+        return aerospike.AS_BYTES_LIST
+    if isinstance(value, dict):
+        return aerospike.AS_BYTES_MAP
+    if isinstance(value, aerospike.GeoJSON):
+        return aerospike.AS_BYTES_GEOJSON
+    # Stored by the client with its serializer
+    return aerospike.AS_BYTES_PYTHON
+
+
+def _int(value) -> int:
+    if type(value) is not int:
+        raise _Unknown
+    return value
+
+
+def _float(value) -> float:
+    if type(value) is not float:
+        raise _Unknown
+    return value
+
+
+def _bool(value) -> bool:
+    if type(value) is not bool:
+        raise _Unknown
+    return value
+
+
+def _numbers(values) -> type:
+    # All of the values must be integers or all of them must be floats
+    value_type = type(values[0])
+    if value_type is not int and value_type is not float:
+        raise _Unknown
+    for value in values:
+        if type(value) is not value_type:
+            raise _Unknown
+    return value_type
+
+
+###############
+# Builders
+###############
+
+# Functions that build an evaluation function for an expression, by operation
+_BUILDERS: Dict[int, Callable] = {}
+
+
+def _builds(*ops):
+    def register(build):
+        for op in ops:
+            _BUILDERS[op] = build
+        return build
+
+    return register
+
+
+class _Builder:
+    def __init__(self):
+        self.n_vars = 0
+        self.params = set()
+
+    def build(self, expr, scope: Dict[str, int]) -> Callable:
+        if not isinstance(expr, _BaseExpr):
+            return lambda ctx: expr
+        build = _BUILDERS.get(expr._op)
+        if build is None:
+            raise _unsupported(type(expr).__name__)
+        return build(self, expr, scope)
+
+    def build_args(self, expr, scope: Dict[str, int]) -> list:
+        return [self.build(child, scope) for child in _args(expr)]
+
+
+def _args(expr) -> tuple:
+    children = expr._children
+    if children and isinstance(children[-1], _BaseExpr) and children[-1]._op == _ExprOp._AS_EXP_CODE_END_OF_VA_ARGS:
+        return children[:-1]
+    return children
+
+
+@_builds(_ExprOp._AS_EXP_CODE_AS_VAL)
+def _build_val(builder, expr, scope):
+    if _Keys.PARAM_KEY in expr._fixed:
+        name = expr._fixed[_Keys.PARAM_KEY]
+        if not isinstance(name, str):
+            raise exception.ParamError(-2, "Expression parameter names must be strings")
+        builder.params.add(name)
+        return lambda ctx: ctx.params[name]
+    value = expr._fixed[_Keys.VALUE_KEY]
+    return lambda ctx: value
+
+
+@_builds(_ExprOp.UNKNOWN)
+def _build_unknown(builder, expr, scope):
+    def unknown(ctx):
+        raise _Unknown
+
+    return unknown
+
+
+# Record
+
+
+@_builds(_ExprOp.BIN)
+def _build_bin(builder, expr, scope):
+    name = expr._fixed[_Keys.BIN_KEY]
+    check = _TYPE_CHECKS[expr._rt]
+
+    def bin_value(ctx):
+        value = ctx.bins.get(name)
+        if value is None or not check(value):
+            raise _Unknown
+        return value
+
+    return bin_value
+
+
+@_builds(_ExprOp.BIN_EXISTS)
+def _build_bin_exists(builder, expr, scope):
+    name = expr._fixed[_Keys.BIN_KEY]
+    return lambda ctx: ctx.bins.get(name) is not None
+
+
+@_builds(_ExprOp.BIN_TYPE)
+def _build_bin_type(builder, expr, scope):
+    name = expr._fixed[_Keys.BIN_KEY]
+    return lambda ctx: _bin_type(ctx.bins.get(name))
+
+
+@_builds(_ExprOp.REC_KEY)
+def _build_key(builder, expr, scope):
+    check = _TYPE_CHECKS[expr._rt]
+
+    def key(ctx):
+        user_key = ctx.key[2] if ctx.key is not None and len(ctx.key) > 2 else None
+        if user_key is None or not check(user_key):
+            raise _Unknown
+        return user_key
+
+    return key
+
+
+@_builds(_ExprOp.META_KEY_EXISTS)
+def _build_key_exists(builder, expr, scope):
+    return lambda ctx: ctx.key is not None and len(ctx.key) > 2 and ctx.key[2] is not None
+
+
+@_builds(_ExprOp.META_SET_NAME)
+def _build_set_name(builder, expr, scope):
+    def set_name(ctx):
+        if ctx.key is None:
+            raise exception.ParamError(-2, "The record has no key")
+        return ctx.key[1] or ""
+
+    return set_name
+
+
+@_builds(_ExprOp.META_DIGEST_MOD)
+def _build_digest_mod(builder, expr, scope):
+    mod = expr._fixed[_Keys.VALUE_KEY]
+
+    def digest_mod(ctx):
+        key = ctx.key
+        if key is None:
+            raise exception.ParamError(-2, "The record has no key")
+        digest = key[3] if len(key) > 3 else None
+        if digest is None:
+            digest = aerospike.calc_digest(key[0], key[1], key[2])
+        # The server uses the last 4 bytes of the digest
+        return int.from_bytes(bytes(digest[16:20]), "little") % mod
+
+    return digest_mod
+
+
+def _meta(ctx, name):
+    value = ctx.meta.get(name)
+    if value is None:
+        raise exception.ParamError(-2, "The record metadata has no {}".format(name))
+    return value
+
+
+@_builds(_ExprOp.META_TTL)
+def _build_ttl(builder, expr, scope):
+    def ttl(ctx):
+        value = _meta(ctx, "ttl")
+        return -1 if value in _NO_EXPIRE_TTLS else value
+
+    return ttl
+
+
+@_builds(_ExprOp.META_VOID_TIME)
+def _build_void_time(builder, expr, scope):
+    def void_time(ctx):
+        value = _meta(ctx, "ttl")
+        if value in _NO_EXPIRE_TTLS:
+            return -1
+        return (ctx.now // 1_000_000_000 + value) * 1_000_000_000
+
+    return void_time
+
+
+@_builds(_ExprOp.META_LAST_UPDATE_TIME)
+def _build_last_update_time(builder, expr, scope):
+    return lambda ctx: _meta(ctx, "last_update_time")
+
+
+@_builds(_ExprOp.META_SINCE_UPDATE_TIME)
+def _build_since_update_time(builder, expr, scope):
+    return lambda ctx: (ctx.now - _meta(ctx, "last_update_time")) // 1_000_000
+
+
+@_builds(_ExprOp.META_IS_TOMBSTONE)
+def _build_is_tombstone(builder, expr, scope):
+    # Records read by the client are never tombstones
+    return lambda ctx: False
+
+
+# Comparison
+
+
+def _build_comparison(test):
+    def build(builder, expr, scope):
+        left, right = builder.build_args(expr, scope)
+
+        def compare(ctx):
+            a = left(ctx)
+            b = right(ctx)
+            if not _same_type(a, b):
+                raise _Unknown
+            return test(_compare(a, b))
+
+        return compare
+
+    return build
+
+
+_builds(_ExprOp.EQ)(_build_comparison(lambda result: result == 0))
+_builds(_ExprOp.NE)(_build_comparison(lambda result: result != 0))
+_builds(_ExprOp.GT)(_build_comparison(lambda result: result > 0))
+_builds(_ExprOp.GE)(_build_comparison(lambda result: result >= 0))
+_builds(_ExprOp.LT)(_build_comparison(lambda result: result < 0))
+_builds(_ExprOp.LE)(_build_comparison(lambda result: result <= 0))
+
+
+@_builds(_ExprOp.CMP_REGEX)
+def _build_cmp_regex(builder, expr, scope):
+    options = expr._fixed[_Keys.REGEX_OPTIONS_KEY]
+    flags = 0
+    if options & aerospike.REGEX_ICASE:
+        flags |= re.IGNORECASE
+    # Without REGEX_NEWLINE, POSIX regexes match newlines with "." and do not match lines with "^" and "$"
+    flags |= re.MULTILINE if options & aerospike.REGEX_NEWLINE else re.DOTALL
+    try:
+        pattern = re.compile(expr._fixed[_Keys.VALUE_KEY], flags)
+    except re.error as error:
+        raise exception.ParamError(-2, "Invalid regex: {}".format(error))
+    (string,) = builder.build_args(expr, scope)
+
+    def cmp_regex(ctx):
+        value = string(ctx)
+        if not isinstance(value, str):
+            raise _Unknown
+        return pattern.search(value) is not None
+
+    return cmp_regex
+
+
+# Logical
+
+
+@_builds(_ExprOp.NOT)
+def _build_not(builder, expr, scope):
+    (arg,) = builder.build_args(expr, scope)
+    return lambda ctx: not _bool(arg(ctx))
+
+
+@_builds(_ExprOp.AND)
+def _build_and(builder, expr, scope):
+    args = builder.build_args(expr, scope)
+
+    def and_(ctx):
+        unknown = False
+        for arg in args:
+            try:
+                if not _bool(arg(ctx)):
+                    return False
+            except _Unknown:
+                unknown = True
+        if unknown:
+            raise _Unknown
+        return True
+
+    return and_
+
+
+@_builds(_ExprOp.OR)
+def _build_or(builder, expr, scope):
+    args = builder.build_args(expr, scope)
+
+    def or_(ctx):
+        unknown = False
+        for arg in args:
+            try:
+                if _bool(arg(ctx)):
+                    return True
+            except _Unknown:
+                unknown = True
+        if unknown:
+            raise _Unknown
+        return False
+
+    return or_
+
+
+@_builds(_ExprOp.EXCLUSIVE)
+def _build_exclusive(builder, expr, scope):
+    args = builder.build_args(expr, scope)
+    return lambda ctx: sum(_bool(arg(ctx)) for arg in args) == 1
+
+
+# Flow control and variables
+
+
+@_builds(_ExprOp.COND)
+def _build_cond(builder, expr, scope):
+    args = builder.build_args(expr, scope)
+    if len(args) < 3 or len(args) % 2 == 0:
+        raise exception.ParamError(-2, "Cond requires pairs of conditions and actions, and a default action")
+    cases = list(zip(args[:-1:2], args[1:-1:2]))
+    default = args[-1]
+
+    def cond(ctx):
+        for test, action in cases:
+            if _bool(test(ctx)):
+                return action(ctx)
+        return default(ctx)
+
+    return cond
+
+
+@_builds(_ExprOp.LET)
+def _build_let(builder, expr, scope):
+    children = _args(expr)
+    scope = dict(scope)
+    definitions = []
+    for definition in children[:-1]:
+        if not isinstance(definition, _BaseExpr) or definition._op != _ExprOp.DEF:
+            raise exception.ParamError(-2, "Let requires Def expressions before its scope expression")
+        value = builder.build(definition._children[0], scope)
+        slot = builder.n_vars
+        builder.n_vars += 1
+        scope[definition._fixed[_Keys.VALUE_KEY]] = slot
+        definitions.append((slot, value))
+    body = builder.build(children[-1], scope)
+
+    def let(ctx):
+        variables = ctx.vars
+        for slot, value in definitions:
+            variables[slot] = value(ctx)
+        return body(ctx)
+
+    return let
+
+
+@_builds(_ExprOp.VAR)
+def _build_var(builder, expr, scope):
+    name = expr._fixed[_Keys.VALUE_KEY]
+    if name not in scope:
+        raise exception.ParamError(-2, "Variable {} is not defined".format(name))
+    slot = scope[name]
+    return lambda ctx: ctx.vars[slot]
+
+
+# Arithmetic
+
+
+@_builds(_ExprOp.ADD)
+def _build_add(builder, expr, scope):
+    args = builder.build_args(expr, scope)
+
+    def add(ctx):
+        values = [arg(ctx) for arg in args]
+        if _numbers(values) is int:
+            return _wrap(sum(values))
+        result = values[0]
+        for value in values[1:]:
+            result += value
+        return result
+
+    return add
+
+
+@_builds(_ExprOp.SUB)
+def _build_sub(builder, expr, scope):
+    args = builder.build_args(expr, scope)
+
+    def sub(ctx):
+        values = [arg(ctx) for arg in args]
+        value_type = _numbers(values)
+        if len(values) == 1:
+            result = -values[0]
+        else:
+            result = values[0]
+            for value in values[1:]:
+                result -= value
+        return _wrap(result) if value_type is int else result
+
+    return sub
+
+
+@_builds(_ExprOp.MUL)
+def _build_mul(builder, expr, scope):
+    args = builder.build_args(expr, scope)
+
+    def mul(ctx):
+        values = [arg(ctx) for arg in args]
+        value_type = _numbers(values)
+        result = values[0]
+        for value in values[1:]:
+            result *= value
+        return _wrap(result) if value_type is int else result
+
+    return mul
+
+
+def _div(a, b, value_type):
+    if value_type is float:
+        if b == 0.0:
+            # IEEE 754 division
+            if a == 0.0 or math.isnan(a):
+                return math.nan
+            return math.copysign(math.inf, a) * math.copysign(1.0, b)
+        return a / b
+    if b == 0:
+        raise _Unknown
+    # Rounds toward zero, as in C
+    quotient = abs(a) // abs(b)
+    return _wrap(quotient if (a < 0) == (b < 0) else -quotient)
+
+
+@_builds(_ExprOp.DIV)
+def _build_div(builder, expr, scope):
+    args = builder.build_args(expr, scope)
+
+    def div(ctx):
+        values = [arg(ctx) for arg in args]
+        value_type = _numbers(values)
+        if len(values) == 1:
+            return _div(value_type(1), values[0], value_type)
+        result = values[0]
+        for value in values[1:]:
+            result = _div(result, value, value_type)
+        return result
+
+    return div
+
+
+@_builds(_ExprOp.POW)
+def _build_pow(builder, expr, scope):
+    base, exponent = builder.build_args(expr, scope)
+
+    def pow_(ctx):
+        try:
+            return math.pow(_float(base(ctx)), _float(exponent(ctx)))
+        except OverflowError:
+            return math.inf
+        except ValueError:
+            return math.nan
+
+    return pow_
+
+
+def _log(value: float) -> float:
+    if value == 0.0:
+        return -math.inf
+    if value < 0.0 or math.isnan(value):
+        return math.nan
+    return math.log(value)
+
+
+@_builds(_ExprOp.LOG)
+def _build_log(builder, expr, scope):
+    num, base = builder.build_args(expr, scope)
+
+    def log(ctx):
+        numerator = _log(_float(num(ctx)))
+        denominator = _log(_float(base(ctx)))
+        if denominator == 0.0:
+            return _div(numerator, denominator, float)
+        return numerator / denominator
+
+    return log
+
+
+@_builds(_ExprOp.MOD)
+def _build_mod(builder, expr, scope):
+    numerator, denominator = builder.build_args(expr, scope)
+
+    def mod(ctx):
+        a = _int(numerator(ctx))
+        b = _int(denominator(ctx))
+        if b == 0:
+            raise _Unknown
+        # Has the sign of the numerator, as in C
+        remainder = abs(a) % abs(b)
+        return -remainder if a < 0 else remainder
+
+    return mod
+
+
+@_builds(_ExprOp.ABS)
+def _build_abs(builder, expr, scope):
+    (arg,) = builder.build_args(expr, scope)
+
+    def abs_(ctx):
+        value = arg(ctx)
+        if _numbers([value]) is int:
+            return _wrap(abs(value))
+        return abs(value)
+
+    return abs_
+
+
+def _build_rounding(rounding):
+    def build(builder, expr, scope):
+        (arg,) = builder.build_args(expr, scope)
+
+        def round_(ctx):
+            value = _float(arg(ctx))
+            if math.isinf(value) or math.isnan(value):
+                return value
+            return float(rounding(value))
+
+        return round_
+
+    return build
+
+
+_builds(_ExprOp.FLOOR)(_build_rounding(math.floor))
+_builds(_ExprOp.CEIL)(_build_rounding(math.ceil))
+
+
+@_builds(_ExprOp.TO_INT)
+def _build_to_int(builder, expr, scope):
+    (arg,) = builder.build_args(expr, scope)
+
+    def to_int(ctx):
+        value = _float(arg(ctx))
+        if math.isinf(value) or math.isnan(value):
+            raise _Unknown
+        result = int(value)
+        if result != _wrap(result):
+            raise _Unknown
+        return result
+
+    return to_int
+
+
+@_builds(_ExprOp.TO_FLOAT)
+def _build_to_float(builder, expr, scope):
+    (arg,) = builder.build_args(expr, scope)
+    return lambda ctx: float(_int(arg(ctx)))
+
+
+def _build_min_max(choose):
+    def build(builder, expr, scope):
+        args = builder.build_args(expr, scope)
+
+        def min_max(ctx):
+            values = [arg(ctx) for arg in args]
+            _numbers(values)
+            return choose(values)
+
+        return min_max
+
+    return build
+
+
+_builds(_ExprOp.MIN)(_build_min_max(min))
+_builds(_ExprOp.MAX)(_build_min_max(max))
+
+
+# Integer bitwise operators
+
+
+def _build_int_va_args(operate):
+    def build(builder, expr, scope):
+        args = builder.build_args(expr, scope)
+
+        def int_op(ctx):
+            result = _int(args[0](ctx))
+            for arg in args[1:]:
+                result = operate(result, _int(arg(ctx)))
+            return result
+
+        return int_op
+
+    return build
+
+
+_builds(_ExprOp.INT_AND)(_build_int_va_args(lambda a, b: a & b))
+_builds(_ExprOp.INT_OR)(_build_int_va_args(lambda a, b: a | b))
+_builds(_ExprOp.INT_XOR)(_build_int_va_args(lambda a, b: a ^ b))
+
+
+@_builds(_ExprOp.INT_NOT)
+def _build_int_not(builder, expr, scope):
+    (arg,) = builder.build_args(expr, scope)
+    return lambda ctx: ~_int(arg(ctx))
+
+
+def _build_shift(shift):
+    def build(builder, expr, scope):
+        value, bits = builder.build_args(expr, scope)
+
+        def shift_(ctx):
+            n = _int(bits(ctx))
+            if n < 0:
+                raise _Unknown
+            # All of the bits are shifted out after 64 bits
+            return _wrap(shift(_int(value(ctx)), min(n, 64)))
+
+        return shift_
+
+    return build
+
+
+_builds(_ExprOp.INT_LSHIFT)(_build_shift(lambda value, n: value << n))
+_builds(_ExprOp.INT_RSHIFT)(_build_shift(lambda value, n: (value & _UINT64_MASK) >> n))
+_builds(_ExprOp.INT_ARSHIFT)(_build_shift(lambda value, n: value >> n))
+
+
+@_builds(_ExprOp.INT_COUNT)
+def _build_int_count(builder, expr, scope):
+    (arg,) = builder.build_args(expr, scope)
+    return lambda ctx: bin(_int(arg(ctx)) & _UINT64_MASK).count("1")
+
+
+def _scan_bits(value: int, search: bool) -> int:
+    # Bits that match the search value
+    return value & _UINT64_MASK if search else ~value & _UINT64_MASK
+
+
+@_builds(_ExprOp.INT_LSCAN)
+def _build_int_lscan(builder, expr, scope):
+    value, search = builder.build_args(expr, scope)
+
+    def lscan(ctx):
+        bits = _scan_bits(_int(value(ctx)), _bool(search(ctx)))
+        # The most significant bit has index 0
+        return 64 - bits.bit_length() if bits else -1
+
+    return lscan
+
+
+@_builds(_ExprOp.INT_RSCAN)
+def _build_int_rscan(builder, expr, scope):
+    value, search = builder.build_args(expr, scope)
+
+    def rscan(ctx):
+        bits = _scan_bits(_int(value(ctx)), _bool(search(ctx)))
+        return 64 - (bits & -bits).bit_length() if bits else -1
+
+    return rscan
+
+
+###############
+# Lists and maps
+###############
+
+
+def _index(n: int, index: int) -> int:
+    # Index of a single item, counting from the end if it is negative
+    if type(index) is not int:
+        raise _Unknown
+    if index < 0:
+        index += n
+    if index < 0 or index >= n:
+        raise _Unknown
+    return index
+
+
+def _range(n: int, index: int, count: Optional[int]) -> range:
+    if type(index) is not int or (count is not None and (type(count) is not int or count < 0)):
+        raise _Unknown
+    if index < 0:
+        index += n
+        if index < 0:
+            # Only the part of the range that is in the list is used
+            if count is not None:
+                count = max(count + index, 0)
+            index = 0
+    end = n if count is None else min(n, index + count)
+    return range(index, max(index, end))
+
+
+def _relative_range(n: int, origin: int, offset: int, count: Optional[int]) -> range:
+    if type(offset) is not int or (count is not None and (type(count) is not int or count < 0)):
+        raise _Unknown
+    start = origin + offset
+    if start < 0:
+        if count is not None:
+            count = max(count + start, 0)
+        start = 0
+    end = n if count is None else min(n, start + count)
+    return range(start, max(start, end))
+
+
+def _in_range(value, begin, end) -> bool:
+    if begin is not None and _compare(value, begin) < 0:
+        return False
+    return end is None or _compare(value, end) < 0
+
+
+def _values_list(values) -> list:
+    if not isinstance(values, list):
+        raise _Unknown
+    return values
+
+
+class _Items:
+    # The items of a list or a map, in index order.
+    # The index order of a map is the order of its keys.
+
+    __slots__ = ("keys", "values", "_order")
+
+    def __init__(self, keys, values):
+        self.keys = keys
+        self.values = values
+        self._order = None
+
+    @classmethod
+    def of(cls, value, is_map):
+        if is_map:
+            if not isinstance(value, dict):
+                raise _Unknown
+            items = _sorted_items(value)
+            return cls([k for k, _ in items], [v for _, v in items])
+        if not isinstance(value, list):
+            raise _Unknown
+        return cls(None, value)
+
+    def __len__(self):
+        return len(self.values)
+
+    def rank_order(self) -> list:
+        if self._order is None:
+            self._order = _rank_order(self.values)
+        return self._order
+
+    def origin(self, items, value) -> int:
+        # Position that value would have in items
+        return sum(1 for item in items if _compare(item, value) < 0)
+
+
+# Selections of items, as lists of indexes
+
+
+def _select_value(items, value):
+    return [i for i, item in enumerate(items.values) if _compare(item, value) == 0]
+
+
+def _select_value_list(items, values):
+    values = _values_list(values)
+    return [i for i, item in enumerate(items.values) if any(_compare(item, value) == 0 for value in values)]
+
+
+def _select_value_range(items, begin, end):
+    return [i for i, item in enumerate(items.values) if _in_range(item, begin, end)]
+
+
+def _select_value_rel_rank_range(items, value, rank, count=None):
+    order = items.rank_order()
+    origin = items.origin(items.values, value)
+    return [order[r] for r in _relative_range(len(items), origin, rank, count)]
+
+
+def _select_index(items, index):
+    return [_index(len(items), index)]
+
+
+def _select_index_range(items, index, count=None):
+    return list(_range(len(items), index, count))
+
+
+def _select_rank(items, rank):
+    return [items.rank_order()[_index(len(items), rank)]]
+
+
+def _select_rank_range(items, rank, count=None):
+    order = items.rank_order()
+    return [order[r] for r in _range(len(items), rank, count)]
+
+
+def _select_key(items, key):
+    return [i for i, item in enumerate(items.keys) if _compare(item, key) == 0]
+
+
+def _select_key_list(items, keys):
+    keys = _values_list(keys)
+    return [i for i, item in enumerate(items.keys) if any(_compare(item, key) == 0 for key in keys)]
+
+
+def _select_key_range(items, begin, end):
+    return [i for i, item in enumerate(items.keys) if _in_range(item, begin, end)]
+
+
+def _select_key_rel_index_range(items, key, index, count=None):
+    origin = items.origin(items.keys, key)
+    return list(_relative_range(len(items), origin, index, count))
+
+
+_LIST_RETURN_TYPES = (
+    aerospike.LIST_RETURN_NONE,
+    aerospike.LIST_RETURN_INDEX,
+    aerospike.LIST_RETURN_REVERSE_INDEX,
+    aerospike.LIST_RETURN_RANK,
+    aerospike.LIST_RETURN_REVERSE_RANK,
+    aerospike.LIST_RETURN_COUNT,
+    aerospike.LIST_RETURN_VALUE,
+    aerospike.LIST_RETURN_EXISTS,
+)
+
+_MAP_RETURN_TYPES = (
+    aerospike.MAP_RETURN_NONE,
+    aerospike.MAP_RETURN_INDEX,
+    aerospike.MAP_RETURN_REVERSE_INDEX,
+    aerospike.MAP_RETURN_RANK,
+    aerospike.MAP_RETURN_REVERSE_RANK,
+    aerospike.MAP_RETURN_COUNT,
+    aerospike.MAP_RETURN_KEY,
+    aerospike.MAP_RETURN_VALUE,
+    aerospike.MAP_RETURN_KEY_VALUE,
+    aerospike.MAP_RETURN_EXISTS,
+    aerospike.MAP_RETURN_UNORDERED_MAP,
+    aerospike.MAP_RETURN_ORDERED_MAP,
+)
+
+_MAP_RETURN_MAPS = (
+    aerospike.MAP_RETURN_KEY_VALUE,
+    aerospike.MAP_RETURN_UNORDERED_MAP,
+    aerospike.MAP_RETURN_ORDERED_MAP,
+)
+
+
+def _result(items: _Items, selected: list, return_type: int, single: bool):
+    # Selected items are returned in index order.
+    # List return types have the same values as the map return types.
+    n = len(items)
+    if return_type & ReturnType.LIST_RETURN_INVERTED:
+        return_type &= ~ReturnType.LIST_RETURN_INVERTED
+        excluded = set(selected)
+        selected = [i for i in range(n) if i not in excluded]
+    else:
+        selected = sorted(set(selected))
+
+    if return_type == aerospike.LIST_RETURN_NONE:
+        return None
+    if return_type == aerospike.LIST_RETURN_COUNT:
+        return len(selected)
+    if return_type == aerospike.LIST_RETURN_EXISTS:
+        return len(selected) > 0
+    if items.keys is not None and return_type in _MAP_RETURN_MAPS:
+        return {items.keys[i]: items.values[i] for i in selected}
+
+    if return_type == aerospike.LIST_RETURN_INDEX:
+        result = selected
+    elif return_type == aerospike.LIST_RETURN_REVERSE_INDEX:
+        result = [n - 1 - i for i in selected]
+    elif return_type in (aerospike.LIST_RETURN_RANK, aerospike.LIST_RETURN_REVERSE_RANK):
+        ranks = _ranks(items.values)
+        result = [ranks[i] for i in selected]
+        if return_type == aerospike.LIST_RETURN_REVERSE_RANK:
+            result = [n - 1 - rank for rank in result]
+    elif items.keys is not None and return_type == aerospike.MAP_RETURN_KEY:
+        result = [items.keys[i] for i in selected]
+    else:
+        result = [items.values[i] for i in selected]
+
+    if single:
+        return result[0] if result else None
+    return result
+
+
+def _build_ctx(ctx_list) -> Optional[Callable]:
+    if not ctx_list:
+        return None
+    steps = []
+    for ctx in ctx_list:
+        if ctx.id in (aerospike.CDT_CTX_LIST_INDEX, aerospike.CDT_CTX_LIST_INDEX_CREATE):
+            steps.append((False, _select_index, ctx.value))
+        elif ctx.id == aerospike.CDT_CTX_LIST_RANK:
+            steps.append((False, _select_rank, ctx.value))
+        elif ctx.id == aerospike.CDT_CTX_LIST_VALUE:
+            steps.append((False, _select_value, ctx.value))
+        elif ctx.id == aerospike.CDT_CTX_MAP_INDEX:
+            steps.append((True, _select_index, ctx.value))
+        elif ctx.id == aerospike.CDT_CTX_MAP_RANK:
+            steps.append((True, _select_rank, ctx.value))
+        elif ctx.id in (aerospike.CDT_CTX_MAP_KEY, aerospike.CDT_CTX_MAP_KEY_CREATE):
+            steps.append((True, _select_key, ctx.value))
+        elif ctx.id == aerospike.CDT_CTX_MAP_VALUE:
+            steps.append((True, _select_value, ctx.value))
+        else:
+            raise _unsupported("This cdt_ctx")
+
+    def apply_ctx(value):
+        for is_map, select, arg in steps:
+            items = _Items.of(value, is_map)
+            selected = select(items, arg)
+            if not selected:
+                raise _Unknown
+            value = items.values[selected[0]]
+        return value
+
+    return apply_ctx
+
+
+def _build_cdt_read(select, is_map, single=False):
+    def build(builder, expr, scope):
+        fixed = expr._fixed or {}
+        return_type = fixed.get(_Keys.RETURN_TYPE_KEY)
+        return_types = _MAP_RETURN_TYPES if is_map else _LIST_RETURN_TYPES
+        if return_type & ~ReturnType.LIST_RETURN_INVERTED not in return_types:
+            raise exception.ParamError(-2, "Invalid return type {}".format(return_type))
+        value_type = fixed.get(_Keys.VALUE_TYPE_KEY)
+        check = _TYPE_CHECKS.get(value_type) if return_type == aerospike.LIST_RETURN_VALUE else None
+        apply_ctx = _build_ctx(fixed.get(_Keys.CTX_KEY))
+        args = builder.build_args(expr, scope)
+        container = args.pop()
+
+        def cdt_read(ctx):
+            value = container(ctx)
+            if apply_ctx is not None:
+                value = apply_ctx(value)
+            items = _Items.of(value, is_map)
+            selected = select(items, *[arg(ctx) for arg in args])
+            result = _result(items, selected, return_type, single)
+            if check is not None and result is not None and not check(result):
+                raise _Unknown
+            return result
+
+        return cdt_read
+
+    return build
+
+
+def _build_cdt_size(is_map):
+    def build(builder, expr, scope):
+        apply_ctx = _build_ctx((expr._fixed or {}).get(_Keys.CTX_KEY))
+        (container,) = builder.build_args(expr, scope)
+
+        def size(ctx):
+            value = container(ctx)
+            if apply_ctx is not None:
+                value = apply_ctx(value)
+            if not isinstance(value, dict if is_map else list):
+                raise _Unknown
+            return len(value)
+
+        return size
+
+    return build
+
+
+_builds(aerospike.OP_LIST_SIZE)(_build_cdt_size(False))
+_builds(aerospike.OP_LIST_GET_BY_VALUE)(_build_cdt_read(_select_value, False))
+_builds(aerospike.OP_LIST_GET_BY_VALUE_LIST)(_build_cdt_read(_select_value_list, False))
+_builds(aerospike.OP_LIST_GET_BY_VALUE_RANGE)(_build_cdt_read(_select_value_range, False))
+_builds(
+    aerospike.OP_LIST_GET_BY_VALUE_RANK_RANGE_REL,
+    aerospike.OP_LIST_GET_BY_VALUE_RANK_RANGE_REL_TO_END,
+)(_build_cdt_read(_select_value_rel_rank_range, False))
+_builds(aerospike.OP_LIST_GET_BY_INDEX)(_build_cdt_read(_select_index, False, single=True))
+_builds(aerospike.OP_LIST_GET_BY_INDEX_RANGE, aerospike.OP_LIST_GET_BY_INDEX_RANGE_TO_END)(
+    _build_cdt_read(_select_index_range, False)
+)
+_builds(aerospike.OP_LIST_GET_BY_RANK)(_build_cdt_read(_select_rank, False, single=True))
+_builds(aerospike.OP_LIST_GET_BY_RANK_RANGE, aerospike.OP_LIST_GET_BY_RANK_RANGE_TO_END)(
+    _build_cdt_read(_select_rank_range, False)
+)
+
+_builds(aerospike.OP_MAP_SIZE)(_build_cdt_size(True))
+_builds(aerospike.OP_MAP_GET_BY_KEY)(_build_cdt_read(_select_key, True, single=True))
+_builds(aerospike.OP_MAP_GET_BY_KEY_LIST)(_build_cdt_read(_select_key_list, True))
+_builds(aerospike.OP_MAP_GET_BY_KEY_RANGE)(_build_cdt_read(_select_key_range, True))
+_builds(aerospike.OP_MAP_GET_BY_KEY_INDEX_RANGE_REL, aerospike.OP_MAP_GET_BY_KEY_REL_INDEX_RANGE_TO_END)(
+    _build_cdt_read(_select_key_rel_index_range, True)
+)
+_builds(aerospike.OP_MAP_GET_BY_VALUE)(_build_cdt_read(_select_value, True))
+_builds(aerospike.OP_MAP_GET_BY_VALUE_LIST)(_build_cdt_read(_select_value_list, True))
+_builds(aerospike.OP_MAP_GET_BY_VALUE_RANGE)(_build_cdt_read(_select_value_range, True))
+_builds(aerospike.OP_MAP_GET_BY_VALUE_RANK_RANGE_REL, aerospike.OP_MAP_GET_BY_VALUE_RANK_RANGE_REL_TO_END)(
+    _build_cdt_read(_select_value_rel_rank_range, True)
+)
+_builds(aerospike.OP_MAP_GET_BY_INDEX)(_build_cdt_read(_select_index, True, single=True))
+_builds(aerospike.OP_MAP_GET_BY_INDEX_RANGE, aerospike.OP_MAP_GET_BY_INDEX_RANGE_TO_END)(
+    _build_cdt_read(_select_index_range, True)
+)
+_builds(aerospike.OP_MAP_GET_BY_RANK)(_build_cdt_read(_select_rank, True, single=True))
+_builds(aerospike.OP_MAP_GET_BY_RANK_RANGE, aerospike.OP_MAP_GET_BY_RANK_RANGE_TO_END)(
+    _build_cdt_read(_select_rank_range, True)
+)
+
+
+###############
+# HyperLogLogs
+###############
+
+_HLL_VALUE_BITS = 6
+
+
+class _HLL:
+    # Registers of an HLL value. The registers are packed at the end of the value, most significant bit first,
+    # after a header that starts with the flags, the number of index bits and the number of min hash bits.
+
+    __slots__ = ("header", "n_index_bits", "n_minhash_bits", "registers")
+
+    def __init__(self, value):
+        if not isinstance(value, HyperLogLog) or len(value) < 3:
+            raise _Unknown
+        self.n_index_bits = value[1]
+        self.n_minhash_bits = value[2]
+        if not 4 <= self.n_index_bits <= 16 or self.n_minhash_bits > 51:
+            raise _Unknown
+        n_registers = 1 << self.n_index_bits
+        register_bits = _HLL_VALUE_BITS + self.n_minhash_bits
+        size = (n_registers * register_bits + 7) // 8
+        if len(value) < 3 + size:
+            raise _Unknown
+        self.header = bytes(value[: len(value) - size])
+        packed = int.from_bytes(value[len(value) - size :], "big") >> (size * 8 - n_registers * register_bits)
+        mask = (1 << register_bits) - 1
+        self.registers = [
+            (packed >> ((n_registers - 1 - i) * register_bits)) & mask for i in range(n_registers)
+        ]
+
+    def hll_values(self) -> list:
+        return [register >> self.n_minhash_bits for register in self.registers]
+
+    def pack(self) -> HyperLogLog:
+        register_bits = _HLL_VALUE_BITS + self.n_minhash_bits
+        packed = 0
+        for register in self.registers:
+            packed = (packed << register_bits) | register
+        n_bits = len(self.registers) * register_bits
+        size = (n_bits + 7) // 8
+        packed <<= size * 8 - n_bits
+        # The rest of the header has the cached count, which is not valid for the new registers
+        header = self.header[:3] + bytes(len(self.header) - 3)
+        return HyperLogLog(header + packed.to_bytes(size, "big"))
+
+
+def _hll_sigma(x: float) -> float:
+    if x == 1.0:
+        return math.inf
+    y = 1.0
+    z = x
+    while True:
+        x *= x
+        previous = z
+        z += x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _hll_tau(x: float) -> float:
+    if x == 0.0 or x == 1.0:
+        return 0.0
+    y = 1.0
+    z = 1.0 - x
+    while True:
+        x = math.sqrt(x)
+        previous = z
+        y *= 0.5
+        z -= (1.0 - x) ** 2 * y
+        if z == previous:
+            return z / 3.0
+
+
+def _hll_estimate(n_index_bits: int, values: list) -> int:
+    # Improved raw estimator from Ertl, "New cardinality estimation algorithms for HyperLogLog sketches"
+    m = len(values)
+    q = 64 - n_index_bits
+    counts = [0] * (q + 2)
+    for value in values:
+        counts[min(value, q + 1)] += 1
+    z = m * _hll_tau(1.0 - counts[q + 1] / m)
+    for k in range(q, 0, -1):
+        z = 0.5 * (z + counts[k])
+    z += m * _hll_sigma(counts[0] / m)
+    if math.isinf(z):
+        return 0
+    return round(m * m / (2.0 * math.log(2.0) * z))
+
+
+def _hlls(values, hll) -> list:
+    if isinstance(values, list):
+        hlls = [_HLL(value) for value in values]
+    else:
+        hlls = [_HLL(values)]
+    hlls.append(_HLL(hll))
+    if any(other.n_index_bits != hlls[0].n_index_bits for other in hlls):
+        raise _Unknown
+    return hlls
+
+
+def _hll_union(hlls) -> list:
+    return [max(values) for values in zip(*[h.hll_values() for h in hlls])]
+
+
+def _hll_intersect_count(hlls) -> int:
+    # Inclusion-exclusion over the union counts of the subsets of the HLLs
+    n_index_bits = hlls[0].n_index_bits
+    total = 0
+    for subset in range(1, 1 << len(hlls)):
+        members = [h for i, h in enumerate(hlls) if subset >> i & 1]
+        count = _hll_estimate(n_index_bits, _hll_union(members))
+        total += count if len(members) % 2 else -count
+    return max(total, 0)
+
+
+@_builds(aerospike.OP_HLL_GET_COUNT)
+def _build_hll_get_count(builder, expr, scope):
+    (hll,) = builder.build_args(expr, scope)
+
+    def get_count(ctx):
+        value = _HLL(hll(ctx))
+        return _hll_estimate(value.n_index_bits, value.hll_values())
+
+    return get_count
+
+
+@_builds(aerospike.OP_HLL_DESCRIBE)
+def _build_hll_describe(builder, expr, scope):
+    (hll,) = builder.build_args(expr, scope)
+
+    def describe(ctx):
+        value = _HLL(hll(ctx))
+        return [value.n_index_bits, value.n_minhash_bits]
+
+    return describe
+
+
+@_builds(aerospike.OP_HLL_GET_UNION)
+def _build_hll_get_union(builder, expr, scope):
+    values, hll = builder.build_args(expr, scope)
+
+    def get_union(ctx):
+        hlls = _hlls(values(ctx), hll(ctx))
+        result = hlls[-1]
+        result.registers = [max(registers) for registers in zip(*[h.registers for h in hlls])]
+        return result.pack()
+
+    return get_union
+
+
+@_builds(aerospike.OP_HLL_GET_UNION_COUNT)
+def _build_hll_get_union_count(builder, expr, scope):
+    values, hll = builder.build_args(expr, scope)
+
+    def get_union_count(ctx):
+        hlls = _hlls(values(ctx), hll(ctx))
+        return _hll_estimate(hlls[0].n_index_bits, _hll_union(hlls))
+
+    return get_union_count
+
+
+@_builds(aerospike.OP_HLL_GET_INTERSECT_COUNT)
+def _build_hll_get_intersect_count(builder, expr, scope):
+    values, hll = builder.build_args(expr, scope)
+    return lambda ctx: _hll_intersect_count(_hlls(values(ctx), hll(ctx)))
+
+
+@_builds(aerospike.OP_HLL_GET_SIMILARITY)
+def _build_hll_get_similarity(builder, expr, scope):
+    values, hll = builder.build_args(expr, scope)
+
+    def get_similarity(ctx):
+        hlls = _hlls(values(ctx), hll(ctx))
+        union = _hll_estimate(hlls[0].n_index_bits, _hll_union(hlls))
+        if union == 0:
+            return 0.0
+        return min(_hll_intersect_count(hlls) / union, 1.0)
+
+    return get_similarity
+
+
+###############
+# Public API
+###############
+
+
+class LocalExpression:
+    """An expression that is evaluated in the client process.
+
+    The expression is checked and prepared once, when the :class:`LocalExpression` is created, so it can be
+    evaluated quickly against many records.
+
+    Expressions have the 'unknown' value when the server would fail to evaluate them, such as when a bin does not
+    exist or does not have the type of the bin expression. Like on the server, ``And`` and ``Or`` expressions
+    that are true or false no matter what their unknown arguments are do not have the unknown value.
+
+    Results of list and map expressions that select several items are in index order, which for maps is the
+    order of their keys. HyperLogLog counts are estimated from the registers of the HyperLogLogs, so they can
+    differ slightly from the server's estimates, and HyperLogLogs that have different numbers of index bits
+    can't be combined.
+
+    Args:
+        expr: an :mod:`aerospike_helpers.expressions` expression. Compiled expressions are not accepted.
+
+    Raises:
+        :exc:`~aerospike.exception.ParamError` if *expr* has an expression that can't be evaluated locally.
+    """
+
+    def __init__(self, expr: _BaseExpr):
+        if not isinstance(expr, _BaseExpr):
+            raise exception.ParamError(-2, "expr must be an aerospike_helpers.expressions expression")
+        builder = _Builder()
+        self._evaluate = builder.build(expr, {})
+        self._n_vars = builder.n_vars
+        self._params = frozenset(builder.params)
+
+    @property
+    def params(self) -> frozenset:
+        """Names of the :class:`~aerospike_helpers.expressions.base.Param` parameters of the expression."""
+        return self._params
+
+    def _context(self, record: TypeRecord, params, now) -> _Context:
+        try:
+            key, meta, bins = record
+        except (TypeError, ValueError):
+            raise exception.ParamError(-2, "record must be a (key, meta, bins) tuple")
+        return _Context(key, meta or {}, bins or {}, params, now, self._n_vars)
+
+    def _check_params(self, params) -> dict:
+        if params is None:
+            params = {}
+        elif not isinstance(params, dict):
+            raise exception.ParamError(-2, "params must be a dict")
+        for name in self._params:
+            if name not in params:
+                raise exception.ParamError(-2, "Expression parameter {} has no value".format(name))
+        for name in params:
+            if name not in self._params:
+                raise exception.ParamError(-2, "The expression has no parameter {}".format(name))
+        return params
+
+    def evaluate(self, record: TypeRecord, params: Optional[Dict[str, Any]] = None, now: Optional[int] = None):
+        """Return the value of the expression for *record*.
+
+        Args:
+            record: a ``(key, meta, bins)`` tuple.
+            params (dict): values of the parameters of the expression, as in the ``"expression_params"`` policy
+                field.
+            now (int): the current time in nanoseconds since 1970-01-01, used by
+                :class:`~aerospike_helpers.expressions.base.SinceUpdateTime` and
+                :class:`~aerospike_helpers.expressions.base.VoidTime`. Defaults to :func:`time.time_ns`.
+
+        Raises:
+            :exc:`~aerospike.exception.OpNotApplicable` if the expression has the unknown value.
+        """
+        params = self._check_params(params)
+        ctx = self._context(record, params, time.time_ns() if now is None else now)
+        try:
+            return self._evaluate(ctx)
+        except _Unknown:
+            raise exception.OpNotApplicable(26, "The expression has the unknown value")
+
+    def matches(self, record: TypeRecord, params: Optional[Dict[str, Any]] = None, now: Optional[int] = None) -> bool:
+        """Return ``True`` if *record* is not filtered out by the expression, as if it was a filter expression.
+
+        The record is filtered out unless the expression is ``True``. Arguments are the same as for
+        :meth:`evaluate`.
+        """
+        params = self._check_params(params)
+        ctx = self._context(record, params, time.time_ns() if now is None else now)
+        try:
+            return self._evaluate(ctx) is True
+        except _Unknown:
+            return False
+
+    def filter(
+        self, records: Iterable[TypeRecord], params: Optional[Dict[str, Any]] = None, now: Optional[int] = None
+    ) -> Iterator[TypeRecord]:
+        """Yield the records that are not filtered out by the expression.
+
+        The parameters are checked and the current time is read once for all of the records. Arguments are the
+        same as for :meth:`evaluate`.
+        """
+        params = self._check_params(params)
+        if now is None:
+            now = time.time_ns()
+        evaluate = self._evaluate
+        for record in records:
+            try:
+                if evaluate(self._context(record, params, now)) is True:
+                    yield record
+            except _Unknown:
+                pass
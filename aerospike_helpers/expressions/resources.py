@@ -6,6 +6,8 @@ Resources used by all expressions.
 from itertools import chain
 from typing import List, Optional, Tuple, Union, Dict, Any
 
+import aerospike
+
 
 class _Keys:
     VALUE_TYPE_KEY = "value_type"
@@ -17,6 +19,7 @@ class _Keys:
     MAP_POLICY_KEY = "map_policy"
     LIST_ORDER_KEY = "list_order"
     REGEX_OPTIONS_KEY = "regex_options"
+    PARAM_KEY = "param"
 
 
 class _ExprOp:  # TODO replace this with an enum
@@ -151,11 +154,106 @@ TypeChildren = Tuple[TypeChild, ...]
 TypeAny = Union[_AtomExpr, Any]
 
 
+# aerospike.CompiledExpression objects returned by precompile(), by _ops_key() of their compiled ops.
+# Entries are kept in least recently used order.
+_compiled_cache: Dict[Any, "aerospike.CompiledExpression"] = {}
+_COMPILED_CACHE_MAX_SIZE = 4096
+_SCALAR_TYPES = frozenset((int, str, bytes, bool))
+
+
+def _freeze(value) -> Any:
+    # Returns a hashable key that is equal for values that compile to the same expression.
+    # The type is part of the key because 1, 1.0 and True are equal in Python.
+    if isinstance(value, _BaseExpr):
+        return value._structural_key()
+    value_type = type(value)
+    if value_type is float:
+        # Also tells 0.0 and -0.0 apart
+        return (float, value.hex())
+    if value_type in (int, str, bytes, bool) or value is None:
+        return (value_type, value)
+    if isinstance(value, dict):
+        # Order matters, because maps are sent in the order of their items
+        return (value_type, tuple((_freeze(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (value_type, tuple(_freeze(v) for v in value))
+    if isinstance(value, (bytes, bytearray)):
+        return (value_type, bytes(value))
+    if hasattr(value, "__dict__"):
+        # Such as cdt_ctx objects
+        return (value_type, _freeze(vars(value)))
+    try:
+        hash(value)
+    except TypeError:
+        # Never equal to another key, so this expression is not shared
+        return object()
+    return (value_type, value)
+
+
+def _ops_key(ops: TypeExpression) -> tuple:
+    # Returns a hashable key that is equal for compiled expressions that are converted to the same
+    # aerospike.CompiledExpression. This runs every time a filter is built again, so it flattens the ops
+    # in one pass and only calls _freeze() for values that are not simple scalars.
+    key = []
+    append = key.append
+    for op, rt, fixed, _ in ops:
+        append(op)
+        append(rt)
+        if fixed:
+            for name, value in fixed.items():
+                value_type = type(value)
+                append(name)
+                append(value_type)
+                append(value if value_type in _SCALAR_TYPES else _freeze(value))
+        # Fixed names are always strings, so this ends the op unambiguously
+        append(None)
+    return tuple(key)
+
+
 class _BaseExpr(_AtomExpr):
+    """
+    Expressions are immutable after they are precompiled or hashed for the first time.
+
+    Expressions with the same structure have the same hash, are equal, and share one precompiled form.
+    """
+
     _op: int = 0
     _rt: TypeResultType = None
     _fixed: TypeFixed = None
     _children: TypeChildren = ()
+    # Set when the expression is frozen
+    _key: Any = None
+    _hash: int = 0
+    _precompiled: Optional["aerospike.CompiledExpression"] = None
+
+    def __setattr__(self, name, value):
+        if self._key is not None or self._precompiled is not None:
+            raise AttributeError("expressions are immutable after they are precompiled or hashed")
+        object.__setattr__(self, name, value)
+
+    def _structural_key(self) -> Any:
+        key = self._key
+        if key is None:
+            key = (
+                self._op,
+                _freeze(self._rt),
+                _freeze(self._fixed),
+                tuple(_freeze(child) for child in self._children),
+            )
+            object.__setattr__(self, "_hash", hash(key))
+            object.__setattr__(self, "_key", key)
+        return key
+
+    def __hash__(self) -> int:
+        self._structural_key()
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, _BaseExpr):
+            return NotImplemented
+        if self is other:
+            return True
+        return hash(self) == hash(other) and self._key == other._key
 
     def _get_op(self) -> TypeCompiledOp:
         return (self._op, self._rt, self._fixed, len(self._children))
@@ -168,7 +266,7 @@ class _BaseExpr(_AtomExpr):
             0,
         )
 
-    def compile(self) -> TypeExpression:
+    def _compile_tree(self) -> TypeExpression:
         expression = [self._get_op()]
         work = chain(self._children)
 
@@ -187,6 +285,34 @@ class _BaseExpr(_AtomExpr):
 
         return expression
 
+    def compile(self) -> TypeExpression:
+        return self._compile_tree()
+
+    def precompile(self) -> "aerospike.CompiledExpression":
+        """
+        Return this expression as an :class:`aerospike.CompiledExpression`.
+
+        The result is shared by all of the expressions with the same structure, so building the same filter
+        again does not convert it again.
+        """
+        compiled = self._precompiled
+        if compiled is None:
+            ops = self._compile_tree()
+            key = _ops_key(ops)
+            # Removed and inserted again, so that filters that are still in use are evicted last
+            compiled = _compiled_cache.pop(key, None)
+            if compiled is None:
+                compiled = aerospike.compile_expression(ops)
+                if len(_compiled_cache) >= _COMPILED_CACHE_MAX_SIZE:
+                    # Evict the least recently used entry. Another thread may be evicting it too.
+                    try:
+                        _compiled_cache.pop(next(iter(_compiled_cache)), None)
+                    except (RuntimeError, StopIteration):
+                        pass
+            _compiled_cache[key] = compiled
+            object.__setattr__(self, "_precompiled", compiled)
+        return compiled
+
     def _overload_op_unary(self, op_type: int):
         if self._op == op_type:
             l = self._children  # noqa: E741
@@ -0,0 +1,313 @@
+##########################################################################
+# Copyright 2013-2024 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+Split a query or scan into work units that cover disjoint ranges of partitions, and run them in other processes.
+
+Instances of :class:`PartitionWorkUnit` are returned by :meth:`aerospike.Query.split` and
+:meth:`aerospike.Scan.split`. They can be pickled, so they can be sent to other processes or machines, and each of
+them keeps its own partition status so that it can be resumed.
+
+:func:`parallel_map` runs work units in worker processes. Records are only faster to process in parallel if they
+are processed in the worker processes: every record that is sent back to the calling process is pickled and
+unpickled again, as :func:`parallel_results` does.
+
+Example::
+
+    import aerospike
+
+    config = {"hosts": [("127.0.0.1", 3000)]}
+    client = aerospike.client(config)
+    scan = client.scan("test", "demo")
+
+    # Process the records of each unit in 8 worker processes, and only send back the result
+    units = scan.split(32)
+    total = sum(count for unit, count in parallel_map(units, 8, config, len))
+
+    # Or send all of the records back to this process, which unpickles every one of them
+    records = scan.parallel_results(8, config)
+
+    # Or run the work units yourself
+    for unit in scan.split(8):
+        for key, meta, bins in unit.results(client):
+            print(bins)
+
+    client.close()
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+import aerospike
+from aerospike import exception
+
+# Same as CLUSTER_NPARTITIONS in the C client
+_N_PARTITIONS = 4096
+
+_QUERY = "query"
+_SCAN = "scan"
+
+
+class PartitionWorkUnit:
+    """A query or scan restricted to the partitions *begin* to *begin* + *count* - 1.
+
+    The query or scan is stored as bytes, so the unit can be pickled. Use :meth:`create` to get back a
+    :class:`aerospike.Query` or :class:`aerospike.Scan` that belongs to another client.
+
+    After the unit runs, :attr:`partition_status` holds the status of its partitions. If the unit was interrupted,
+    running it again resumes it from the last record received in each partition.
+
+    Attributes:
+        kind (str): ``"query"`` or ``"scan"``.
+        data (bytes): the serialized query or scan.
+        begin (int): the first partition of the unit.
+        count (int): the number of partitions of the unit.
+        partition_status (dict): see :ref:`aerospike_partition_objects`. :py:obj:`None` if the unit has not run yet.
+    """
+
+    def __init__(self, kind: str, data: bytes, begin: int, count: int, partition_status: Optional[dict] = None):
+        self.kind = kind
+        self.data = data
+        self.begin = begin
+        self.count = count
+        self.partition_status = partition_status
+
+    def __repr__(self) -> str:
+        return "{}(kind={!r}, begin={}, count={}, done={})".format(
+            type(self).__name__, self.kind, self.begin, self.count, self.is_done()
+        )
+
+    def partition_filter(self) -> dict:
+        """Return the ``"partition_filter"`` policy that restricts the query or scan to this unit.
+
+        See :ref:`aerospike_partition_objects`.
+        """
+        partition_filter = {"begin": self.begin, "count": self.count}
+        if self.partition_status is not None:
+            partition_filter["partition_status"] = self.partition_status
+        return partition_filter
+
+    def is_done(self) -> bool:
+        """Return :py:obj:`True` if the unit received all of the records of its partitions."""
+        return self.partition_status is not None and bool(self.partition_status.get("done", False))
+
+    def create(self, client: aerospike.Client):
+        """Return a new :class:`aerospike.Query` or :class:`aerospike.Scan` of *client* for this unit."""
+        if self.kind == _QUERY:
+            return client._query_from_bytes(self.data)
+        return client._scan_from_bytes(self.data)
+
+    def _run(self, method: str, client: aerospike.Client, args: tuple, policy: Optional[dict], kwargs: dict):
+        source = self.create(client)
+        # Pagination keeps the status of the partitions after the query or scan returns
+        source.paginate()
+        policy = dict(policy) if policy else {}
+        policy["partition_filter"] = self.partition_filter()
+        try:
+            return getattr(source, method)(*args, policy, **kwargs)
+        finally:
+            self.partition_status = source.get_partitions_status()
+
+    def results(self, client: aerospike.Client, policy: Optional[dict] = None, **kwargs) -> List[tuple]:
+        """Run the unit with :meth:`aerospike.Query.results` or :meth:`aerospike.Scan.results`.
+
+        Args:
+            client (aerospike.Client): the client that runs the unit.
+            policy (dict): the query or scan policy. The ``"partition_filter"`` of the unit is added to it.
+            kwargs: the other arguments of ``results()``.
+
+        Returns:
+            A :class:`list` of :ref:`aerospike_record_tuple`.
+        """
+        return self._run("results", client, (), policy, kwargs)
+
+    def foreach(self, client: aerospike.Client, callback: Callable, policy: Optional[dict] = None, **kwargs) -> None:
+        """Run the unit with :meth:`aerospike.Query.foreach` or :meth:`aerospike.Scan.foreach`.
+
+        The callback receives the partition ID and the record, because the unit uses a ``"partition_filter"``.
+        If the callback returns ``False``, the unit stops and can be resumed later.
+        """
+        self._run("foreach", client, (callback,), policy, kwargs)
+
+
+def _check_n(name: str, value) -> None:
+    if not isinstance(value, int) or isinstance(value, bool) or not 1 <= value <= _N_PARTITIONS:
+        raise exception.ParamError(-2, "{} must be an integer between 1 and {}".format(name, _N_PARTITIONS))
+
+
+def split(source, n: int) -> List[PartitionWorkUnit]:
+    """Split *source* into *n* work units that cover all of the partitions.
+
+    Each unit covers a contiguous range of partitions, and the sizes of the ranges differ by at most one.
+    This is the implementation of :meth:`aerospike.Query.split` and :meth:`aerospike.Scan.split`.
+
+    Raises:
+        :exc:`~aerospike.exception.ParamError`: *n* is not between 1 and 4096.
+    """
+    _check_n("n", n)
+    kind = _QUERY if isinstance(source, aerospike.Query) else _SCAN
+    data = source._to_bytes()
+
+    units = []
+    size, remainder = divmod(_N_PARTITIONS, n)
+    begin = 0
+    for i in range(n):
+        count = size + (1 if i < remainder else 0)
+        units.append(PartitionWorkUnit(kind, data, begin, count))
+        begin += count
+    return units
+
+
+# The client of a worker process
+_worker_client = None
+
+
+def _init_worker(config: dict) -> None:
+    global _worker_client
+    _worker_client = aerospike.client(config)
+
+
+def _run_unit(
+    unit: PartitionWorkUnit, function: Optional[Callable], policy: Optional[dict], kwargs: dict
+) -> Tuple[Optional[dict], Any, Optional[tuple]]:
+    # The unit is a copy, so its partition status is sent back along with the result
+    try:
+        records = unit.results(_worker_client, policy, **kwargs)
+    except exception.AerospikeError as error:
+        # Aerospike exceptions cannot be pickled, so they are sent back as their class name and attributes
+        return unit.partition_status, None, (type(error).__name__, error.args, vars(error))
+    if function is not None:
+        # If this raises, the partition status is not sent back, so the unit runs again when it is resumed
+        records = function(records)
+    return unit.partition_status, records, None
+
+
+def _check_config(config) -> None:
+    if not isinstance(config, dict):
+        raise exception.ParamError(-2, "config must be a dict")
+
+
+def parallel_map(
+    units: Iterable[PartitionWorkUnit],
+    n_procs: int,
+    config: dict,
+    function: Optional[Callable[[List[tuple]], Any]] = None,
+    policy: Optional[dict] = None,
+    **kwargs
+) -> Iterator[Tuple[PartitionWorkUnit, Any]]:
+    """Run *units* in *n_procs* worker processes, and yield each unit with its result as soon as it is done.
+
+    Each worker process connects its own client with *config*, and runs one unit at a time with
+    :meth:`PartitionWorkUnit.results`. If *function* is given, it is called in the worker process with the list of
+    records of the unit, and only its return value is sent back to this process. Use it to filter, aggregate or
+    convert the records, so that deserializing and processing them is spread over the worker processes.
+    *function* and its return value must be picklable, so *function* should be defined at the top level of a module.
+
+    The :attr:`~PartitionWorkUnit.partition_status` of each unit in *units* is updated when the unit returns,
+    including when it fails. To resume after an error, run the units that are not done again.
+
+    Args:
+        units: the work units to run, such as the ones returned by :func:`split`. There can be more units than
+            worker processes.
+        n_procs (int): the maximum number of worker processes.
+        config (dict): the :ref:`client configuration <client_config>` of the worker processes.
+        function (Callable): optional function called with the records of each unit in the worker processes.
+        policy (dict): the query or scan policy of each unit.
+        kwargs: the other arguments of ``results()``.
+
+    Yields:
+        ``(unit, result)`` in the order the units finish, where *result* is the return value of *function*, or the
+        :class:`list` of :ref:`aerospike_record_tuple` of the unit if *function* is not given.
+
+    Raises:
+        :exc:`~aerospike.exception.AerospikeError`: the first error raised by a unit. The units that are still
+        running are cancelled or waited for.
+
+    Example::
+
+        def count_adults(records):
+            return sum(1 for _, _, bins in records if bins["age"] >= 18)
+
+        units = client.scan("test", "demo").split(64)
+        adults = 0
+        try:
+            for unit, count in parallel_map(units, 8, config, count_adults):
+                adults += count
+        except aerospike.exception.AerospikeError:
+            # Resume later with the units that are not done
+            remaining = [unit for unit in units if not unit.is_done()]
+    """
+    _check_n("n_procs", n_procs)
+    _check_config(config)
+    return _map_units(list(units), n_procs, config, function, policy, kwargs)
+
+
+def _map_units(
+    units: List[PartitionWorkUnit],
+    n_procs: int,
+    config: dict,
+    function: Optional[Callable],
+    policy: Optional[dict],
+    kwargs: dict,
+) -> Iterator[Tuple[PartitionWorkUnit, Any]]:
+    if not units:
+        return
+
+    executor = ProcessPoolExecutor(max_workers=min(n_procs, len(units)), initializer=_init_worker, initargs=(config,))
+    try:
+        futures = {executor.submit(_run_unit, unit, function, policy, kwargs): unit for unit in units}
+        for future in as_completed(futures):
+            unit = futures[future]
+            partition_status, result, error = future.result()
+            unit.partition_status = partition_status
+            if error is not None:
+                name, args, attrs = error
+                error = getattr(exception, name, exception.AerospikeError)(*args)
+                vars(error).update(attrs)
+                raise error
+            yield unit, result
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def parallel_results(source, n_procs: int, config: dict, policy: Optional[dict] = None, **kwargs) -> List[tuple]:
+    """Run *source* in *n_procs* worker processes and return all of its records.
+
+    *source* is split into *n_procs* work units with :func:`split`, which run with :func:`parallel_map`. The records
+    are received in the worker processes, but every one of them is pickled and sent back to this process, which
+    unpickles and keeps all of them on a single thread. That can cost as much as receiving the records with
+    ``results()``, so this is often not faster. Use :func:`parallel_map` with a *function* to process the records
+    in the worker processes instead. The records are returned in partition order.
+
+    This is the implementation of :meth:`aerospike.Query.parallel_results` and
+    :meth:`aerospike.Scan.parallel_results`.
+
+    Args:
+        source (aerospike.Query | aerospike.Scan): the query or scan to run.
+        n_procs (int): the number of worker processes and work units.
+        config (dict): the :ref:`client configuration <client_config>` of the worker processes.
+        policy (dict): the query or scan policy of each unit.
+        kwargs: the other arguments of ``results()``.
+
+    Returns:
+        A :class:`list` of :ref:`aerospike_record_tuple`.
+    """
+    _check_n("n_procs", n_procs)
+    _check_config(config)
+    units = split(source, n_procs)
+    records_by_begin = {}
+    for unit, records in parallel_map(units, n_procs, config, None, policy, **kwargs):
+        records_by_begin[unit.begin] = records
+    return [record for unit in units for record in records_by_begin[unit.begin]]
@@ -0,0 +1,269 @@
+##########################################################################
+# Copyright 2013-2024 Aerospike, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+##########################################################################
+"""
+Iterate over the records of a query or scan while they are still being received, without buffering the whole result
+set in memory.
+
+Instances of :class:`RecordStream` are returned by :meth:`aerospike.Query.stream` and :meth:`aerospike.Scan.stream`.
+
+Example::
+
+    import aerospike
+
+    client = aerospike.client({"hosts": [("127.0.0.1", 3000)]})
+    scan = client.scan("test", "demo")
+
+    with scan.stream(buffer_size=1000) as records:
+        for key, meta, bins in records:
+            print(bins)
+
+    client.close()
+"""
+
+import collections
+import queue
+import threading
+from typing import List, Optional
+
+_DEFAULT_BUFFER_SIZE = 5000
+# Most records taken from the buffer at a time
+_MAX_RECORDS_PER_FETCH = 256
+# How often (in seconds) threads blocked on the buffer check whether it was closed
+_POLL_INTERVAL = 0.1
+# Same as CLUSTER_NPARTITIONS in the C client
+_N_PARTITIONS = 4096
+_DIGEST_SIZE = 20
+
+_END = object()
+
+
+def _partition_id(record: tuple) -> int:
+    # Same as as_partition_getid() in the C client
+    digest = record[0][3]
+    return (digest[0] | (digest[1] << 8)) & (_N_PARTITIONS - 1)
+
+
+class _RecordBuffer:
+    """Runs ``source.foreach()`` on a background thread and hands the records over through a bounded queue.
+
+    The foreach callback runs on the C client's worker threads and blocks while the queue is full,
+    which stops the C client from reading more records off the socket until the consumer catches up.
+
+    If track_partitions is True, the number of records received but not consumed yet is kept for each partition
+    so that :meth:`partitions_status` can report the partitions those records belong to as not done.
+    """
+
+    def __init__(self, source, args: tuple, kwargs: dict, buffer_size: int, track_partitions: bool = False):
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be greater than 0")
+        self._source = source
+        self._args = args
+        self._kwargs = kwargs
+        self._queue = queue.Queue(maxsize=buffer_size)
+        self._closed = threading.Event()
+        self._finished = False
+        self._error = None
+        self._thread = None
+        self._track_partitions = track_partitions
+        self._unconsumed = collections.Counter()
+        self._unconsumed_lock = threading.Lock()
+
+    def start(self) -> None:
+        if self._thread is None:
+            if self._track_partitions:
+                # Makes the source keep its partition status after foreach() returns
+                self._source.paginate()
+            self._thread = threading.Thread(target=self._produce, name="aerospike-records", daemon=True)
+            self._thread.start()
+
+    def _produce(self) -> None:
+        try:
+            self._foreach()
+        except Exception as exc:
+            # Errors caused by closing the buffer early are not reported, and an error raised by a callback is
+            # reported instead of the error it caused
+            if not self._closed.is_set() and self._error is None:
+                self._error = exc
+        finally:
+            self._put(_END)
+
+    def _foreach(self) -> None:
+        self._source.foreach(self._on_record, *self._args, **self._kwargs)
+
+    def _on_record(self, *args) -> bool:
+        # With a partition filter the callback also receives the partition id
+        record = args[-1]
+        if not self._track_partitions:
+            return self._put(record)
+        # The key is None if the policy has "return_key": False, so the partition id is queued with the record
+        part_id = args[0] if len(args) > 1 else _partition_id(record)
+        # Counted before it is queued because the C client has already moved the partition status past it
+        with self._unconsumed_lock:
+            self._unconsumed[part_id] += 1
+        return self._put((part_id, record))
+
+    def _put(self, item) -> bool:
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        # Returning False from the callback stops the query or scan
+        return False
+
+    def get_many(self, max_records: int) -> List[tuple]:
+        """Block until at least one record is available and return up to max_records records.
+
+        If track_partitions is True, each record is returned as (partition id, record).
+        An empty list means that there are no more records.
+        """
+        records = []
+        while not self._finished and not self._closed.is_set():
+            try:
+                item = self._queue.get(timeout=_POLL_INTERVAL) if not records else self._queue.get_nowait()
+            except queue.Empty:
+                if records:
+                    break
+                continue
+            if item is _END:
+                self._finished = True
+                break
+            records.append(item)
+            if len(records) >= max_records:
+                break
+
+        if self._finished and not records and self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        return records
+
+    def consumed(self, part_id: int) -> None:
+        if self._track_partitions:
+            with self._unconsumed_lock:
+                self._unconsumed[part_id] -= 1
+                if not self._unconsumed[part_id]:
+                    del self._unconsumed[part_id]
+
+    def partitions_status(self, start_status: Optional[dict]) -> dict:
+        status = self._source.get_partitions_status()
+        with self._unconsumed_lock:
+            unconsumed = list(self._unconsumed)
+        for part_id in unconsumed:
+            if part_id not in status:
+                continue
+            # Rewind the partition to where it was when the stream started
+            if start_status and part_id in start_status:
+                part_status = tuple(start_status[part_id])
+                status[part_id] = (part_id, part_status[1], True) + part_status[3:]
+            else:
+                status[part_id] = (part_id, False, True, bytearray(_DIGEST_SIZE), 0)
+            status["done"] = False
+            status["retry"] = True
+        return status
+
+    def close(self) -> None:
+        self._closed.set()
+
+
+class RecordStream:
+    """Iterator over the records of a query or scan.
+
+    Returned by :meth:`aerospike.Query.stream` and :meth:`aerospike.Scan.stream`. The query or scan starts on the
+    first iteration and runs on a background thread while records are yielded. At most *buffer_size* records are
+    buffered ahead of the consumer. When the buffer is full, the C client stops receiving more records until the
+    consumer catches up, so memory usage stays flat regardless of the size of the result set.
+
+    Args:
+        source (aerospike.Query | aerospike.Scan): the query or scan to run.
+        args: positional arguments passed to the source's ``foreach()`` after the callback.
+        buffer_size (int): maximum number of records buffered ahead of the consumer.
+        kwargs: keyword arguments passed to the source's ``foreach()``.
+
+    Calling :meth:`close`, or leaving a ``with`` block, stops the query or scan. An error raised by the query or
+    scan is raised by the iteration after all records received before the error have been yielded.
+
+    The source tracks its partitions the same way as after calling ``paginate()``.
+    See :meth:`get_partitions_status` to resume a stream that did not finish.
+    """
+
+    def __init__(self, source, *args, buffer_size: int = _DEFAULT_BUFFER_SIZE, **kwargs):
+        self._pending = collections.deque()
+        self._exhausted = False
+
+        policy = args[0] if args else kwargs.get("policy")
+        partition_filter = (policy or {}).get("partition_filter") or {}
+        self._start_status = partition_filter.get("partition_status")
+        if policy is not None and not policy.get("return_key", True) and not partition_filter:
+            # Without the key, the partition of a record is only known from the partition id passed to the callback,
+            # which requires a partition filter. One that covers all partitions does not change the results.
+            policy = dict(policy, partition_filter={"begin": 0, "count": _N_PARTITIONS})
+            if args:
+                args = (policy,) + args[1:]
+            else:
+                kwargs = dict(kwargs, policy=policy)
+        self._buffer = _RecordBuffer(source, args, kwargs, buffer_size, track_partitions=True)
+
+    def __iter__(self) -> "RecordStream":
+        return self
+
+    def __next__(self) -> tuple:
+        if not self._pending:
+            if self._exhausted:
+                raise StopIteration
+            self._buffer.start()
+            try:
+                records = self._buffer.get_many(_MAX_RECORDS_PER_FETCH)
+            except BaseException:
+                self.close()
+                raise
+            if not records:
+                self._exhausted = True
+                raise StopIteration
+            self._pending.extend(records)
+        part_id, record = self._pending.popleft()
+        self._buffer.consumed(part_id)
+        return record
+
+    def get_partitions_status(self) -> dict:
+        """Get the partition status of the stream.
+
+        Same as :meth:`aerospike.Query.get_partitions_status`, except that partitions with records that were
+        received but not yielded yet are reported as not done, starting from where they were when the stream
+        started. Passing the returned value as the ``partition_status`` of a ``partition_filter`` policy resumes
+        the query or scan without skipping records. Records of those partitions that were already yielded may be
+        returned again.
+
+        Can be called at any point, including after the stream was closed or an error was raised.
+
+        :return: See :ref:`aerospike_partition_objects` for a description of the partition status return value.
+        """
+        return self._buffer.partitions_status(self._start_status)
+
+    def close(self) -> None:
+        """Stop the query or scan and discard the buffered records."""
+        self._exhausted = True
+        self._pending.clear()
+        self._buffer.close()
+
+    def __enter__(self) -> "RecordStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __del__(self):
+        self._buffer.close()
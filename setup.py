@@ -320,6 +320,7 @@ setup(
     packages=['aerospike_helpers', 'aerospike_helpers.operations', 'aerospike_helpers.batch',
               'aerospike_helpers.expressions',
               'aerospike_helpers.metrics',
+              'aerospike_helpers.aio',
               'aerospike-stubs'],
     cmdclass={
         'build': CClientBuild,
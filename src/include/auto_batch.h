@@ -0,0 +1,47 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#pragma once
+
+#include <Python.h>
+#include <stdint.h>
+
+#include <aerospike/as_error.h>
+#include <aerospike/as_key.h>
+
+#include "types.h"
+
+#define AUTO_BATCH_DEFAULT_WINDOW_US 200
+#define AUTO_BATCH_DEFAULT_MAX_KEYS 500
+
+auto_batch *auto_batch_create(uint32_t window_us, uint32_t max_keys);
+
+void auto_batch_destroy(auto_batch *ab);
+
+// Called in a forked child process, where the lock may have been held by a
+// thread that doesn't exist anymore
+void auto_batch_reset_after_fork(auto_batch *ab);
+
+/**
+ * Read a record as part of a batch read shared with the reads of other
+ * threads that arrive within the client's auto_batch window.
+ *
+ * bins is a NULL terminated list of bin names, or NULL to read all bins.
+ * Must be called with the GIL held. The GIL is released while waiting for the
+ * batch read to complete.
+ */
+as_status auto_batch_read(AerospikeClient *self, as_error *err, as_key *key,
+                          const char **bins, PyObject **py_rec);
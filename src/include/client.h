@@ -198,6 +198,14 @@ PyObject *AerospikeClient_Touch(AerospikeClient *self, PyObject *args,
  */
 PyObject *AerospikeClient_Operate(AerospikeClient *self, PyObject *args,
                                   PyObject *kwds);
+/**
+ * Builds operations once, for operate() with different values on each call
+ *
+ *		client.prepare_operations([ops])
+ *
+ */
+PyObject *AerospikeClient_Prepare_Operations(AerospikeClient *self,
+                                             PyObject *args, PyObject *kwds);
 /**
  * Performs operate ordered operations
  *
@@ -230,6 +238,9 @@ PyObject *AerospikeClient_OperateOrdered(AerospikeClient *self, PyObject *args,
  */
 AerospikeScan *AerospikeClient_Scan(AerospikeClient *self, PyObject *args,
                                     PyObject *kwds);
+// Creates a scan from the bytes returned by Scan._to_bytes()
+AerospikeScan *AerospikeClient_Scan_From_Bytes(AerospikeClient *self,
+                                               PyObject *args, PyObject *kwds);
 PyObject *AerospikeClient_ScanApply(AerospikeClient *self, PyObject *args,
                                     PyObject *kwds);
 
@@ -258,6 +269,10 @@ PyObject *AerospikeClient_ScanApply(AerospikeClient *self, PyObject *args,
  */
 AerospikeQuery *AerospikeClient_Query(AerospikeClient *self, PyObject *args,
                                       PyObject *kwds);
+// Creates a query from the bytes returned by Query._to_bytes()
+AerospikeQuery *AerospikeClient_Query_From_Bytes(AerospikeClient *self,
+                                                 PyObject *args,
+                                                 PyObject *kwds);
 PyObject *AerospikeClient_QueryApply(AerospikeClient *self, PyObject *args,
                                      PyObject *kwds);
 PyObject *AerospikeClient_JobInfo(AerospikeClient *self, PyObject *args,
@@ -469,6 +484,15 @@ PyObject *AerospikeClient_BatchWrite(AerospikeClient *self, PyObject *args,
 PyObject *AerospikeClient_Batch_Operate(AerospikeClient *self, PyObject *args,
                                         PyObject *kwds);
 
+/**
+ * Register the types of the bins of the records of a set.
+ *
+ *		client.register_schema(namespace, set, {bin: type})
+ *
+ */
+PyObject *AerospikeClient_Register_Schema(AerospikeClient *self,
+                                          PyObject *args, PyObject *kwds);
+
 /**
  * Perform reads on multiple keys.
  *
@@ -478,6 +502,24 @@ PyObject *AerospikeClient_Batch_Operate(AerospikeClient *self, PyObject *args,
 PyObject *AerospikeClient_BatchRead(AerospikeClient *self, PyObject *args,
                                     PyObject *kwds);
 
+/**
+ * Run a batch command on a native worker thread.
+ * Returns a concurrent.futures.Future completed with the command's result.
+ *
+ *      future = client.batch_read_future([keys], [bins], policy_batch)
+ *
+ */
+PyObject *AerospikeClient_BatchRead_Future(AerospikeClient *self,
+                                           PyObject *args, PyObject *kwds);
+PyObject *AerospikeClient_BatchWrite_Future(AerospikeClient *self,
+                                            PyObject *args, PyObject *kwds);
+PyObject *AerospikeClient_Batch_Operate_Future(AerospikeClient *self,
+                                               PyObject *args, PyObject *kwds);
+PyObject *AerospikeClient_Batch_Apply_Future(AerospikeClient *self,
+                                             PyObject *args, PyObject *kwds);
+PyObject *AerospikeClient_Batch_Remove_Future(AerospikeClient *self,
+                                              PyObject *args, PyObject *kwds);
+
 /**
  * Remove multiple records by key.
  * Requires server version 6.0+
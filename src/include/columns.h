@@ -0,0 +1,131 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#pragma once
+
+#include <Python.h>
+#include <pthread.h>
+#include <stdbool.h>
+#include <stdint.h>
+
+#include <aerospike/as_bin.h>
+#include <aerospike/as_error.h>
+#include <aerospike/as_record.h>
+#include <aerospike/as_vector.h>
+
+#include "types.h"
+
+// Format of the arrays a builder returns
+typedef enum {
+    // Byte masks and C arrays for NumPy. Only numbers and booleans
+    COLUMN_FORMAT_NUMPY,
+    // Bitmaps and buffers of the Arrow columnar format. Also stores strings,
+    // bytes, lists and maps
+    COLUMN_FORMAT_ARROW
+} column_format;
+
+// Type of the values of a column. Set by the first value of the bin
+typedef enum {
+    COLUMN_TYPE_INT64,
+    COLUMN_TYPE_DOUBLE,
+    COLUMN_TYPE_BOOL,
+    COLUMN_TYPE_STRING,
+    COLUMN_TYPE_BYTES,
+    // Lists and maps, converted to nested Arrow arrays when the column is
+    // returned
+    COLUMN_TYPE_OBJECT,
+    // Types of the arrays of the values in lists and maps
+    COLUMN_TYPE_NULL,
+    COLUMN_TYPE_LIST,
+    COLUMN_TYPE_MAP
+} column_type;
+
+typedef struct {
+    char name[AS_BIN_NAME_MAX_SIZE];
+    column_type type;
+    // One value per row. The values of invalid rows are 0.
+    // Strings and bytes store the end offset of the row in data, and objects
+    // store a reserved as_val *
+    uint8_t *values;
+    // One byte per row, set to 1 if the record has the bin
+    uint8_t *valid;
+    // Strings and bytes of all rows
+    uint8_t *data;
+    uint32_t data_size;
+    uint32_t data_capacity;
+} column;
+
+/**
+ * Stores the bins of records in one C array per bin, so that the records are
+ * returned as NumPy or Arrow arrays without creating a Python object for each
+ * value. Rows are appended from the callbacks of the C client, without the
+ * GIL.
+ */
+typedef struct {
+    column_format format;
+    // column
+    as_vector columns;
+    uint32_t n_rows;
+    uint32_t capacity;
+    pthread_mutex_t lock;
+    // Error of the first row that could not be appended
+    as_error err;
+} column_builder;
+
+/**
+ * Return true if py_output selects NumPy output.
+ * py_output may be NULL or None for the default output.
+ */
+as_status get_numpy_output_option(as_error *err, PyObject *py_output,
+                                  bool *numpy_output);
+
+void column_builder_init(column_builder *builder, uint32_t capacity,
+                         column_format format);
+
+void column_builder_destroy(column_builder *builder);
+
+/**
+ * Append the bins of rec as a new row. If rec is NULL, the row is invalid in
+ * every column. Can be called from several threads at the same time.
+ * Returns false and keeps the error in builder->err if a bin can't be stored.
+ */
+bool column_builder_append(column_builder *builder, const as_record *rec);
+
+/**
+ * If builder has at least min_rows rows, initialize batch with them, leave
+ * builder empty and return true. Can be called from several threads at the
+ * same time.
+ */
+bool column_builder_take(column_builder *builder, uint32_t min_rows,
+                         column_builder *batch);
+
+/**
+ * Return a new dict of bin names to the buffers of their column.
+ * For COLUMN_FORMAT_NUMPY, each buffer is (type_code, values, valid).
+ * For COLUMN_FORMAT_ARROW, each buffer is
+ * (type_code, validity_bitmap, values, data, children), where data is None
+ * except for strings and bytes. The values of lists and maps are their
+ * offsets, and children has the arrays of their items, or of their keys and
+ * values, as (length, type_code, validity_bitmap, values, data, children).
+ * children is empty for other types. The GIL must be held.
+ */
+PyObject *column_builder_to_buffers(column_builder *builder, as_error *err);
+
+/**
+ * Return a new aerospike_helpers.columns.Columns with the rows of a
+ * COLUMN_FORMAT_NUMPY builder. The GIL must be held.
+ */
+PyObject *column_builder_to_pyobject(column_builder *builder, as_error *err);
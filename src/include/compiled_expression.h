@@ -0,0 +1,97 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#pragma once
+
+#include <Python.h>
+
+#include <aerospike/as_error.h>
+#include <aerospike/as_exp.h>
+
+#include "types.h"
+
+// A parameter of an expression, created by exp.Param(). Its value is packed
+// in the size bytes at offset in the packed expression
+typedef struct {
+    PyObject *name;
+    uint32_t offset;
+    uint32_t size;
+} expression_param;
+
+// Returned by aerospike.compile_expression()
+typedef struct {
+    PyObject_HEAD
+        // Immutable after creation
+        as_exp *exp;
+    // The parameters of exp, by offset. NULL if it has none
+    expression_param *params;
+    uint32_t n_params;
+} AerospikeCompiledExpression;
+
+extern PyTypeObject AerospikeCompiledExpression_Type;
+
+#define AerospikeCompiledExpression_Check(op)                                  \
+    (Py_TYPE(op) == &AerospikeCompiledExpression_Type)
+
+PyTypeObject *AerospikeCompiledExpression_Ready();
+
+/**
+ * Compiles an expression list once, so it can be reused by later commands
+ *
+ *		aerospike.compile_expression(expr)
+ *
+ */
+PyObject *Aerospike_Compile_Expression(PyObject *self, PyObject *args,
+                                       PyObject *kwds);
+
+/**
+ * Returns a new reference to py_expr converted to a compiled expression, or
+ * to py_expr itself if it is already one. On error, returns NULL and err is
+ * populated.
+ */
+PyObject *AerospikeCompiledExpression_New(as_error *err, PyObject *py_expr);
+
+/**
+ * Returns a copy of the expression of a compiled expression, with the values
+ * of py_params bound to its parameters. py_params is a dict from parameter
+ * names to values, or NULL. On error, returns NULL and err is populated.
+ * The caller owns the copy and frees it with as_exp_destroy().
+ */
+as_exp *as_exp_copy_from_compiled(AerospikeClient *self, as_error *err,
+                                  AerospikeCompiledExpression *py_compiled,
+                                  PyObject *py_params);
+
+/**
+ * Returns a copy of exp, with the values of py_params bound to params.
+ * On error, returns NULL and err is populated.
+ */
+as_exp *as_exp_bind_params(AerospikeClient *self, as_error *err, as_exp *exp,
+                           expression_param *params, uint32_t n_params,
+                           PyObject *py_params);
+
+void expression_params_destroy(expression_param *params, uint32_t n_params);
+
+/**
+ * Converts a list of expression tuples, without binding its parameters.
+ * *params is set to a new array of the parameters of the expression, by
+ * offset, or to NULL if it has none.
+ */
+as_status as_exp_new_with_params_from_pyobject(AerospikeClient *self,
+                                               PyObject *py_expr,
+                                               as_exp **exp_list,
+                                               expression_param **params,
+                                               uint32_t *n_params,
+                                               as_error *err);
@@ -105,7 +105,8 @@ as_status pyobject_to_index(AerospikeClient *self, as_error *err,
 as_status as_record_init_from_pyobject(AerospikeClient *self, as_error *err,
                                        PyObject *py_rec, PyObject *py_meta,
                                        as_record *rec, int serializer_option,
-                                       as_static_pool *static_pool);
+                                       as_static_pool *static_pool,
+                                       PyObject *py_schema);
 
 as_status val_to_pyobject(AerospikeClient *self, as_error *err,
                           const as_val *val, PyObject **py_map);
@@ -120,10 +121,36 @@ as_status record_to_pyobject(AerospikeClient *self, as_error *err,
                              const as_record *rec, const as_key *key,
                              PyObject **obj);
 
+// Options of record_to_pyobject_with_options, set by the policy of a command.
+// See get_record_options
+//
+// The bins are an aerospike.Record that converts each bin the first time it
+// is read
+#define RECORD_LAZY_BINS 0x1
+// Blobs in the bins are returned as read-only memoryviews that take the
+// buffers of the record instead of copying them
+#define RECORD_BLOB_VIEWS 0x2
+// The key of the record tuple is None
+#define RECORD_NO_KEY 0x4
+
+// Same as record_to_pyobject, with a combination of the RECORD_* options.
+// RECORD_BLOB_VIEWS is ignored with RECORD_LAZY_BINS
+as_status record_to_pyobject_with_options(AerospikeClient *self,
+                                          as_error *err, const as_record *rec,
+                                          const as_key *key, int options,
+                                          PyObject **obj);
+
+// Converts a value returned by a query or scan. Records are converted with
+// record_to_pyobject_with_options
+as_status query_result_to_pyobject(AerospikeClient *self, as_error *err,
+                                   const as_val *val, int record_options,
+                                   PyObject **py_val);
+
 as_status operate_bins_to_pyobject(AerospikeClient *self, as_error *err,
                                    const as_record *rec, PyObject **py_bins);
 
-as_status key_to_pyobject(as_error *err, const as_key *key, PyObject **obj);
+as_status key_to_pyobject(AerospikeClient *self, as_error *err,
+                          const as_key *key, PyObject **obj);
 
 as_status metadata_to_pyobject(as_error *err, const as_record *rec,
                                PyObject **obj);
@@ -171,12 +198,26 @@ as_status get_cdt_ctx(AerospikeClient *self, as_error *err, as_cdt_ctx *cdt_ctx,
                       PyObject *op_dict, bool *ctx_in_use,
                       as_static_pool *static_pool, int serializer_type);
 
+// Initializes a client with the default configuration, without connecting it.
+// Used to convert values that do not belong to a client, such as compiled
+// expressions and prepared policies.
+void init_default_client(AerospikeClient *client);
+
 // allow_base64_encoded_exprs: can the Python object also be a Python unicode object (base64 encoded)?
 // if false, the Python object should only be a compiled Python expression object from aerospike_helpers
 as_status as_exp_new_from_pyobject(AerospikeClient *self, PyObject *py_expr,
                                    as_exp **exp_list, as_error *err,
                                    bool allow_base64_encoded_exprs);
 
+// Like as_exp_new_from_pyobject(), with the values of py_params bound to the
+// parameters of the expression. py_params is a dict from parameter names to
+// values, or NULL. Every parameter of the expression must have a value.
+as_status as_exp_new_from_pyobject_with_params(AerospikeClient *self,
+                                               PyObject *py_expr,
+                                               PyObject *py_params,
+                                               as_exp **exp_list, as_error *err,
+                                               bool allow_base64_encoded_exprs);
+
 as_status convert_partition_filter(AerospikeClient *self,
                                    PyObject *py_partition_filter,
                                    as_partition_filter *partition_filter,
@@ -196,7 +237,8 @@ as_status as_partition_status_to_pyobject(
 as_status as_batch_result_to_BatchRecord(AerospikeClient *self, as_error *err,
                                          as_batch_result *bres,
                                          PyObject *py_batch_record,
-                                         bool checking_if_records_exist);
+                                         bool checking_if_records_exist,
+                                         int record_options);
 
 PyObject *create_py_cluster_from_as_cluster(as_error *error_p,
                                             struct as_cluster_s *cluster);
@@ -218,6 +260,22 @@ PyObject *create_class_instance_from_module(as_error *error_p,
                                             const char *class_name,
                                             PyObject *py_arg);
 
+// Returns a copy of a value parsed from a server response, or a new reference to it if it is
+// heap-allocated. Returns NULL if the value has a type that cannot be copied.
+as_val *copy_parsed_val(const as_val *val);
+
+// Returns a heap-allocated copy of a record passed to a query or scan callback, which stays valid
+// after the callback returns. Returns NULL if a bin has a type that cannot be copied.
+as_record *copy_parsed_record(const as_record *rec);
+
+// Returns module_name.attr_name(py_source, *args, **kwds), where attr_name is
+// a class or a function.
+// Used by methods of native types that are implemented in aerospike_helpers
+// Returns NULL and leaves the Python exception set on error
+PyObject *call_helper_with_source(const char *module_name,
+                                  const char *attr_name, PyObject *py_source,
+                                  PyObject *args, PyObject *kwds);
+
 // Convert a Python integer into a fixed-width integer and verify it is within that range
 // We return an unsigned long long because it should be able to fit all fixed-width int types up to uint64_t
 // Returns -1 on error. Error indicator can be checked to verify if error occurred
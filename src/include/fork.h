@@ -0,0 +1,33 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#pragma once
+
+#include <Python.h>
+
+#include "types.h"
+
+/**
+ * Register a handler with os.register_at_fork() that rebuilds the fork safe
+ * clients in a forked child process.
+ *
+ * Returns -1 and sets a Python exception on error.
+ */
+int register_fork_handler(void);
+
+// Clients created with config["fork_safe"] set to True
+void track_fork_safe_client(AerospikeClient *client);
+void untrack_fork_safe_client(AerospikeClient *client);
@@ -0,0 +1,40 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#pragma once
+
+#include <Python.h>
+
+#include "types.h"
+
+/**
+ * Call py_obj.method_name(*args, **kwds) on a thread of the client's C client
+ * thread pool and return a concurrent.futures.Future that is completed with
+ * its result.
+ *
+ * At most thread_pool_size - 1 futures of a client run at once, since batch,
+ * query and scan commands need a free thread for their per-node tasks. Other
+ * futures wait in the client's queue.
+ */
+PyObject *submit_future(AerospikeClient *client, PyObject *py_obj,
+                        const char *method_name, PyObject *args,
+                        PyObject *kwds);
+
+/**
+ * Called in a forked child process for a client that is rebuilt. The futures
+ * of the parent process are dropped.
+ */
+void reset_futures_after_fork(AerospikeClient *client);
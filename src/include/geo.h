@@ -54,3 +54,11 @@ AerospikeGeospatial *Aerospike_Set_Geo_Json(PyObject *parent, PyObject *args,
                                             PyObject *kwds);
 
 PyObject *AerospikeGeospatial_New(as_error *err, PyObject *value);
+
+PyObject *AerospikeGeospatial_New_From_Json(as_error *err, const char *json);
+
+PyObject *AerospikeGeospatial_Get_Data(AerospikeGeospatial *self,
+                                       as_error *err);
+
+PyObject *AerospikeGeospatial_Get_Json(AerospikeGeospatial *self,
+                                       as_error *err);
@@ -0,0 +1,56 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#pragma once
+
+#include <Python.h>
+
+#include <aerospike/as_error.h>
+
+// Classes of aerospike_helpers that are created for each value or result
+typedef enum {
+    HELPER_TYPE_HYPERLOGLOG,
+    HELPER_TYPE_BATCH_RECORDS,
+    HELPER_TYPE_BATCH_RECORD,
+    HELPER_TYPE_COLUMNS,
+    HELPER_TYPE_COUNT
+} helper_type;
+
+/**
+ * Return a borrowed reference to the class.
+ * The class is imported the first time, and the same class is returned after
+ * that. The GIL must be held.
+ */
+PyObject *get_helper_type(as_error *err, helper_type type);
+
+/**
+ * Create an aerospike_helpers.HyperLogLog with a copy of the bytes, without
+ * calling the Python constructor.
+ */
+PyObject *new_hyperloglog(as_error *err, const char *bytes, Py_ssize_t size);
+
+/**
+ * Create an aerospike_helpers.batch.records.BatchRecord for py_key, without
+ * calling the Python constructor. The attributes are set to the same values as
+ * BatchRecord.__init__() sets them to.
+ */
+PyObject *new_batch_record(as_error *err, PyObject *py_key);
+
+/**
+ * Create an aerospike_helpers.batch.records.BatchRecords with an empty list of
+ * batch records.
+ */
+PyObject *new_batch_records(as_error *err);
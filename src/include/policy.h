@@ -289,6 +289,13 @@ void set_scan_options(as_error *err, as_scan *scan_p, PyObject *py_options);
 as_status set_query_options(as_error *err, PyObject *query_options,
                             as_query *query);
 
+// Reads the client-side options of the record tuples returned by a command
+// from its policy: "lazy_records", "blob_as_memoryview" and "return_key".
+// record_options is set to a combination of the RECORD_* options of
+// conversions.h
+as_status get_record_options(as_error *err, PyObject *py_policy,
+                             int *record_options);
+
 as_status pyobject_to_list_policy(as_error *err, PyObject *py_policy,
                                   as_list_policy *policy, bool validate_keys);
 
@@ -1,3 +1,5 @@
+#pragma once
+
 /*
  *******************************************************************************************************
  * Static pool maintained to avoid runtime mallocs.
@@ -14,6 +16,12 @@
 typedef struct bytes_static_pool {
     as_bytes bytes_pool[AS_MAX_STORE_SIZE];
     uint32_t current_bytes_id;
+    // If true, blobs are written from the buffers of Python objects without
+    // copying them. Only set this when the values are used before the pool is
+    // destroyed
+    bool pin_buffers;
+    // memoryviews that pin the buffers of the blobs
+    PyObject *pinned_buffers;
 } as_static_pool;
 
 #define BYTES_CNT(static_pool)                                                 \
@@ -29,7 +37,11 @@ typedef struct bytes_static_pool {
         as_error_update(err, AEROSPIKE_ERR, "Cannot allocate as_bytes");       \
     }
 
+#define POOL_RELEASE_BUFFERS(static_pool)                                      \
+    Py_CLEAR(((as_static_pool *)static_pool)->pinned_buffers)
+
 #define POOL_DESTROY(static_pool)                                              \
     for (uint32_t iter = 0; iter < BYTES_CNT(static_pool); iter++) {           \
         as_bytes_destroy(&BYTES_POOL(static_pool)[iter]);                      \
-    }
+    }                                                                          \
+    POOL_RELEASE_BUFFERS(static_pool)
@@ -0,0 +1,110 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#pragma once
+
+#include <Python.h>
+#include <stdbool.h>
+
+#include <aerospike/as_error.h>
+#include <aerospike/as_operations.h>
+#include <aerospike/as_vector.h>
+
+#include "types.h"
+#include "pool.h"
+
+// Returned by aerospike.Placeholder(index)
+typedef struct {
+    PyObject_HEAD
+        // Position of the value in the values passed to operate()
+        Py_ssize_t index;
+} AerospikePlaceholder;
+
+extern PyTypeObject AerospikePlaceholder_Type;
+
+#define AerospikePlaceholder_Check(op)                                         \
+    (Py_TYPE(op) == &AerospikePlaceholder_Type)
+
+typedef enum {
+    // Built once, and shared by every call
+    PREPARED_OP_BUILT,
+    // A write or increment whose value is bound on each call. Only the value
+    // is converted, and the bin name is taken from the built operation
+    PREPARED_OP_WRITE,
+    PREPARED_OP_INCR,
+    // Built on each call from the operation, with its values bound
+    PREPARED_OP_BOUND
+} prepared_op_kind;
+
+typedef struct {
+    prepared_op_kind kind;
+    // Index of the operation in the built as_operations, or -1 if it has none
+    int32_t binop;
+    // Index of the value of a PREPARED_OP_WRITE or PREPARED_OP_INCR
+    Py_ssize_t value_index;
+    // The operation dict, for the operations that have placeholders
+    PyObject *py_op;
+} prepared_op;
+
+// Returned by client.prepare_operations()
+typedef struct {
+    PyObject_HEAD
+        // Operations are built with the options of this client, so they can
+        // only be used by it
+        AerospikeClient *client;
+    // The operations that were built when the operations were prepared
+    as_operations ops;
+    // True if a touch operation set the ttl of ops
+    bool has_ttl;
+    prepared_op *slots;
+    uint16_t n_slots;
+    // Number of values that must be passed on each call
+    Py_ssize_t n_values;
+    // Strings and blobs of the built operations
+    as_vector *unicodeStrVector;
+    as_static_pool *static_pool;
+} AerospikePreparedOperations;
+
+extern PyTypeObject AerospikePreparedOperations_Type;
+
+#define AerospikePreparedOperations_Check(op)                                  \
+    (Py_TYPE(op) == &AerospikePreparedOperations_Type)
+
+PyTypeObject *AerospikePlaceholder_Ready();
+PyTypeObject *AerospikePreparedOperations_Ready();
+
+/**
+ * Builds the operations of py_list that have no placeholders. On error,
+ * returns NULL and err is populated.
+ */
+AerospikePreparedOperations *
+AerospikePreparedOperations_New(AerospikeClient *client, as_error *err,
+                                PyObject *py_list);
+
+/**
+ * Adds the operations of prepared to ops, with py_values bound to their
+ * placeholders. The indexes of the operations in ops that are shared with
+ * prepared are appended to borrowed, and must be released with
+ * prepared_operations_release() before ops is destroyed.
+ */
+as_status prepared_operations_add(AerospikeClient *self, as_error *err,
+                                  AerospikePreparedOperations *prepared,
+                                  PyObject *py_values,
+                                  as_vector *unicodeStrVector,
+                                  as_static_pool *static_pool,
+                                  as_operations *ops, as_vector *borrowed);
+
+void prepared_operations_release(as_operations *ops, as_vector *borrowed);
@@ -0,0 +1,75 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#pragma once
+
+#include <Python.h>
+#include <stdbool.h>
+
+#include <aerospike/as_policy.h>
+
+#include "types.h"
+
+// The policy structs that can be prepared by aerospike.ReadPolicy(), etc.
+typedef enum {
+    PREPARED_POLICY_READ,
+    PREPARED_POLICY_WRITE,
+    PREPARED_POLICY_OPERATE,
+    PREPARED_POLICY_REMOVE,
+    PREPARED_POLICY_APPLY,
+    PREPARED_POLICY_BATCH,
+    PREPARED_POLICY_QUERY,
+    PREPARED_POLICY_SCAN,
+    PREPARED_POLICY_KIND_COUNT
+} prepared_policy_kind;
+
+typedef union {
+    as_policy_read read;
+    as_policy_write write;
+    as_policy_operate operate;
+    as_policy_remove remove;
+    as_policy_apply apply;
+    as_policy_batch batch;
+    as_policy_query query;
+    as_policy_scan scan;
+} prepared_policy_struct;
+
+// An immutable policy dict that caches its conversion to an as_policy_* struct
+typedef struct {
+    PyDictObject dict;
+    bool initialized;
+    // Set by the last conversion of the policy
+    bool cached;
+    prepared_policy_kind cached_kind;
+    // The client policy that the cached policy was converted on top of
+    prepared_policy_struct cached_config;
+    // filter_exp and txn are not cached, since commands own them
+    prepared_policy_struct cached_policy;
+} AerospikePreparedPolicy;
+
+PyTypeObject *AerospikeReadPolicy_Ready();
+PyTypeObject *AerospikeWritePolicy_Ready();
+PyTypeObject *AerospikeOperatePolicy_Ready();
+PyTypeObject *AerospikeRemovePolicy_Ready();
+PyTypeObject *AerospikeApplyPolicy_Ready();
+PyTypeObject *AerospikeBatchPolicy_Ready();
+PyTypeObject *AerospikeQueryPolicy_Ready();
+PyTypeObject *AerospikeScanPolicy_Ready();
+
+/**
+ * Returns py_policy as a prepared policy, or NULL if it is not one.
+ */
+AerospikePreparedPolicy *as_prepared_policy(PyObject *py_policy);
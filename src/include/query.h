@@ -105,6 +105,36 @@ PyObject *AerospikeQuery_Foreach(AerospikeQuery *self, PyObject *args,
 PyObject *AerospikeQuery_Results(AerospikeQuery *self, PyObject *args,
                                  PyObject *kwds);
 
+/**
+ * Return an asynchronous iterator over the results of the query.
+ *
+ *    async for result in query.aiter():
+ *      print(result)
+ *
+ */
+PyObject *AerospikeQuery_Aiter(AerospikeQuery *self, PyObject *args,
+                               PyObject *kwds);
+
+/**
+ * Return an iterator that yields the results of the query as they are received.
+ *
+ *    for result in query.stream():
+ *      print(result)
+ *
+ */
+PyObject *AerospikeQuery_Stream(AerospikeQuery *self, PyObject *args,
+                                PyObject *kwds);
+
+/**
+ * Execute the query on a native worker thread.
+ * Returns a concurrent.futures.Future completed with the results() list.
+ *
+ *    future = query.results_future()
+ *
+ */
+PyObject *AerospikeQuery_Results_Future(AerospikeQuery *self, PyObject *args,
+                                        PyObject *kwds);
+
 /**
  * Execute a UDF in the background. Returns the query id to allow status of the query to be monitored.
  * */
@@ -137,6 +167,51 @@ PyObject *AerospikeQuery_Is_Done(AerospikeQuery *self);
  */
 PyObject *AerospikeQuery_Get_Partitions_status(AerospikeQuery *self);
 
+/**
+ * Split the query into n picklable work units that each cover a contiguous
+ * range of partitions.
+ *
+ *    units = query.split(n)
+ *
+ */
+PyObject *AerospikeQuery_Split(AerospikeQuery *self, PyObject *args,
+                               PyObject *kwds);
+
+/**
+ * Run the query in n_procs worker processes and return all of the records.
+ *
+ *    records = query.parallel_results(n_procs, config)
+ *
+ */
+PyObject *AerospikeQuery_Parallel_Results(AerospikeQuery *self, PyObject *args,
+                                          PyObject *kwds);
+
+/**
+ * Return an iterator that yields pyarrow.RecordBatch objects with the records
+ * of the query.
+ *
+ *    for batch in query.to_arrow(batch_size=10000):
+ *      print(batch.num_rows)
+ *
+ */
+PyObject *AerospikeQuery_To_Arrow(AerospikeQuery *self, PyObject *args,
+                                  PyObject *kwds);
+
+/**
+ * Invoke the callback with the bins of up to batch_size records at a time,
+ * stored in the buffers of the Arrow columnar format.
+ *
+ */
+PyObject *AerospikeQuery_Foreach_Columns(AerospikeQuery *self, PyObject *args,
+                                         PyObject *kwds);
+
+/**
+ * Serialize the query definition to bytes.
+ *
+ */
+PyObject *AerospikeQuery_To_Bytes(AerospikeQuery *self,
+                                  PyObject *Py_UNUSED(args));
+
 /**
  * Store the Unicode -> UTF8 string converted PyObject into 
  * a pool of PyObjects. So that, they will be decref'ed at later stages
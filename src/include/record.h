@@ -0,0 +1,39 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#pragma once
+
+#include <Python.h>
+
+#include <aerospike/as_error.h>
+#include <aerospike/as_record.h>
+
+#include "types.h"
+
+/*******************************************************************************
+ * FUNCTIONS
+ ******************************************************************************/
+
+PyTypeObject *AerospikeRecord_Ready(void);
+
+/**
+ * Create an aerospike.Record for the bins of rec.
+ * The bin values are reserved instead of copied, so rec can be destroyed
+ * after this returns. Each bin is converted to a Python object the first time
+ * it is read.
+ */
+PyObject *AerospikeRecord_New(AerospikeClient *client, as_error *err,
+                              const as_record *rec);
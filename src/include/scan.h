@@ -79,6 +79,36 @@ PyObject *AerospikeScan_Foreach(AerospikeScan *self, PyObject *args,
 PyObject *AerospikeScan_Results(AerospikeScan *self, PyObject *args,
                                 PyObject *kwds);
 
+/**
+ * Return an asynchronous iterator over the results of the scan.
+ *
+ *    async for result in scan.aiter():
+ *      print(result)
+ *
+ */
+PyObject *AerospikeScan_Aiter(AerospikeScan *self, PyObject *args,
+                              PyObject *kwds);
+
+/**
+ * Return an iterator that yields the results of the scan as they are received.
+ *
+ *    for result in scan.stream():
+ *      print(result)
+ *
+ */
+PyObject *AerospikeScan_Stream(AerospikeScan *self, PyObject *args,
+                               PyObject *kwds);
+
+/**
+ * Execute the scan on a native worker thread.
+ * Returns a concurrent.futures.Future completed with the results() list.
+ *
+ *    future = scan.results_future()
+ *
+ */
+PyObject *AerospikeScan_Results_Future(AerospikeScan *self, PyObject *args,
+                                       PyObject *kwds);
+
 /**
  * Execute the scan in the background.
  *
@@ -130,5 +160,50 @@ PyObject *AerospikeScan_Is_Done(AerospikeScan *self, PyObject *args,
  */
 PyObject *AerospikeScan_Get_Partitions_status(AerospikeScan *self);
 
+/**
+ * Split the scan into n picklable work units that each cover a contiguous
+ * range of partitions.
+ *
+ *    units = scan.split(n)
+ *
+ */
+PyObject *AerospikeScan_Split(AerospikeScan *self, PyObject *args,
+                              PyObject *kwds);
+
+/**
+ * Run the scan in n_procs worker processes and return all of the records.
+ *
+ *    records = scan.parallel_results(n_procs, config)
+ *
+ */
+PyObject *AerospikeScan_Parallel_Results(AerospikeScan *self, PyObject *args,
+                                         PyObject *kwds);
+
+/**
+ * Return an iterator that yields pyarrow.RecordBatch objects with the records
+ * of the scan.
+ *
+ *    for batch in scan.to_arrow(batch_size=10000):
+ *      print(batch.num_rows)
+ *
+ */
+PyObject *AerospikeScan_To_Arrow(AerospikeScan *self, PyObject *args,
+                                 PyObject *kwds);
+
+/**
+ * Invoke the callback with the bins of up to batch_size records at a time,
+ * stored in the buffers of the Arrow columnar format.
+ *
+ */
+PyObject *AerospikeScan_Foreach_Columns(AerospikeScan *self, PyObject *args,
+                                        PyObject *kwds);
+
+/**
+ * Serialize the scan definition to bytes.
+ *
+ */
+PyObject *AerospikeScan_To_Bytes(AerospikeScan *self,
+                                 PyObject *Py_UNUSED(args));
+
 AerospikeScan *AerospikeScan_Type_New(PyTypeObject *type,
                                       AerospikeClient *client);
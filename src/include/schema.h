@@ -0,0 +1,51 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#pragma once
+
+#include <Python.h>
+
+#include <aerospike/as_key.h>
+
+#include "types.h"
+
+// The types of the bins of a schema registered with client.register_schema()
+typedef enum {
+    SCHEMA_BIN_INT,
+    SCHEMA_BIN_FLOAT,
+    SCHEMA_BIN_STR,
+    SCHEMA_BIN_BYTES,
+    SCHEMA_BIN_BYTEARRAY,
+    SCHEMA_BIN_LIST,
+    SCHEMA_BIN_DICT
+} schema_bin_type;
+
+typedef struct {
+    char ns[AS_NAMESPACE_MAX_SIZE];
+    char set[AS_SET_MAX_SIZE];
+    // Maps the names of the bins to their schema_bin_type, as int
+    PyObject *py_bins;
+} set_schema;
+
+/**
+ * Return the bins of the schema registered for ns and set, or NULL if there
+ * is none. The returned dict is borrowed, so callers that may run Python code
+ * while using it must hold a reference, since that code can replace it.
+ */
+PyObject *get_set_schema(AerospikeClient *self, const char *ns,
+                         const char *set);
+
+void destroy_set_schemas(AerospikeClient *self);
@@ -69,4 +69,14 @@ extern as_status deserialize_based_on_as_bytes_type(AerospikeClient *self,
                                                     as_bytes *bytes,
                                                     PyObject **retval,
                                                     as_error *error_p);
+
+/**
+ * Same as deserialize_based_on_as_bytes_type, but a blob is returned as a
+ * read-only memoryview that takes the buffer of bytes instead of copying it.
+ * bytes should not be read again after this returns.
+ */
+extern as_status deserialize_blob_as_memoryview(AerospikeClient *self,
+                                                as_bytes *bytes,
+                                                PyObject **retval,
+                                                as_error *error_p);
 #endif
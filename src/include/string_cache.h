@@ -0,0 +1,41 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#pragma once
+
+#include <Python.h>
+
+#include "types.h"
+
+// Number of strings kept by a cache. Must be a power of 2
+#define STRING_CACHE_SIZE 1024
+
+// Longest string that is cached. Bin names, namespaces and sets are shorter
+#define STRING_CACHE_MAX_LEN 63
+
+string_cache *string_cache_create(void);
+
+void string_cache_destroy(string_cache *cache);
+
+/**
+ * Return a new reference to a str equal to the UTF-8 string str, or NULL with
+ * a Python exception set.
+ *
+ * Strings that were returned recently are reused instead of created again.
+ * The cache keeps at most STRING_CACHE_SIZE strings: a string replaces the
+ * one with the same slot. cache may be NULL, and the GIL must be held.
+ */
+PyObject *string_cache_get(string_cache *cache, const char *str);
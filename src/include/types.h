@@ -25,6 +25,7 @@
 #include <aerospike/as_scan.h>
 #include <aerospike/as_bin.h>
 #include <aerospike/as_operations.h>
+#include <aerospike/as_record.h>
 #include <aerospike/as_txn.h>
 #include <aerospike/as_config.h>
 
@@ -52,6 +53,15 @@ typedef struct {
     PyObject_HEAD
 } AerospikeCDTInfObject;
 
+// Defined in client/auto_batch.c
+typedef struct auto_batch_s auto_batch;
+
+// Defined in string_cache.c
+typedef struct string_cache_s string_cache;
+
+// Defined in future.c
+typedef struct future_task_s future_task;
+
 typedef struct {
     PyObject_HEAD aerospike *as;
     int shm_key;
@@ -79,6 +89,19 @@ typedef struct {
     bool use_shared_connection;
     uint8_t send_bool_as;
     bool validate_keys;
+    // NULL unless config["auto_batch"] is set
+    auto_batch *auto_batch;
+    // Rebuilt in forked child processes
+    bool fork_safe;
+    // Strings of the bin names, namespaces and sets of the records read
+    string_cache *strings;
+    // set_schema entries registered with register_schema(). NULL if none
+    as_vector *schemas;
+    // Futures waiting for a thread of the C client's thread pool, oldest
+    // first, and the number of futures running on it. Protected by the GIL
+    future_task *pending_futures;
+    future_task *last_pending_future;
+    uint32_t running_futures;
 } AerospikeClient;
 
 typedef struct {
@@ -98,12 +121,23 @@ typedef struct {
 
 typedef struct {
     PyObject_HEAD PyObject *geo_data;
+    // GeoJSON string read from the server. geo_data is parsed from it on
+    // first access
+    PyObject *geo_json;
 } AerospikeGeospatial;
 
 typedef struct {
     PyDictObject dict;
 } AerospikeKeyOrderedDict;
 
+typedef struct {
+    PyObject_HEAD AerospikeClient *client;
+    // Holds a reference to each bin value of the record that was read
+    as_record *rec;
+    // Bins that were already converted, by name
+    PyObject *py_bins;
+} AerospikeRecord;
+
 typedef struct {
     PyObject_HEAD
         /* Type-specific fields go here. */
@@ -125,6 +159,7 @@ extern PyObject *py_client_config_shm_valid_keys;
 extern PyObject *py_client_config_lua_valid_keys;
 extern PyObject *py_client_config_policies_valid_keys;
 extern PyObject *py_client_config_tls_valid_keys;
+extern PyObject *py_client_config_auto_batch_valid_keys;
 extern PyObject *py_apply_policy_valid_keys;
 extern PyObject *py_admin_policy_valid_keys;
 extern PyObject *py_info_policy_valid_keys;
@@ -33,7 +33,12 @@
 #include "nullobject.h"
 #include "cdt_types.h"
 #include "transaction.h"
+#include "compiled_expression.h"
+#include "prepared_policy.h"
+#include "prepared_operations.h"
 #include "config_provider.h"
+#include "fork.h"
+#include "record.h"
 
 #include <aerospike/as_operations.h>
 #include <aerospike/as_log_macros.h>
@@ -90,6 +95,10 @@ static PyMethodDef aerospike_methods[] = {
     {"get_partition_id", (PyCFunction)Aerospike_Get_Partition_Id, METH_VARARGS,
      "Get partition ID for given digest"},
 
+    {"compile_expression", (PyCFunction)Aerospike_Compile_Expression,
+     METH_VARARGS | METH_KEYWORDS,
+     "Compile an expression once, so it can be reused by many commands"},
+
     {NULL}};
 
 struct module_constant_name_to_value {
@@ -632,12 +641,24 @@ static struct type_name_to_creation_method py_module_types[] = {
     {"Query", AerospikeQuery_Ready},
     {"Scan", AerospikeScan_Ready},
     {"KeyOrderedDict", AerospikeKeyOrderedDict_Ready},
+    {"Record", AerospikeRecord_Ready},
     {"GeoJSON", AerospikeGeospatial_Ready},
     {"null", AerospikeNullObject_Ready},
     {"CDTWildcard", AerospikeWildcardObject_Ready},
     {"CDTInfinite", AerospikeInfiniteObject_Ready},
     {"Transaction", AerospikeTransaction_Ready},
     {"ConfigProvider", AerospikeConfigProvider_Ready},
+    {"CompiledExpression", AerospikeCompiledExpression_Ready},
+    {"ReadPolicy", AerospikeReadPolicy_Ready},
+    {"WritePolicy", AerospikeWritePolicy_Ready},
+    {"OperatePolicy", AerospikeOperatePolicy_Ready},
+    {"RemovePolicy", AerospikeRemovePolicy_Ready},
+    {"ApplyPolicy", AerospikeApplyPolicy_Ready},
+    {"BatchPolicy", AerospikeBatchPolicy_Ready},
+    {"QueryPolicy", AerospikeQueryPolicy_Ready},
+    {"ScanPolicy", AerospikeScanPolicy_Ready},
+    {"Placeholder", AerospikePlaceholder_Ready},
+    {"PreparedOperations", AerospikePreparedOperations_Ready},
 };
 
 // We use a macro to avoid repetition
@@ -653,13 +674,17 @@ DEFINE_SET_OF_VALID_KEYS(
     "send_bool_as", "compression_threshold", "tend_interval", "cluster_name",
     "strict_types", "rack_aware", "rack_id", "rack_ids",
     "use_services_alternate", "max_socket_idle", "fail_if_not_connected",
-    "user", "password", "validate_keys", "app_id", "force_single_node", NULL)
+    "user", "password", "validate_keys", "app_id", "force_single_node",
+    "auto_batch", "fork_safe", NULL)
 
 DEFINE_SET_OF_VALID_KEYS(client_config_shm, "shm_max_nodes", "max_nodes",
                          "shm_max_namespaces", "max_namespaces",
                          "shm_takeover_threshold_sec", "takeover_threshold_sec",
                          "shm_key", NULL)
 
+DEFINE_SET_OF_VALID_KEYS(client_config_auto_batch, "window_us", "max_keys",
+                         NULL)
+
 DEFINE_SET_OF_VALID_KEYS(client_config_lua, "system_path", "user_path", NULL
 
 )
@@ -682,7 +707,8 @@ DEFINE_SET_OF_VALID_KEYS(client_config_tls, "enable", "cafile", "capath",
 
 #define BASE_POLICY_KEYS                                                       \
     "total_timeout", "socket_timeout", "max_retries", "sleep_between_retries", \
-        "compress", "txn", "expressions", "connect_timeout", "timeout_delay"
+        "compress", "txn", "expressions", "expression_params",                 \
+        "connect_timeout", "timeout_delay"
 
 DEFINE_SET_OF_VALID_KEYS(apply_policy, BASE_POLICY_KEYS, "key", "replica",
                          "commit_level", "durable_delete", "ttl",
@@ -700,13 +726,15 @@ DEFINE_SET_OF_VALID_KEYS(info_policy, INFO_POLICY_KEYS, NULL
 
 DEFINE_SET_OF_VALID_KEYS(query_policy, BASE_POLICY_KEYS, "deserialize",
                          "replica", "short_query", "expected_duration",
-                         "partition_filter", NULL
+                         "partition_filter", "lazy_records",
+                         "blob_as_memoryview", "return_key", NULL
 
 )
 
 DEFINE_SET_OF_VALID_KEYS(read_policy, BASE_POLICY_KEYS, "key", "replica",
                          "deserialize", "read_touch_ttl_percent",
-                         "read_mode_ap", "read_mode_sc", NULL
+                         "read_mode_ap", "read_mode_sc", "lazy_records",
+                         "blob_as_memoryview", "return_key", NULL
 
 )
 
@@ -718,7 +746,7 @@ DEFINE_SET_OF_VALID_KEYS(remove_policy, BASE_POLICY_KEYS, "generation", "key",
 
 #define SCAN_POLICY_KEYS                                                       \
     "durable_delete", "records_per_second", "max_records", "replica", "ttl",   \
-        "partition_filter"
+        "partition_filter", "lazy_records", "blob_as_memoryview", "return_key"
 
 DEFINE_SET_OF_VALID_KEYS(scan_policy, BASE_POLICY_KEYS, SCAN_POLICY_KEYS, NULL)
 
@@ -748,29 +776,32 @@ DEFINE_SET_OF_VALID_KEYS(batch_policy, BASE_POLICY_KEYS, "concurrent",
                          "allow_inline", "deserialize", "replica",
                          "read_touch_ttl_percent", "read_mode_ap",
                          "read_mode_sc", "allow_inline_ssd", "respond_all_keys",
+                         "lazy_records", "blob_as_memoryview", "return_key",
                          NULL
 
 )
 
 DEFINE_SET_OF_VALID_KEYS(batch_write_policy, "key", "gen", "commit_level",
                          "durable_delete", "exists", "on_locking_only",
-                         "expressions", "ttl", NULL
+                         "expressions", "expression_params", "ttl", NULL
 
 )
 
 DEFINE_SET_OF_VALID_KEYS(batch_read_policy, "read_touch_ttl_percent",
-                         "read_mode_ap", "read_mode_sc", "expressions", NULL
+                         "read_mode_ap", "read_mode_sc", "expressions",
+                         "expression_params", NULL
 
 )
 
 DEFINE_SET_OF_VALID_KEYS(batch_apply_policy, "key", "commit_level", "ttl",
                          "durable_delete", "on_locking_only", "expressions",
-                         NULL
+                         "expression_params", NULL
 
 )
 
 DEFINE_SET_OF_VALID_KEYS(batch_remove_policy, "key", "commit_level", "gen",
-                         "durable_delete", "generation", "expressions", NULL
+                         "durable_delete", "generation", "expressions",
+                         "expression_params", NULL
 
 )
 
@@ -811,6 +842,7 @@ static struct py_set_name_to_str_list py_set_name_to_str_lists[] = {
     PY_SET_NAME_TO_STR_LIST(client_config_lua_valid_keys),
     PY_SET_NAME_TO_STR_LIST(client_config_policies_valid_keys),
     PY_SET_NAME_TO_STR_LIST(client_config_tls_valid_keys),
+    PY_SET_NAME_TO_STR_LIST(client_config_auto_batch_valid_keys),
     PY_SET_NAME_TO_STR_LIST(apply_policy_valid_keys),
     PY_SET_NAME_TO_STR_LIST(info_policy_valid_keys),
     PY_SET_NAME_TO_STR_LIST(admin_policy_valid_keys),
@@ -929,6 +961,10 @@ PyMODINIT_FUNC PyInit_aerospike(void)
         goto AEROSPIKE_MODULE_CLEANUP_ON_ERROR;
     }
 
+    if (register_fork_handler() == -1) {
+        goto AEROSPIKE_MODULE_CLEANUP_ON_ERROR;
+    }
+
     unsigned long i = 0;
     for (i = 0; i < sizeof(py_module_types) / sizeof(py_module_types[0]); i++) {
         PyTypeObject *(*py_type_ready_func)(void) =
@@ -0,0 +1,221 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+#include <errno.h>
+#include <pthread.h>
+#include <stdbool.h>
+#include <string.h>
+#include <time.h>
+
+#include <aerospike/aerospike_batch.h>
+#include <aerospike/as_batch.h>
+#include <aerospike/as_error.h>
+#include <aerospike/as_key.h>
+#include <aerospike/as_record.h>
+#include <aerospike/as_vector.h>
+
+#include "auto_batch.h"
+#include "conversions.h"
+
+// Reads that are sent together in one batch read.
+// All fields are protected by the lock of the auto_batch that owns the group.
+typedef struct {
+    as_batch_records *records;
+    // Signalled when the group is sealed and when the batch read completes
+    pthread_cond_t cond;
+    // Number of callers that have not converted their record yet
+    uint32_t n_callers;
+    // No more reads can join the group
+    bool sealed;
+    bool done;
+    // Error of the batch read itself. Each record has its own result.
+    as_error err;
+} auto_batch_group;
+
+struct auto_batch_s {
+    uint32_t window_us;
+    uint32_t max_keys;
+    pthread_mutex_t lock;
+    // Group that new reads join, or NULL if the next read starts a new group
+    auto_batch_group *open_group;
+};
+
+auto_batch *auto_batch_create(uint32_t window_us, uint32_t max_keys)
+{
+    auto_batch *ab = (auto_batch *)cf_malloc(sizeof(auto_batch));
+    ab->window_us = window_us;
+    ab->max_keys = max_keys;
+    pthread_mutex_init(&ab->lock, NULL);
+    ab->open_group = NULL;
+    return ab;
+}
+
+void auto_batch_destroy(auto_batch *ab)
+{
+    // Every group is freed by its last caller, and callers keep the client alive
+    pthread_mutex_destroy(&ab->lock);
+    cf_free(ab);
+}
+
+void auto_batch_reset_after_fork(auto_batch *ab)
+{
+    // The reads of the open group were made by the parent's threads
+    pthread_mutex_init(&ab->lock, NULL);
+    ab->open_group = NULL;
+}
+
+static auto_batch_group *group_create(uint32_t max_keys)
+{
+    auto_batch_group *group =
+        (auto_batch_group *)cf_malloc(sizeof(auto_batch_group));
+    group->records = as_batch_records_create(max_keys);
+    pthread_cond_init(&group->cond, NULL);
+    group->n_callers = 0;
+    group->sealed = false;
+    group->done = false;
+    as_error_init(&group->err);
+    return group;
+}
+
+static void group_destroy(auto_batch_group *group)
+{
+    // The keys and bin names are owned by the callers, so
+    // as_batch_records_destroy() can't be used
+    as_vector *list = &group->records->list;
+    for (uint32_t i = 0; i < list->size; i++) {
+        as_batch_read_record *record =
+            (as_batch_read_record *)as_vector_get(list, i);
+        as_record_destroy(&record->record);
+    }
+    as_vector_destroy(list);
+    pthread_cond_destroy(&group->cond);
+    cf_free(group);
+}
+
+// Must be called with the lock held
+static void group_seal(auto_batch *ab, auto_batch_group *group)
+{
+    group->sealed = true;
+    if (ab->open_group == group) {
+        ab->open_group = NULL;
+    }
+    pthread_cond_broadcast(&group->cond);
+}
+
+static void get_deadline(struct timespec *deadline, uint32_t window_us)
+{
+    clock_gettime(CLOCK_REALTIME, deadline);
+    uint64_t nsec = (uint64_t)deadline->tv_nsec + (uint64_t)window_us * 1000;
+    deadline->tv_sec += nsec / 1000000000;
+    deadline->tv_nsec = nsec % 1000000000;
+}
+
+as_status auto_batch_read(AerospikeClient *self, as_error *err, as_key *key,
+                          const char **bins, PyObject **py_rec)
+{
+    auto_batch *ab = self->auto_batch;
+    auto_batch_group *group = NULL;
+    uint32_t index = 0;
+
+    uint32_t n_bins = 0;
+    if (bins) {
+        while (bins[n_bins]) {
+            n_bins++;
+        }
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    pthread_mutex_lock(&ab->lock);
+
+    // The caller that starts a group sends its batch read
+    bool leader = ab->open_group == NULL;
+    if (leader) {
+        ab->open_group = group_create(ab->max_keys);
+    }
+    group = ab->open_group;
+
+    index = group->records->list.size;
+    as_batch_read_record *record = as_batch_read_reserve(group->records);
+    // Shallow copy. The caller's key outlives the batch read.
+    memcpy(&record->key, key, sizeof(as_key));
+    if (key->valuep == &key->value) {
+        record->key.valuep = &record->key.value;
+    }
+    if (bins) {
+        record->bin_names = (char **)bins;
+        record->n_bin_names = n_bins;
+    }
+    else {
+        record->read_all_bins = true;
+    }
+    // Distinguishes records that the batch read never got to
+    record->result = AEROSPIKE_NO_RESPONSE;
+    group->n_callers++;
+
+    if (group->records->list.size >= ab->max_keys) {
+        group_seal(ab, group);
+    }
+
+    if (leader) {
+        struct timespec deadline;
+        get_deadline(&deadline, ab->window_us);
+        while (!group->sealed) {
+            if (pthread_cond_timedwait(&group->cond, &ab->lock, &deadline) ==
+                ETIMEDOUT) {
+                group_seal(ab, group);
+            }
+        }
+        pthread_mutex_unlock(&ab->lock);
+
+        aerospike_batch_read(self->as, &group->err, NULL, group->records);
+
+        pthread_mutex_lock(&ab->lock);
+        group->done = true;
+        pthread_cond_broadcast(&group->cond);
+    }
+    else {
+        while (!group->done) {
+            pthread_cond_wait(&group->cond, &ab->lock);
+        }
+    }
+    pthread_mutex_unlock(&ab->lock);
+    Py_END_ALLOW_THREADS
+
+    // The group's records are no longer modified once it is done
+    as_batch_read_record *result =
+        (as_batch_read_record *)as_vector_get(&group->records->list, index);
+    if (result->result == AEROSPIKE_OK) {
+        record_to_pyobject(self, err, &result->record, key, py_rec);
+    }
+    else if (result->result == AEROSPIKE_NO_RESPONSE &&
+             group->err.code != AEROSPIKE_OK) {
+        as_error_copy(err, &group->err);
+    }
+    else {
+        as_error_update(err, result->result, "%s",
+                        as_error_string(result->result));
+    }
+
+    pthread_mutex_lock(&ab->lock);
+    bool last = --group->n_callers == 0;
+    pthread_mutex_unlock(&ab->lock);
+    if (last) {
+        group_destroy(group);
+    }
+
+    return err->code;
+}
@@ -29,13 +29,12 @@
 #include "client.h"
 #include "conversions.h"
 #include "exceptions.h"
+#include "helper_types.h"
 #include "policy.h"
 
 // Struct for Python User-Data for the Callback
 typedef struct {
     PyObject *py_results;
-    PyObject *batch_records_module;
-    PyObject *func_name;
     AerospikeClient *client;
 } LocalData;
 
@@ -60,14 +59,14 @@ static bool batch_apply_cb(const as_batch_result *results, uint32_t n,
         res = (as_batch_read *)&results[i];
 
         // NOTE these conversions shouldn't go wrong but if they do, return
-        if (key_to_pyobject(&err, res->key, &py_key) != AEROSPIKE_OK) {
+        if (key_to_pyobject(data->client, &err, res->key, &py_key) !=
+            AEROSPIKE_OK) {
             as_log_error("unable to convert res->key at results index: %d", i);
             success = false;
             break;
         }
 
-        py_batch_record = PyObject_CallMethodObjArgs(
-            data->batch_records_module, data->func_name, py_key, NULL);
+        py_batch_record = new_batch_record(&err, py_key);
         if (py_batch_record == NULL) {
             as_log_error("unable to instance BatchRecord at results index: %d",
                          i);
@@ -78,7 +77,7 @@ static bool batch_apply_cb(const as_batch_result *results, uint32_t n,
         Py_DECREF(py_key);
 
         as_batch_result_to_BatchRecord(data->client, &err, res, py_batch_record,
-                                       false);
+                                       false, 0);
         if (err.code != AEROSPIKE_OK) {
             as_log_error(
                 "as_batch_result_to_BatchRecord failed at results index: %d",
@@ -202,47 +201,15 @@ static PyObject *AerospikeClient_Batch_Apply_Invoke(
         goto CLEANUP;
     }
 
-    // import batch_records helper
-    PyObject *br_module = NULL;
-    PyObject *sys_modules = PyImport_GetModuleDict();
-
-    if (PyMapping_HasKeyString(sys_modules,
-                               "aerospike_helpers.batch.records")) {
-        br_module = PyMapping_GetItemString(sys_modules,
-                                            "aerospike_helpers.batch.records");
-    }
-    else {
-        br_module = PyImport_ImportModule("aerospike_helpers.batch.records");
-    }
-
-    if (!br_module) {
-        as_error_update(err, AEROSPIKE_ERR_CLIENT,
-                        "Unable to load batch_records module");
-        goto CLEANUP;
-    }
-
-    PyObject *obj_name = PyUnicode_FromString("BatchRecords");
-    PyObject *res_list = PyList_New(0);
-    br_instance =
-        PyObject_CallMethodObjArgs(br_module, obj_name, res_list, NULL);
+    br_instance = new_batch_records(err);
     if (!br_instance) {
-        as_error_update(err, AEROSPIKE_ERR_CLIENT,
-                        "Unable to instance BatchRecords");
-        Py_DECREF(br_module);
-        Py_DECREF(obj_name);
-        Py_DECREF(res_list);
         goto CLEANUP;
     }
-    Py_DECREF(br_module);
-    Py_DECREF(obj_name);
-    Py_DECREF(res_list);
 
     // Create and initialize callback user-data
     LocalData data;
     data.client = self;
-    data.func_name = PyUnicode_FromString("BatchRecord");
     data.py_results = PyObject_GetAttrString(br_instance, "batch_records");
-    data.batch_records_module = br_module;
 
     as_error batch_apply_err;
     as_error_init(&batch_apply_err);
@@ -256,7 +223,6 @@ static PyObject *AerospikeClient_Batch_Apply_Invoke(
     Py_END_ALLOW_THREADS
 
     Py_DECREF(data.py_results);
-    Py_DECREF(data.func_name);
 
     PyObject *py_bw_res = PyLong_FromLong((long)batch_apply_err.code);
     PyObject_SetAttrString(br_instance, FIELD_NAME_BATCH_RESULT, py_bw_res);
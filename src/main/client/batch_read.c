@@ -9,17 +9,38 @@
 #include "policy.h"
 #include "conversions.h"
 #include "exceptions.h"
+#include "helper_types.h"
+#include "columns.h"
 #include "macros.h"
 
 // Struct for Python User-Data for the Callback
 typedef struct {
     PyObject *py_results;
-    PyObject *batch_records_module;
-    PyObject *func_name;
     AerospikeClient *client;
     bool checking_if_records_exist;
+    // RECORD_* options of the record tuples
+    int record_options;
+    // Set if the bins are returned as NumPy arrays
+    column_builder *columns;
 } LocalData;
 
+// Only fills C arrays, so the GIL is not needed
+static bool batch_read_columns_cb(const as_batch_result *results, uint32_t n,
+                                  void *udata)
+{
+    LocalData *data = (LocalData *)udata;
+
+    for (uint32_t i = 0; i < n; i++) {
+        const as_batch_read *res = &results[i];
+        const as_record *rec =
+            res->result == AEROSPIKE_OK ? &res->record : NULL;
+        if (!column_builder_append(data->columns, rec)) {
+            return false;
+        }
+    }
+    return true;
+}
+
 static bool batch_read_cb(const as_batch_result *results, uint32_t n,
                           void *udata)
 {
@@ -41,15 +62,19 @@ static bool batch_read_cb(const as_batch_result *results, uint32_t n,
         res = (as_batch_read *)&results[i];
 
         // NOTE these conversions shouldn't go wrong but if they do, return
-        if (key_to_pyobject(&err, res->key, &py_key) != AEROSPIKE_OK) {
+        if (data->record_options & RECORD_NO_KEY) {
+            Py_INCREF(Py_None);
+            py_key = Py_None;
+        }
+        else if (key_to_pyobject(data->client, &err, res->key, &py_key) !=
+                 AEROSPIKE_OK) {
             as_log_error("unable to convert res->key at results index: %d", i);
             success = false;
             break;
         }
 
         // Create BatchRecord instance
-        py_batch_record = PyObject_CallMethodObjArgs(
-            data->batch_records_module, data->func_name, py_key, NULL);
+        py_batch_record = new_batch_record(&err, py_key);
         if (py_batch_record == NULL) {
             as_log_error("unable to instance BatchRecord at results index: %d",
                          i);
@@ -61,7 +86,8 @@ static bool batch_read_cb(const as_batch_result *results, uint32_t n,
 
         // Initialize BatchRecord instance
         as_batch_result_to_BatchRecord(data->client, &err, res, py_batch_record,
-                                       data->checking_if_records_exist);
+                                       data->checking_if_records_exist,
+                                       data->record_options);
         if (err.code != AEROSPIKE_OK) {
             as_log_error(
                 "as_batch_result_to_BatchRecord failed at results index: %d",
@@ -85,10 +111,11 @@ PyObject *AerospikeClient_BatchRead(AerospikeClient *self, PyObject *args,
     PyObject *py_keys = NULL;
     PyObject *py_bins = NULL;
     PyObject *py_policy_batch = NULL;
-    static char *kwlist[] = {"keys", "bins", "policy", NULL};
-    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|OO:batch_read", kwlist,
-                                    &py_keys, &py_bins,
-                                    &py_policy_batch) == false) {
+    PyObject *py_output = NULL;
+    static char *kwlist[] = {"keys", "bins", "policy", "output", NULL};
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|OOO:batch_read", kwlist,
+                                    &py_keys, &py_bins, &py_policy_batch,
+                                    &py_output) == false) {
         return NULL;
     }
 
@@ -96,6 +123,14 @@ PyObject *AerospikeClient_BatchRead(AerospikeClient *self, PyObject *args,
     as_error_init(&err);
 
     PyObject *br_instance = NULL;
+    bool numpy_output = false;
+    column_builder columns;
+    bool columns_initialized = false;
+
+    if (get_numpy_output_option(&err, py_output, &numpy_output) !=
+        AEROSPIKE_OK) {
+        goto CLEANUP1;
+    }
 
     // required arg so don't need to check for NULL
     if (!PyList_Check(py_keys)) {
@@ -165,52 +200,34 @@ PyObject *AerospikeClient_BatchRead(AerospikeClient *self, PyObject *args,
         }
     }
 
-    // import batch_records helper
-    PyObject *br_module = NULL;
-    PyObject *sys_modules = PyImport_GetModuleDict();
+    // Create and initialize callback user-data
+    LocalData data;
+    // Used to decode record bins
+    data.client = self;
+    data.py_results = NULL;
+    data.checking_if_records_exist = false;
+    data.columns = NULL;
 
-    Py_INCREF(sys_modules);
-    if (PyMapping_HasKeyString(sys_modules,
-                               "aerospike_helpers.batch.records")) {
-        br_module = PyMapping_GetItemString(sys_modules,
-                                            "aerospike_helpers.batch.records");
+    if (numpy_output) {
+        column_builder_init(&columns, (uint32_t)processed_key_count,
+                            COLUMN_FORMAT_NUMPY);
+        columns_initialized = true;
+        data.columns = &columns;
     }
     else {
-        br_module = PyImport_ImportModule("aerospike_helpers.batch.records");
-    }
-    Py_DECREF(sys_modules);
-
-    if (!br_module) {
-        as_error_update(&err, AEROSPIKE_ERR_CLIENT,
-                        "Unable to load batch_records module");
-        goto CLEANUP3;
+        br_instance = new_batch_records(&err);
+        if (!br_instance) {
+            goto CLEANUP3;
+        }
+        // Used to append BatchRecord instances to the BatchRecords object in this function
+        data.py_results = PyObject_GetAttrString(br_instance, "batch_records");
     }
 
-    PyObject *obj_name = PyUnicode_FromString("BatchRecords");
-    PyObject *res_list = PyList_New(0);
-    br_instance =
-        PyObject_CallMethodObjArgs(br_module, obj_name, res_list, NULL);
-
-    Py_DECREF(obj_name);
-    Py_DECREF(res_list);
-
-    if (!br_instance) {
-        as_error_update(&err, AEROSPIKE_ERR_CLIENT,
-                        "Unable to instance BatchRecords");
+    if (get_record_options(&err, py_policy_batch, &data.record_options) !=
+        AEROSPIKE_OK) {
         goto CLEANUP4;
     }
 
-    // Create and initialize callback user-data
-    LocalData data;
-    // Used to decode record bins
-    data.client = self;
-    // Used to append BatchRecord instances to the BatchRecords object in this function
-    data.py_results = PyObject_GetAttrString(br_instance, "batch_records");
-    // Used to create a new BatchRecord instance in the callback function
-    data.batch_records_module = br_module;
-    data.func_name = PyUnicode_FromString("BatchRecord");
-    data.checking_if_records_exist = false;
-
     Py_ssize_t bin_count = 0;
     const char **filter_bins = NULL;
 
@@ -228,7 +245,13 @@ PyObject *AerospikeClient_BatchRead(AerospikeClient *self, PyObject *args,
         }
 
         bin_count = PyList_Size(py_bins);
-        if (bin_count == 0) {
+        if (bin_count == 0 && numpy_output) {
+            as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                            "bins can't be an empty list when output is "
+                            "\"numpy\"");
+            goto CLEANUP4;
+        }
+        else if (bin_count == 0) {
             data.checking_if_records_exist = true;
         }
         else {
@@ -249,23 +272,37 @@ PyObject *AerospikeClient_BatchRead(AerospikeClient *self, PyObject *args,
         }
     }
 
+    bool (*callback)(const as_batch_result *, uint32_t, void *) =
+        numpy_output ? batch_read_columns_cb : batch_read_cb;
+
     Py_BEGIN_ALLOW_THREADS
 
     if (py_bins == NULL) {
-        aerospike_batch_get(self->as, &err, policy_batch_p, &batch,
-                            batch_read_cb, &data);
+        aerospike_batch_get(self->as, &err, policy_batch_p, &batch, callback,
+                            &data);
     }
     else if (bin_count == 0) {
         aerospike_batch_exists(self->as, &err, policy_batch_p, &batch,
-                               batch_read_cb, &data);
+                               callback, &data);
     }
     else {
         aerospike_batch_get_bins(self->as, &err, policy_batch_p, &batch,
-                                 filter_bins, bin_count, batch_read_cb, &data);
+                                 filter_bins, bin_count, callback, &data);
     }
 
     Py_END_ALLOW_THREADS
 
+    if (numpy_output) {
+        // There is no BatchRecords to set the result on, so errors are raised
+        if (columns.err.code != AEROSPIKE_OK) {
+            as_error_copy(&err, &columns.err);
+        }
+        if (err.code == AEROSPIKE_OK) {
+            br_instance = column_builder_to_pyobject(&columns, &err);
+        }
+        goto CLEANUP5;
+    }
+
     PyObject *py_br_res = PyLong_FromLong((long)err.code);
     PyObject_SetAttrString(br_instance, FIELD_NAME_BATCH_RESULT, py_br_res);
     Py_DECREF(py_br_res);
@@ -278,10 +315,10 @@ CLEANUP5:
 
 CLEANUP4:
 
-    Py_DECREF(br_module);
-
-    Py_DECREF(data.py_results);
-    Py_DECREF(data.func_name);
+    Py_XDECREF(data.py_results);
+    if (columns_initialized) {
+        column_builder_destroy(&columns);
+    }
 
 CLEANUP3:
 
@@ -582,17 +582,30 @@ PyObject *AerospikeClient_BatchWrite(AerospikeClient *self, PyObject *args,
 {
     PyObject *py_policy = NULL;
     PyObject *py_batch_recs = NULL;
+    PyObject *py_max_batch_size = NULL;
+    PyObject *py_max_inflight_batches = NULL;
 
     as_error err;
     as_error_init(&err);
 
-    static char *kwlist[] = {"batch_records", "policy_batch", NULL};
+    static char *kwlist[] = {"batch_records", "policy_batch", "max_batch_size",
+                             "max_inflight_batches", NULL};
 
-    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|O:batch_write", kwlist,
-                                    &py_batch_recs, &py_policy) == false) {
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|O$OO:batch_write", kwlist,
+                                    &py_batch_recs, &py_policy,
+                                    &py_max_batch_size,
+                                    &py_max_inflight_batches) == false) {
         return NULL;
     }
 
+    if ((py_max_batch_size && py_max_batch_size != Py_None) ||
+        (py_max_inflight_batches && py_max_inflight_batches != Py_None)) {
+        // Each chunk is sent by calling this method again without these options
+        return call_helper_with_source("aerospike_helpers.batch.chunks",
+                                       "BatchWriteChunks", (PyObject *)self,
+                                       args, kwds);
+    }
+
     if (py_policy == Py_None) {
         // Let C client choose the client config policy to use
         py_policy = NULL;
@@ -96,7 +96,7 @@ extern PyObject *AerospikeClient_Exists_Invoke(AerospikeClient *self,
         PyObject *py_result_key = NULL;
         PyObject *py_result_meta = NULL;
 
-        key_to_pyobject(&err, &key, &py_result_key);
+        key_to_pyobject(self, &err, &key, &py_result_key);
         metadata_to_pyobject(&err, rec, &py_result_meta);
 
         py_result = PyTuple_New(2);
@@ -109,7 +109,7 @@ extern PyObject *AerospikeClient_Exists_Invoke(AerospikeClient *self,
         PyObject *py_result_key = NULL;
         PyObject *py_result_meta = Py_None;
 
-        key_to_pyobject(&err, &key, &py_result_key);
+        key_to_pyobject(self, &err, &key, &py_result_key);
 
         py_result = PyTuple_New(2);
         PyTuple_SetItem(py_result, 0, py_result_key);
@@ -0,0 +1,166 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+#include <stdbool.h>
+#include <string.h>
+
+#include <aerospike/aerospike.h>
+#include <aerospike/as_config.h>
+#include <aerospike/as_error.h>
+#include <aerospike/as_log_macros.h>
+#include <aerospike/as_vector.h>
+
+#include "auto_batch.h"
+#include "fork.h"
+#include "future.h"
+
+// Protected by the GIL
+static as_vector fork_safe_clients;
+static bool fork_safe_clients_initialized = false;
+
+void track_fork_safe_client(AerospikeClient *client)
+{
+    if (!fork_safe_clients_initialized) {
+        as_vector_init(&fork_safe_clients, sizeof(AerospikeClient *), 8);
+        fork_safe_clients_initialized = true;
+    }
+    // Each client is rebuilt at most once after a fork
+    as_vector_append_unique(&fork_safe_clients, &client);
+}
+
+void untrack_fork_safe_client(AerospikeClient *client)
+{
+    if (!fork_safe_clients_initialized) {
+        return;
+    }
+    for (uint32_t i = 0; i < fork_safe_clients.size; i++) {
+        AerospikeClient **tracked = as_vector_get(&fork_safe_clients, i);
+        if (*tracked == client) {
+            as_vector_remove(&fork_safe_clients, i);
+            return;
+        }
+    }
+}
+
+static void rebuild_client(AerospikeClient *client)
+{
+    if (!client->as) {
+        return;
+    }
+
+    // Only the thread that called fork() exists in the child. The cluster's
+    // tend thread is gone, its locks may be held and its sockets are shared
+    // with the parent, so the parent's aerospike object is abandoned without
+    // closing or destroying it. The new one takes over its config.
+    bool was_connected = client->is_conn_16;
+    as_config config;
+    memcpy(&config, &client->as->config, sizeof(as_config));
+    client->as = aerospike_new(&config);
+    client->is_conn_16 = false;
+    client->has_connected = false;
+
+    if (client->auto_batch) {
+        auto_batch_reset_after_fork(client->auto_batch);
+    }
+    reset_futures_after_fork(client);
+
+    if (!was_connected) {
+        return;
+    }
+
+    // With shm enabled, the child attaches to the parent's shared memory
+    // segment and reads the partition map from it instead of tending the
+    // cluster from scratch.
+    as_error err;
+    as_error_init(&err);
+    Py_BEGIN_ALLOW_THREADS
+    aerospike_connect(client->as, &err);
+    Py_END_ALLOW_THREADS
+
+    if (err.code != AEROSPIKE_OK) {
+        // The client can still be connected later with connect()
+        as_log_warn("Failed to reconnect client after fork: %s", err.message);
+        return;
+    }
+    client->is_conn_16 = true;
+    client->has_connected = true;
+}
+
+static PyObject *rebuild_clients_after_fork(PyObject *self, PyObject *unused)
+{
+    if (fork_safe_clients_initialized) {
+        for (uint32_t i = 0; i < fork_safe_clients.size; i++) {
+            AerospikeClient **client = as_vector_get(&fork_safe_clients, i);
+            rebuild_client(*client);
+        }
+    }
+
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef rebuild_clients_after_fork_def = {
+    "_rebuild_clients_after_fork", (PyCFunction)rebuild_clients_after_fork,
+    METH_NOARGS, NULL};
+
+int register_fork_handler(void)
+{
+    PyObject *py_os = PyImport_ImportModule("os");
+    if (!py_os) {
+        return -1;
+    }
+
+    PyObject *py_register_at_fork =
+        PyObject_GetAttrString(py_os, "register_at_fork");
+    Py_DECREF(py_os);
+    if (!py_register_at_fork) {
+        // Not available on platforms without fork()
+        PyErr_Clear();
+        return 0;
+    }
+
+    PyObject *py_handler =
+        PyCFunction_New(&rebuild_clients_after_fork_def, NULL);
+    if (!py_handler) {
+        Py_DECREF(py_register_at_fork);
+        return -1;
+    }
+
+    PyObject *py_kwargs = Py_BuildValue("{s:O}", "after_in_child", py_handler);
+    Py_DECREF(py_handler);
+    if (!py_kwargs) {
+        Py_DECREF(py_register_at_fork);
+        return -1;
+    }
+
+    PyObject *py_empty_args = PyTuple_New(0);
+    if (!py_empty_args) {
+        Py_DECREF(py_kwargs);
+        Py_DECREF(py_register_at_fork);
+        return -1;
+    }
+
+    PyObject *py_result =
+        PyObject_Call(py_register_at_fork, py_empty_args, py_kwargs);
+    Py_DECREF(py_empty_args);
+    Py_DECREF(py_kwargs);
+    Py_DECREF(py_register_at_fork);
+    if (!py_result) {
+        return -1;
+    }
+    Py_DECREF(py_result);
+    return 0;
+}
@@ -0,0 +1,51 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+
+#include <Python.h>
+
+#include "client.h"
+#include "future.h"
+
+PyObject *AerospikeClient_BatchRead_Future(AerospikeClient *self,
+                                           PyObject *args, PyObject *kwds)
+{
+    return submit_future(self, (PyObject *)self, "batch_read", args, kwds);
+}
+
+PyObject *AerospikeClient_BatchWrite_Future(AerospikeClient *self,
+                                            PyObject *args, PyObject *kwds)
+{
+    return submit_future(self, (PyObject *)self, "batch_write", args, kwds);
+}
+
+PyObject *AerospikeClient_Batch_Operate_Future(AerospikeClient *self,
+                                               PyObject *args, PyObject *kwds)
+{
+    return submit_future(self, (PyObject *)self, "batch_operate", args, kwds);
+}
+
+PyObject *AerospikeClient_Batch_Apply_Future(AerospikeClient *self,
+                                             PyObject *args, PyObject *kwds)
+{
+    return submit_future(self, (PyObject *)self, "batch_apply", args, kwds);
+}
+
+PyObject *AerospikeClient_Batch_Remove_Future(AerospikeClient *self,
+                                              PyObject *args, PyObject *kwds)
+{
+    return submit_future(self, (PyObject *)self, "batch_remove", args, kwds);
+}
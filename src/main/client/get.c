@@ -22,6 +22,7 @@
 #include <aerospike/as_error.h>
 #include <aerospike/as_record.h>
 
+#include "auto_batch.h"
 #include "client.h"
 #include "conversions.h"
 #include "exceptions.h"
@@ -59,6 +60,7 @@ PyObject *AerospikeClient_Get_Invoke(AerospikeClient *self, PyObject *py_key,
     // Initialised flags
     bool key_initialised = false;
     bool record_initialised = false;
+    int record_options = 0;
 
     // Initialize error
     as_error_init(&err);
@@ -82,37 +84,57 @@ PyObject *AerospikeClient_Get_Invoke(AerospikeClient *self, PyObject *py_key,
     // Key is successfully initialised.
     key_initialised = true;
 
-    // Convert python policy object to as_policy_exists
-    pyobject_to_policy_read(self, &err, py_policy, &read_policy, &read_policy_p,
-                            &self->as->config.policies.read, &exp_list_p);
-    if (err.code != AEROSPIKE_OK) {
-        goto CLEANUP;
+    if (self->auto_batch && (!py_policy || py_policy == Py_None)) {
+        // Sent in a batch read together with the concurrent reads of other
+        // threads
+        read_policy_p = &self->as->config.policies.read;
+        if (auto_batch_read(self, &err, &key, NULL, &py_rec) != AEROSPIKE_OK) {
+            goto CLEANUP;
+        }
     }
+    else {
+        // Convert python policy object to as_policy_exists
+        pyobject_to_policy_read(self, &err, py_policy, &read_policy,
+                                &read_policy_p,
+                                &self->as->config.policies.read, &exp_list_p);
+        if (err.code != AEROSPIKE_OK) {
+            goto CLEANUP;
+        }
 
-    // Invoke operation
-    Py_BEGIN_ALLOW_THREADS
-    aerospike_key_get(self->as, &err, read_policy_p, &key, &rec);
-    Py_END_ALLOW_THREADS
-    if (err.code == AEROSPIKE_OK) {
-        record_initialised = true;
-
-        if (record_to_pyobject(self, &err, rec, &key, &py_rec) !=
+        if (get_record_options(&err, py_policy, &record_options) !=
             AEROSPIKE_OK) {
             goto CLEANUP;
         }
-        if (!read_policy_p ||
-            (read_policy_p && read_policy_p->key == AS_POLICY_KEY_DIGEST)) {
-            // This is a special case.
-            // C-client returns NULL key, so to the user
-            // response will be (<ns>, <set>, None, <digest>)
-            // Using the same input key, just making primary key part to be None
-            // Only in case of POLICY_KEY_DIGEST or no policy specified
-            PyObject *p_key = PyTuple_GetItem(py_rec, 0);
-            Py_INCREF(Py_None);
-            PyTuple_SetItem(p_key, 2, Py_None);
+
+        // Invoke operation
+        Py_BEGIN_ALLOW_THREADS
+        aerospike_key_get(self->as, &err, read_policy_p, &key, &rec);
+        Py_END_ALLOW_THREADS
+        if (err.code != AEROSPIKE_OK) {
+            goto CLEANUP;
+        }
+        record_initialised = true;
+
+        record_to_pyobject_with_options(self, &err, rec, &key,
+                                        record_options, &py_rec);
+        if (err.code != AEROSPIKE_OK) {
+            goto CLEANUP;
         }
     }
 
+    if (!(record_options & RECORD_NO_KEY) &&
+        (!read_policy_p ||
+         (read_policy_p && read_policy_p->key == AS_POLICY_KEY_DIGEST))) {
+        // This is a special case.
+        // C-client returns NULL key, so to the user
+        // response will be (<ns>, <set>, None, <digest>)
+        // Using the same input key, just making primary key part to be None
+        // Only in case of POLICY_KEY_DIGEST or no policy specified
+        PyObject *p_key = PyTuple_GetItem(py_rec, 0);
+        Py_INCREF(Py_None);
+        PyTuple_SetItem(p_key, 2, Py_None);
+    }
+
 CLEANUP:
 
     if (exp_list_p) {
@@ -37,6 +37,7 @@
 #include "hll_operations.h"
 #include "pythoncapi_compat.h"
 #include "expression_operations.h"
+#include "prepared_operations.h"
 
 #include <aerospike/as_double.h>
 #include <aerospike/as_integer.h>
@@ -894,16 +895,19 @@ CLEANUP:
  * @param err                   The as_error to be populated by the function
  *                              with the encountered error if any.
  * @param key                   The C client's as_key that identifies the record.
- * @param py_list               The list containing op, bin and value.
+ * @param py_list               The list containing op, bin and value, or
+ *                              prepared operations.
  * @param py_meta               The metadata for the operation.
  * @param py_policy      		Python dict used to populate the operate_policy or map_policy.
+ * @param py_values             The values of the placeholders of prepared
+ *                              operations.
  *******************************************************************************************************
  */
-static PyObject *AerospikeClient_Operate_Invoke(AerospikeClient *self,
-                                                as_error *err, as_key *key,
-                                                PyObject *py_list,
-                                                PyObject *py_meta,
-                                                PyObject *py_policy)
+static PyObject *
+AerospikeClient_Operate_Invoke(AerospikeClient *self, as_error *err,
+                               as_key *key, PyObject *py_list,
+                               PyObject *py_meta, PyObject *py_policy,
+                               PyObject *py_values)
 {
     int i = 0;
     long operation;
@@ -919,10 +923,24 @@ static PyObject *AerospikeClient_Operate_Invoke(AerospikeClient *self,
 
     as_vector *unicodeStrVector = as_vector_create(sizeof(char *), 128);
 
+    // Blobs are written from the buffers of the values
+    as_static_pool static_pool;
+    memset(&static_pool, 0, sizeof(static_pool));
+    static_pool.pin_buffers = true;
+
+    AerospikePreparedOperations *prepared = NULL;
+    if (AerospikePreparedOperations_Check(py_list)) {
+        prepared = (AerospikePreparedOperations *)py_list;
+    }
+
     as_operations ops;
-    Py_ssize_t size = PyList_Size(py_list);
+    Py_ssize_t size = prepared ? prepared->n_slots : PyList_Size(py_list);
     as_operations_inita(&ops, size);
 
+    // Operations that are shared with the prepared operations
+    as_vector borrowed;
+    as_vector_inita(&borrowed, sizeof(uint16_t), size ? size : 1);
+
     if (py_policy) {
         if (pyobject_to_policy_operate(self, err, py_policy, &operate_policy,
                                        &operate_policy_p,
@@ -932,8 +950,6 @@ static PyObject *AerospikeClient_Operate_Invoke(AerospikeClient *self,
         }
     }
 
-    as_static_pool static_pool;
-    memset(&static_pool, 0, sizeof(static_pool));
     CHECK_CONNECTED(err);
 
     if (check_and_set_meta(py_meta, &ops.ttl, &ops.gen, err,
@@ -941,13 +957,22 @@ static PyObject *AerospikeClient_Operate_Invoke(AerospikeClient *self,
         goto CLEANUP;
     }
 
-    for (i = 0; i < size; i++) {
-        PyObject *py_val = PyList_GetItem(py_list, i);
+    if (prepared) {
+        if (prepared_operations_add(self, err, prepared, py_values,
+                                    unicodeStrVector, &static_pool, &ops,
+                                    &borrowed) != AEROSPIKE_OK) {
+            goto CLEANUP;
+        }
+    }
+    else {
+        for (i = 0; i < size; i++) {
+            PyObject *py_val = PyList_GetItem(py_list, i);
 
-        if (PyDict_Check(py_val)) {
-            if (add_op(self, err, py_val, unicodeStrVector, &static_pool, &ops,
-                       &operation, &return_type) != AEROSPIKE_OK) {
-                goto CLEANUP;
+            if (PyDict_Check(py_val)) {
+                if (add_op(self, err, py_val, unicodeStrVector, &static_pool,
+                           &ops, &operation, &return_type) != AEROSPIKE_OK) {
+                    goto CLEANUP;
+                }
             }
         }
     }
@@ -988,7 +1013,10 @@ CLEANUP:
         as_key_destroy(key);
     }
 
+    prepared_operations_release(&ops, &borrowed);
     as_operations_destroy(&ops);
+    as_vector_destroy(&borrowed);
+    POOL_RELEASE_BUFFERS(&static_pool);
 
     if (err->code != AEROSPIKE_OK) {
         raise_exception(err);
@@ -1022,12 +1050,13 @@ PyObject *AerospikeClient_Operate(AerospikeClient *self, PyObject *args,
     BASE_VARIABLES
     PyObject *py_list = NULL;
     PyObject *py_bin = NULL;
+    PyObject *py_values = NULL;
 
     // Python Function Keyword Arguments
-    static char *kwlist[] = {"key", "list", "meta", "policy", NULL};
-    if (PyArg_ParseTupleAndKeywords(args, kwds, "OO|OO:operate", kwlist,
-                                    &py_key, &py_list, &py_meta,
-                                    &py_policy) == false) {
+    static char *kwlist[] = {"key", "list", "meta", "policy", "values", NULL};
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "OO|OOO:operate", kwlist,
+                                    &py_key, &py_list, &py_meta, &py_policy,
+                                    &py_values) == false) {
         return NULL;
     }
 
@@ -1037,9 +1066,17 @@ PyObject *AerospikeClient_Operate(AerospikeClient *self, PyObject *args,
         goto CLEANUP;
     }
 
-    if (py_list && PyList_Check(py_list)) {
+    if (py_list && AerospikePreparedOperations_Check(py_list)) {
+        py_result = AerospikeClient_Operate_Invoke(
+            self, &err, &key, py_list, py_meta, py_policy, py_values);
+    }
+    else if (py_values && py_values != Py_None) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                        "values can only be passed with prepared operations");
+    }
+    else if (py_list && PyList_Check(py_list)) {
         py_result = AerospikeClient_Operate_Invoke(self, &err, &key, py_list,
-                                                   py_meta, py_policy);
+                                                   py_meta, py_policy, NULL);
     }
     else {
         as_error_update(&err, AEROSPIKE_ERR_PARAM,
@@ -1052,6 +1089,42 @@ CLEANUP:
     return py_result;
 }
 
+/**
+ *******************************************************************************************************
+ * Builds a list of operations once, so it can be passed to operate() with
+ * different values on each call.
+ *
+ * @param self                  AerospikeClient object
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns an aerospike.PreparedOperations object.
+ *******************************************************************************************************
+ */
+PyObject *AerospikeClient_Prepare_Operations(AerospikeClient *self,
+                                             PyObject *args, PyObject *kwds)
+{
+    PyObject *py_list = NULL;
+
+    as_error err;
+    as_error_init(&err);
+
+    static char *kwlist[] = {"list", NULL};
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "O:prepare_operations", kwlist,
+                                    &py_list) == false) {
+        return NULL;
+    }
+
+    AerospikePreparedOperations *prepared =
+        AerospikePreparedOperations_New(self, &err, py_list);
+    if (!prepared) {
+        raise_exception(&err);
+        return NULL;
+    }
+    return (PyObject *)prepared;
+}
+
 /**
  *******************************************************************************************************
  * This function invokes csdk's API's.
@@ -1081,8 +1154,10 @@ AerospikeClient_OperateOrdered_Invoke(AerospikeClient *self, as_error *err,
 
     as_vector *unicodeStrVector = as_vector_create(sizeof(char *), 128);
 
+    // Blobs are written from the buffers of the values
     as_static_pool static_pool;
     memset(&static_pool, 0, sizeof(static_pool));
+    static_pool.pin_buffers = true;
 
     as_operations ops;
     Py_ssize_t ops_list_size = PyList_Size(py_list);
@@ -1146,7 +1221,7 @@ AerospikeClient_OperateOrdered_Invoke(AerospikeClient *self, as_error *err,
     operation_succeeded = true;
     if (rec) {
         /* Build the return tuple: (key, meta, bins) */
-        key_to_pyobject(err, key, &py_return_key);
+        key_to_pyobject(self, err, key, &py_return_key);
         if (err->code != AEROSPIKE_OK || !py_return_key) {
             goto CLEANUP;
         }
@@ -1200,6 +1275,7 @@ CLEANUP:
     }
 
     as_operations_destroy(&ops);
+    POOL_RELEASE_BUFFERS(&static_pool);
 
     if (err->code != AEROSPIKE_OK) {
         raise_exception(err);
@@ -1315,7 +1391,7 @@ PyObject *AerospikeClient_Append(AerospikeClient *self, PyObject *args,
     PyObject *py_list = NULL;
     py_list = create_pylist(py_list, AS_OPERATOR_APPEND, py_bin, py_append_str);
     py_result = AerospikeClient_Operate_Invoke(self, &err, &key, py_list,
-                                               py_meta, py_policy);
+                                               py_meta, py_policy, NULL);
 
     DECREF_LIST_AND_RESULT();
 
@@ -1363,7 +1439,7 @@ PyObject *AerospikeClient_Prepend(AerospikeClient *self, PyObject *args,
     py_list =
         create_pylist(py_list, AS_OPERATOR_PREPEND, py_bin, py_prepend_str);
     py_result = AerospikeClient_Operate_Invoke(self, &err, &key, py_list,
-                                               py_meta, py_policy);
+                                               py_meta, py_policy, NULL);
 
     DECREF_LIST_AND_RESULT();
 
@@ -1410,7 +1486,7 @@ PyObject *AerospikeClient_Increment(AerospikeClient *self, PyObject *args,
     PyObject *py_list = NULL;
     py_list = create_pylist(py_list, AS_OPERATOR_INCR, py_bin, py_offset_value);
     py_result = AerospikeClient_Operate_Invoke(self, &err, &key, py_list,
-                                               py_meta, py_policy);
+                                               py_meta, py_policy, NULL);
 
     DECREF_LIST_AND_RESULT();
 
@@ -1461,7 +1537,7 @@ PyObject *AerospikeClient_Touch(AerospikeClient *self, PyObject *args,
     PyObject *py_list = NULL;
     py_list = create_pylist(py_list, AS_OPERATOR_TOUCH, NULL, py_touchvalue);
     py_result = AerospikeClient_Operate_Invoke(self, &err, &key, py_list,
-                                               py_meta, py_policy);
+                                               py_meta, py_policy, NULL);
 
     DECREF_LIST_AND_RESULT();
 
@@ -24,6 +24,7 @@
 
 #include "client.h"
 #include "conversions.h"
+#include "schema.h"
 #include "exceptions.h"
 #include "policy.h"
 
@@ -57,12 +58,17 @@ PyObject *AerospikeClient_Put_Invoke(AerospikeClient *self, PyObject *py_key,
     // For converting expressions.
     as_exp *exp_list_p = NULL;
 
+    // A serializer called while converting the bins may replace the schema
+    PyObject *py_schema = NULL;
+
     // Initialisation flags
     bool key_initialised = false;
     bool record_initialised = false;
 
+    // Blobs are written from the buffers of the bin values
     as_static_pool static_pool;
     memset(&static_pool, 0, sizeof(static_pool));
+    static_pool.pin_buffers = true;
 
     // Initialize error
     as_error_init(&err);
@@ -87,8 +93,10 @@ PyObject *AerospikeClient_Put_Invoke(AerospikeClient *self, PyObject *py_key,
     key_initialised = true;
 
     // Convert python bins and metadata objects to as_record
+    py_schema = get_set_schema(self, key.ns, key.set);
+    Py_XINCREF(py_schema);
     as_record_init_from_pyobject(self, &err, py_bins, py_meta, &rec,
-                                 serializer_option, &static_pool);
+                                 serializer_option, &static_pool, py_schema);
     if (err.code != AEROSPIKE_OK) {
         goto CLEANUP;
     }
@@ -111,6 +119,7 @@ PyObject *AerospikeClient_Put_Invoke(AerospikeClient *self, PyObject *py_key,
 
 CLEANUP:
     POOL_DESTROY(&static_pool);
+    Py_XDECREF(py_schema);
 
     if (exp_list_p) {
         as_exp_destroy(exp_list_p);
@@ -61,6 +61,55 @@ AerospikeQuery *AerospikeClient_Query(AerospikeClient *self, PyObject *args,
     return query;
 }
 
+/**
+ *******************************************************************************************************
+ * Create a Query object from the bytes returned by Query._to_bytes().
+ * Used to run a share of a query in another process.
+ *
+ * @param self                  AerospikeClient object
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns a new Query object on success.
+ * In case of error,appropriate exceptions will be raised.
+ *******************************************************************************************************
+ */
+AerospikeQuery *AerospikeClient_Query_From_Bytes(AerospikeClient *self,
+                                                 PyObject *args, PyObject *kwds)
+{
+    Py_buffer py_buffer;
+    static char *kwlist[] = {"data", NULL};
+
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "y*:_query_from_bytes", kwlist,
+                                    &py_buffer) == false) {
+        return NULL;
+    }
+
+    AerospikeQuery *query = AerospikeQuery_Type_New(&AerospikeQuery_Type, self);
+    if (!query) {
+        PyBuffer_Release(&py_buffer);
+        return NULL;
+    }
+
+    bool deserialized = as_query_from_bytes(
+        &query->query, (uint8_t *)py_buffer.buf, (uint32_t)py_buffer.len);
+    PyBuffer_Release(&py_buffer);
+    if (!deserialized) {
+        // Safe to destroy when the query is deallocated
+        memset(&query->query, 0, sizeof(as_query));
+        Py_DECREF(query);
+
+        as_error err;
+        as_error_init(&err);
+        as_error_update(&err, AEROSPIKE_ERR_PARAM, "Invalid serialized query");
+        raise_exception(&err);
+        return NULL;
+    }
+
+    return query;
+}
+
 static int query_where_add(as_query **query, as_predicate_type predicate,
                            as_index_datatype in_datatype, PyObject *py_bin,
                            PyObject *py_val1, PyObject *py_val2, int index_type,
@@ -0,0 +1,224 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+#include <stdbool.h>
+#include <string.h>
+
+#include <aerospike/as_bin.h>
+#include <aerospike/as_error.h>
+#include <aerospike/as_key.h>
+#include <aerospike/as_vector.h>
+
+#include "client.h"
+#include "exceptions.h"
+#include "schema.h"
+
+static const struct {
+    PyTypeObject *type;
+    schema_bin_type bin_type;
+} schema_types[] = {
+    {&PyLong_Type, SCHEMA_BIN_INT},
+    {&PyFloat_Type, SCHEMA_BIN_FLOAT},
+    {&PyUnicode_Type, SCHEMA_BIN_STR},
+    {&PyBytes_Type, SCHEMA_BIN_BYTES},
+    {&PyByteArray_Type, SCHEMA_BIN_BYTEARRAY},
+    {&PyList_Type, SCHEMA_BIN_LIST},
+    {&PyDict_Type, SCHEMA_BIN_DICT},
+};
+
+PyObject *get_set_schema(AerospikeClient *self, const char *ns,
+                         const char *set)
+{
+    if (!self->schemas) {
+        return NULL;
+    }
+    for (uint32_t i = 0; i < self->schemas->size; i++) {
+        set_schema *schema = as_vector_get(self->schemas, i);
+        if (!strcmp(schema->ns, ns) && !strcmp(schema->set, set)) {
+            return schema->py_bins;
+        }
+    }
+    return NULL;
+}
+
+void destroy_set_schemas(AerospikeClient *self)
+{
+    if (!self->schemas) {
+        return;
+    }
+    for (uint32_t i = 0; i < self->schemas->size; i++) {
+        set_schema *schema = as_vector_get(self->schemas, i);
+        Py_XDECREF(schema->py_bins);
+    }
+    as_vector_destroy(self->schemas);
+    self->schemas = NULL;
+}
+
+// Converts {bin name: type} to {bin name: schema_bin_type}
+static PyObject *convert_schema_bins(as_error *err, PyObject *py_schema)
+{
+    if (!PyDict_Check(py_schema)) {
+        as_error_update(err, AEROSPIKE_ERR_PARAM,
+                        "schema must be a dict or None");
+        return NULL;
+    }
+
+    PyObject *py_bins = PyDict_New();
+    if (!py_bins) {
+        as_error_update(err, AEROSPIKE_ERR_CLIENT, "Unable to create schema");
+        return NULL;
+    }
+
+    PyObject *py_name = NULL;
+    PyObject *py_type = NULL;
+    Py_ssize_t pos = 0;
+    while (PyDict_Next(py_schema, &pos, &py_name, &py_type)) {
+        Py_ssize_t name_len = 0;
+        if (!PyUnicode_Check(py_name) ||
+            !PyUnicode_AsUTF8AndSize(py_name, &name_len) ||
+            name_len > AS_BIN_NAME_MAX_LEN) {
+            PyErr_Clear();
+            as_error_update(err, AEROSPIKE_ERR_PARAM,
+                            "Bin names of a schema must be strings of at most "
+                            "%d characters",
+                            AS_BIN_NAME_MAX_LEN);
+            goto ERROR;
+        }
+
+        PyObject *py_bin_type = NULL;
+        for (size_t i = 0; i < sizeof(schema_types) / sizeof(schema_types[0]);
+             i++) {
+            if (py_type == (PyObject *)schema_types[i].type) {
+                py_bin_type = PyLong_FromLong(schema_types[i].bin_type);
+                break;
+            }
+        }
+        if (!py_bin_type) {
+            as_error_update(err, AEROSPIKE_ERR_PARAM,
+                            "Bin types of a schema must be one of int, float, "
+                            "str, bytes, bytearray, list or dict");
+            goto ERROR;
+        }
+        int rc = PyDict_SetItem(py_bins, py_name, py_bin_type);
+        Py_DECREF(py_bin_type);
+        if (rc == -1) {
+            PyErr_Clear();
+            as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                            "Unable to create schema");
+            goto ERROR;
+        }
+    }
+    return py_bins;
+
+ERROR:
+    Py_DECREF(py_bins);
+    return NULL;
+}
+
+/**
+ *******************************************************************************************************
+ * Register the types of the bins of the records of a set.
+ *
+ * @param self                  AerospikeClient object
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns None. In case of error, appropriate exceptions will be raised.
+ *******************************************************************************************************
+ */
+PyObject *AerospikeClient_Register_Schema(AerospikeClient *self,
+                                          PyObject *args, PyObject *kwds)
+{
+    PyObject *py_ns = NULL;
+    PyObject *py_set = NULL;
+    PyObject *py_schema = NULL;
+    PyObject *py_bins = NULL;
+    const char *ns = NULL;
+    const char *set = NULL;
+    Py_ssize_t ns_len = 0;
+    Py_ssize_t set_len = 0;
+
+    as_error err;
+    as_error_init(&err);
+
+    static char *kwlist[] = {"namespace", "set", "schema", NULL};
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "OOO:register_schema", kwlist,
+                                    &py_ns, &py_set, &py_schema) == false) {
+        return NULL;
+    }
+
+    if (!PyUnicode_Check(py_ns) ||
+        !(ns = PyUnicode_AsUTF8AndSize(py_ns, &ns_len)) ||
+        ns_len >= AS_NAMESPACE_MAX_SIZE) {
+        PyErr_Clear();
+        as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                        "Namespace should be a string of at most %d "
+                        "characters",
+                        AS_NAMESPACE_MAX_SIZE - 1);
+        goto CLEANUP;
+    }
+    if (!PyUnicode_Check(py_set) ||
+        !(set = PyUnicode_AsUTF8AndSize(py_set, &set_len)) ||
+        set_len >= AS_SET_MAX_SIZE) {
+        PyErr_Clear();
+        as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                        "Set should be a string of at most %d characters",
+                        AS_SET_MAX_SIZE - 1);
+        goto CLEANUP;
+    }
+
+    if (py_schema != Py_None) {
+        py_bins = convert_schema_bins(&err, py_schema);
+        if (!py_bins) {
+            goto CLEANUP;
+        }
+    }
+
+    // Replace or remove the schema of the set
+    if (self->schemas) {
+        for (uint32_t i = 0; i < self->schemas->size; i++) {
+            set_schema *schema = as_vector_get(self->schemas, i);
+            if (!strcmp(schema->ns, ns) && !strcmp(schema->set, set)) {
+                Py_DECREF(schema->py_bins);
+                as_vector_remove(self->schemas, i);
+                break;
+            }
+        }
+    }
+
+    if (py_bins) {
+        if (!self->schemas) {
+            self->schemas = as_vector_create(sizeof(set_schema), 4);
+        }
+        set_schema *schema = as_vector_reserve(self->schemas);
+        strncpy(schema->ns, ns, AS_NAMESPACE_MAX_SIZE - 1);
+        schema->ns[AS_NAMESPACE_MAX_SIZE - 1] = '\0';
+        strncpy(schema->set, set, AS_SET_MAX_SIZE - 1);
+        schema->set[AS_SET_MAX_SIZE - 1] = '\0';
+        // Owned by the schema
+        schema->py_bins = py_bins;
+    }
+
+CLEANUP:
+    if (err.code != AEROSPIKE_OK) {
+        raise_exception(&err);
+        return NULL;
+    }
+
+    Py_RETURN_NONE;
+}
@@ -62,6 +62,55 @@ AerospikeScan *AerospikeClient_Scan(AerospikeClient *self, PyObject *args,
     return scan;
 }
 
+/**
+ *******************************************************************************************************
+ * Create a Scan object from the bytes returned by Scan._to_bytes().
+ * Used to run a share of a scan in another process.
+ *
+ * @param self                  AerospikeClient object
+ * @param args                  The args is a tuple object containing an argument
+ *                              list passed from Python to a C function
+ * @param kwds                  Dictionary of keywords
+ *
+ * Returns a new Scan object on success.
+ * In case of error,appropriate exceptions will be raised.
+ *******************************************************************************************************
+ */
+AerospikeScan *AerospikeClient_Scan_From_Bytes(AerospikeClient *self,
+                                               PyObject *args, PyObject *kwds)
+{
+    Py_buffer py_buffer;
+    static char *kwlist[] = {"data", NULL};
+
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "y*:_scan_from_bytes", kwlist,
+                                    &py_buffer) == false) {
+        return NULL;
+    }
+
+    AerospikeScan *scan = AerospikeScan_Type_New(&AerospikeScan_Type, self);
+    if (!scan) {
+        PyBuffer_Release(&py_buffer);
+        return NULL;
+    }
+
+    bool deserialized = as_scan_from_bytes(
+        &scan->scan, (uint8_t *)py_buffer.buf, (uint32_t)py_buffer.len);
+    PyBuffer_Release(&py_buffer);
+    if (!deserialized) {
+        // Safe to destroy when the scan is deallocated
+        memset(&scan->scan, 0, sizeof(as_scan));
+        Py_DECREF(scan);
+
+        as_error err;
+        as_error_init(&err);
+        as_error_update(&err, AEROSPIKE_ERR_PARAM, "Invalid serialized scan");
+        raise_exception(&err);
+        return NULL;
+    }
+
+    return scan;
+}
+
 /**
  * Scans a set in the Aerospike DB and applies UDF on it.
  *
@@ -22,6 +22,7 @@
 #include <aerospike/as_error.h>
 #include <aerospike/as_record.h>
 
+#include "auto_batch.h"
 #include "client.h"
 #include "conversions.h"
 #include "exceptions.h"
@@ -61,6 +62,7 @@ PyObject *AerospikeClient_Select_Invoke(AerospikeClient *self, PyObject *py_key,
 
     // Initialisation flags
     bool key_initialised = false;
+    int record_options = 0;
 
     // Initialize error
     as_error_init(&err);
@@ -142,6 +144,13 @@ PyObject *AerospikeClient_Select_Invoke(AerospikeClient *self, PyObject *py_key,
         goto CLEANUP;
     }
 
+    if (self->auto_batch && (!py_policy || py_policy == Py_None) && bins[0]) {
+        // Sent in a batch read together with the concurrent reads of other
+        // threads
+        auto_batch_read(self, &err, &key, (const char **)bins, &py_rec);
+        goto CLEANUP;
+    }
+
     // Convert python policy object to as_policy_exists
     pyobject_to_policy_read(self, &err, py_policy, &read_policy, &read_policy_p,
                             &self->as->config.policies.read, &exp_list_p);
@@ -149,6 +158,11 @@ PyObject *AerospikeClient_Select_Invoke(AerospikeClient *self, PyObject *py_key,
         goto CLEANUP;
     }
 
+    if (get_record_options(&err, py_policy, &record_options) !=
+        AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+
     // Invoke operation
     Py_BEGIN_ALLOW_THREADS
     aerospike_key_select(self->as, &err, read_policy_p, &key,
@@ -157,7 +171,8 @@ PyObject *AerospikeClient_Select_Invoke(AerospikeClient *self, PyObject *py_key,
 
     if (err.code == AEROSPIKE_OK) {
         select_succeeded = true;
-        record_to_pyobject(self, &err, rec, &key, &py_rec);
+        record_to_pyobject_with_options(self, &err, rec, &key,
+                                        record_options, &py_rec);
     }
 
 CLEANUP:
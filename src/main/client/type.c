@@ -34,9 +34,16 @@
 #include "tls_config.h"
 #include "policy_config.h"
 #include "metrics.h"
+#include "auto_batch.h"
+#include "string_cache.h"
+#include "schema.h"
+#include "fork.h"
 
 static int set_rack_aware_config(as_config *conf, PyObject *config_dict);
 static int set_use_services_alternate(as_config *conf, PyObject *config_dict);
+static as_status get_auto_batch_option(as_error *err, PyObject *py_auto_batch,
+                                       const char *name, uint32_t min_value,
+                                       uint32_t *value);
 
 enum {
     INIT_SUCCESS,
@@ -113,13 +120,20 @@ PyDoc_STRVAR(increment_doc, "increment(key, bin, offset[, meta[, policy]])\n\
 Increment the integer value in bin by the integer val.");
 
 PyDoc_STRVAR(operate_doc,
-             "operate(key, list[, meta[, policy]]) -> (key, meta, bins)\n\
+             "operate(key, list[, meta[, policy[, values]]]) -> (key, meta, bins)\n\
 \n\
 Perform multiple bin operations on a record with a given key, In Aerospike server versions prior to 3.6.0, \
 non-existent bins being read will have a None value. \
 Starting with 3.6.0 non-existent bins will not be present in the returned Record Tuple. \
 The returned record tuple will only contain one entry per bin, \
-even if multiple operations were performed on the bin.");
+even if multiple operations were performed on the bin. \
+list can also be operations prepared by prepare_operations(), with values holding the values of their placeholders.");
+
+PyDoc_STRVAR(prepare_operations_doc,
+             "prepare_operations(list) -> PreparedOperations\n\
+\n\
+Build a list of operations once, to be passed to operate() with different values on each call. \
+The values of the operations that change between calls are aerospike.Placeholder objects.");
 
 PyDoc_STRVAR(
     operate_ordered_doc,
@@ -264,6 +278,13 @@ PyDoc_STRVAR(index_geo2dsphere_create_doc,
 \n\
 Create a geospatial 2D spherical index with index_name on the bin in the specified ns, set.");
 
+PyDoc_STRVAR(register_schema_doc,
+             "register_schema(namespace, set, schema) -> None\n\
+\n\
+Register the types of the bins of the records of a set, so that writing \
+those bins skips the generic type checks. Pass None as schema to \
+unregister it.");
+
 PyDoc_STRVAR(batch_write_doc, "batch_write(batch_records, policy) -> None\n\
 \n\
 Read/Write multiple records for specified batch keys in one batch call. \
@@ -292,6 +313,13 @@ PyDoc_STRVAR(
 Apply a user defined function (UDF) to multiple keys. \
 Requires server version 6.0+");
 
+PyDoc_STRVAR(
+    batch_future_doc,
+    "batch_<command>_future(...) -> concurrent.futures.Future\n\
+\n\
+Run the batch command with the same arguments on a native worker thread, \
+and return a future that is completed with its result or exception.");
+
 PyDoc_STRVAR(get_key_partition_id_doc,
              "get_key_partition_id(ns, set, key) -> int\n\
 \n\
@@ -414,11 +442,15 @@ static PyMethodDef AerospikeClient_Type_Methods[] = {
      METH_VARARGS | METH_KEYWORDS, operate_doc},
     {"operate_ordered", (PyCFunction)AerospikeClient_OperateOrdered,
      METH_VARARGS | METH_KEYWORDS, operate_ordered_doc},
+    {"prepare_operations", (PyCFunction)AerospikeClient_Prepare_Operations,
+     METH_VARARGS | METH_KEYWORDS, prepare_operations_doc},
 
     // QUERY OPERATIONS
 
     {"query", (PyCFunction)AerospikeClient_Query, METH_VARARGS | METH_KEYWORDS,
      query_doc},
+    {"_query_from_bytes", (PyCFunction)AerospikeClient_Query_From_Bytes,
+     METH_VARARGS | METH_KEYWORDS, NULL},
     {"query_apply", (PyCFunction)AerospikeClient_QueryApply,
      METH_VARARGS | METH_KEYWORDS, query_apply_doc},
     {"job_info", (PyCFunction)AerospikeClient_JobInfo,
@@ -428,6 +460,8 @@ static PyMethodDef AerospikeClient_Type_Methods[] = {
 
     {"scan", (PyCFunction)AerospikeClient_Scan, METH_VARARGS | METH_KEYWORDS,
      scan_doc},
+    {"_scan_from_bytes", (PyCFunction)AerospikeClient_Scan_From_Bytes,
+     METH_VARARGS | METH_KEYWORDS, NULL},
     {"scan_apply", (PyCFunction)AerospikeClient_ScanApply,
      METH_VARARGS | METH_KEYWORDS, scan_apply_doc},
 
@@ -486,6 +520,9 @@ static PyMethodDef AerospikeClient_Type_Methods[] = {
      (PyCFunction)AerospikeClient_Index_2dsphere_Create,
      METH_VARARGS | METH_KEYWORDS, index_geo2dsphere_create_doc},
 
+    {"register_schema", (PyCFunction)AerospikeClient_Register_Schema,
+     METH_VARARGS | METH_KEYWORDS, register_schema_doc},
+
     // BATCH OPERATIONS
 
     {"batch_write", (PyCFunction)AerospikeClient_BatchWrite,
@@ -498,6 +535,16 @@ static PyMethodDef AerospikeClient_Type_Methods[] = {
      METH_VARARGS | METH_KEYWORDS, batch_apply_doc},
     {"batch_read", (PyCFunction)AerospikeClient_BatchRead,
      METH_VARARGS | METH_KEYWORDS, "Read multiple keys."},
+    {"batch_write_future", (PyCFunction)AerospikeClient_BatchWrite_Future,
+     METH_VARARGS | METH_KEYWORDS, batch_future_doc},
+    {"batch_operate_future", (PyCFunction)AerospikeClient_Batch_Operate_Future,
+     METH_VARARGS | METH_KEYWORDS, batch_future_doc},
+    {"batch_remove_future", (PyCFunction)AerospikeClient_Batch_Remove_Future,
+     METH_VARARGS | METH_KEYWORDS, batch_future_doc},
+    {"batch_apply_future", (PyCFunction)AerospikeClient_Batch_Apply_Future,
+     METH_VARARGS | METH_KEYWORDS, batch_future_doc},
+    {"batch_read_future", (PyCFunction)AerospikeClient_BatchRead_Future,
+     METH_VARARGS | METH_KEYWORDS, batch_future_doc},
 
     // TRUNCATE OPERATIONS
     {"truncate", (PyCFunction)AerospikeClient_Truncate,
@@ -584,6 +631,15 @@ static int AerospikeClient_Type_Init(AerospikeClient *self, PyObject *args,
     self->as = NULL;
     self->send_bool_as = SEND_BOOL_AS_AS_BOOL;
     self->validate_keys = false;
+    self->auto_batch = NULL;
+    // __init__() may be called again on a client that is already tracked
+    if (self->fork_safe) {
+        untrack_fork_safe_client(self);
+    }
+    self->fork_safe = false;
+    if (!self->strings) {
+        self->strings = string_cache_create();
+    }
 
     as_config config;
     as_config_init(&config);
@@ -870,6 +926,33 @@ static int AerospikeClient_Type_Init(AerospikeClient *self, PyObject *args,
         }
     }
 
+    PyObject *py_auto_batch = PyDict_GetItemString(py_config, "auto_batch");
+    if (py_auto_batch && PyDict_Check(py_auto_batch)) {
+        if (validate_keys) {
+            int retval = does_py_dict_contain_valid_keys(
+                &constructor_err, py_auto_batch,
+                py_client_config_auto_batch_valid_keys,
+                CLIENT_CONFIG_DICTIONARY_ADJECTIVE_FOR_ERROR_MESSAGE);
+            if (retval == -1) {
+                goto RAISE_EXCEPTION_WITHOUT_AS_ERROR;
+            }
+            else if (retval == 0) {
+                goto RAISE_EXCEPTION_WITH_AS_ERROR;
+            }
+        }
+
+        uint32_t window_us = AUTO_BATCH_DEFAULT_WINDOW_US;
+        uint32_t max_keys = AUTO_BATCH_DEFAULT_MAX_KEYS;
+        if (get_auto_batch_option(&constructor_err, py_auto_batch,
+                                  "window_us", 0,
+                                  &window_us) != AEROSPIKE_OK ||
+            get_auto_batch_option(&constructor_err, py_auto_batch, "max_keys",
+                                  1, &max_keys) != AEROSPIKE_OK) {
+            goto RAISE_EXCEPTION_WITH_AS_ERROR;
+        }
+        self->auto_batch = auto_batch_create(window_us, max_keys);
+    }
+
     self->is_client_put_serializer = false;
     self->user_serializer_call_info.callback = NULL;
     self->user_deserializer_call_info.callback = NULL;
@@ -1183,6 +1266,25 @@ static int AerospikeClient_Type_Init(AerospikeClient *self, PyObject *args,
         self->use_shared_connection = PyObject_IsTrue(py_share_connect);
     }
 
+    bool fork_safe = false;
+    PyObject *py_fork_safe = PyDict_GetItemString(py_config, "fork_safe");
+    if (py_fork_safe) {
+        if (!PyBool_Check(py_fork_safe)) {
+            as_error_update(&constructor_err, AEROSPIKE_ERR_PARAM,
+                            "config[\"fork_safe\"] must be a boolean");
+            goto RAISE_EXCEPTION_WITH_AS_ERROR;
+        }
+        fork_safe = py_fork_safe == Py_True;
+    }
+    if (fork_safe && self->use_shared_connection) {
+        // The shared aerospike object is also used by clients that aren't
+        // fork safe
+        as_error_update(&constructor_err, AEROSPIKE_ERR_PARAM,
+                        "config[\"fork_safe\"] can't be used with "
+                        "config[\"use_shared_connection\"]");
+        goto RAISE_EXCEPTION_WITH_AS_ERROR;
+    }
+
     PyObject *py_send_bool_as = PyDict_GetItemString(py_config, "send_bool_as");
     if (py_send_bool_as != NULL && PyLong_Check(py_send_bool_as)) {
         int send_bool_as_temp = PyLong_AsLong(py_send_bool_as);
@@ -1294,6 +1396,11 @@ static int AerospikeClient_Type_Init(AerospikeClient *self, PyObject *args,
 
     self->as = aerospike_new(&config);
 
+    if (fork_safe) {
+        self->fork_safe = true;
+        track_fork_safe_client(self);
+    }
+
     if (AerospikeClientConnect(self) == -1) {
         return -1;
     }
@@ -1475,6 +1582,31 @@ static int set_use_services_alternate(as_config *conf, PyObject *config_dict)
     return INIT_SUCCESS;
 }
 
+static as_status get_auto_batch_option(as_error *err, PyObject *py_auto_batch,
+                                       const char *name, uint32_t min_value,
+                                       uint32_t *value)
+{
+    PyObject *py_value = PyDict_GetItemString(py_auto_batch, name);
+    if (!py_value) {
+        return AEROSPIKE_OK;
+    }
+
+    if (PyLong_Check(py_value) && !PyBool_Check(py_value)) {
+        unsigned long long long_value = PyLong_AsUnsignedLongLong(py_value);
+        if (!PyErr_Occurred() && long_value >= min_value &&
+            long_value <= UINT32_MAX) {
+            *value = (uint32_t)long_value;
+            return AEROSPIKE_OK;
+        }
+        PyErr_Clear();
+    }
+
+    return as_error_update(
+        err, AEROSPIKE_ERR_PARAM,
+        "config[\"auto_batch\"][\"%s\"] must be an integer between %u and %u",
+        name, min_value, UINT32_MAX);
+}
+
 static void AerospikeClient_Type_Dealloc(PyObject *self)
 {
 
@@ -1520,6 +1652,16 @@ static void AerospikeClient_Type_Dealloc(PyObject *self)
             }
         }
     }
+
+    if (client->fork_safe) {
+        untrack_fork_safe_client(client);
+    }
+
+    if (client->auto_batch) {
+        auto_batch_destroy(client->auto_batch);
+    }
+    string_cache_destroy(client->strings);
+    destroy_set_schemas(client);
     self->ob_type->tp_free((PyObject *)self);
 }
 
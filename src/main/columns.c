@@ -0,0 +1,918 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+#include <pthread.h>
+#include <stdbool.h>
+#include <stdlib.h>
+#include <string.h>
+
+#include <aerospike/as_boolean.h>
+#include <aerospike/as_bytes.h>
+#include <aerospike/as_double.h>
+#include <aerospike/as_error.h>
+#include <aerospike/as_geojson.h>
+#include <aerospike/as_integer.h>
+#include <aerospike/as_list.h>
+#include <aerospike/as_map.h>
+#include <aerospike/as_record.h>
+#include <aerospike/as_record_iterator.h>
+#include <aerospike/as_string.h>
+#include <aerospike/as_vector.h>
+
+#include "columns.h"
+#include "helper_types.h"
+
+#define NUMPY_OUTPUT "numpy"
+
+// Same as the type codes of the array module, except for strings, bytes,
+// objects, nulls, lists and maps
+static const char *column_type_codes[] = {
+    [COLUMN_TYPE_INT64] = "q",  [COLUMN_TYPE_DOUBLE] = "d",
+    [COLUMN_TYPE_BOOL] = "?",   [COLUMN_TYPE_STRING] = "s",
+    [COLUMN_TYPE_BYTES] = "b",  [COLUMN_TYPE_OBJECT] = "O",
+    [COLUMN_TYPE_NULL] = "n",   [COLUMN_TYPE_LIST] = "l",
+    [COLUMN_TYPE_MAP] = "m",
+};
+
+static const size_t column_type_sizes[] = {
+    [COLUMN_TYPE_INT64] = sizeof(int64_t),
+    [COLUMN_TYPE_DOUBLE] = sizeof(double),
+    [COLUMN_TYPE_BOOL] = sizeof(uint8_t),
+    [COLUMN_TYPE_STRING] = sizeof(int32_t),
+    [COLUMN_TYPE_BYTES] = sizeof(int32_t),
+    [COLUMN_TYPE_OBJECT] = sizeof(as_val *),
+    [COLUMN_TYPE_NULL] = 0,
+    [COLUMN_TYPE_LIST] = sizeof(int32_t),
+    [COLUMN_TYPE_MAP] = sizeof(int32_t),
+};
+
+as_status get_numpy_output_option(as_error *err, PyObject *py_output,
+                                  bool *numpy_output)
+{
+    *numpy_output = false;
+    if (!py_output || py_output == Py_None) {
+        return AEROSPIKE_OK;
+    }
+
+    if (!PyUnicode_Check(py_output) ||
+        strcmp(PyUnicode_AsUTF8(py_output), NUMPY_OUTPUT)) {
+        return as_error_update(err, AEROSPIKE_ERR_PARAM,
+                               "output must be None or \"numpy\"");
+    }
+
+    // Fails before the command is sent if NumPy is not installed
+    if (!get_helper_type(err, HELPER_TYPE_COLUMNS)) {
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "output=\"numpy\" requires the numpy package");
+        return err->code;
+    }
+
+    *numpy_output = true;
+    return AEROSPIKE_OK;
+}
+
+void column_builder_init(column_builder *builder, uint32_t capacity,
+                         column_format format)
+{
+    builder->format = format;
+    as_vector_init(&builder->columns, sizeof(column), 8);
+    builder->n_rows = 0;
+    builder->capacity = capacity > 0 ? capacity : 1;
+    pthread_mutex_init(&builder->lock, NULL);
+    as_error_init(&builder->err);
+}
+
+static void destroy_column(column *col, uint32_t n_rows)
+{
+    if (col->type == COLUMN_TYPE_OBJECT) {
+        as_val **vals = (as_val **)col->values;
+        for (uint32_t i = 0; i < n_rows; i++) {
+            if (col->valid[i]) {
+                as_val_destroy(vals[i]);
+            }
+        }
+    }
+    free(col->values);
+    free(col->valid);
+    free(col->data);
+}
+
+void column_builder_destroy(column_builder *builder)
+{
+    for (uint32_t i = 0; i < builder->columns.size; i++) {
+        destroy_column((column *)as_vector_get(&builder->columns, i),
+                       builder->n_rows);
+    }
+    as_vector_destroy(&builder->columns);
+    pthread_mutex_destroy(&builder->lock);
+}
+
+// Grow a buffer of capacity items to new_capacity items, filled with 0
+static uint8_t *grow_buffer(uint8_t *buffer, size_t item_size,
+                            uint32_t capacity, uint32_t new_capacity)
+{
+    uint8_t *new_buffer = realloc(buffer, item_size * new_capacity);
+    if (new_buffer) {
+        memset(new_buffer + item_size * capacity, 0,
+               item_size * (new_capacity - capacity));
+    }
+    return new_buffer;
+}
+
+static bool grow_columns(column_builder *builder)
+{
+    uint32_t new_capacity = builder->capacity * 2;
+    for (uint32_t i = 0; i < builder->columns.size; i++) {
+        column *col = (column *)as_vector_get(&builder->columns, i);
+        uint8_t *values =
+            grow_buffer(col->values, column_type_sizes[col->type],
+                        builder->capacity, new_capacity);
+        if (!values) {
+            return false;
+        }
+        col->values = values;
+
+        uint8_t *valid = grow_buffer(col->valid, sizeof(uint8_t),
+                                     builder->capacity, new_capacity);
+        if (!valid) {
+            return false;
+        }
+        col->valid = valid;
+    }
+    builder->capacity = new_capacity;
+    return true;
+}
+
+static column *get_column(column_builder *builder, const char *name,
+                          column_type type)
+{
+    for (uint32_t i = 0; i < builder->columns.size; i++) {
+        column *col = (column *)as_vector_get(&builder->columns, i);
+        if (!strcmp(col->name, name)) {
+            return col;
+        }
+    }
+
+    // The rows before this one don't have the bin
+    column col = {0};
+    strncpy(col.name, name, AS_BIN_NAME_MAX_LEN);
+    col.name[AS_BIN_NAME_MAX_LEN] = '\0';
+    col.type = type;
+    col.values = calloc(builder->capacity, column_type_sizes[type]);
+    col.valid = calloc(builder->capacity, sizeof(uint8_t));
+    if (!col.values || !col.valid) {
+        free(col.values);
+        free(col.valid);
+        return NULL;
+    }
+    as_vector_append(&builder->columns, &col);
+    return (column *)as_vector_get(&builder->columns,
+                                   builder->columns.size - 1);
+}
+
+static bool append_data(column_builder *builder, column *col, uint32_t row,
+                        const uint8_t *bytes, uint32_t size)
+{
+    if (size > (uint32_t)INT32_MAX - col->data_size) {
+        as_error_update(&builder->err, AEROSPIKE_ERR_CLIENT,
+                        "Bin %s has more than 2 GiB of data in one batch",
+                        col->name);
+        return false;
+    }
+
+    if (col->data_size + size > col->data_capacity) {
+        uint32_t new_capacity = col->data_capacity ? col->data_capacity : 1024;
+        while (new_capacity < col->data_size + size) {
+            new_capacity = new_capacity > (uint32_t)INT32_MAX / 2
+                               ? (uint32_t)INT32_MAX
+                               : new_capacity * 2;
+        }
+        uint8_t *data = realloc(col->data, new_capacity);
+        if (!data) {
+            as_error_update(&builder->err, AEROSPIKE_ERR_CLIENT,
+                            "Unable to allocate data of bin %s", col->name);
+            return false;
+        }
+        col->data = data;
+        col->data_capacity = new_capacity;
+    }
+
+    memcpy(col->data + col->data_size, bytes, size);
+    col->data_size += size;
+    ((int32_t *)col->values)[row] = (int32_t)col->data_size;
+    return true;
+}
+
+// Return false if val has no column type
+static bool get_column_type(const as_val *val, column_type *type)
+{
+    switch (as_val_type(val)) {
+    case AS_INTEGER:
+        *type = COLUMN_TYPE_INT64;
+        return true;
+    case AS_DOUBLE:
+        *type = COLUMN_TYPE_DOUBLE;
+        return true;
+    case AS_BOOLEAN:
+        *type = COLUMN_TYPE_BOOL;
+        return true;
+    case AS_STRING:
+    case AS_GEOJSON:
+        *type = COLUMN_TYPE_STRING;
+        return true;
+    case AS_BYTES:
+        *type = COLUMN_TYPE_BYTES;
+        return true;
+    case AS_LIST:
+        *type = COLUMN_TYPE_LIST;
+        return true;
+    case AS_MAP:
+        *type = COLUMN_TYPE_MAP;
+        return true;
+    default:
+        return false;
+    }
+}
+
+static bool set_value(column_builder *builder, const char *name,
+                      const as_val *val, uint32_t row)
+{
+    bool arrow = builder->format == COLUMN_FORMAT_ARROW;
+    column_type type;
+    if (!get_column_type(val, &type)) {
+        as_error_update(&builder->err, AEROSPIKE_ERR_CLIENT,
+                        "Bin %s has a value of an unsupported type", name);
+        return false;
+    }
+    if (type == COLUMN_TYPE_LIST || type == COLUMN_TYPE_MAP) {
+        type = COLUMN_TYPE_OBJECT;
+    }
+
+    if (!arrow && type > COLUMN_TYPE_BOOL) {
+        as_error_update(&builder->err, AEROSPIKE_ERR_CLIENT,
+                        "Bin %s has a value that can't be stored in a NumPy "
+                        "array. Only integers, floats and booleans can be",
+                        name);
+        return false;
+    }
+
+    column *col = get_column(builder, name, type);
+    if (!col) {
+        as_error_update(&builder->err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to allocate column of bin %s", name);
+        return false;
+    }
+
+    // Integers and floats of the same bin are stored as floats
+    if (col->type == COLUMN_TYPE_INT64 && type == COLUMN_TYPE_DOUBLE) {
+        int64_t *ints = (int64_t *)col->values;
+        double *doubles = (double *)col->values;
+        for (uint32_t i = 0; i < row; i++) {
+            doubles[i] = (double)ints[i];
+        }
+        col->type = COLUMN_TYPE_DOUBLE;
+    }
+    else if (col->type != type &&
+             !(col->type == COLUMN_TYPE_DOUBLE && type == COLUMN_TYPE_INT64)) {
+        as_error_update(&builder->err, AEROSPIKE_ERR_CLIENT,
+                        "Bin %s has values of types that can't be stored in "
+                        "the same array",
+                        name);
+        return false;
+    }
+
+    switch (col->type) {
+    case COLUMN_TYPE_INT64:
+        ((int64_t *)col->values)[row] = as_integer_get(as_integer_fromval(val));
+        break;
+    case COLUMN_TYPE_DOUBLE:
+        ((double *)col->values)[row] =
+            type == COLUMN_TYPE_INT64
+                ? (double)as_integer_get(as_integer_fromval(val))
+                : as_double_get(as_double_fromval(val));
+        break;
+    case COLUMN_TYPE_BOOL:
+        col->values[row] = as_boolean_get(as_boolean_fromval(val));
+        break;
+    case COLUMN_TYPE_STRING: {
+        const char *str = as_val_type(val) == AS_GEOJSON
+                              ? as_geojson_get(as_geojson_fromval(val))
+                              : as_string_get(as_string_fromval(val));
+        if (!append_data(builder, col, row, (const uint8_t *)str,
+                         (uint32_t)strlen(str))) {
+            return false;
+        }
+        break;
+    }
+    case COLUMN_TYPE_BYTES: {
+        as_bytes *bytes = as_bytes_fromval(val);
+        if (!append_data(builder, col, row, as_bytes_get(bytes),
+                         as_bytes_size(bytes))) {
+            return false;
+        }
+        break;
+    }
+    case COLUMN_TYPE_OBJECT:
+        // Converted to a nested array when the column is returned
+        ((as_val **)col->values)[row] = as_val_reserve((as_val *)val);
+        break;
+    default:
+        break;
+    }
+    col->valid[row] = 1;
+    return true;
+}
+
+bool column_builder_append(column_builder *builder, const as_record *rec)
+{
+    bool success = true;
+    pthread_mutex_lock(&builder->lock);
+
+    if (builder->err.code != AEROSPIKE_OK) {
+        success = false;
+        goto UNLOCK;
+    }
+
+    if (builder->n_rows == builder->capacity && !grow_columns(builder)) {
+        as_error_update(&builder->err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to allocate columns for %u rows",
+                        builder->capacity * 2);
+        success = false;
+        goto UNLOCK;
+    }
+
+    uint32_t row = builder->n_rows;
+    if (rec) {
+        as_record_iterator it;
+        as_record_iterator_init(&it, rec);
+        while (as_record_iterator_has_next(&it)) {
+            as_bin *bin = as_record_iterator_next(&it);
+            as_val *val = (as_val *)as_bin_get_value(bin);
+            // Bins without a value are missing
+            if (!val || as_val_type(val) == AS_NIL) {
+                continue;
+            }
+            if (!set_value(builder, as_bin_get_name(bin), val, row)) {
+                success = false;
+                break;
+            }
+        }
+        as_record_iterator_destroy(&it);
+    }
+
+    // A row that failed is not counted, and no more rows are appended after
+    // it, so only its objects need to be released
+    if (success) {
+        builder->n_rows++;
+    }
+    else {
+        for (uint32_t i = 0; i < builder->columns.size; i++) {
+            column *col = (column *)as_vector_get(&builder->columns, i);
+            if (col->type == COLUMN_TYPE_OBJECT && col->valid[row]) {
+                as_val_destroy(((as_val **)col->values)[row]);
+            }
+            col->valid[row] = 0;
+        }
+    }
+
+UNLOCK:
+    pthread_mutex_unlock(&builder->lock);
+    return success;
+}
+
+bool column_builder_take(column_builder *builder, uint32_t min_rows,
+                         column_builder *batch)
+{
+    bool taken = false;
+    pthread_mutex_lock(&builder->lock);
+
+    if (builder->n_rows > 0 && builder->n_rows >= min_rows) {
+        column_builder_init(batch, builder->capacity, builder->format);
+        as_vector columns = batch->columns;
+        batch->columns = builder->columns;
+        batch->n_rows = builder->n_rows;
+        builder->columns = columns;
+        builder->n_rows = 0;
+        taken = true;
+    }
+
+    pthread_mutex_unlock(&builder->lock);
+    return taken;
+}
+
+// Pack one byte per row into an Arrow bitmap
+static PyObject *pack_bits(const uint8_t *bytes, uint32_t n)
+{
+    PyObject *py_bitmap = PyByteArray_FromStringAndSize(NULL, (n + 7) / 8);
+    if (!py_bitmap) {
+        return NULL;
+    }
+    uint8_t *bitmap = (uint8_t *)PyByteArray_AsString(py_bitmap);
+    memset(bitmap, 0, (n + 7) / 8);
+    for (uint32_t i = 0; i < n; i++) {
+        if (bytes[i]) {
+            bitmap[i / 8] |= (uint8_t)(1 << (i % 8));
+        }
+    }
+    return py_bitmap;
+}
+
+static PyObject *numpy_buffer(column *col, uint32_t n_rows)
+{
+    // bytearray, so that the NumPy arrays are writable
+    PyObject *py_values = PyByteArray_FromStringAndSize(
+        (const char *)col->values,
+        (Py_ssize_t)(column_type_sizes[col->type] * n_rows));
+    PyObject *py_valid =
+        PyByteArray_FromStringAndSize((const char *)col->valid, n_rows);
+    PyObject *py_buffer = NULL;
+    if (py_values && py_valid) {
+        py_buffer = Py_BuildValue("(sOO)", column_type_codes[col->type],
+                                  py_values, py_valid);
+    }
+    Py_XDECREF(py_values);
+    Py_XDECREF(py_valid);
+    return py_buffer;
+}
+
+// Return a new bytearray of size bytes set to 0
+static PyObject *new_buffer(size_t size)
+{
+    PyObject *py_buffer = PyByteArray_FromStringAndSize(NULL, (Py_ssize_t)size);
+    if (py_buffer) {
+        memset(PyByteArray_AsString(py_buffer), 0, size);
+    }
+    return py_buffer;
+}
+
+static as_val *null_if_nil(const as_val *val)
+{
+    return val && as_val_type(val) != AS_NIL ? (as_val *)val : NULL;
+}
+
+// Set type to the type of the array of vals. NULL items are null, and the
+// type is empty_type if all of them are
+static bool get_nested_type(as_error *err, const char *name, as_val **vals,
+                            uint32_t n, column_type empty_type,
+                            column_type *type)
+{
+    bool found = false;
+    for (uint32_t i = 0; i < n; i++) {
+        if (!vals[i]) {
+            continue;
+        }
+        column_type val_type;
+        if (!get_column_type(vals[i], &val_type)) {
+            as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                            "Bin %s has a value of an unsupported type", name);
+            return false;
+        }
+        if (!found) {
+            *type = val_type;
+            found = true;
+        }
+        // Integers and floats of the same array are stored as floats
+        else if (*type == COLUMN_TYPE_INT64 && val_type == COLUMN_TYPE_DOUBLE) {
+            *type = COLUMN_TYPE_DOUBLE;
+        }
+        else if (*type != val_type && !(*type == COLUMN_TYPE_DOUBLE &&
+                                        val_type == COLUMN_TYPE_INT64)) {
+            as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                            "Bin %s has values of types that can't be stored "
+                            "in the same array",
+                            name);
+            return false;
+        }
+    }
+    if (!found) {
+        *type = empty_type;
+    }
+    return true;
+}
+
+// Items of lists, or keys and values of maps
+typedef struct {
+    as_val **keys;
+    as_val **items;
+    uint32_t size;
+    uint32_t capacity;
+} nested_items;
+
+static bool append_map_entry(const as_val *key, const as_val *val, void *udata)
+{
+    nested_items *entries = (nested_items *)udata;
+    if (entries->size == entries->capacity) {
+        return false;
+    }
+    entries->keys[entries->size] = (as_val *)key;
+    entries->items[entries->size] = null_if_nil(val);
+    entries->size++;
+    return true;
+}
+
+static PyObject *nested_array(as_error *err, const char *name, as_val **vals,
+                              uint32_t n, column_type empty_type);
+
+// Set the offsets of the lists or maps in vals, and return a new tuple with
+// the arrays of their items, or of their keys and values
+static PyObject *nested_children(as_error *err, const char *name, as_val **vals,
+                                 uint32_t n, column_type type, int32_t *offsets)
+{
+    uint64_t total = 0;
+    offsets[0] = 0;
+    for (uint32_t i = 0; i < n; i++) {
+        if (vals[i]) {
+            total += type == COLUMN_TYPE_LIST
+                         ? as_list_size(as_list_fromval(vals[i]))
+                         : as_map_size(as_map_fromval(vals[i]));
+        }
+        if (total > INT32_MAX) {
+            as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                            "Bin %s has more than 2^31 nested values in one "
+                            "batch",
+                            name);
+            return NULL;
+        }
+        offsets[i + 1] = (int32_t)total;
+    }
+
+    nested_items entries = {0};
+    entries.capacity = (uint32_t)total;
+    size_t size = sizeof(as_val *) * (total ? total : 1);
+    entries.items = malloc(size);
+    if (type == COLUMN_TYPE_MAP) {
+        entries.keys = malloc(size);
+    }
+    if (!entries.items || (type == COLUMN_TYPE_MAP && !entries.keys)) {
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to allocate nested values of bin %s", name);
+        goto CLEANUP;
+    }
+
+    for (uint32_t i = 0; i < n; i++) {
+        if (!vals[i]) {
+            continue;
+        }
+        if (type == COLUMN_TYPE_LIST) {
+            as_list *list = as_list_fromval(vals[i]);
+            uint32_t list_size = as_list_size(list);
+            for (uint32_t j = 0; j < list_size; j++) {
+                entries.items[entries.size++] =
+                    null_if_nil(as_list_get(list, j));
+            }
+        }
+        else {
+            as_map_foreach(as_map_fromval(vals[i]), append_map_entry, &entries);
+        }
+    }
+
+    PyObject *py_children = NULL;
+    if (type == COLUMN_TYPE_LIST) {
+        PyObject *py_items = nested_array(err, name, entries.items,
+                                          entries.size, COLUMN_TYPE_NULL);
+        if (py_items) {
+            py_children = PyTuple_Pack(1, py_items);
+            Py_DECREF(py_items);
+        }
+    }
+    else {
+        // Arrow map keys can't be null, so keys of empty maps are strings
+        PyObject *py_keys = nested_array(err, name, entries.keys, entries.size,
+                                         COLUMN_TYPE_STRING);
+        PyObject *py_items = py_keys
+                                 ? nested_array(err, name, entries.items,
+                                                entries.size, COLUMN_TYPE_NULL)
+                                 : NULL;
+        if (py_items) {
+            py_children = PyTuple_Pack(2, py_keys, py_items);
+        }
+        Py_XDECREF(py_keys);
+        Py_XDECREF(py_items);
+    }
+
+    free(entries.keys);
+    free(entries.items);
+    return py_children;
+
+CLEANUP:
+    free(entries.keys);
+    free(entries.items);
+    return NULL;
+}
+
+// Return the values buffer of a nested array of numbers or booleans
+static PyObject *nested_values(as_val **vals, uint32_t n, column_type type)
+{
+    if (type == COLUMN_TYPE_BOOL) {
+        PyObject *py_values = new_buffer((n + 7) / 8);
+        if (py_values) {
+            uint8_t *bitmap = (uint8_t *)PyByteArray_AsString(py_values);
+            for (uint32_t i = 0; i < n; i++) {
+                if (vals[i] && as_boolean_get(as_boolean_fromval(vals[i]))) {
+                    bitmap[i / 8] |= (uint8_t)(1 << (i % 8));
+                }
+            }
+        }
+        return py_values;
+    }
+
+    PyObject *py_values = new_buffer(column_type_sizes[type] * n);
+    if (!py_values) {
+        return NULL;
+    }
+    char *values = PyByteArray_AsString(py_values);
+    for (uint32_t i = 0; i < n; i++) {
+        if (!vals[i]) {
+            continue;
+        }
+        if (type == COLUMN_TYPE_INT64) {
+            ((int64_t *)values)[i] =
+                as_integer_get(as_integer_fromval(vals[i]));
+        }
+        else {
+            ((double *)values)[i] =
+                as_val_type(vals[i]) == AS_INTEGER
+                    ? (double)as_integer_get(as_integer_fromval(vals[i]))
+                    : as_double_get(as_double_fromval(vals[i]));
+        }
+    }
+    return py_values;
+}
+
+static const uint8_t *get_nested_data(const as_val *val, uint32_t *size)
+{
+    if (as_val_type(val) == AS_BYTES) {
+        as_bytes *bytes = as_bytes_fromval(val);
+        *size = as_bytes_size(bytes);
+        return as_bytes_get(bytes);
+    }
+    const char *str = as_val_type(val) == AS_GEOJSON
+                          ? as_geojson_get(as_geojson_fromval(val))
+                          : as_string_get(as_string_fromval(val));
+    *size = (uint32_t)strlen(str);
+    return (const uint8_t *)str;
+}
+
+// Set the offsets of the strings or bytes in vals, and return their data
+static PyObject *nested_data(as_error *err, const char *name, as_val **vals,
+                             uint32_t n, int32_t *offsets)
+{
+    uint64_t total = 0;
+    offsets[0] = 0;
+    for (uint32_t i = 0; i < n; i++) {
+        if (vals[i]) {
+            uint32_t size;
+            get_nested_data(vals[i], &size);
+            total += size;
+        }
+        if (total > INT32_MAX) {
+            as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                            "Bin %s has more than 2 GiB of data in one batch",
+                            name);
+            return NULL;
+        }
+        offsets[i + 1] = (int32_t)total;
+    }
+
+    PyObject *py_data = new_buffer((size_t)total);
+    if (!py_data) {
+        return NULL;
+    }
+    uint8_t *data = (uint8_t *)PyByteArray_AsString(py_data);
+    for (uint32_t i = 0; i < n; i++) {
+        if (vals[i]) {
+            uint32_t size;
+            const uint8_t *bytes = get_nested_data(vals[i], &size);
+            memcpy(data + offsets[i], bytes, size);
+        }
+    }
+    return py_data;
+}
+
+// Return a new tuple (length, type_code, validity_bitmap, values, data,
+// children) with the buffers of the Arrow array of vals. NULL items are null.
+// The values of the lists and maps in vals are stored in child arrays, without
+// creating Python objects for them.
+static PyObject *nested_array(as_error *err, const char *name, as_val **vals,
+                              uint32_t n, column_type empty_type)
+{
+    column_type type;
+    if (!get_nested_type(err, name, vals, n, empty_type, &type)) {
+        return NULL;
+    }
+
+    PyObject *py_array = NULL;
+    PyObject *py_values = NULL;
+    PyObject *py_data = NULL;
+    PyObject *py_children = NULL;
+    PyObject *py_validity = new_buffer((n + 7) / 8);
+    if (!py_validity) {
+        goto CLEANUP;
+    }
+    uint8_t *validity = (uint8_t *)PyByteArray_AsString(py_validity);
+    for (uint32_t i = 0; i < n; i++) {
+        if (vals[i]) {
+            validity[i / 8] |= (uint8_t)(1 << (i % 8));
+        }
+    }
+
+    switch (type) {
+    case COLUMN_TYPE_NULL:
+        Py_INCREF(Py_None);
+        py_values = Py_None;
+        break;
+    case COLUMN_TYPE_STRING:
+    case COLUMN_TYPE_BYTES:
+    case COLUMN_TYPE_LIST:
+    case COLUMN_TYPE_MAP: {
+        py_values = new_buffer(sizeof(int32_t) * ((size_t)n + 1));
+        if (!py_values) {
+            goto CLEANUP;
+        }
+        int32_t *offsets = (int32_t *)PyByteArray_AsString(py_values);
+        if (type == COLUMN_TYPE_STRING || type == COLUMN_TYPE_BYTES) {
+            py_data = nested_data(err, name, vals, n, offsets);
+            if (!py_data) {
+                goto CLEANUP;
+            }
+        }
+        else {
+            py_children = nested_children(err, name, vals, n, type, offsets);
+            if (!py_children) {
+                goto CLEANUP;
+            }
+        }
+        break;
+    }
+    default:
+        py_values = nested_values(vals, n, type);
+        if (!py_values) {
+            goto CLEANUP;
+        }
+        break;
+    }
+
+    if (!py_data) {
+        Py_INCREF(Py_None);
+        py_data = Py_None;
+    }
+    if (!py_children) {
+        py_children = PyTuple_New(0);
+        if (!py_children) {
+            goto CLEANUP;
+        }
+    }
+    py_array = Py_BuildValue("(IsOOOO)", n, column_type_codes[type],
+                             py_validity, py_values, py_data, py_children);
+
+CLEANUP:
+    Py_XDECREF(py_validity);
+    Py_XDECREF(py_values);
+    Py_XDECREF(py_data);
+    Py_XDECREF(py_children);
+    return py_array;
+}
+
+static PyObject *arrow_values(column *col, uint32_t n_rows)
+{
+    switch (col->type) {
+    case COLUMN_TYPE_BOOL:
+        return pack_bits(col->values, n_rows);
+    case COLUMN_TYPE_STRING:
+    case COLUMN_TYPE_BYTES: {
+        // Offsets of the Arrow format. Rows without the bin are empty
+        PyObject *py_offsets = PyByteArray_FromStringAndSize(
+            NULL, (Py_ssize_t)(sizeof(int32_t) * (n_rows + 1)));
+        if (!py_offsets) {
+            return NULL;
+        }
+        int32_t *offsets = (int32_t *)PyByteArray_AsString(py_offsets);
+        int32_t *ends = (int32_t *)col->values;
+        offsets[0] = 0;
+        for (uint32_t i = 0; i < n_rows; i++) {
+            offsets[i + 1] = col->valid[i] ? ends[i] : offsets[i];
+        }
+        return py_offsets;
+    }
+    default:
+        return PyByteArray_FromStringAndSize(
+            (const char *)col->values,
+            (Py_ssize_t)(column_type_sizes[col->type] * n_rows));
+    }
+}
+
+static PyObject *arrow_buffer(column *col, uint32_t n_rows, as_error *err)
+{
+    if (col->type == COLUMN_TYPE_OBJECT) {
+        as_val **vals = (as_val **)col->values;
+        for (uint32_t i = 0; i < n_rows; i++) {
+            if (!col->valid[i]) {
+                vals[i] = NULL;
+            }
+        }
+        PyObject *py_array =
+            nested_array(err, col->name, vals, n_rows, COLUMN_TYPE_NULL);
+        if (!py_array) {
+            return NULL;
+        }
+        // Without the length, which is the number of rows
+        PyObject *py_buffer =
+            PyTuple_GetSlice(py_array, 1, PyTuple_GET_SIZE(py_array));
+        Py_DECREF(py_array);
+        return py_buffer;
+    }
+
+    PyObject *py_validity = pack_bits(col->valid, n_rows);
+    PyObject *py_values = arrow_values(col, n_rows);
+    PyObject *py_data = NULL;
+    if (col->type == COLUMN_TYPE_STRING || col->type == COLUMN_TYPE_BYTES) {
+        py_data = PyByteArray_FromStringAndSize((const char *)col->data,
+                                                col->data_size);
+    }
+    else {
+        Py_INCREF(Py_None);
+        py_data = Py_None;
+    }
+
+    PyObject *py_buffer = NULL;
+    if (py_validity && py_values && py_data) {
+        py_buffer = Py_BuildValue("(sOOO())", column_type_codes[col->type],
+                                  py_validity, py_values, py_data);
+    }
+    Py_XDECREF(py_validity);
+    Py_XDECREF(py_values);
+    Py_XDECREF(py_data);
+    return py_buffer;
+}
+
+PyObject *column_builder_to_buffers(column_builder *builder, as_error *err)
+{
+    PyObject *py_buffers = PyDict_New();
+    if (!py_buffers) {
+        goto ERROR;
+    }
+
+    for (uint32_t i = 0; i < builder->columns.size; i++) {
+        column *col = (column *)as_vector_get(&builder->columns, i);
+        PyObject *py_buffer =
+            builder->format == COLUMN_FORMAT_ARROW
+                ? arrow_buffer(col, builder->n_rows, err)
+                : numpy_buffer(col, builder->n_rows);
+        if (!py_buffer) {
+            goto ERROR;
+        }
+        int rc = PyDict_SetItemString(py_buffers, col->name, py_buffer);
+        Py_DECREF(py_buffer);
+        if (rc) {
+            goto ERROR;
+        }
+    }
+    return py_buffers;
+
+ERROR:
+    Py_XDECREF(py_buffers);
+    PyErr_Clear();
+    if (err->code == AEROSPIKE_OK) {
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to convert records to columns");
+    }
+    return NULL;
+}
+
+PyObject *column_builder_to_pyobject(column_builder *builder, as_error *err)
+{
+    PyObject *py_buffers = column_builder_to_buffers(builder, err);
+    if (!py_buffers) {
+        return NULL;
+    }
+
+    PyObject *py_class = get_helper_type(err, HELPER_TYPE_COLUMNS);
+    if (!py_class) {
+        Py_DECREF(py_buffers);
+        return NULL;
+    }
+
+    PyObject *py_columns = PyObject_CallMethod(
+        py_class, "_from_buffers", "(IO)", builder->n_rows, py_buffers);
+    Py_DECREF(py_buffers);
+    if (!py_columns) {
+        PyErr_Clear();
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to convert records to NumPy arrays");
+    }
+    return py_columns;
+}
@@ -0,0 +1,191 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+#include <string.h>
+
+#include <aerospike/as_error.h>
+#include <aerospike/as_exp.h>
+
+#include "types.h"
+#include "conversions.h"
+#include "exceptions.h"
+#include "policy.h"
+#include "compiled_expression.h"
+
+void expression_params_destroy(expression_param *params, uint32_t n_params)
+{
+    if (!params) {
+        return;
+    }
+    for (uint32_t i = 0; i < n_params; i++) {
+        Py_DECREF(params[i].name);
+    }
+    cf_free(params);
+}
+
+static void
+AerospikeCompiledExpression_dealloc(AerospikeCompiledExpression *self)
+{
+    as_exp_destroy(self->exp);
+    expression_params_destroy(self->params, self->n_params);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static PyObject *
+AerospikeCompiledExpression_get_size(AerospikeCompiledExpression *self,
+                                     void *closure)
+{
+    return PyLong_FromUnsignedLong((unsigned long)self->exp->packed_sz);
+}
+
+static PyObject *
+AerospikeCompiledExpression_get_params(AerospikeCompiledExpression *self,
+                                       void *closure)
+{
+    // Names of the parameters, without repeats
+    PyObject *py_names = PyList_New(0);
+    if (!py_names) {
+        return NULL;
+    }
+    for (uint32_t i = 0; i < self->n_params; i++) {
+        int retval = PySequence_Contains(py_names, self->params[i].name);
+        if (retval == 0) {
+            retval = PyList_Append(py_names, self->params[i].name);
+        }
+        if (retval == -1) {
+            Py_DECREF(py_names);
+            return NULL;
+        }
+    }
+
+    PyObject *py_params = PyList_AsTuple(py_names);
+    Py_DECREF(py_names);
+    return py_params;
+}
+
+static PyObject *
+AerospikeCompiledExpression_repr(AerospikeCompiledExpression *self)
+{
+    return PyUnicode_FromFormat("<%s size=%u>", Py_TYPE(self)->tp_name,
+                                self->exp->packed_sz);
+}
+
+static PyGetSetDef AerospikeCompiledExpression_getsetters[] = {
+    {.name = "size",
+     .get = (getter)AerospikeCompiledExpression_get_size,
+     .doc = "Size of the packed expression in bytes."},
+    {.name = "params",
+     .get = (getter)AerospikeCompiledExpression_get_params,
+     .doc = "Names of the parameters of the expression."},
+    {NULL} /* Sentinel */
+};
+
+// No tp_new, so instances can only be created by compile_expression()
+PyTypeObject AerospikeCompiledExpression_Type = {
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0).tp_name =
+        FULLY_QUALIFIED_TYPE_NAME("CompiledExpression"),
+    .tp_basicsize = sizeof(AerospikeCompiledExpression),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_doc = "An expression compiled by aerospike.compile_expression().",
+    .tp_dealloc = (destructor)AerospikeCompiledExpression_dealloc,
+    .tp_repr = (reprfunc)AerospikeCompiledExpression_repr,
+    .tp_getset = AerospikeCompiledExpression_getsetters};
+
+PyTypeObject *AerospikeCompiledExpression_Ready()
+{
+    return PyType_Ready(&AerospikeCompiledExpression_Type) == 0
+               ? &AerospikeCompiledExpression_Type
+               : NULL;
+}
+
+as_exp *as_exp_copy_from_compiled(AerospikeClient *self, as_error *err,
+                                  AerospikeCompiledExpression *py_compiled,
+                                  PyObject *py_params)
+{
+    if (py_compiled->n_params || (py_params && py_params != Py_None)) {
+        return as_exp_bind_params(self, err, py_compiled->exp,
+                                  py_compiled->params, py_compiled->n_params,
+                                  py_params);
+    }
+
+    // The expression is packed in a single allocation
+    size_t size = sizeof(as_exp) + py_compiled->exp->packed_sz;
+    as_exp *exp = (as_exp *)cf_malloc(size);
+    memcpy(exp, py_compiled->exp, size);
+    return exp;
+}
+
+PyObject *AerospikeCompiledExpression_New(as_error *err, PyObject *py_expr)
+{
+    if (AerospikeCompiledExpression_Check(py_expr)) {
+        Py_INCREF(py_expr);
+        return py_expr;
+    }
+
+    // Values in the expression are converted with the default client
+    // configuration, since the expression does not belong to a client
+    AerospikeClient default_client;
+    init_default_client(&default_client);
+
+    // Parameters are kept unbound, and bound by each command
+    as_exp *exp = NULL;
+    expression_param *params = NULL;
+    uint32_t n_params = 0;
+    if (as_exp_new_with_params_from_pyobject(&default_client, py_expr, &exp,
+                                             &params, &n_params,
+                                             err) != AEROSPIKE_OK) {
+        return NULL;
+    }
+
+    AerospikeCompiledExpression *py_compiled = PyObject_New(
+        AerospikeCompiledExpression, &AerospikeCompiledExpression_Type);
+    if (!py_compiled) {
+        PyErr_Clear();
+        as_exp_destroy(exp);
+        expression_params_destroy(params, n_params);
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to create compiled expression");
+        return NULL;
+    }
+    py_compiled->exp = exp;
+    py_compiled->params = params;
+    py_compiled->n_params = n_params;
+    return (PyObject *)py_compiled;
+}
+
+PyObject *Aerospike_Compile_Expression(PyObject *self, PyObject *args,
+                                       PyObject *kwds)
+{
+    PyObject *py_expr = NULL;
+
+    as_error err;
+    as_error_init(&err);
+
+    static char *kwlist[] = {"expr", NULL};
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "O:compile_expression", kwlist,
+                                    &py_expr) == false) {
+        return NULL;
+    }
+
+    PyObject *py_compiled = AerospikeCompiledExpression_New(&err, py_expr);
+    if (!py_compiled) {
+        raise_exception(&err);
+        return NULL;
+    }
+    return py_compiled;
+}
@@ -48,6 +48,9 @@
 #include "cdt_types.h"
 #include "cdt_operation_utils.h"
 #include "key_ordered_dict.h"
+#include "record.h"
+#include "string_cache.h"
+#include "schema.h"
 
 #define PY_KEYT_NAMESPACE 0
 #define PY_KEYT_SET 1
@@ -70,6 +73,11 @@ static as_status as_integer_new_from_py_bool(as_error *err, PyObject *py_bool,
                                              as_integer **target);
 static as_status as_bool_new_from_py_bool(as_error *err, PyObject *py_bool,
                                           as_boolean **target);
+static as_status bins_to_pyobject_with_options(AerospikeClient *self,
+                                               as_error *err,
+                                               const as_record *rec,
+                                               bool blob_as_memoryview,
+                                               PyObject **py_bins);
 
 as_status as_udf_file_to_pyobject(as_error *err, as_udf_file *entry,
                                   PyObject **py_file)
@@ -1163,6 +1171,46 @@ CLEANUP1:
     return py_instance;
 }
 
+PyObject *call_helper_with_source(const char *module_name,
+                                  const char *attr_name, PyObject *py_source,
+                                  PyObject *args, PyObject *kwds)
+{
+    PyObject *py_result = NULL;
+    PyObject *py_module = PyImport_ImportModule(module_name);
+    if (py_module == NULL) {
+        return NULL;
+    }
+
+    PyObject *py_callable = PyObject_GetAttrString(py_module, attr_name);
+    Py_DECREF(py_module);
+    if (py_callable == NULL) {
+        return NULL;
+    }
+
+    // Pass the source as the first positional argument
+    Py_ssize_t args_size = PyTuple_Size(args);
+    PyObject *py_call_args = PyTuple_New(args_size + 1);
+    if (py_call_args == NULL) {
+        goto CLEANUP;
+    }
+
+    Py_INCREF(py_source);
+    PyTuple_SET_ITEM(py_call_args, 0, py_source);
+    for (Py_ssize_t i = 0; i < args_size; i++) {
+        PyObject *py_arg = PyTuple_GET_ITEM(args, i);
+        Py_INCREF(py_arg);
+        PyTuple_SET_ITEM(py_call_args, i + 1, py_arg);
+    }
+
+    py_result = PyObject_Call(py_callable, py_call_args, kwds);
+    Py_DECREF(py_call_args);
+
+CLEANUP:
+    Py_DECREF(py_callable);
+
+    return py_result;
+}
+
 bool is_pyobj_correct_as_helpers_type(PyObject *obj,
                                       const char *expected_submodule_name,
                                       const char *expected_type_name,
@@ -1246,6 +1294,76 @@ CLEANUP1:
     return retval;
 }
 
+// Returns true if py_obj would be passed to a serializer registered by the
+// user. See serialize_based_on_serializer_policy
+static bool is_user_serializer_used(AerospikeClient *self, int serializer_type)
+{
+    return serializer_type == SERIALIZER_USER ||
+           (self->user_serializer_call_info.callback &&
+            !self->is_client_put_serializer);
+}
+
+// Converts an object that supports the buffer protocol to a blob.
+// If static_pool->pin_buffers is true and the buffer is contiguous, the blob
+// points to the buffer, which stays pinned until the pool is destroyed.
+// Otherwise the buffer is copied.
+// NumPy scalars such as np.int64 and np.bool_ support the buffer protocol,
+// but their raw bytes aren't written as blobs. Unlike arrays, they aren't
+// sequences.
+static bool is_numeric_scalar(PyObject *py_obj)
+{
+    return PyNumber_Check(py_obj) && !PySequence_Check(py_obj);
+}
+
+static as_status as_bytes_new_from_py_buffer(as_error *err, PyObject *py_obj,
+                                             as_static_pool *static_pool,
+                                             as_bytes **bytes)
+{
+    PyObject *py_view = PyMemoryView_FromObject(py_obj);
+    if (!py_view) {
+        PyErr_Clear();
+        return as_error_update(err, AEROSPIKE_ERR_PARAM,
+                               "Unable to get the buffer of a value");
+    }
+
+    Py_buffer *view = PyMemoryView_GET_BUFFER(py_view);
+    if (view->len > UINT32_MAX) {
+        Py_DECREF(py_view);
+        return as_error_update(err, AEROSPIKE_ERR_PARAM,
+                               "Buffer of a value is too large");
+    }
+
+    if (static_pool && static_pool->pin_buffers &&
+        PyBuffer_IsContiguous(view, 'C')) {
+        if (!static_pool->pinned_buffers) {
+            static_pool->pinned_buffers = PyList_New(0);
+        }
+        if (!static_pool->pinned_buffers ||
+            PyList_Append(static_pool->pinned_buffers, py_view) < 0) {
+            PyErr_Clear();
+            Py_DECREF(py_view);
+            return as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                                   "Unable to pin the buffer of a value");
+        }
+        *bytes = as_bytes_new_wrap((uint8_t *)view->buf, (uint32_t)view->len,
+                                   false);
+        Py_DECREF(py_view);
+        return AEROSPIKE_OK;
+    }
+
+    uint8_t *buffer = (uint8_t *)malloc(view->len ? view->len : 1);
+    if (PyBuffer_ToContiguous(buffer, view, view->len, 'C') < 0) {
+        PyErr_Clear();
+        free(buffer);
+        Py_DECREF(py_view);
+        return as_error_update(err, AEROSPIKE_ERR_PARAM,
+                               "Unable to copy the buffer of a value");
+    }
+    *bytes = as_bytes_new_wrap(buffer, (uint32_t)view->len, true);
+    Py_DECREF(py_view);
+    return AEROSPIKE_OK;
+}
+
 as_status as_val_new_from_pyobject(AerospikeClient *self, as_error *err,
                                    PyObject *py_obj, as_val **val,
                                    as_static_pool *static_pool,
@@ -1323,15 +1441,16 @@ as_status as_val_new_from_pyobject(AerospikeClient *self, as_error *err,
         }
     }
     else if (!strcmp(py_obj->ob_type->tp_name, "aerospike.Geospatial")) {
-        PyObject *py_parameter = PyUnicode_FromString("geo_data");
-        PyObject *py_data = PyObject_GenericGetAttr(py_obj, py_parameter);
-        Py_DECREF(py_parameter);
-
-        PyObject *geospatial_dump = AerospikeGeospatial_DoDumps(py_data, err);
+        // Reuses the GeoJSON string read from the server, if any
+        PyObject *geospatial_dump =
+            AerospikeGeospatial_Get_Json((AerospikeGeospatial *)py_obj, err);
+        if (!geospatial_dump) {
+            return as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                                   "Unable to get GeoJSON string");
+        }
         const char *geo_value = PyUnicode_AsUTF8(geospatial_dump);
         char *geo_value_cpy = strdup(geo_value);
 
-        Py_DECREF(py_data);
         Py_DECREF(geospatial_dump);
 
         *val = (as_val *)as_geojson_new(geo_value_cpy, true);
@@ -1377,6 +1496,16 @@ as_status as_val_new_from_pyobject(AerospikeClient *self, as_error *err,
             double d = PyFloat_AsDouble(py_obj);
             *val = (as_val *)as_double_new(d);
         }
+        else if (PyObject_CheckBuffer(py_obj) &&
+                 !is_numeric_scalar(py_obj) &&
+                 !is_user_serializer_used(self, serializer_type)) {
+            // numpy arrays, memoryviews, mmaps, etc. are written as blobs
+            as_bytes *bytes = NULL;
+            if (as_bytes_new_from_py_buffer(err, py_obj, static_pool,
+                                            &bytes) == AEROSPIKE_OK) {
+                *val = (as_val *)bytes;
+            }
+        }
         else {
             as_bytes *bytes;
             GET_BYTES_POOL(bytes, static_pool, err);
@@ -1394,6 +1523,101 @@ as_status as_val_new_from_pyobject(AerospikeClient *self, as_error *err,
     return err->code;
 }
 
+void init_default_client(AerospikeClient *client)
+{
+    memset(client, 0, sizeof(*client));
+    client->send_bool_as = SEND_BOOL_AS_AS_BOOL;
+    client->strict_types = true;
+}
+
+// Converts the value of a bin registered with client.register_schema().
+// Values of exactly the registered type skip the checks of
+// as_val_new_from_pyobject(), and other values fall back to it.
+static as_status as_val_new_from_pyobject_with_schema(
+    AerospikeClient *self, as_error *err, PyObject *py_obj,
+    schema_bin_type bin_type, as_val **val, as_static_pool *static_pool,
+    int serializer_type)
+{
+    switch (bin_type) {
+    case SCHEMA_BIN_INT:
+        if (PyLong_CheckExact(py_obj)) {
+            int64_t i = (int64_t)PyLong_AsLongLong(py_obj);
+            if (i == -1 && PyErr_Occurred()) {
+                // Raised again by as_val_new_from_pyobject()
+                PyErr_Clear();
+                break;
+            }
+            *val = (as_val *)as_integer_new(i);
+            return err->code;
+        }
+        break;
+    case SCHEMA_BIN_FLOAT:
+        if (PyFloat_CheckExact(py_obj)) {
+            *val = (as_val *)as_double_new(PyFloat_AS_DOUBLE(py_obj));
+            return err->code;
+        }
+        break;
+    case SCHEMA_BIN_STR:
+        if (PyUnicode_CheckExact(py_obj)) {
+            const char *str = PyUnicode_AsUTF8(py_obj);
+            if (!str) {
+                PyErr_Clear();
+                break;
+            }
+            *val = (as_val *)as_string_new_strdup(str);
+            return err->code;
+        }
+        break;
+    case SCHEMA_BIN_BYTES:
+        if (PyBytes_CheckExact(py_obj)) {
+            Py_ssize_t b_len = PyBytes_GET_SIZE(py_obj);
+            as_bytes *bytes = as_bytes_new(b_len);
+            as_bytes_set(bytes, 0, (const uint8_t *)PyBytes_AS_STRING(py_obj),
+                         b_len);
+            *val = (as_val *)bytes;
+            return err->code;
+        }
+        break;
+    case SCHEMA_BIN_BYTEARRAY:
+        if (PyByteArray_CheckExact(py_obj)) {
+            Py_ssize_t b_len = PyByteArray_GET_SIZE(py_obj);
+            as_bytes *bytes = as_bytes_new(b_len);
+            as_bytes_set(bytes, 0,
+                         (const uint8_t *)PyByteArray_AS_STRING(py_obj), b_len);
+            *val = (as_val *)bytes;
+            return err->code;
+        }
+        break;
+    case SCHEMA_BIN_LIST:
+        if (PyList_CheckExact(py_obj)) {
+            as_list *list = NULL;
+            pyobject_to_list(self, err, py_obj, &list, static_pool,
+                             serializer_type);
+            if (err->code == AEROSPIKE_OK) {
+                *val = (as_val *)list;
+            }
+            return err->code;
+        }
+        break;
+    case SCHEMA_BIN_DICT:
+        if (PyDict_CheckExact(py_obj)) {
+            as_map *map = NULL;
+            pyobject_to_map(self, err, py_obj, &map, static_pool,
+                            serializer_type);
+            if (err->code == AEROSPIKE_OK) {
+                *val = (as_val *)map;
+            }
+            return err->code;
+        }
+        break;
+    default:
+        break;
+    }
+
+    return as_val_new_from_pyobject(self, err, py_obj, val, static_pool,
+                                    serializer_type);
+}
+
 /**
  * Converts a PyObject into an as_record.
  * Returns AEROSPIKE_OK on success. On error, the err argument is populated.
@@ -1402,7 +1626,8 @@ as_status as_record_init_from_pyobject(AerospikeClient *self, as_error *err,
                                        PyObject *py_bins_dict,
                                        PyObject *py_meta, as_record *rec,
                                        int serializer_type,
-                                       as_static_pool *static_pool)
+                                       as_static_pool *static_pool,
+                                       PyObject *py_schema)
 {
     as_error_reset(err);
 
@@ -1436,7 +1661,11 @@ as_status as_record_init_from_pyobject(AerospikeClient *self, as_error *err,
             goto CLEANUP;
         }
 
-        if (self->strict_types) {
+        // Bin names of a schema were checked when it was registered
+        PyObject *py_bin_type =
+            py_schema ? PyDict_GetItem(py_schema, py_bin_name) : NULL;
+
+        if (self->strict_types && !py_bin_type) {
             if (strlen(name) > AS_BIN_NAME_MAX_LEN) {
                 as_error_update(
                     err, AEROSPIKE_ERR_BIN_NAME,
@@ -1452,8 +1681,16 @@ as_status as_record_init_from_pyobject(AerospikeClient *self, as_error *err,
         }
 
         as_val *val = NULL;
-        as_val_new_from_pyobject(self, err, py_bin_value, &val, static_pool,
-                                 serializer_type);
+        if (py_bin_type) {
+            as_val_new_from_pyobject_with_schema(
+                self, err, py_bin_value,
+                (schema_bin_type)PyLong_AsLong(py_bin_type), &val, static_pool,
+                serializer_type);
+        }
+        else {
+            as_val_new_from_pyobject(self, err, py_bin_value, &val,
+                                     static_pool, serializer_type);
+        }
         if (err->code != AEROSPIKE_OK) {
             goto CLEANUP;
         }
@@ -1622,6 +1859,8 @@ typedef struct {
     uint32_t count;
     AerospikeClient *client;
     void *udata;
+    // Blobs in bins are returned as memoryviews
+    bool blob_as_memoryview;
 } conversion_data;
 
 as_status val_to_pyobject(AerospikeClient *self, as_error *err,
@@ -1725,16 +1964,8 @@ as_status val_to_pyobject(AerospikeClient *self, as_error *err,
     case AS_GEOJSON: {
         as_geojson *gp = as_geojson_fromval(val);
         char *locstr = as_geojson_get(gp);
-        PyObject *py_locstr = PyUnicode_FromString(locstr);
-        PyObject *py_loads = AerospikeGeospatial_DoLoads(py_locstr, err);
-        Py_DECREF(py_locstr);
-        if (err->code != AEROSPIKE_OK) {
-            break;
-        }
-        *py_val = AerospikeGeospatial_New(err, py_loads);
-        if (py_loads) {
-            Py_DECREF(py_loads);
-        }
+        // The string is parsed when the geospatial data is accessed
+        *py_val = AerospikeGeospatial_New_From_Json(err, locstr);
         break;
     }
     default: {
@@ -1882,9 +2113,10 @@ as_status map_to_pyobject(AerospikeClient *self, as_error *err,
     return err->code;
 }
 
-as_status record_to_pyobject(AerospikeClient *self, as_error *err,
-                             const as_record *rec, const as_key *key,
-                             PyObject **obj)
+as_status record_to_pyobject_with_options(AerospikeClient *self,
+                                          as_error *err, const as_record *rec,
+                                          const as_key *key, int options,
+                                          PyObject **obj)
 {
     as_error_reset(err);
     *obj = NULL;
@@ -1898,8 +2130,9 @@ as_status record_to_pyobject(AerospikeClient *self, as_error *err,
     PyObject *py_rec_meta = NULL;
     PyObject *py_rec_bins = NULL;
 
-    if (key_to_pyobject(err, key ? key : &rec->key, &py_rec_key) !=
-        AEROSPIKE_OK) {
+    if (!(options & RECORD_NO_KEY) &&
+        key_to_pyobject(self, err, key ? key : &rec->key, &py_rec_key) !=
+            AEROSPIKE_OK) {
         return err->code;
     }
 
@@ -1908,7 +2141,15 @@ as_status record_to_pyobject(AerospikeClient *self, as_error *err,
         return err->code;
     }
 
-    if (bins_to_pyobject(self, err, rec, &py_rec_bins) != AEROSPIKE_OK) {
+    if (options & RECORD_LAZY_BINS) {
+        py_rec_bins = AerospikeRecord_New(self, err, rec);
+    }
+    else {
+        bins_to_pyobject_with_options(self, err, rec,
+                                      options & RECORD_BLOB_VIEWS,
+                                      &py_rec_bins);
+    }
+    if (err->code != AEROSPIKE_OK) {
         Py_CLEAR(py_rec_key);
         Py_CLEAR(py_rec_meta);
         return err->code;
@@ -1938,7 +2179,29 @@ as_status record_to_pyobject(AerospikeClient *self, as_error *err,
     return err->code;
 }
 
-as_status key_to_pyobject(as_error *err, const as_key *key, PyObject **obj)
+as_status record_to_pyobject(AerospikeClient *self, as_error *err,
+                             const as_record *rec, const as_key *key,
+                             PyObject **obj)
+{
+    return record_to_pyobject_with_options(self, err, rec, key, 0, obj);
+}
+
+as_status query_result_to_pyobject(AerospikeClient *self, as_error *err,
+                                   const as_val *val, int record_options,
+                                   PyObject **py_val)
+{
+    if (record_options && as_val_type(val) == AS_REC) {
+        as_error_reset(err);
+        *py_val = NULL;
+        return record_to_pyobject_with_options(
+            self, err, as_record_fromval((as_val *)val), NULL, record_options,
+            py_val);
+    }
+    return val_to_pyobject(self, err, val, py_val);
+}
+
+as_status key_to_pyobject(AerospikeClient *self, as_error *err,
+                          const as_key *key, PyObject **obj)
 {
     as_error_reset(err);
 
@@ -1954,11 +2217,11 @@ as_status key_to_pyobject(as_error *err, const as_key *key, PyObject **obj)
     PyObject *py_digest = NULL;
 
     if (strlen(key->ns) > 0) {
-        py_namespace = PyUnicode_FromString(key->ns);
+        py_namespace = string_cache_get(self->strings, key->ns);
     }
 
     if (strlen(key->set) > 0) {
-        py_set = PyUnicode_FromString(key->set);
+        py_set = string_cache_get(self->strings, key->set);
     }
 
     if (key->valuep) {
@@ -2052,22 +2315,40 @@ static bool bins_to_pyobject_each(const char *name, const as_val *val,
     PyObject *py_bins = (PyObject *)convd->udata;
     PyObject *py_val = NULL;
 
-    val_to_pyobject(convd->client, err, val, &py_val);
+    if (convd->blob_as_memoryview && as_val_type(val) == AS_BYTES) {
+        deserialize_blob_as_memoryview(convd->client, (as_bytes *)val, &py_val,
+                                       err);
+    }
+    else {
+        val_to_pyobject(convd->client, err, val, &py_val);
+    }
 
     if (err->code != AEROSPIKE_OK) {
         return false;
     }
 
-    PyDict_SetItemString(py_bins, name, py_val);
+    PyObject *py_name = string_cache_get(convd->client->strings, name);
+    if (!py_name) {
+        PyErr_Clear();
+        Py_DECREF(py_val);
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to convert bin name");
+        return false;
+    }
+    PyDict_SetItem(py_bins, py_name, py_val);
 
+    Py_DECREF(py_name);
     Py_DECREF(py_val);
 
     convd->count++;
     return true;
 }
 
-as_status bins_to_pyobject(AerospikeClient *self, as_error *err,
-                           const as_record *rec, PyObject **py_bins)
+static as_status bins_to_pyobject_with_options(AerospikeClient *self,
+                                               as_error *err,
+                                               const as_record *rec,
+                                               bool blob_as_memoryview,
+                                               PyObject **py_bins)
 {
     as_error_reset(err);
 
@@ -2078,8 +2359,11 @@ as_status bins_to_pyobject(AerospikeClient *self, as_error *err,
 
     *py_bins = PyDict_New();
 
-    conversion_data convd = {
-        .err = err, .count = 0, .client = self, .udata = *py_bins};
+    conversion_data convd = {.err = err,
+                             .count = 0,
+                             .client = self,
+                             .udata = *py_bins,
+                             .blob_as_memoryview = blob_as_memoryview};
 
     as_record_foreach(rec, bins_to_pyobject_each, &convd);
 
@@ -2091,6 +2375,12 @@ as_status bins_to_pyobject(AerospikeClient *self, as_error *err,
     return err->code;
 }
 
+as_status bins_to_pyobject(AerospikeClient *self, as_error *err,
+                           const as_record *rec, PyObject **py_bins)
+{
+    return bins_to_pyobject_with_options(self, err, rec, false, py_bins);
+}
+
 /*
  * operate_bins_to_pyobject
  *
@@ -2134,7 +2424,9 @@ as_status operate_bins_to_pyobject(AerospikeClient *self, as_error *err,
                             "Null entry in operate ordered conversion");
             goto CLEANUP;
         }
-        py_bin_pair = Py_BuildValue("sO", as_bin_get_name(bin), py_bin_value);
+        py_bin_pair = Py_BuildValue(
+            "NO", string_cache_get(self->strings, as_bin_get_name(bin)),
+            py_bin_value);
         if (!py_bin_pair) {
             as_error_update(err, AEROSPIKE_ERR_CLIENT,
                             "Unable to build bin entry");
@@ -2249,8 +2541,13 @@ void initialize_bin_for_strictypes(AerospikeClient *self, as_error *err,
         binop_bin->valuep = (as_bin_value *)map;
     }
     else if (!strcmp(py_value->ob_type->tp_name, "aerospike.Geospatial")) {
-        PyObject *geo_data = PyObject_GetAttrString(py_value, "geo_data");
-        PyObject *geo_data_py_str = AerospikeGeospatial_DoDumps(geo_data, err);
+        PyObject *geo_data_py_str = AerospikeGeospatial_Get_Json(
+            (AerospikeGeospatial *)py_value, err);
+        if (!geo_data_py_str) {
+            as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                            "Unable to get GeoJSON string");
+            return;
+        }
         const char *geo_data_str = PyUnicode_AsUTF8(geo_data_py_str);
 
         // Make a copy of the encoding since the utf8 encoding points to a buffer in the PyUnicode object
@@ -2263,7 +2560,6 @@ void initialize_bin_for_strictypes(AerospikeClient *self, as_error *err,
 
         // Cleanup
         Py_XDECREF(geo_data_py_str);
-        Py_XDECREF(geo_data);
     }
     else if (!strcmp(py_value->ob_type->tp_name, "aerospike.null")) {
         ((as_val *)&binop_bin->value)->type = AS_UNKNOWN;
@@ -2688,10 +2984,13 @@ as_status get_int_from_py_int(as_error *err, PyObject *py_long,
 // checking_if_records_exist:
 // false if we want to get the record metadata and bins
 // true if we only care about the record's metadata
+// record_options:
+// the RECORD_* options of the record tuple
 as_status as_batch_result_to_BatchRecord(AerospikeClient *self, as_error *err,
                                          as_batch_result *bres,
                                          PyObject *py_batch_record,
-                                         bool checking_if_records_exist)
+                                         bool checking_if_records_exist,
+                                         int record_options)
 {
     as_status *result_code = &(bres->result);
     as_record *result_rec = &(bres->record);
@@ -2709,13 +3008,14 @@ as_status as_batch_result_to_BatchRecord(AerospikeClient *self, as_error *err,
     if (*result_code == AEROSPIKE_OK) {
         PyObject *rec = NULL;
         if (!checking_if_records_exist) {
-            record_to_pyobject(self, err, result_rec, bres->key, &rec);
+            record_to_pyobject_with_options(self, err, result_rec, bres->key,
+                                            record_options, &rec);
         }
         else {
             PyObject *py_result_key = NULL;
             PyObject *py_result_meta = NULL;
 
-            key_to_pyobject(err, bres->key, &py_result_key);
+            key_to_pyobject(self, err, bres->key, &py_result_key);
             metadata_to_pyobject(err, &(bres->record), &py_result_meta);
 
             rec = PyTuple_New(2);
@@ -2936,3 +3236,84 @@ error:
     Py_XDECREF(py_cluster_stats);
     return NULL;
 }
+
+// Values that the C client parsed directly into a bin or key are not heap-allocated,
+// so they are copied. Heap-allocated values (lists, maps, ...) are shared.
+as_val *copy_parsed_val(const as_val *val)
+{
+    if (val->free) {
+        return as_val_reserve((as_val *)val);
+    }
+
+    switch (as_val_type(val)) {
+    case AS_NIL:
+        return (as_val *)&as_nil;
+    case AS_BOOLEAN:
+        return (as_val *)as_boolean_new(
+            as_boolean_get((const as_boolean *)val));
+    case AS_INTEGER:
+        return (as_val *)as_integer_new(
+            as_integer_get((const as_integer *)val));
+    case AS_DOUBLE:
+        return (as_val *)as_double_new(as_double_get((const as_double *)val));
+    case AS_STRING: {
+        const as_string *str = (const as_string *)val;
+        size_t len = as_string_len((as_string *)str);
+        char *value = cf_malloc(len + 1);
+        memcpy(value, str->value, len);
+        value[len] = '\0';
+        return (as_val *)as_string_new_wlen(value, len, true);
+    }
+    case AS_GEOJSON: {
+        const as_geojson *geo = (const as_geojson *)val;
+        size_t len = as_geojson_len((as_geojson *)geo);
+        char *value = cf_malloc(len + 1);
+        memcpy(value, geo->value, len);
+        value[len] = '\0';
+        return (as_val *)as_geojson_new_wlen(value, len, true);
+    }
+    case AS_BYTES: {
+        const as_bytes *bytes = (const as_bytes *)val;
+        uint8_t *value = cf_malloc(bytes->size);
+        memcpy(value, bytes->value, bytes->size);
+        as_bytes *copy = as_bytes_new_wrap(value, bytes->size, true);
+        copy->type = bytes->type;
+        return (as_val *)copy;
+    }
+    default:
+        return NULL;
+    }
+}
+
+as_record *copy_parsed_record(const as_record *rec)
+{
+    as_record *copy = as_record_new(rec->bins.size);
+    if (!copy) {
+        return NULL;
+    }
+
+    copy->gen = rec->gen;
+    copy->ttl = rec->ttl;
+
+    as_key *key = &copy->key;
+    memcpy(key, &rec->key, sizeof(as_key));
+    key->_free = false;
+    key->valuep = NULL;
+    memset(&key->value, 0, sizeof(as_key_value));
+    if (rec->key.valuep) {
+        key->valuep = (as_key_value *)copy_parsed_val((as_val *)rec->key.valuep);
+    }
+
+    for (uint16_t i = 0; i < rec->bins.size; i++) {
+        const as_bin *bin = &rec->bins.entries[i];
+        as_val *value = bin->valuep ? copy_parsed_val((as_val *)bin->valuep)
+                                    : (as_val *)&as_nil;
+        if (!value) {
+            as_record_destroy(copy);
+            return NULL;
+        }
+        as_record_set(copy, bin->name, (as_bin_value *)value);
+    }
+
+    return copy;
+}
@@ -23,6 +23,7 @@
 #include <aerospike/as_vector.h>
 #include <aerospike/as_geojson.h>
 #include <aerospike/as_msgpack_ext.h>
+#include <aerospike/as_random.h>
 
 #include "client.h"
 #include "conversions.h"
@@ -33,6 +34,7 @@
 #include "geo.h"
 #include "cdt_types.h"
 #include "key_ordered_dict.h"
+#include "compiled_expression.h"
 
 // EXPR OPS
 enum expr_ops {
@@ -124,6 +126,11 @@ enum utiity_constants {
 // FIXED DICTIONARY KEYS
 #define LIST_ORDER_KEY "list_order"
 #define REGEX_OPTIONS_KEY "regex_options"
+#define AS_PY_PARAM_KEY "param"
+
+// Serializer of the values of expressions and of their parameters, so that a
+// parameter is packed the same way as the value it replaces
+#define EXP_VALUE_SERIALIZER SERIALIZER_PYTHON
 
 // UTILITY MACROS
 #define EXP_SZ(_expr) sizeof((as_exp_entry[]){_expr})
@@ -170,6 +177,10 @@ typedef struct {
     as_map_policy *map_policy;
 
     int64_t num_children;
+
+    // Set for the value of a parameter. Unique integer that is packed in place
+    // of the value, and found in the compiled expression afterwards
+    int64_t param_sentinel;
 } intermediate_expr;
 
 // FUNCTION DEFINITIONS
@@ -516,13 +527,24 @@ get_exp_val_from_pyval(AerospikeClient *self, as_static_pool *static_pool,
         *new_entry = tmp_entry;
     }
     else if (!strcmp(py_obj->ob_type->tp_name, "aerospike.Geospatial")) {
-        PyObject *py_parameter = PyUnicode_FromString("geo_data");
-        PyObject *py_data = PyObject_GenericGetAttr(py_obj, py_parameter);
-        Py_DECREF(py_parameter);
-        char *geo_value =
-            (char *)PyUnicode_AsUTF8(AerospikeGeospatial_DoDumps(py_data, err));
-        Py_DECREF(py_data);
-        as_exp_entry tmp_entry = as_exp_geo(geo_value);
+        PyObject *py_geo_json =
+            AerospikeGeospatial_Get_Json((AerospikeGeospatial *)py_obj, err);
+        if (!py_geo_json) {
+            return as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                                   "Unable to get GeoJSON string");
+        }
+        const char *geo_value = PyUnicode_AsUTF8(py_geo_json);
+        if (!geo_value) {
+            PyErr_Clear();
+            Py_DECREF(py_geo_json);
+            return as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                                   "Unable to get GeoJSON string");
+        }
+        // Copied like a string value, since the expression points to it
+        temp_expr->val.val_string_p = strdup(geo_value);
+        temp_expr->val_flag = VAL_STRING_P_ACTIVE;
+        Py_DECREF(py_geo_json);
+        as_exp_entry tmp_entry = as_exp_geo(temp_expr->val.val_string_p);
         *new_entry = tmp_entry;
     }
     else if (PyByteArray_Check(py_obj)) {
@@ -705,10 +727,25 @@ add_expr_macros(AerospikeClient *self, as_static_pool *static_pool,
         case VAL:
         case _AS_EXP_CODE_AS_VAL:;
             as_exp_entry tmp_expr;
-            if (get_exp_val_from_pyval(
-                    self, static_pool, serializer_type, &tmp_expr,
-                    PyDict_GetItemString(temp_expr->pydict, AS_PY_VAL_KEY),
-                    temp_expr, err) != AEROSPIKE_OK) {
+            PyObject *py_param_name =
+                PyDict_GetItemString(temp_expr->pydict, AS_PY_PARAM_KEY);
+            if (py_param_name) {
+                if (!PyUnicode_Check(py_param_name)) {
+                    return as_error_update(
+                        err, AEROSPIKE_ERR_PARAM,
+                        "Expression parameter name must be a string");
+                }
+                // Packed in 9 bytes, like any integer of at least 2^32
+                temp_expr->param_sentinel =
+                    (int64_t)(as_random_get_uint64() | ((uint64_t)1 << 62));
+                as_exp_entry tmp_entry = as_exp_int(temp_expr->param_sentinel);
+                tmp_expr = tmp_entry;
+            }
+            else if (get_exp_val_from_pyval(
+                         self, static_pool, serializer_type, &tmp_expr,
+                         PyDict_GetItemString(temp_expr->pydict,
+                                              AS_PY_VAL_KEY),
+                         temp_expr, err) != AEROSPIKE_OK) {
                 return err->code;
             }
 
@@ -1729,34 +1766,50 @@ add_expr_macros(AerospikeClient *self, as_static_pool *static_pool,
 */
 #define EXPR_INVALID_TYPE_MSG                                                  \
     "Expressions must be a non empty list of 4 element tuples, generated by "  \
-    "a compiled aerospike expression. For Query.where_with_expr(), it can "    \
-    "also be a base64 string."
+    "a compiled aerospike expression, or an aerospike.CompiledExpression. "    \
+    "For Query.where_with_expr(), it can also be a base64 string."
 
-as_status as_exp_new_from_pyobject(AerospikeClient *self, PyObject *py_expr,
-                                   as_exp **exp_list, as_error *err,
-                                   bool allow_base64_encoded_exprs)
+// Finds the position of the value of a parameter in exp
+static as_status find_param(as_error *err, as_exp *exp, int64_t sentinel,
+                            expression_param *param)
 {
-    int bottom = 0;
-
-    if (py_expr == NULL) {
-        as_error_update(err, AEROSPIKE_ERR_PARAM, EXPR_INVALID_TYPE_MSG);
-        goto FINISH_WITHOUT_CLEANUP;
-    }
-    else if (allow_base64_encoded_exprs && PyUnicode_Check(py_expr)) {
-        // We assume the string is base64 encoded
-        const char *expr_str = PyUnicode_AsUTF8(py_expr);
-        if (!expr_str) {
-            as_error_update(err, AEROSPIKE_ERR_PARAM,
-                            "Unable to convert Python base64 encoded "
-                            "expression to C string");
-            goto FINISH_WITHOUT_CLEANUP;
+    as_exp_entry entry = as_exp_int(sentinel);
+    as_exp *packed = as_exp_compile(&entry, 1);
+
+    uint32_t matches = 0;
+    for (uint32_t offset = 0; offset + packed->packed_sz <= exp->packed_sz;
+         offset++) {
+        if (!memcmp(&exp->packed[offset], packed->packed, packed->packed_sz)) {
+            param->offset = offset;
+            matches++;
         }
+    }
+    param->size = packed->packed_sz;
+    as_exp_destroy(packed);
 
-        as_exp *exp = as_exp_from_base64(expr_str);
-        *exp_list = exp;
-        goto FINISH_WITHOUT_CLEANUP;
+    if (matches != 1) {
+        return as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                               "Unable to find an expression parameter");
     }
-    else if (!PyList_Check(py_expr)) {
+    return AEROSPIKE_OK;
+}
+
+static int compare_param_offsets(const void *a, const void *b)
+{
+    uint32_t offset_a = ((const expression_param *)a)->offset;
+    uint32_t offset_b = ((const expression_param *)b)->offset;
+    return (offset_a > offset_b) - (offset_a < offset_b);
+}
+
+// Converts a list of expression tuples. The parameters of the expression are
+// appended to params, sorted by offset, with new references to their names
+static as_status exp_list_to_exp(AerospikeClient *self, PyObject *py_expr,
+                                 as_exp **exp_list, as_vector *params,
+                                 as_error *err)
+{
+    int bottom = 0;
+
+    if (!PyList_Check(py_expr)) {
         as_error_update(err, AEROSPIKE_ERR_PARAM, EXPR_INVALID_TYPE_MSG);
         goto FINISH_WITHOUT_CLEANUP;
     }
@@ -1846,7 +1899,7 @@ as_status as_exp_new_from_pyobject(AerospikeClient *self, PyObject *py_expr,
 
             if (get_cdt_ctx(self, err, temp_expr.ctx, temp_expr.pydict,
                             &ctx_in_use, &static_pool,
-                            SERIALIZER_PYTHON) != AEROSPIKE_OK) {
+                            EXP_VALUE_SERIALIZER) != AEROSPIKE_OK) {
                 goto CLEANUP;
             }
         }
@@ -1924,14 +1977,41 @@ as_status as_exp_new_from_pyobject(AerospikeClient *self, PyObject *py_expr,
         goto CLEANUP;
     }
 
-    if (add_expr_macros(self, &static_pool, SERIALIZER_PYTHON, unicodeStrVector,
-                        &intermediate_expr_queue, &c_expr_entries, &bottom,
-                        (int *)&size, err) != AEROSPIKE_OK) {
+    if (add_expr_macros(self, &static_pool, EXP_VALUE_SERIALIZER,
+                        unicodeStrVector, &intermediate_expr_queue,
+                        &c_expr_entries, &bottom, (int *)&size,
+                        err) != AEROSPIKE_OK) {
         goto CLEANUP;
     }
 
     *exp_list = as_exp_compile(c_expr_entries, bottom);
 
+    for (int i = 0; i < processed_exp_count; ++i) {
+        intermediate_expr *param_expr = (intermediate_expr *)as_vector_get(
+            &intermediate_expr_queue, (uint32_t)i);
+        if (!param_expr->param_sentinel) {
+            continue;
+        }
+
+        expression_param param;
+        if (find_param(err, *exp_list, param_expr->param_sentinel, &param) !=
+            AEROSPIKE_OK) {
+            as_exp_destroy(*exp_list);
+            *exp_list = NULL;
+            goto CLEANUP;
+        }
+        param.name = PyDict_GetItemString(param_expr->pydict, AS_PY_PARAM_KEY);
+        Py_INCREF(param.name);
+        as_vector_append(params, &param);
+    }
+
+    // Values are spliced in by increasing offset, which is not necessarily
+    // the order of the queue
+    if (params->size > 1) {
+        qsort(params->list, params->size, sizeof(expression_param),
+              compare_param_offsets);
+    }
+
 CLEANUP:
     if (is_building_temp_expr) {
         bool success = free_temp_expr(&temp_expr, err, is_ctx_initialized);
@@ -1968,6 +2048,232 @@ FINISH_WITHOUT_CLEANUP:
     return err->code;
 }
 
+as_status as_exp_new_with_params_from_pyobject(AerospikeClient *self,
+                                               PyObject *py_expr,
+                                               as_exp **exp_list,
+                                               expression_param **params,
+                                               uint32_t *n_params,
+                                               as_error *err)
+{
+    as_vector params_vector;
+    as_vector_init(&params_vector, sizeof(expression_param), 4);
+
+    *params = NULL;
+    *n_params = 0;
+
+    if (exp_list_to_exp(self, py_expr, exp_list, &params_vector, err) ==
+            AEROSPIKE_OK &&
+        params_vector.size) {
+        *n_params = params_vector.size;
+        *params = (expression_param *)cf_malloc(params_vector.size *
+                                                sizeof(expression_param));
+        memcpy(*params, params_vector.list,
+               params_vector.size * sizeof(expression_param));
+    }
+    else {
+        for (uint32_t i = 0; i < params_vector.size; i++) {
+            Py_DECREF(((expression_param *)as_vector_get(&params_vector, i))
+                          ->name);
+        }
+    }
+
+    as_vector_destroy(&params_vector);
+    return err->code;
+}
+
+as_status as_exp_new_from_pyobject_with_params(AerospikeClient *self,
+                                               PyObject *py_expr,
+                                               PyObject *py_params,
+                                               as_exp **exp_list, as_error *err,
+                                               bool allow_base64_encoded_exprs)
+{
+    if (py_expr == NULL) {
+        return as_error_update(err, AEROSPIKE_ERR_PARAM, EXPR_INVALID_TYPE_MSG);
+    }
+    else if (AerospikeCompiledExpression_Check(py_expr)) {
+        // Already converted by aerospike.compile_expression()
+        *exp_list = as_exp_copy_from_compiled(
+            self, err, (AerospikeCompiledExpression *)py_expr, py_params);
+        return err->code;
+    }
+    else if (allow_base64_encoded_exprs && PyUnicode_Check(py_expr)) {
+        // We assume the string is base64 encoded
+        const char *expr_str = PyUnicode_AsUTF8(py_expr);
+        if (!expr_str) {
+            return as_error_update(err, AEROSPIKE_ERR_PARAM,
+                                   "Unable to convert Python base64 encoded "
+                                   "expression to C string");
+        }
+
+        as_exp *exp = as_exp_from_base64(expr_str);
+        if (py_params) {
+            // Rejects any parameter, since the expression has none
+            *exp_list = as_exp_bind_params(self, err, exp, NULL, 0, py_params);
+            as_exp_destroy(exp);
+        }
+        else {
+            *exp_list = exp;
+        }
+        return err->code;
+    }
+
+    expression_param *params = NULL;
+    uint32_t n_params = 0;
+    as_exp *exp = NULL;
+    if (as_exp_new_with_params_from_pyobject(self, py_expr, &exp, &params,
+                                             &n_params, err) != AEROSPIKE_OK) {
+        return err->code;
+    }
+
+    if (n_params || py_params) {
+        *exp_list =
+            as_exp_bind_params(self, err, exp, params, n_params, py_params);
+        as_exp_destroy(exp);
+        expression_params_destroy(params, n_params);
+    }
+    else {
+        *exp_list = exp;
+    }
+    return err->code;
+}
+
+as_status as_exp_new_from_pyobject(AerospikeClient *self, PyObject *py_expr,
+                                   as_exp **exp_list, as_error *err,
+                                   bool allow_base64_encoded_exprs)
+{
+    return as_exp_new_from_pyobject_with_params(
+        self, py_expr, NULL, exp_list, err, allow_base64_encoded_exprs);
+}
+
+// Packs a value of a parameter like a value of an expression
+static as_exp *pack_param_value(AerospikeClient *self, as_error *err,
+                                PyObject *py_value)
+{
+    intermediate_expr temp_expr;
+    memset(&temp_expr, 0, sizeof(intermediate_expr));
+    as_exp *packed = NULL;
+
+    as_static_pool static_pool;
+    memset(&static_pool, 0, sizeof(static_pool));
+
+    as_exp_entry entry;
+    if (get_exp_val_from_pyval(self, &static_pool, EXP_VALUE_SERIALIZER,
+                               &entry, py_value, &temp_expr,
+                               err) == AEROSPIKE_OK) {
+        packed = as_exp_compile(&entry, 1);
+    }
+
+    free_temp_expr(&temp_expr, err, false);
+    POOL_DESTROY(&static_pool);
+    return packed;
+}
+
+as_exp *as_exp_bind_params(AerospikeClient *self, as_error *err, as_exp *exp,
+                           expression_param *params, uint32_t n_params,
+                           PyObject *py_params)
+{
+    as_exp *bound = NULL;
+    as_exp **values = NULL;
+
+    if (py_params == Py_None) {
+        py_params = NULL;
+    }
+
+    if (py_params) {
+        if (!PyDict_Check(py_params)) {
+            as_error_update(err, AEROSPIKE_ERR_PARAM,
+                            "expression_params must be a dict");
+            goto CLEANUP;
+        }
+
+        PyObject *py_name = NULL;
+        PyObject *py_value = NULL;
+        Py_ssize_t pos = 0;
+        while (PyDict_Next(py_params, &pos, &py_name, &py_value)) {
+            bool is_param = false;
+            for (uint32_t i = 0; i < n_params && !is_param; i++) {
+                int retval =
+                    PyObject_RichCompareBool(params[i].name, py_name, Py_EQ);
+                if (retval == -1) {
+                    PyErr_Clear();
+                }
+                is_param = retval == 1;
+            }
+            if (!is_param) {
+                const char *name =
+                    PyUnicode_Check(py_name) ? PyUnicode_AsUTF8(py_name) : NULL;
+                as_error_update(err, AEROSPIKE_ERR_PARAM,
+                                "The expression has no parameter %s",
+                                name ? name : "of this type");
+                goto CLEANUP;
+            }
+        }
+    }
+
+    size_t size = exp->packed_sz;
+    if (n_params) {
+        values = (as_exp **)cf_calloc(n_params, sizeof(as_exp *));
+    }
+
+    uint32_t end = 0;
+    for (uint32_t i = 0; i < n_params; i++) {
+        if (params[i].offset < end ||
+            params[i].offset + params[i].size > exp->packed_sz) {
+            as_error_update(err, AEROSPIKE_ERR_PARAM,
+                            "Expression parameters overlap or are out of "
+                            "order");
+            goto CLEANUP;
+        }
+        end = params[i].offset + params[i].size;
+    }
+
+    for (uint32_t i = 0; i < n_params; i++) {
+        PyObject *py_value =
+            py_params ? PyDict_GetItemWithError(py_params, params[i].name)
+                      : NULL;
+        if (!py_value) {
+            PyErr_Clear();
+            as_error_update(err, AEROSPIKE_ERR_PARAM,
+                            "Expression parameter %s has no value",
+                            PyUnicode_AsUTF8(params[i].name));
+            goto CLEANUP;
+        }
+
+        values[i] = pack_param_value(self, err, py_value);
+        if (!values[i]) {
+            goto CLEANUP;
+        }
+        size = size - params[i].size + values[i]->packed_sz;
+    }
+
+    // Copies the packed expression, with the value of each parameter in
+    // place of its sentinel
+    bound = (as_exp *)cf_malloc(sizeof(as_exp) + size);
+    bound->packed_sz = (uint32_t)size;
+
+    uint8_t *dst = bound->packed;
+    uint32_t src_offset = 0;
+    for (uint32_t i = 0; i < n_params; i++) {
+        memcpy(dst, &exp->packed[src_offset], params[i].offset - src_offset);
+        dst += params[i].offset - src_offset;
+        memcpy(dst, values[i]->packed, values[i]->packed_sz);
+        dst += values[i]->packed_sz;
+        src_offset = params[i].offset + params[i].size;
+    }
+    memcpy(dst, &exp->packed[src_offset], exp->packed_sz - src_offset);
+
+CLEANUP:
+    if (values) {
+        for (uint32_t i = 0; i < n_params; i++) {
+            if (values[i]) {
+                as_exp_destroy(values[i]);
+            }
+        }
+        cf_free(values);
+    }
+    return bound;
+}
+
 // Returns true if successful, false if not
 static bool free_temp_expr(intermediate_expr *temp_expr, as_error *err,
                            bool is_ctx_initialized)
@@ -0,0 +1,260 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+#include <stdbool.h>
+
+#include <aerospike/aerospike.h>
+#include <aerospike/as_error.h>
+#include <aerospike/as_cluster.h>
+#include <aerospike/as_thread_pool.h>
+#include <citrusleaf/alloc.h>
+
+#include "exceptions.h"
+#include "future.h"
+
+// Futures run on the C client's thread pool. Batch, query and scan commands
+// queue their per-node tasks to the same pool and wait for them, so one of
+// its threads is always left free for those tasks. Otherwise a command run in
+// a future could wait forever on tasks queued behind other futures.
+struct future_task_s {
+    AerospikeClient *client;
+    PyObject *py_method;
+    PyObject *py_args;
+    PyObject *py_kwds;
+    PyObject *py_future;
+    // Next future waiting for a thread
+    future_task *next;
+};
+
+static PyObject *fetch_raised_exception(void)
+{
+#if PY_MAJOR_VERSION == 3 && PY_MINOR_VERSION >= 12
+    return PyErr_GetRaisedException();
+#else
+    PyObject *py_type, *py_value, *py_traceback;
+    PyErr_Fetch(&py_type, &py_value, &py_traceback);
+    PyErr_NormalizeException(&py_type, &py_value, &py_traceback);
+    if (py_value && py_traceback) {
+        PyException_SetTraceback(py_value, py_traceback);
+    }
+    Py_XDECREF(py_type);
+    Py_XDECREF(py_traceback);
+    return py_value;
+#endif
+}
+
+static void free_future_task(future_task *task)
+{
+    Py_DECREF(task->client);
+    Py_DECREF(task->py_method);
+    Py_DECREF(task->py_args);
+    Py_XDECREF(task->py_kwds);
+    Py_DECREF(task->py_future);
+    cf_free(task);
+}
+
+// Completes the future with the result of the method, or with the exception
+// it raised. Neither is set if the future was cancelled while it was waiting.
+// If run is false, the future is completed with the exception that has
+// already been raised instead of calling the method.
+static void complete_future(future_task *task, bool run)
+{
+    PyObject *py_exc = run ? NULL : fetch_raised_exception();
+
+    // Returns False if the future was cancelled while it was queued
+    PyObject *py_running = PyObject_CallMethod(
+        task->py_future, "set_running_or_notify_cancel", NULL);
+
+    if (py_running == Py_True) {
+        PyObject *py_result = NULL;
+        if (run) {
+            // The command releases the GIL while it waits on the network
+            py_result =
+                PyObject_Call(task->py_method, task->py_args, task->py_kwds);
+            if (!py_result) {
+                py_exc = fetch_raised_exception();
+            }
+        }
+
+        PyObject *py_set_return = NULL;
+        if (py_result) {
+            py_set_return = PyObject_CallMethod(task->py_future, "set_result",
+                                                "O", py_result);
+            Py_DECREF(py_result);
+        }
+        else {
+            py_set_return = PyObject_CallMethod(
+                task->py_future, "set_exception", "O",
+                py_exc ? py_exc : Py_None);
+        }
+        Py_XDECREF(py_set_return);
+    }
+    Py_XDECREF(py_running);
+    Py_XDECREF(py_exc);
+
+    // Nobody can handle an error raised while completing the future
+    if (PyErr_Occurred()) {
+        PyErr_WriteUnraisable(task->py_future);
+    }
+}
+
+static void run_future_task(void *udata);
+
+// Returns NULL if the client isn't connected
+static as_thread_pool *get_thread_pool(AerospikeClient *client)
+{
+    if (!client->is_conn_16 || !client->as || !client->as->cluster) {
+        return NULL;
+    }
+    return &client->as->cluster->thread_pool;
+}
+
+// Queues waiting futures to the client's thread pool until only one of its
+// threads is left for the tasks of batch, query and scan commands.
+// Must be called with the GIL held.
+static void dispatch_pending_futures(AerospikeClient *client)
+{
+    while (client->pending_futures) {
+        as_thread_pool *pool = get_thread_pool(client);
+        if (pool && client->running_futures + 1 >= pool->thread_size) {
+            return;
+        }
+
+        future_task *task = client->pending_futures;
+        client->pending_futures = task->next;
+        if (!client->pending_futures) {
+            client->last_pending_future = NULL;
+        }
+        task->next = NULL;
+
+        as_error err;
+        as_error_init(&err);
+        if (!pool) {
+            // The client was closed while the future was waiting
+            as_error_update(&err, AEROSPIKE_ERR_CLUSTER,
+                            "No connection to aerospike cluster");
+        }
+        else if (as_thread_pool_queue_task(pool, run_future_task, task) !=
+                 0) {
+            as_error_update(&err, AEROSPIKE_ERR_CLIENT,
+                            "Failed to queue command to thread pool");
+        }
+
+        if (err.code != AEROSPIKE_OK) {
+            raise_exception(&err);
+            complete_future(task, false);
+            free_future_task(task);
+            continue;
+        }
+        client->running_futures++;
+    }
+}
+
+static void run_future_task(void *udata)
+{
+    future_task *task = (future_task *)udata;
+
+    PyGILState_STATE gstate;
+    gstate = PyGILState_Ensure();
+
+    complete_future(task, true);
+
+    AerospikeClient *client = task->client;
+    client->running_futures--;
+    dispatch_pending_futures(client);
+    free_future_task(task);
+
+    PyGILState_Release(gstate);
+}
+
+PyObject *submit_future(AerospikeClient *client, PyObject *py_obj,
+                        const char *method_name, PyObject *args,
+                        PyObject *kwds)
+{
+    as_error err;
+    as_error_init(&err);
+
+    as_thread_pool *pool = get_thread_pool(client);
+    if (!pool) {
+        as_error_update(&err, AEROSPIKE_ERR_CLUSTER,
+                        "No connection to aerospike cluster");
+        goto CLEANUP;
+    }
+    if (pool->thread_size < 2) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                        "config[\"thread_pool_size\"] must be at least 2 to "
+                        "run commands in futures");
+        goto CLEANUP;
+    }
+
+    PyObject *py_method = PyObject_GetAttrString(py_obj, method_name);
+    if (!py_method) {
+        return NULL;
+    }
+
+    PyObject *py_futures_module = PyImport_ImportModule("concurrent.futures");
+    if (!py_futures_module) {
+        Py_DECREF(py_method);
+        return NULL;
+    }
+    PyObject *py_future =
+        PyObject_CallMethod(py_futures_module, "Future", NULL);
+    Py_DECREF(py_futures_module);
+    if (!py_future) {
+        Py_DECREF(py_method);
+        return NULL;
+    }
+
+    // Freed by the thread that runs it
+    future_task *task = cf_malloc(sizeof(future_task));
+    task->client = client;
+    Py_INCREF(client);
+    task->py_method = py_method;
+    task->py_args = args;
+    Py_INCREF(args);
+    task->py_kwds = kwds;
+    Py_XINCREF(kwds);
+    task->py_future = py_future;
+    Py_INCREF(py_future);
+    task->next = NULL;
+
+    if (client->last_pending_future) {
+        client->last_pending_future->next = task;
+    }
+    else {
+        client->pending_futures = task;
+    }
+    client->last_pending_future = task;
+
+    dispatch_pending_futures(client);
+
+    return py_future;
+
+CLEANUP:
+    raise_exception(&err);
+    return NULL;
+}
+
+void reset_futures_after_fork(AerospikeClient *client)
+{
+    // The futures that were running or waiting belong to the parent process.
+    // Their tasks are leaked, since running them again in the child would
+    // repeat the parent's commands.
+    client->running_futures = 0;
+    client->pending_futures = NULL;
+    client->last_pending_future = NULL;
+}
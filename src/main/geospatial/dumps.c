@@ -70,7 +70,7 @@ PyObject *AerospikeGeospatial_Dumps(AerospikeGeospatial *self, PyObject *args,
         goto CLEANUP;
     }
 
-    initresult = AerospikeGeospatial_DoDumps(self->geo_data, &err);
+    initresult = AerospikeGeospatial_Get_Json(self, &err);
     if (!initresult) {
         as_error_update(&err, AEROSPIKE_ERR_CLIENT,
                         "Unable to call dumps function");
@@ -32,9 +32,39 @@
 /*******************************************************************************
  * PYTHON TYPE METHODS
  ******************************************************************************/
-static PyMemberDef AerospikeGeospatial_Type_Members[] = {
-    {"geo_data", T_OBJECT, offsetof(AerospikeGeospatial, geo_data), 0,
-     "The aerospike.GeoJSON object"},
+static PyObject *AerospikeGeospatial_Get_Geo_Data(AerospikeGeospatial *self,
+                                                  void *closure)
+{
+    as_error err;
+    as_error_init(&err);
+
+    PyObject *py_geodata = AerospikeGeospatial_Get_Data(self, &err);
+    if (err.code != AEROSPIKE_OK) {
+        raise_exception(&err);
+        return NULL;
+    }
+    if (!py_geodata) {
+        Py_RETURN_NONE;
+    }
+    Py_INCREF(py_geodata);
+    return py_geodata;
+}
+
+static int AerospikeGeospatial_Set_Geo_Data(AerospikeGeospatial *self,
+                                            PyObject *py_geodata,
+                                            void *closure)
+{
+    Py_XINCREF(py_geodata);
+    Py_XDECREF(self->geo_data);
+    self->geo_data = py_geodata;
+    Py_CLEAR(self->geo_json);
+    return 0;
+}
+
+static PyGetSetDef AerospikeGeospatial_Type_Getset[] = {
+    {"geo_data", (getter)AerospikeGeospatial_Get_Geo_Data,
+     (setter)AerospikeGeospatial_Set_Geo_Data, "The aerospike.GeoJSON object",
+     NULL},
     {NULL}};
 static PyMethodDef AerospikeGeospatial_Type_Methods[] = {
 
@@ -70,6 +100,7 @@ void store_geodata(AerospikeGeospatial *self, as_error *err,
             Py_DECREF(self->geo_data);
         }
         self->geo_data = py_geodata;
+        Py_CLEAR(self->geo_json);
     }
     else {
         as_error_update(
@@ -148,7 +179,7 @@ AerospikeGeospatial *self;
         goto CLEANUP;
     }
 
-    initresult = AerospikeGeospatial_DoDumps(self->geo_data, &err);
+    initresult = AerospikeGeospatial_Get_Json(self, &err);
     if (!initresult) {
         as_error_update(&err, AEROSPIKE_ERR_CLIENT,
                         "Unable to call get data in str format");
@@ -191,7 +222,7 @@ AerospikeGeospatial *self;
         goto CLEANUP;
     }
 
-    initresult = AerospikeGeospatial_DoDumps(self->geo_data, &err);
+    initresult = AerospikeGeospatial_Get_Json(self, &err);
     if (!initresult) {
         as_error_update(&err, AEROSPIKE_ERR_CLIENT,
                         "Unable to call get data in str format");
@@ -209,9 +240,8 @@ CLEANUP:
 }
 static void AerospikeGeospatial_Type_Dealloc(AerospikeGeospatial *self)
 {
-    if (self->geo_data) {
-        Py_DECREF(self->geo_data);
-    }
+    Py_XDECREF(self->geo_data);
+    Py_XDECREF(self->geo_json);
     Py_TYPE(self)->tp_free((PyObject *)self);
 }
 
@@ -251,8 +281,8 @@ static PyTypeObject AerospikeGeospatial_Type = {
     0,                                // tp_iter
     0,                                // tp_iternext
     AerospikeGeospatial_Type_Methods, // tp_methods
-    AerospikeGeospatial_Type_Members, // tp_members
-    0,                                // tp_getset
+    0,                                // tp_members
+    AerospikeGeospatial_Type_Getset,  // tp_getset
     0,                                // tp_base
     0,                                // tp_dict
     0,                                // tp_descr_get
@@ -363,3 +393,58 @@ PyObject *AerospikeGeospatial_New(as_error *err, PyObject *value)
     Py_XINCREF(self->geo_data);
     return (PyObject *)self;
 }
+
+PyObject *AerospikeGeospatial_New_From_Json(as_error *err, const char *json)
+{
+    PyObject *py_json = PyUnicode_FromString(json);
+    if (!py_json) {
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to decode GeoJSON string");
+        return NULL;
+    }
+
+    AerospikeGeospatial *self =
+        (AerospikeGeospatial *)AerospikeGeospatial_Type.tp_new(
+            &AerospikeGeospatial_Type, Py_None, Py_None);
+    if (!self) {
+        Py_DECREF(py_json);
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to create aerospike.GeoJSON object");
+        return NULL;
+    }
+    // The string is only parsed if the geospatial data is accessed
+    self->geo_json = py_json;
+    return (PyObject *)self;
+}
+
+/*
+ * Returns a borrowed reference to the geospatial data, parsing the GeoJSON
+ * string read from the server if needed.
+ * The caller may modify the data, so the string is not reused after this.
+ */
+PyObject *AerospikeGeospatial_Get_Data(AerospikeGeospatial *self,
+                                       as_error *err)
+{
+    if (!self->geo_data && self->geo_json) {
+        self->geo_data = AerospikeGeospatial_DoLoads(self->geo_json, err);
+        if (!self->geo_data) {
+            return NULL;
+        }
+    }
+    Py_CLEAR(self->geo_json);
+    return self->geo_data;
+}
+
+/*
+ * Returns a new reference to the GeoJSON string of the object.
+ * The string read from the server is returned as is.
+ */
+PyObject *AerospikeGeospatial_Get_Json(AerospikeGeospatial *self,
+                                       as_error *err)
+{
+    if (self->geo_json) {
+        Py_INCREF(self->geo_json);
+        return self->geo_json;
+    }
+    return AerospikeGeospatial_DoDumps(self->geo_data, err);
+}
@@ -30,7 +30,7 @@ PyObject *AerospikeGeospatial_Unwrap(AerospikeGeospatial *self, PyObject *args,
                                      PyObject *kwds)
 {
 
-    // Python function arguments
+    PyObject *py_geodata = NULL;
     // Python function keyword arguments
     static char *kwlist[] = {NULL};
 
@@ -48,6 +48,8 @@ PyObject *AerospikeGeospatial_Unwrap(AerospikeGeospatial *self, PyObject *args,
         goto CLEANUP;
     }
 
+    py_geodata = AerospikeGeospatial_Get_Data(self, &err);
+
 CLEANUP:
 
     // If an error occurred, tell Python.
@@ -55,6 +57,9 @@ CLEANUP:
         raise_exception(&err);
         return NULL;
     }
-    Py_INCREF(self->geo_data);
-    return self->geo_data;
+    if (!py_geodata) {
+        Py_RETURN_NONE;
+    }
+    Py_INCREF(py_geodata);
+    return py_geodata;
 }
@@ -0,0 +1,157 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+
+#include <aerospike/as_error.h>
+
+#include "helper_types.h"
+
+struct helper_type_entry {
+    const char *module_name;
+    const char *class_name;
+    // Set the first time the class is used
+    PyObject *py_class;
+};
+
+// Indexed by helper_type
+static struct helper_type_entry helper_types[HELPER_TYPE_COUNT] = {
+    [HELPER_TYPE_HYPERLOGLOG] = {"aerospike_helpers", "HyperLogLog", NULL},
+    [HELPER_TYPE_BATCH_RECORDS] = {"aerospike_helpers.batch.records",
+                                   "BatchRecords", NULL},
+    [HELPER_TYPE_BATCH_RECORD] = {"aerospike_helpers.batch.records",
+                                  "BatchRecord", NULL},
+    [HELPER_TYPE_COLUMNS] = {"aerospike_helpers.columns", "Columns", NULL},
+};
+
+PyObject *get_helper_type(as_error *err, helper_type type)
+{
+    struct helper_type_entry *entry = &helper_types[type];
+    if (entry->py_class) {
+        return entry->py_class;
+    }
+
+    PyObject *py_module = PyImport_ImportModule(entry->module_name);
+    if (!py_module) {
+        PyErr_Clear();
+        as_error_update(err, AEROSPIKE_ERR_CLIENT, "Unable to import %s module",
+                        entry->module_name);
+        return NULL;
+    }
+
+    PyObject *py_class = PyObject_GetAttrString(py_module, entry->class_name);
+    Py_DECREF(py_module);
+    if (!py_class || !PyType_Check(py_class)) {
+        PyErr_Clear();
+        Py_XDECREF(py_class);
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to import %s class from %s module",
+                        entry->class_name, entry->module_name);
+        return NULL;
+    }
+
+    // Kept until the process exits
+    entry->py_class = py_class;
+    return py_class;
+}
+
+PyObject *new_hyperloglog(as_error *err, const char *bytes, Py_ssize_t size)
+{
+    PyObject *py_class = get_helper_type(err, HELPER_TYPE_HYPERLOGLOG);
+    if (!py_class) {
+        return NULL;
+    }
+
+    PyObject *py_args = Py_BuildValue("(y#)", bytes, size);
+    if (!py_args) {
+        PyErr_Clear();
+        as_error_update(
+            err, AEROSPIKE_ERR_CLIENT,
+            "Unable to convert C client's as_bytes to Python bytes");
+        return NULL;
+    }
+
+    // HyperLogLog.__new__() only calls bytes.__new__(), so it is called
+    // directly
+    PyObject *py_hll =
+        PyBytes_Type.tp_new((PyTypeObject *)py_class, py_args, NULL);
+    Py_DECREF(py_args);
+    if (!py_hll) {
+        PyErr_Clear();
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to create HyperLogLog instance");
+    }
+    return py_hll;
+}
+
+PyObject *new_batch_record(as_error *err, PyObject *py_key)
+{
+    PyTypeObject *py_class =
+        (PyTypeObject *)get_helper_type(err, HELPER_TYPE_BATCH_RECORD);
+    if (!py_class) {
+        return NULL;
+    }
+
+    PyObject *py_args = PyTuple_Pack(1, py_key);
+    if (!py_args) {
+        goto ERROR;
+    }
+
+    // Same as BatchRecord(py_key), without looking up the class or calling it
+    // through the type's __call__
+    PyObject *py_batch_record = py_class->tp_new(py_class, py_args, NULL);
+    if (py_batch_record &&
+        py_class->tp_init(py_batch_record, py_args, NULL) < 0) {
+        Py_CLEAR(py_batch_record);
+    }
+    Py_DECREF(py_args);
+    if (!py_batch_record) {
+        goto ERROR;
+    }
+
+    return py_batch_record;
+
+ERROR:
+    PyErr_Clear();
+    as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                    "Unable to create BatchRecord instance");
+    return NULL;
+}
+
+PyObject *new_batch_records(as_error *err)
+{
+    PyObject *py_class = get_helper_type(err, HELPER_TYPE_BATCH_RECORDS);
+    if (!py_class) {
+        return NULL;
+    }
+
+    PyObject *py_list = PyList_New(0);
+    if (!py_list) {
+        PyErr_Clear();
+        as_error_update(err, AEROSPIKE_ERR_CLIENT, "Unable to create list");
+        return NULL;
+    }
+
+    PyObject *py_batch_records =
+        PyObject_CallFunctionObjArgs(py_class, py_list, NULL);
+    Py_DECREF(py_list);
+    if (!py_batch_records) {
+        PyErr_Clear();
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to instance BatchRecords");
+    }
+    return py_batch_records;
+}
@@ -35,6 +35,7 @@
 #include "policy.h"
 #include "macros.h"
 #include "policy_config.h"
+#include "prepared_policy.h"
 
 #define MAP_WRITE_FLAGS_KEY "map_write_flags"
 #define BIT_WRITE_FLAGS_KEY "bit_write_flags"
@@ -115,8 +116,11 @@
         }                                                                      \
         Py_DECREF(py_field_name);                                              \
         if (py_exp_list) {                                                     \
-            if (as_exp_new_from_pyobject(self, py_exp_list, exp_list_p, err,   \
-                                         false) == AEROSPIKE_OK) {             \
+            PyObject *py_exp_params =                                          \
+                PyDict_GetItemString(py_policy, "expression_params");          \
+            if (as_exp_new_from_pyobject_with_params(                          \
+                    self, py_exp_list, py_exp_params, exp_list_p, err,         \
+                    false) == AEROSPIKE_OK) {                                  \
                 policy->filter_exp = *exp_list_p;                              \
             }                                                                  \
             else {                                                             \
@@ -229,6 +233,56 @@ as_status set_query_options(as_error *err, PyObject *query_options,
     return AEROSPIKE_OK;
 }
 
+// Reads a client-side bool option of a policy
+static as_status get_bool_option(as_error *err, PyObject *py_policy,
+                                 const char *name, bool default_value,
+                                 bool *value)
+{
+    *value = default_value;
+    if (!py_policy || !PyDict_Check(py_policy)) {
+        return AEROSPIKE_OK;
+    }
+
+    PyObject *py_value = PyDict_GetItemString(py_policy, name);
+    if (py_value) {
+        if (!PyBool_Check(py_value)) {
+            return as_error_update(err, AEROSPIKE_ERR_PARAM,
+                                   "%s value must be a bool", name);
+        }
+        *value = py_value == Py_True;
+    }
+    return AEROSPIKE_OK;
+}
+
+as_status get_record_options(as_error *err, PyObject *py_policy,
+                             int *record_options)
+{
+    bool lazy_records = false;
+    bool blob_as_memoryview = false;
+    bool return_key = true;
+
+    *record_options = 0;
+    if (get_bool_option(err, py_policy, "lazy_records", false,
+                        &lazy_records) != AEROSPIKE_OK ||
+        get_bool_option(err, py_policy, "blob_as_memoryview", false,
+                        &blob_as_memoryview) != AEROSPIKE_OK ||
+        get_bool_option(err, py_policy, "return_key", true, &return_key) !=
+            AEROSPIKE_OK) {
+        return err->code;
+    }
+
+    if (lazy_records) {
+        *record_options |= RECORD_LAZY_BINS;
+    }
+    if (blob_as_memoryview) {
+        *record_options |= RECORD_BLOB_VIEWS;
+    }
+    if (!return_key) {
+        *record_options |= RECORD_NO_KEY;
+    }
+    return AEROSPIKE_OK;
+}
+
 /**
  * Converts a PyObject into an as_policy_admin object.
  * Returns AEROSPIKE_OK on success. On error, the err argument is populated.
@@ -309,6 +363,25 @@ static inline void check_and_set_txn_field(as_error *err,
     policy_base->txn = py_txn->txn;
 }
 
+// Sets the fields of the base policy that point to memory owned by the
+// command or by a Python object, so they are never cached
+static inline as_status set_policy_base_references(AerospikeClient *self,
+                                                   as_error *err,
+                                                   PyObject *py_policy,
+                                                   as_policy_base *policy,
+                                                   as_exp **exp_list_p)
+{
+    // Setting txn field to a non-NULL value in a query or scan policy is a no-op,
+    // so this is safe to call for a scan/query policy's base policy
+    check_and_set_txn_field(err, policy, py_policy);
+    if (err->code != AEROSPIKE_OK) {
+        return err->code;
+    }
+
+    POLICY_SET_EXPRESSIONS_FIELD();
+    return AEROSPIKE_OK;
+}
+
 static inline as_status pyobject_to_policy_base(AerospikeClient *self,
                                                 as_error *err,
                                                 PyObject *py_policy,
@@ -323,17 +396,59 @@ static inline as_status pyobject_to_policy_base(AerospikeClient *self,
     POLICY_SET_FIELD(compress, bool);
     POLICY_SET_FIELD(connect_timeout, uint32_t);
 
-    // Setting txn field to a non-NULL value in a query or scan policy is a no-op,
-    // so this is safe to call for a scan/query policy's base policy
-    check_and_set_txn_field(err, policy, py_policy);
-    if (err->code != AEROSPIKE_OK) {
-        return err->code;
+    return set_policy_base_references(self, err, py_policy, policy, exp_list_p);
+}
+
+// Returns true if policy was copied from the conversion cached by a prepared
+// policy, for the same kind of policy and the same client policy
+static bool load_prepared_policy(PyObject *py_policy,
+                                 prepared_policy_kind kind,
+                                 const void *config_policy, void *policy,
+                                 size_t size)
+{
+    AerospikePreparedPolicy *prepared = as_prepared_policy(py_policy);
+    if (!prepared || !prepared->cached || prepared->cached_kind != kind ||
+        memcmp(&prepared->cached_config, config_policy, size)) {
+        return false;
     }
+    memcpy(policy, &prepared->cached_policy, size);
+    return true;
+}
 
-    POLICY_SET_EXPRESSIONS_FIELD();
-    return AEROSPIKE_OK;
+static void store_prepared_policy(PyObject *py_policy,
+                                  prepared_policy_kind kind,
+                                  const void *config_policy,
+                                  const void *policy, size_t size)
+{
+    AerospikePreparedPolicy *prepared = as_prepared_policy(py_policy);
+    if (!prepared) {
+        return;
+    }
+    memcpy(&prepared->cached_config, config_policy, size);
+    memcpy(&prepared->cached_policy, policy, size);
+    // Set again by each command, by set_policy_base_references()
+    as_policy_base *base = (as_policy_base *)&prepared->cached_policy;
+    base->filter_exp = NULL;
+    base->txn = NULL;
+    prepared->cached_kind = kind;
+    prepared->cached = true;
 }
 
+// Every as_policy_* struct below starts with its as_policy_base
+#define PREPARED_POLICY_LOAD(__kind, __config_policy)                          \
+    if (load_prepared_policy(py_policy, __kind, __config_policy, policy,       \
+                             sizeof(*policy))) {                               \
+        if (set_policy_base_references(self, err, py_policy, &policy->base,    \
+                                       exp_list_p) == AEROSPIKE_OK) {          \
+            POLICY_UPDATE();                                                   \
+        }                                                                      \
+        return err->code;                                                      \
+    }
+
+#define PREPARED_POLICY_STORE(__kind, __config_policy)                         \
+    store_prepared_policy(py_policy, __kind, __config_policy, policy,          \
+                          sizeof(*policy));
+
 /**
  * Converts a PyObject into an as_policy_apply object.
  * Returns AEROSPIKE_OK on success. On error, the err argument is populated.
@@ -354,6 +469,8 @@ as_status pyobject_to_policy_apply(AerospikeClient *self, as_error *err,
     as_policy_apply_copy(config_apply_policy, policy);
 
     if (py_policy && py_policy != Py_None) {
+        PREPARED_POLICY_LOAD(PREPARED_POLICY_APPLY, config_apply_policy);
+
         if (self->validate_keys) {
             as_status retval = does_py_dict_contain_valid_keys(
                 err, py_policy, py_apply_policy_valid_keys,
@@ -382,6 +499,8 @@ as_status pyobject_to_policy_apply(AerospikeClient *self, as_error *err,
         POLICY_SET_FIELD(durable_delete, bool);
         POLICY_SET_FIELD(ttl, uint32_t);
         POLICY_SET_FIELD(on_locking_only, bool);
+
+        PREPARED_POLICY_STORE(PREPARED_POLICY_APPLY, config_apply_policy);
     }
 
     // Update the policy
@@ -470,6 +589,8 @@ as_status pyobject_to_policy_query(AerospikeClient *self, as_error *err,
     as_policy_query_copy(config_query_policy, policy);
 
     if (py_policy && py_policy != Py_None) {
+        PREPARED_POLICY_LOAD(PREPARED_POLICY_QUERY, config_query_policy);
+
         if (self->validate_keys) {
             as_status retval = does_py_dict_contain_valid_keys(
                 err, py_policy, py_query_policy_valid_keys,
@@ -496,6 +617,8 @@ as_status pyobject_to_policy_query(AerospikeClient *self, as_error *err,
         POLICY_SET_FIELD(short_query, bool);
 
         POLICY_SET_FIELD(expected_duration, as_query_duration);
+
+        PREPARED_POLICY_STORE(PREPARED_POLICY_QUERY, config_query_policy);
     }
 
     // Update the policy
@@ -525,6 +648,8 @@ as_status pyobject_to_policy_read(AerospikeClient *self, as_error *err,
     as_policy_read_copy(config_read_policy, policy);
 
     if (py_policy && py_policy != Py_None) {
+        PREPARED_POLICY_LOAD(PREPARED_POLICY_READ, config_read_policy);
+
         if (self->validate_keys) {
             as_status retval = does_py_dict_contain_valid_keys(
                 err, py_policy, py_read_policy_valid_keys,
@@ -554,6 +679,8 @@ as_status pyobject_to_policy_read(AerospikeClient *self, as_error *err,
         // 4.0.0 new policies
         POLICY_SET_FIELD(read_mode_ap, as_policy_read_mode_ap);
         POLICY_SET_FIELD(read_mode_sc, as_policy_read_mode_sc);
+
+        PREPARED_POLICY_STORE(PREPARED_POLICY_READ, config_read_policy);
     }
 
     // Update the policy
@@ -583,6 +710,8 @@ as_status pyobject_to_policy_remove(AerospikeClient *self, as_error *err,
     as_policy_remove_copy(config_remove_policy, policy);
 
     if (py_policy && py_policy != Py_None) {
+        PREPARED_POLICY_LOAD(PREPARED_POLICY_REMOVE, config_remove_policy);
+
         if (self->validate_keys) {
             as_status retval = does_py_dict_contain_valid_keys(
                 err, py_policy, py_remove_policy_valid_keys,
@@ -611,6 +740,8 @@ as_status pyobject_to_policy_remove(AerospikeClient *self, as_error *err,
         POLICY_SET_FIELD(commit_level, as_policy_commit_level);
         POLICY_SET_FIELD(replica, as_policy_replica);
         POLICY_SET_FIELD(durable_delete, bool);
+
+        PREPARED_POLICY_STORE(PREPARED_POLICY_REMOVE, config_remove_policy);
     }
 
     // Update the policy
@@ -640,6 +771,8 @@ pyobject_to_policy_scan(AerospikeClient *self, as_error *err,
     as_policy_scan_copy(config_scan_policy, policy);
 
     if (py_policy && py_policy != Py_None) {
+        PREPARED_POLICY_LOAD(PREPARED_POLICY_SCAN, config_scan_policy);
+
         if (self->validate_keys) {
             PyObject *py_policy_valid_keys = NULL;
             if (py_policy_also_supports_info_policy_fields) {
@@ -673,6 +806,8 @@ pyobject_to_policy_scan(AerospikeClient *self, as_error *err,
         POLICY_SET_FIELD(max_records, uint64_t);
         POLICY_SET_FIELD(replica, as_policy_replica);
         POLICY_SET_FIELD(ttl, uint32_t);
+
+        PREPARED_POLICY_STORE(PREPARED_POLICY_SCAN, config_scan_policy);
     }
 
     // Update the policy
@@ -701,6 +836,8 @@ as_status pyobject_to_policy_write(
     as_policy_write_copy(config_write_policy, policy);
 
     if (py_policy && py_policy != Py_None) {
+        PREPARED_POLICY_LOAD(PREPARED_POLICY_WRITE, config_write_policy);
+
         if (self->validate_keys) {
             PyObject *py_policy_valid_keys = NULL;
             if (py_policy_also_supports_info_policy_fields) {
@@ -738,6 +875,8 @@ as_status pyobject_to_policy_write(
         POLICY_SET_FIELD(ttl, uint32_t);
         POLICY_SET_FIELD(compression_threshold, uint32_t);
         POLICY_SET_FIELD(on_locking_only, bool);
+
+        PREPARED_POLICY_STORE(PREPARED_POLICY_WRITE, config_write_policy);
     }
 
     // Update the policy
@@ -767,6 +906,8 @@ as_status pyobject_to_policy_operate(AerospikeClient *self, as_error *err,
     as_policy_operate_copy(config_operate_policy, policy);
 
     if (py_policy && py_policy != Py_None) {
+        PREPARED_POLICY_LOAD(PREPARED_POLICY_OPERATE, config_operate_policy);
+
         if (self->validate_keys) {
             as_status retval = does_py_dict_contain_valid_keys(
                 err, py_policy, py_operate_policy_valid_keys,
@@ -801,6 +942,8 @@ as_status pyobject_to_policy_operate(AerospikeClient *self, as_error *err,
         // 4.0.0 new policies
         POLICY_SET_FIELD(read_mode_ap, as_policy_read_mode_ap);
         POLICY_SET_FIELD(read_mode_sc, as_policy_read_mode_sc);
+
+        PREPARED_POLICY_STORE(PREPARED_POLICY_OPERATE, config_operate_policy);
     }
 
     // Update the policy
@@ -829,6 +972,8 @@ as_status pyobject_to_policy_batch(AerospikeClient *self, as_error *err,
     as_policy_batch_copy(config_batch_policy, policy);
 
     if (py_policy && py_policy != Py_None) {
+        PREPARED_POLICY_LOAD(PREPARED_POLICY_BATCH, config_batch_policy);
+
         if (self->validate_keys) {
             as_status retval = does_py_dict_contain_valid_keys(
                 err, py_policy, py_batch_policy_valid_keys,
@@ -862,6 +1007,8 @@ as_status pyobject_to_policy_batch(AerospikeClient *self, as_error *err,
         // C client 6.0.0 (batch writes)
         POLICY_SET_FIELD(allow_inline_ssd, bool);
         POLICY_SET_FIELD(respond_all_keys, bool);
+
+        PREPARED_POLICY_STORE(PREPARED_POLICY_BATCH, config_batch_policy);
     }
 
     // Update the policy
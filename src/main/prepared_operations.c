@@ -0,0 +1,489 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+#include <stdbool.h>
+#include <stdlib.h>
+#include <string.h>
+
+#include <aerospike/as_error.h>
+#include <aerospike/as_operations.h>
+#include <aerospike/as_vector.h>
+
+#include "types.h"
+#include "conversions.h"
+#include "exceptions.h"
+#include "operate.h"
+#include "policy.h"
+#include "serializer.h"
+#include "prepared_operations.h"
+
+/*******************************************************************************
+ * PLACEHOLDER
+ ******************************************************************************/
+
+static PyObject *AerospikePlaceholder_New(PyTypeObject *type, PyObject *args,
+                                          PyObject *kwds)
+{
+    Py_ssize_t index = 0;
+
+    static char *kwlist[] = {"index", NULL};
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "n:Placeholder", kwlist,
+                                    &index) == false) {
+        return NULL;
+    }
+
+    if (index < 0) {
+        as_error err;
+        as_error_init(&err);
+        as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                        "Placeholder index should not be negative");
+        raise_exception(&err);
+        return NULL;
+    }
+
+    AerospikePlaceholder *self =
+        (AerospikePlaceholder *)type->tp_alloc(type, 0);
+    if (!self) {
+        return NULL;
+    }
+    self->index = index;
+    return (PyObject *)self;
+}
+
+static PyObject *AerospikePlaceholder_repr(AerospikePlaceholder *self)
+{
+    return PyUnicode_FromFormat("%s(%zd)", Py_TYPE(self)->tp_name,
+                                self->index);
+}
+
+static PyObject *AerospikePlaceholder_get_index(AerospikePlaceholder *self,
+                                                void *closure)
+{
+    return PyLong_FromSsize_t(self->index);
+}
+
+static PyGetSetDef AerospikePlaceholder_getsetters[] = {
+    {.name = "index",
+     .get = (getter)AerospikePlaceholder_get_index,
+     .doc = "Position of the value in the values passed to operate()."},
+    {NULL} /* Sentinel */
+};
+
+PyTypeObject AerospikePlaceholder_Type = {
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0).tp_name =
+        FULLY_QUALIFIED_TYPE_NAME("Placeholder"),
+    .tp_basicsize = sizeof(AerospikePlaceholder),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_doc = "A value of an operation that is passed on each call to "
+              "operate().",
+    .tp_new = AerospikePlaceholder_New,
+    .tp_repr = (reprfunc)AerospikePlaceholder_repr,
+    .tp_getset = AerospikePlaceholder_getsetters};
+
+PyTypeObject *AerospikePlaceholder_Ready()
+{
+    return PyType_Ready(&AerospikePlaceholder_Type) == 0
+               ? &AerospikePlaceholder_Type
+               : NULL;
+}
+
+/*******************************************************************************
+ * PREPARED OPERATIONS
+ ******************************************************************************/
+
+static void
+AerospikePreparedOperations_dealloc(AerospikePreparedOperations *self)
+{
+    as_operations_destroy(&self->ops);
+
+    if (self->slots) {
+        for (uint16_t i = 0; i < self->n_slots; i++) {
+            Py_XDECREF(self->slots[i].py_op);
+        }
+        cf_free(self->slots);
+    }
+
+    if (self->unicodeStrVector) {
+        for (uint32_t i = 0; i < self->unicodeStrVector->size; i++) {
+            free(as_vector_get_ptr(self->unicodeStrVector, i));
+        }
+        as_vector_destroy(self->unicodeStrVector);
+    }
+
+    if (self->static_pool) {
+        POOL_RELEASE_BUFFERS(self->static_pool);
+        cf_free(self->static_pool);
+    }
+
+    Py_CLEAR(self->client);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static PyObject *
+AerospikePreparedOperations_repr(AerospikePreparedOperations *self)
+{
+    return PyUnicode_FromFormat("<%s operations=%u values=%zd>",
+                                Py_TYPE(self)->tp_name,
+                                (unsigned int)self->n_slots, self->n_values);
+}
+
+static PyObject *
+AerospikePreparedOperations_get_values(AerospikePreparedOperations *self,
+                                       void *closure)
+{
+    return PyLong_FromSsize_t(self->n_values);
+}
+
+static PyGetSetDef AerospikePreparedOperations_getsetters[] = {
+    {.name = "values",
+     .get = (getter)AerospikePreparedOperations_get_values,
+     .doc = "Number of values that must be passed to operate()."},
+    {NULL} /* Sentinel */
+};
+
+// No tp_new, so instances can only be created by client.prepare_operations()
+PyTypeObject AerospikePreparedOperations_Type = {
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0).tp_name =
+        FULLY_QUALIFIED_TYPE_NAME("PreparedOperations"),
+    .tp_basicsize = sizeof(AerospikePreparedOperations),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_doc = "Operations prepared by client.prepare_operations().",
+    .tp_dealloc = (destructor)AerospikePreparedOperations_dealloc,
+    .tp_repr = (reprfunc)AerospikePreparedOperations_repr,
+    .tp_getset = AerospikePreparedOperations_getsetters};
+
+PyTypeObject *AerospikePreparedOperations_Ready()
+{
+    return PyType_Ready(&AerospikePreparedOperations_Type) == 0
+               ? &AerospikePreparedOperations_Type
+               : NULL;
+}
+
+// Returns a copy of py_op with each placeholder replaced by its value, or by
+// py_dummy if py_values is NULL
+static PyObject *bind_op(as_error *err, PyObject *py_op, PyObject *py_values,
+                         PyObject *py_dummy)
+{
+    PyObject *py_bound = PyDict_Copy(py_op);
+    if (!py_bound) {
+        PyErr_Clear();
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to bind the values of an operation");
+        return NULL;
+    }
+
+    PyObject *py_name = NULL;
+    PyObject *py_value = NULL;
+    Py_ssize_t pos = 0;
+    while (PyDict_Next(py_op, &pos, &py_name, &py_value)) {
+        if (!AerospikePlaceholder_Check(py_value)) {
+            continue;
+        }
+        PyObject *py_bound_value =
+            py_values ? PySequence_Fast_GET_ITEM(
+                            py_values,
+                            ((AerospikePlaceholder *)py_value)->index)
+                      : py_dummy;
+        if (PyDict_SetItem(py_bound, py_name, py_bound_value) == -1) {
+            PyErr_Clear();
+            Py_DECREF(py_bound);
+            as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                            "Unable to bind the values of an operation");
+            return NULL;
+        }
+    }
+    return py_bound;
+}
+
+// Builds py_op into prepared->ops, with py_dummy bound to its placeholders
+static as_status build_op(AerospikePreparedOperations *prepared, as_error *err,
+                          prepared_op *slot, PyObject *py_op,
+                          PyObject *py_dummy)
+{
+    long operation = 0;
+    long return_type = -1;
+    uint32_t size = prepared->ops.binops.size;
+
+    PyObject *py_bound = bind_op(err, py_op, NULL, py_dummy);
+    if (!py_bound) {
+        return err->code;
+    }
+    add_op(prepared->client, err, py_bound, prepared->unicodeStrVector,
+           prepared->static_pool, &prepared->ops, &operation, &return_type);
+    Py_DECREF(py_bound);
+
+    slot->binop = prepared->ops.binops.size > size ? (int32_t)size : -1;
+    return err->code;
+}
+
+AerospikePreparedOperations *
+AerospikePreparedOperations_New(AerospikeClient *client, as_error *err,
+                                PyObject *py_list)
+{
+    if (!PyList_Check(py_list)) {
+        as_error_update(err, AEROSPIKE_ERR_PARAM,
+                        "Operations should be of type list");
+        return NULL;
+    }
+
+    Py_ssize_t size = PyList_Size(py_list);
+    if (size > UINT16_MAX) {
+        as_error_update(err, AEROSPIKE_ERR_PARAM, "Too many operations");
+        return NULL;
+    }
+
+    AerospikePreparedOperations *self = PyObject_New(
+        AerospikePreparedOperations, &AerospikePreparedOperations_Type);
+    if (!self) {
+        PyErr_Clear();
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Unable to create prepared operations");
+        return NULL;
+    }
+
+    Py_INCREF(client);
+    self->client = client;
+    as_operations_init(&self->ops, (uint16_t)size);
+    self->has_ttl = false;
+    self->n_slots = (uint16_t)size;
+    self->n_values = 0;
+    self->slots = (prepared_op *)cf_calloc(size ? size : 1,
+                                           sizeof(prepared_op));
+    self->unicodeStrVector = as_vector_create(sizeof(char *), 128);
+    // Blobs are copied, since the operations outlive the call
+    self->static_pool = (as_static_pool *)cf_calloc(1, sizeof(as_static_pool));
+
+    uint32_t ttl = self->ops.ttl;
+
+    for (Py_ssize_t i = 0; i < size; i++) {
+        PyObject *py_op = PyList_GetItem(py_list, i);
+        prepared_op *slot = &self->slots[i];
+        slot->binop = -1;
+        slot->value_index = -1;
+
+        if (!PyDict_Check(py_op)) {
+            as_error_update(err, AEROSPIKE_ERR_PARAM,
+                            "Operation should be of type dict");
+            goto CLEANUP;
+        }
+
+        bool has_placeholders = false;
+        bool only_val = true;
+        PyObject *py_name = NULL;
+        PyObject *py_value = NULL;
+        Py_ssize_t pos = 0;
+        while (PyDict_Next(py_op, &pos, &py_name, &py_value)) {
+            if (!AerospikePlaceholder_Check(py_value)) {
+                continue;
+            }
+            has_placeholders = true;
+            if (!PyUnicode_Check(py_name) ||
+                PyUnicode_CompareWithASCIIString(py_name, "val")) {
+                only_val = false;
+            }
+            Py_ssize_t index = ((AerospikePlaceholder *)py_value)->index;
+            if (index >= self->n_values) {
+                self->n_values = index + 1;
+            }
+        }
+
+        if (!has_placeholders) {
+            slot->kind = PREPARED_OP_BUILT;
+            if (build_op(self, err, slot, py_op, NULL) != AEROSPIKE_OK) {
+                goto CLEANUP;
+            }
+            continue;
+        }
+
+        // Copied, so later changes to the operation have no effect, like
+        // for the operations that were built
+        slot->py_op = PyDict_Copy(py_op);
+        if (!slot->py_op) {
+            PyErr_Clear();
+            as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                            "Unable to copy an operation");
+            goto CLEANUP;
+        }
+        slot->kind = PREPARED_OP_BOUND;
+
+        // Writes and increments of a bin only need their value to be
+        // converted on each call. The operation is built once with a dummy
+        // value, which checks it and sets the bin name
+        PyObject *py_operation = PyDict_GetItemString(py_op, "op");
+        PyObject *py_val = PyDict_GetItemString(py_op, "val");
+        if (!only_val || PyDict_Size(py_op) != 3 || !py_operation ||
+            !PyLong_Check(py_operation)) {
+            continue;
+        }
+
+        long operation = PyLong_AsLong(py_operation);
+        PyObject *py_dummy = NULL;
+        if (operation == AS_OPERATOR_WRITE) {
+            slot->kind = PREPARED_OP_WRITE;
+            py_dummy = Py_None;
+            Py_INCREF(py_dummy);
+        }
+        else if (operation == AS_OPERATOR_INCR) {
+            slot->kind = PREPARED_OP_INCR;
+            py_dummy = PyLong_FromLong(0);
+        }
+        else {
+            continue;
+        }
+
+        slot->value_index = ((AerospikePlaceholder *)py_val)->index;
+        as_status status = build_op(self, err, slot, py_op, py_dummy);
+        Py_XDECREF(py_dummy);
+        if (status != AEROSPIKE_OK) {
+            goto CLEANUP;
+        }
+        if (slot->binop == -1) {
+            slot->kind = PREPARED_OP_BOUND;
+        }
+    }
+
+    self->has_ttl = self->ops.ttl != ttl;
+
+CLEANUP:
+    if (err->code != AEROSPIKE_OK) {
+        Py_DECREF(self);
+        return NULL;
+    }
+    return self;
+}
+
+// Adds py_op to ops with the values of py_values bound to its placeholders
+static as_status add_bound_op(AerospikeClient *self, as_error *err,
+                              PyObject *py_op, PyObject *py_values,
+                              as_vector *unicodeStrVector,
+                              as_static_pool *static_pool, as_operations *ops)
+{
+    long operation = 0;
+    long return_type = -1;
+
+    PyObject *py_bound = bind_op(err, py_op, py_values, NULL);
+    if (!py_bound) {
+        return err->code;
+    }
+    add_op(self, err, py_bound, unicodeStrVector, static_pool, ops, &operation,
+           &return_type);
+    Py_DECREF(py_bound);
+    return err->code;
+}
+
+as_status prepared_operations_add(AerospikeClient *self, as_error *err,
+                                  AerospikePreparedOperations *prepared,
+                                  PyObject *py_values,
+                                  as_vector *unicodeStrVector,
+                                  as_static_pool *static_pool,
+                                  as_operations *ops, as_vector *borrowed)
+{
+    if (prepared->client != self) {
+        return as_error_update(err, AEROSPIKE_ERR_PARAM,
+                               "Prepared operations can only be used by the "
+                               "client that prepared them");
+    }
+
+    if (prepared->n_values == 0) {
+        if (py_values && py_values != Py_None &&
+            (!PySequence_Check(py_values) || PySequence_Size(py_values))) {
+            PyErr_Clear();
+            return as_error_update(err, AEROSPIKE_ERR_PARAM,
+                                   "The prepared operations take no values");
+        }
+        py_values = NULL;
+    }
+    else if (!py_values ||
+             !(PyTuple_Check(py_values) || PyList_Check(py_values)) ||
+             PySequence_Fast_GET_SIZE(py_values) != prepared->n_values) {
+        return as_error_update(err, AEROSPIKE_ERR_PARAM,
+                               "values should be a tuple of %zd values",
+                               prepared->n_values);
+    }
+
+    if (prepared->has_ttl) {
+        ops->ttl = prepared->ops.ttl;
+    }
+
+    for (uint16_t i = 0; i < prepared->n_slots; i++) {
+        prepared_op *slot = &prepared->slots[i];
+        PyObject *py_value = NULL;
+        as_binop *built = slot->binop == -1
+                              ? NULL
+                              : &prepared->ops.binops.entries[slot->binop];
+
+        switch (slot->kind) {
+        case PREPARED_OP_BUILT:
+            if (built) {
+                // The copy shares the value of the built operation, so the
+                // value is released instead of destroyed with ops
+                uint16_t index = ops->binops.size;
+                ops->binops.entries[ops->binops.size++] = *built;
+                as_vector_append(borrowed, &index);
+            }
+            continue;
+        case PREPARED_OP_WRITE: {
+            as_val *val = NULL;
+            py_value = PySequence_Fast_GET_ITEM(py_values, slot->value_index);
+            if (as_val_new_from_pyobject(self, err, py_value, &val,
+                                         static_pool, SERIALIZER_PYTHON) !=
+                AEROSPIKE_OK) {
+                return err->code;
+            }
+            as_operations_add_write(ops, built->bin.name, (as_bin_value *)val);
+            continue;
+        }
+        case PREPARED_OP_INCR:
+            py_value = PySequence_Fast_GET_ITEM(py_values, slot->value_index);
+            if (PyLong_CheckExact(py_value)) {
+                long offset = PyLong_AsLong(py_value);
+                if (offset == -1 && PyErr_Occurred()) {
+                    // Let add_op() handle the overflow
+                    PyErr_Clear();
+                    break;
+                }
+                as_operations_add_incr(ops, built->bin.name, offset);
+                continue;
+            }
+            if (PyFloat_CheckExact(py_value)) {
+                as_operations_add_incr_double(ops, built->bin.name,
+                                              PyFloat_AsDouble(py_value));
+                continue;
+            }
+            break;
+        case PREPARED_OP_BOUND:
+            break;
+        }
+
+        if (add_bound_op(self, err, slot->py_op, py_values, unicodeStrVector,
+                         static_pool, ops) != AEROSPIKE_OK) {
+            return err->code;
+        }
+    }
+
+    return AEROSPIKE_OK;
+}
+
+void prepared_operations_release(as_operations *ops, as_vector *borrowed)
+{
+    for (uint32_t i = 0; i < borrowed->size; i++) {
+        uint16_t index = *(uint16_t *)as_vector_get(borrowed, i);
+        ops->binops.entries[index].bin.valuep = NULL;
+    }
+}
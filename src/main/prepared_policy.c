@@ -0,0 +1,320 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+#include <stdbool.h>
+
+#include <aerospike/as_error.h>
+#include <aerospike/as_exp.h>
+#include <aerospike/as_policy.h>
+
+#include "types.h"
+#include "conversions.h"
+#include "exceptions.h"
+#include "policy.h"
+#include "compiled_expression.h"
+#include "prepared_policy.h"
+
+static PyTypeObject AerospikePreparedPolicy_Types[PREPARED_POLICY_KIND_COUNT];
+
+// The keys that each kind of policy accepts
+static PyObject **prepared_policy_valid_keys[PREPARED_POLICY_KIND_COUNT] = {
+    [PREPARED_POLICY_READ] = &py_read_policy_valid_keys,
+    [PREPARED_POLICY_WRITE] = &py_write_policy_valid_keys,
+    [PREPARED_POLICY_OPERATE] = &py_operate_policy_valid_keys,
+    [PREPARED_POLICY_REMOVE] = &py_remove_policy_valid_keys,
+    [PREPARED_POLICY_APPLY] = &py_apply_policy_valid_keys,
+    [PREPARED_POLICY_BATCH] = &py_batch_policy_valid_keys,
+    [PREPARED_POLICY_QUERY] = &py_query_policy_valid_keys,
+    [PREPARED_POLICY_SCAN] = &py_scan_policy_valid_keys,
+};
+
+static int AerospikePreparedPolicy_Type_Init(PyObject *self, PyObject *args,
+                                             PyObject *kwds);
+
+AerospikePreparedPolicy *as_prepared_policy(PyObject *py_policy)
+{
+    // All of the prepared policy types share the same tp_init
+    if (Py_TYPE(py_policy)->tp_init != AerospikePreparedPolicy_Type_Init) {
+        return NULL;
+    }
+    return (AerospikePreparedPolicy *)py_policy;
+}
+
+// Converts the policy once on top of the default policy of its kind, so
+// invalid values are raised by the constructor. The conversion is cached.
+static as_status convert_prepared_policy(as_error *err, PyObject *py_policy,
+                                         prepared_policy_kind kind)
+{
+    AerospikeClient default_client;
+    init_default_client(&default_client);
+
+    prepared_policy_struct config;
+    prepared_policy_struct policy;
+    as_exp *exp_list = NULL;
+
+    switch (kind) {
+    case PREPARED_POLICY_READ:;
+        as_policy_read *read_p = NULL;
+        as_policy_read_init(&config.read);
+        pyobject_to_policy_read(&default_client, err, py_policy, &policy.read,
+                                &read_p, &config.read, &exp_list);
+        break;
+    case PREPARED_POLICY_WRITE:;
+        as_policy_write *write_p = NULL;
+        as_policy_write_init(&config.write);
+        pyobject_to_policy_write(&default_client, err, py_policy,
+                                 &policy.write, &write_p, &config.write,
+                                 &exp_list, false);
+        break;
+    case PREPARED_POLICY_OPERATE:;
+        as_policy_operate *operate_p = NULL;
+        as_policy_operate_init(&config.operate);
+        pyobject_to_policy_operate(&default_client, err, py_policy,
+                                   &policy.operate, &operate_p,
+                                   &config.operate, &exp_list);
+        break;
+    case PREPARED_POLICY_REMOVE:;
+        as_policy_remove *remove_p = NULL;
+        as_policy_remove_init(&config.remove);
+        pyobject_to_policy_remove(&default_client, err, py_policy,
+                                  &policy.remove, &remove_p, &config.remove,
+                                  &exp_list);
+        break;
+    case PREPARED_POLICY_APPLY:;
+        as_policy_apply *apply_p = NULL;
+        as_policy_apply_init(&config.apply);
+        pyobject_to_policy_apply(&default_client, err, py_policy,
+                                 &policy.apply, &apply_p, &config.apply,
+                                 &exp_list);
+        break;
+    case PREPARED_POLICY_BATCH:;
+        as_policy_batch *batch_p = NULL;
+        as_policy_batch_init(&config.batch);
+        pyobject_to_policy_batch(&default_client, err, py_policy,
+                                 &policy.batch, &batch_p, &config.batch,
+                                 &exp_list);
+        break;
+    case PREPARED_POLICY_QUERY:;
+        as_policy_query *query_p = NULL;
+        as_policy_query_init(&config.query);
+        pyobject_to_policy_query(&default_client, err, py_policy,
+                                 &policy.query, &query_p, &config.query,
+                                 &exp_list);
+        break;
+    case PREPARED_POLICY_SCAN:;
+        as_policy_scan *scan_p = NULL;
+        as_policy_scan_init(&config.scan);
+        pyobject_to_policy_scan(&default_client, err, py_policy, &policy.scan,
+                                &scan_p, &config.scan, &exp_list, false);
+        break;
+    default:
+        as_error_update(err, AEROSPIKE_ERR_CLIENT, "Unknown policy type");
+        break;
+    }
+
+    if (exp_list) {
+        as_exp_destroy(exp_list);
+    }
+    return err->code;
+}
+
+static int AerospikePreparedPolicy_Type_Init(PyObject *self, PyObject *args,
+                                             PyObject *kwds)
+{
+    AerospikePreparedPolicy *prepared = as_prepared_policy(self);
+    if (prepared->initialized) {
+        PyErr_Format(PyExc_TypeError, "'%s' object is immutable",
+                     Py_TYPE(self)->tp_name);
+        return -1;
+    }
+    if (PyDict_Type.tp_init(self, args, kwds) < 0) {
+        return -1;
+    }
+    prepared->initialized = true;
+
+    prepared_policy_kind kind = 0;
+    while (Py_TYPE(self) != &AerospikePreparedPolicy_Types[kind]) {
+        kind++;
+    }
+
+    as_error err;
+    as_error_init(&err);
+
+    int retval = does_py_dict_contain_valid_keys(
+        &err, self, *prepared_policy_valid_keys[kind],
+        POLICY_DICTIONARY_ADJECTIVE_FOR_ERROR_MESSAGE);
+    if (retval == -1) {
+        as_error_update(&err, AEROSPIKE_ERR,
+                        ERR_MSG_FAILED_TO_VALIDATE_POLICY_KEYS);
+        goto CLEANUP;
+    }
+    else if (retval == 0) {
+        goto CLEANUP;
+    }
+
+    // Expressions are converted once and kept in the policy
+    PyObject *py_expr = PyDict_GetItemString(self, "expressions");
+    if (py_expr) {
+        PyObject *py_compiled = AerospikeCompiledExpression_New(&err, py_expr);
+        if (!py_compiled) {
+            goto CLEANUP;
+        }
+        // Bypasses the immutability of the policy
+        retval = PyDict_SetItemString(self, "expressions", py_compiled);
+        Py_DECREF(py_compiled);
+        if (retval == -1) {
+            return -1;
+        }
+    }
+
+    convert_prepared_policy(&err, self, kind);
+
+CLEANUP:
+    if (err.code != AEROSPIKE_OK) {
+        raise_exception(&err);
+        return -1;
+    }
+    return 0;
+}
+
+static PyObject *AerospikePreparedPolicy_Immutable(PyObject *self,
+                                                   PyObject *args,
+                                                   PyObject *kwds)
+{
+    PyErr_Format(PyExc_TypeError, "'%s' object is immutable",
+                 Py_TYPE(self)->tp_name);
+    return NULL;
+}
+
+static int AerospikePreparedPolicy_Ass_Subscript(PyObject *self,
+                                                 PyObject *py_key,
+                                                 PyObject *py_value)
+{
+    AerospikePreparedPolicy_Immutable(self, NULL, NULL);
+    return -1;
+}
+
+static PyObject *AerospikePreparedPolicy_Inplace_Or(PyObject *self,
+                                                    PyObject *py_other)
+{
+    return AerospikePreparedPolicy_Immutable(self, NULL, NULL);
+}
+
+static PyObject *AerospikePreparedPolicy_Reduce(PyObject *self,
+                                                PyObject *Py_UNUSED(ignored))
+{
+    return Py_BuildValue("O(N)", Py_TYPE(self), PyDict_Copy(self));
+}
+
+static PyObject *AerospikePreparedPolicy_Repr(PyObject *self)
+{
+    PyObject *py_dict_repr = PyDict_Type.tp_repr(self);
+    if (!py_dict_repr) {
+        return NULL;
+    }
+    PyObject *py_repr = PyUnicode_FromFormat("%s(%U)", Py_TYPE(self)->tp_name,
+                                             py_dict_repr);
+    Py_DECREF(py_dict_repr);
+    return py_repr;
+}
+
+#define IMMUTABLE_METHOD(name)                                                 \
+    {                                                                          \
+        name, (PyCFunction)AerospikePreparedPolicy_Immutable,                  \
+            METH_VARARGS | METH_KEYWORDS, NULL                                 \
+    }
+
+static PyMethodDef AerospikePreparedPolicy_Type_Methods[] = {
+    IMMUTABLE_METHOD("clear"),
+    IMMUTABLE_METHOD("pop"),
+    IMMUTABLE_METHOD("popitem"),
+    IMMUTABLE_METHOD("setdefault"),
+    IMMUTABLE_METHOD("update"),
+    {"__reduce__", (PyCFunction)AerospikePreparedPolicy_Reduce, METH_NOARGS,
+     NULL},
+    {NULL}};
+
+static PyMappingMethods AerospikePreparedPolicy_As_Mapping;
+static PyNumberMethods AerospikePreparedPolicy_As_Number;
+
+#define PREPARED_POLICY_TYPE(kind, name, doc)                                  \
+    [kind] = {PyVarObject_HEAD_INIT(NULL, 0).tp_name =                         \
+                  FULLY_QUALIFIED_TYPE_NAME(name),                             \
+              .tp_basicsize = sizeof(AerospikePreparedPolicy),                 \
+              .tp_flags = Py_TPFLAGS_DEFAULT,                                  \
+              .tp_doc = doc,                                                   \
+              .tp_repr = AerospikePreparedPolicy_Repr,                         \
+              .tp_as_mapping = &AerospikePreparedPolicy_As_Mapping,            \
+              .tp_methods = AerospikePreparedPolicy_Type_Methods,              \
+              .tp_init = AerospikePreparedPolicy_Type_Init}
+
+static PyTypeObject AerospikePreparedPolicy_Types[PREPARED_POLICY_KIND_COUNT] =
+    {
+        PREPARED_POLICY_TYPE(PREPARED_POLICY_READ, "ReadPolicy",
+                             "An immutable, validated read policy."),
+        PREPARED_POLICY_TYPE(PREPARED_POLICY_WRITE, "WritePolicy",
+                             "An immutable, validated write policy."),
+        PREPARED_POLICY_TYPE(PREPARED_POLICY_OPERATE, "OperatePolicy",
+                             "An immutable, validated operate policy."),
+        PREPARED_POLICY_TYPE(PREPARED_POLICY_REMOVE, "RemovePolicy",
+                             "An immutable, validated remove policy."),
+        PREPARED_POLICY_TYPE(PREPARED_POLICY_APPLY, "ApplyPolicy",
+                             "An immutable, validated apply policy."),
+        PREPARED_POLICY_TYPE(PREPARED_POLICY_BATCH, "BatchPolicy",
+                             "An immutable, validated batch policy."),
+        PREPARED_POLICY_TYPE(PREPARED_POLICY_QUERY, "QueryPolicy",
+                             "An immutable, validated query policy."),
+        PREPARED_POLICY_TYPE(PREPARED_POLICY_SCAN, "ScanPolicy",
+                             "An immutable, validated scan policy."),
+};
+
+static PyTypeObject *AerospikePreparedPolicy_Ready(prepared_policy_kind kind)
+{
+    // Same as dict, except for writes
+    if (!AerospikePreparedPolicy_As_Mapping.mp_subscript) {
+        AerospikePreparedPolicy_As_Mapping = *PyDict_Type.tp_as_mapping;
+        AerospikePreparedPolicy_As_Mapping.mp_ass_subscript =
+            AerospikePreparedPolicy_Ass_Subscript;
+        if (PyDict_Type.tp_as_number) {
+            AerospikePreparedPolicy_As_Number = *PyDict_Type.tp_as_number;
+            AerospikePreparedPolicy_As_Number.nb_inplace_or =
+                AerospikePreparedPolicy_Inplace_Or;
+        }
+    }
+
+    PyTypeObject *type = &AerospikePreparedPolicy_Types[kind];
+    type->tp_base = &PyDict_Type;
+    if (PyDict_Type.tp_as_number) {
+        type->tp_as_number = &AerospikePreparedPolicy_As_Number;
+    }
+    return PyType_Ready(type) == 0 ? type : NULL;
+}
+
+#define DEFINE_PREPARED_POLICY_READY(name, kind)                               \
+    PyTypeObject *Aerospike##name##_Ready()                                    \
+    {                                                                          \
+        return AerospikePreparedPolicy_Ready(kind);                            \
+    }
+
+DEFINE_PREPARED_POLICY_READY(ReadPolicy, PREPARED_POLICY_READ)
+DEFINE_PREPARED_POLICY_READY(WritePolicy, PREPARED_POLICY_WRITE)
+DEFINE_PREPARED_POLICY_READY(OperatePolicy, PREPARED_POLICY_OPERATE)
+DEFINE_PREPARED_POLICY_READY(RemovePolicy, PREPARED_POLICY_REMOVE)
+DEFINE_PREPARED_POLICY_READY(ApplyPolicy, PREPARED_POLICY_APPLY)
+DEFINE_PREPARED_POLICY_READY(BatchPolicy, PREPARED_POLICY_BATCH)
+DEFINE_PREPARED_POLICY_READY(QueryPolicy, PREPARED_POLICY_QUERY)
+DEFINE_PREPARED_POLICY_READY(ScanPolicy, PREPARED_POLICY_SCAN)
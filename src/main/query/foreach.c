@@ -30,6 +30,7 @@
 #include "exceptions.h"
 #include "query.h"
 #include "policy.h"
+#include "columns.h"
 
 // Struct for Python User-Data for the Callback
 typedef struct {
@@ -38,8 +39,28 @@ typedef struct {
     int partition_query;
     as_vector thread_errors;
     pthread_mutex_t thread_errors_mutex;
+    // When chunk_size > 0, records are copied into chunk without the GIL
+    // and passed to the callback chunk_size at a time
+    uint32_t chunk_size;
+    as_vector chunk;
+    pthread_mutex_t chunk_mutex;
+    bool aborted;
+    // RECORD_* options of the record tuples
+    int record_options;
+    // Set if records are stored in columns, which are passed to the callback
+    // chunk_size rows at a time
+    column_builder *columns;
 } LocalData;
 
+static void store_thread_error(LocalData *data, as_error *thread_err)
+{
+    pthread_mutex_lock(&data->thread_errors_mutex);
+    as_error *stored_err_ref = (as_error *)cf_malloc(sizeof(as_error));
+    as_error_copy(stored_err_ref, thread_err);
+    as_vector_append(&data->thread_errors, &stored_err_ref);
+    pthread_mutex_unlock(&data->thread_errors_mutex);
+}
+
 static bool each_result(const as_val *val, void *udata)
 {
     bool retval = true;
@@ -66,7 +87,8 @@ static bool each_result(const as_val *val, void *udata)
     // We want to avoid resetting the main error in case it was already set by another thread.
     as_error thread_err_local;
     as_error_init(&thread_err_local);
-    val_to_pyobject(data->client, &thread_err_local, val, &py_result);
+    query_result_to_pyobject(data->client, &thread_err_local, val,
+                             data->record_options, &py_result);
 
     if (thread_err_local.code != AEROSPIKE_OK) {
         goto EXIT_CALLBACK;
@@ -114,12 +136,7 @@ static bool each_result(const as_val *val, void *udata)
 
 EXIT_CALLBACK:
     if (thread_err_local.code != AEROSPIKE_OK) {
-        pthread_mutex_lock(&data->thread_errors_mutex);
-        as_error *stored_err_ref = (as_error *)cf_malloc(sizeof(as_error));
-        as_error_copy(stored_err_ref, &thread_err_local);
-        as_vector_append(&data->thread_errors, &stored_err_ref);
-        pthread_mutex_unlock(&data->thread_errors_mutex);
-
+        store_thread_error(data, &thread_err_local);
         retval = false;
     }
 
@@ -129,29 +146,241 @@ EXIT_CALLBACK:
     return retval;
 }
 
-PyObject *AerospikeQuery_Foreach(AerospikeQuery *self, PyObject *args,
-                                 PyObject *kwds)
+// Converts the records and passes them to the callback as a single list.
+// The GIL must be held. The records are destroyed.
+static bool invoke_callback_with_chunk(LocalData *data, as_error *err,
+                                       as_record **records, uint32_t size)
 {
-    // Python Function Arguments
-    PyObject *py_callback = NULL;
-    PyObject *py_policy = NULL;
-    PyObject *py_options = NULL;
-    // Python Function Keyword Arguments
-    static char *kwlist[] = {"callback", "policy", "options", NULL};
+    bool retval = true;
+    PyObject *py_records = PyList_New(0);
+    if (!py_records) {
+        as_error_update(err, AEROSPIKE_ERR_CLIENT, "Unable to create list");
+    }
 
-    // Python Function Argument Parsing
-    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|OO:foreach", kwlist,
-                                    &py_callback, &py_policy,
-                                    &py_options) == false) {
-        as_query_destroy(&self->query);
-        return NULL;
+    for (uint32_t i = 0; i < size; i++) {
+        as_record *rec = records[i];
+        PyObject *py_result = NULL;
+
+        if (err->code == AEROSPIKE_OK) {
+            query_result_to_pyobject(data->client, err, (as_val *)rec,
+                                     data->record_options, &py_result);
+        }
+
+        if (py_result && data->partition_query) {
+            uint32_t part_id = 0;
+            if (rec->key.digest.init) {
+                part_id = as_partition_getid(rec->key.digest.value,
+                                             CLUSTER_NPARTITIONS);
+            }
+            PyObject *py_tuple = PyTuple_New(2);
+            PyTuple_SetItem(py_tuple, 0, PyLong_FromUnsignedLong(part_id));
+            PyTuple_SetItem(py_tuple, 1, py_result);
+            py_result = py_tuple;
+        }
+
+        if (py_result) {
+            PyList_Append(py_records, py_result);
+            Py_DECREF(py_result);
+        }
+
+        as_record_destroy(rec);
+    }
+
+    if (err->code != AEROSPIKE_OK) {
+        Py_XDECREF(py_records);
+        return false;
     }
 
+    PyObject *py_return =
+        PyObject_CallFunctionObjArgs(data->callback, py_records, NULL);
+    Py_DECREF(py_records);
+
+    if (!py_return) {
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Callback function contains an error");
+        retval = false;
+    }
+    else if (py_return == Py_False) {
+        retval = false;
+    }
+    Py_XDECREF(py_return);
+
+    return retval;
+}
+
+static bool each_result_chunked(const as_val *val, void *udata)
+{
+    if (!val) {
+        return false;
+    }
+
+    LocalData *data = (LocalData *)udata;
+
+    // The C client frees the record when this returns, so keep a copy
+    as_record *rec = copy_parsed_record(as_record_fromval(val));
+    if (!rec) {
+        as_error thread_err_local;
+        as_error_init(&thread_err_local);
+        as_error_update(&thread_err_local, AEROSPIKE_ERR_CLIENT,
+                        "Unable to copy record");
+        store_thread_error(data, &thread_err_local);
+        return false;
+    }
+
+    as_record **records = NULL;
+    uint32_t size = 0;
+
+    pthread_mutex_lock(&data->chunk_mutex);
+    if (data->aborted) {
+        pthread_mutex_unlock(&data->chunk_mutex);
+        as_record_destroy(rec);
+        return false;
+    }
+    as_vector_append(&data->chunk, &rec);
+    if (data->chunk.size >= data->chunk_size) {
+        records = (as_record **)as_vector_to_array(&data->chunk, &size);
+        as_vector_clear(&data->chunk);
+    }
+    pthread_mutex_unlock(&data->chunk_mutex);
+
+    if (!records) {
+        return true;
+    }
+
+    as_error thread_err_local;
+    as_error_init(&thread_err_local);
+
+    PyGILState_STATE gstate;
+    gstate = PyGILState_Ensure();
+    bool retval =
+        invoke_callback_with_chunk(data, &thread_err_local, records, size);
+    if (thread_err_local.code != AEROSPIKE_OK) {
+        store_thread_error(data, &thread_err_local);
+    }
+    PyGILState_Release(gstate);
+
+    cf_free(records);
+
+    if (!retval) {
+        pthread_mutex_lock(&data->chunk_mutex);
+        data->aborted = true;
+        pthread_mutex_unlock(&data->chunk_mutex);
+    }
+
+    return retval;
+}
+
+// Passes the columns of batch to the callback as (n_rows, buffers).
+// The GIL must be held. The batch is destroyed.
+static bool invoke_callback_with_columns(LocalData *data, as_error *err,
+                                         column_builder *batch)
+{
+    bool retval = true;
+    PyObject *py_buffers = column_builder_to_buffers(batch, err);
+    uint32_t n_rows = batch->n_rows;
+    column_builder_destroy(batch);
+    if (!py_buffers) {
+        return false;
+    }
+
+    PyObject *py_return = PyObject_CallFunction(data->callback, "(IO)",
+                                                n_rows, py_buffers);
+    Py_DECREF(py_buffers);
+
+    if (!py_return) {
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Callback function contains an error");
+        retval = false;
+    }
+    else if (py_return == Py_False) {
+        retval = false;
+    }
+    Py_XDECREF(py_return);
+
+    return retval;
+}
+
+// Fills the columns without the GIL, and only takes it every chunk_size rows
+static bool each_result_to_columns(const as_val *val, void *udata)
+{
+    if (!val) {
+        return false;
+    }
+
+    LocalData *data = (LocalData *)udata;
+    pthread_mutex_lock(&data->chunk_mutex);
+    bool aborted = data->aborted;
+    pthread_mutex_unlock(&data->chunk_mutex);
+    if (aborted) {
+        return false;
+    }
+
+    as_record *rec = as_record_fromval(val);
+    if (!rec) {
+        as_error thread_err_local;
+        as_error_init(&thread_err_local);
+        as_error_update(&thread_err_local, AEROSPIKE_ERR_CLIENT,
+                        "Only records can be stored in columns");
+        store_thread_error(data, &thread_err_local);
+        return false;
+    }
+
+    if (!column_builder_append(data->columns, rec)) {
+        store_thread_error(data, &data->columns->err);
+        return false;
+    }
+
+    column_builder batch;
+    if (!column_builder_take(data->columns, data->chunk_size, &batch)) {
+        return true;
+    }
+
+    as_error thread_err_local;
+    as_error_init(&thread_err_local);
+
+    PyGILState_STATE gstate;
+    gstate = PyGILState_Ensure();
+    bool retval = invoke_callback_with_columns(data, &thread_err_local, &batch);
+    if (thread_err_local.code != AEROSPIKE_OK) {
+        store_thread_error(data, &thread_err_local);
+    }
+    PyGILState_Release(gstate);
+
+    if (!retval) {
+        pthread_mutex_lock(&data->chunk_mutex);
+        data->aborted = true;
+        pthread_mutex_unlock(&data->chunk_mutex);
+    }
+
+    return retval;
+}
+
+static PyObject *query_foreach(AerospikeQuery *self, PyObject *py_callback,
+                               PyObject *py_policy, PyObject *py_options,
+                               int chunk_size, bool to_columns)
+{
+    column_builder columns;
+
     // Initialize callback user data
     LocalData data;
     data.callback = py_callback;
     data.client = self->client;
     data.partition_query = 0;
+    data.chunk_size = chunk_size > 0 ? (uint32_t)chunk_size : 0;
+    data.aborted = false;
+    data.record_options = 0;
+    data.columns = NULL;
+    as_vector_init(&data.chunk, sizeof(as_record *),
+                   data.chunk_size && !to_columns ? data.chunk_size : 1);
+    pthread_mutex_init(&data.chunk_mutex, NULL);
+
+    aerospike_query_foreach_callback callback =
+        data.chunk_size ? each_result_chunked : each_result;
+    if (to_columns) {
+        column_builder_init(&columns, data.chunk_size, COLUMN_FORMAT_ARROW);
+        data.columns = &columns;
+        callback = each_result_to_columns;
+    }
 
     // Main error
     as_error err;
@@ -178,6 +407,18 @@ PyObject *AerospikeQuery_Foreach(AerospikeQuery *self, PyObject *args,
         goto CLEANUP;
     }
 
+    if (chunk_size < 0) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                        "chunk_size must not be negative");
+        goto CLEANUP;
+    }
+
+    if (to_columns && chunk_size < 1) {
+        as_error_update(&err, AEROSPIKE_ERR_PARAM,
+                        "batch_size must be greater than 0");
+        goto CLEANUP;
+    }
+
     if (!self->client->is_conn_16) {
         as_error_update(&err, AEROSPIKE_ERR_CLUSTER,
                         "No connection to aerospike cluster");
@@ -192,6 +433,11 @@ PyObject *AerospikeQuery_Foreach(AerospikeQuery *self, PyObject *args,
         goto CLEANUP;
     }
 
+    if (get_record_options(&err, py_policy, &data.record_options) !=
+        AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+
     if (py_policy) {
         PyObject *py_partition_filter =
             PyDict_GetItemString(py_policy, "partition_filter");
@@ -222,7 +468,7 @@ PyObject *AerospikeQuery_Foreach(AerospikeQuery *self, PyObject *args,
 
         aerospike_query_partitions(self->client->as, &err, query_policy_p,
                                    &self->query, partition_filter_p,
-                                   each_result, &data);
+                                   callback, &data);
 
         if (ps) {
             as_partitions_status_release(ps);
@@ -230,7 +476,7 @@ PyObject *AerospikeQuery_Foreach(AerospikeQuery *self, PyObject *args,
     }
     else {
         aerospike_query_foreach(self->client->as, &err, query_policy_p,
-                                &self->query, each_result, &data);
+                                &self->query, callback, &data);
     }
 
     Py_END_ALLOW_THREADS
@@ -242,6 +488,23 @@ PyObject *AerospikeQuery_Foreach(AerospikeQuery *self, PyObject *args,
         as_error_copy(&err, vector_item);
     }
 
+    // Pass the last partial batch of columns to the callback
+    column_builder batch;
+    if (to_columns && err.code == AEROSPIKE_OK && !data.aborted &&
+        column_builder_take(&columns, 1, &batch)) {
+        invoke_callback_with_columns(&data, &err, &batch);
+    }
+
+    // Pass the last partial chunk to the callback
+    if (err.code == AEROSPIKE_OK && !data.aborted && data.chunk.size > 0) {
+        uint32_t size = 0;
+        as_record **records =
+            (as_record **)as_vector_to_array(&data.chunk, &size);
+        as_vector_clear(&data.chunk);
+        invoke_callback_with_chunk(&data, &err, records, size);
+        cf_free(records);
+    }
+
 CLEANUP:
     if (exp_list_p) {
         as_exp_destroy(exp_list_p);
@@ -259,6 +522,17 @@ CLEANUP:
     as_vector_destroy(&data.thread_errors);
     pthread_mutex_destroy(&data.thread_errors_mutex);
 
+    // Records left over after an error or after the callback stopped the query
+    for (uint32_t i = 0; i < data.chunk.size; ++i) {
+        as_record_destroy(*(as_record **)as_vector_get(&data.chunk, i));
+    }
+    as_vector_destroy(&data.chunk);
+    pthread_mutex_destroy(&data.chunk_mutex);
+
+    if (to_columns) {
+        column_builder_destroy(&columns);
+    }
+
     if (err.code != AEROSPIKE_OK) {
         raise_exception_base(&err, Py_None, Py_None, Py_None, Py_None, Py_None);
         return NULL;
@@ -267,3 +541,47 @@ CLEANUP:
     Py_INCREF(Py_None);
     return Py_None;
 }
+
+PyObject *AerospikeQuery_Foreach(AerospikeQuery *self, PyObject *args,
+                                 PyObject *kwds)
+{
+    // Python Function Arguments
+    PyObject *py_callback = NULL;
+    PyObject *py_policy = NULL;
+    PyObject *py_options = NULL;
+    int chunk_size = 0;
+    // Python Function Keyword Arguments
+    static char *kwlist[] = {"callback", "policy", "options", "chunk_size",
+                             NULL};
+
+    // Python Function Argument Parsing
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|OO$i:foreach", kwlist,
+                                    &py_callback, &py_policy, &py_options,
+                                    &chunk_size) == false) {
+        as_query_destroy(&self->query);
+        return NULL;
+    }
+
+    return query_foreach(self, py_callback, py_policy, py_options, chunk_size,
+                         false);
+}
+
+PyObject *AerospikeQuery_Foreach_Columns(AerospikeQuery *self, PyObject *args,
+                                         PyObject *kwds)
+{
+    PyObject *py_callback = NULL;
+    PyObject *py_policy = NULL;
+    PyObject *py_options = NULL;
+    int batch_size = 0;
+    static char *kwlist[] = {"callback", "batch_size", "policy", "options",
+                             NULL};
+
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "Oi|OO:_foreach_columns",
+                                    kwlist, &py_callback, &batch_size,
+                                    &py_policy, &py_options) == false) {
+        return NULL;
+    }
+
+    return query_foreach(self, py_callback, py_policy, py_options, batch_size,
+                         true);
+}
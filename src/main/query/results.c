@@ -28,6 +28,7 @@
 #include "exceptions.h"
 #include "query.h"
 #include "policy.h"
+#include "columns.h"
 
 #undef TRACE
 #define TRACE()
@@ -35,8 +36,31 @@
 typedef struct {
     PyObject *py_results;
     AerospikeClient *client;
+    // RECORD_* options of the record tuples
+    int record_options;
+    // Set if the bins are returned as NumPy arrays
+    column_builder *columns;
 } LocalData;
 
+// Only fills C arrays, so the GIL is not needed
+static bool each_result_to_columns(const as_val *val, void *udata)
+{
+    if (!val) {
+        return false;
+    }
+
+    LocalData *data = (LocalData *)udata;
+    as_record *rec = as_record_fromval(val);
+    if (!rec) {
+        pthread_mutex_lock(&data->columns->lock);
+        as_error_update(&data->columns->err, AEROSPIKE_ERR_CLIENT,
+                        "NumPy output is only supported for records");
+        pthread_mutex_unlock(&data->columns->lock);
+        return false;
+    }
+    return column_builder_append(data->columns, rec);
+}
+
 static bool each_result(const as_val *val, void *udata)
 {
     if (!val) {
@@ -53,7 +77,8 @@ static bool each_result(const as_val *val, void *udata)
     PyGILState_STATE gstate;
     gstate = PyGILState_Ensure();
 
-    val_to_pyobject(data->client, &err, val, &py_result);
+    query_result_to_pyobject(data->client, &err, val, data->record_options,
+                             &py_result);
 
     if (py_result) {
         PyList_Append(py_results, py_result);
@@ -71,19 +96,27 @@ PyObject *AerospikeQuery_Results(AerospikeQuery *self, PyObject *args,
     PyObject *py_results = NULL;
     PyObject *py_options = NULL;
 
-    static char *kwlist[] = {"policy", "options", NULL};
+    PyObject *py_output = NULL;
+
+    static char *kwlist[] = {"policy", "options", "output", NULL};
 
     LocalData data;
     data.client = self->client;
+    data.record_options = 0;
+    data.columns = NULL;
 
-    if (PyArg_ParseTupleAndKeywords(args, kwds, "|OO:results", kwlist,
-                                    &py_policy, &py_options) == false) {
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "|OOO:results", kwlist,
+                                    &py_policy, &py_options,
+                                    &py_output) == false) {
         return NULL;
     }
 
     as_error err;
     as_error_init(&err);
 
+    bool numpy_output = false;
+    column_builder columns;
+
     as_policy_query query_policy;
     as_policy_query *query_policy_p = NULL;
 
@@ -113,10 +146,20 @@ PyObject *AerospikeQuery_Results(AerospikeQuery *self, PyObject *args,
         goto CLEANUP;
     }
 
+    if (get_record_options(&err, py_policy, &data.record_options) !=
+        AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+
     if (set_query_options(&err, py_options, &self->query) != AEROSPIKE_OK) {
         goto CLEANUP;
     }
 
+    if (get_numpy_output_option(&err, py_output, &numpy_output) !=
+        AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+
     if (py_policy) {
         PyObject *py_partition_filter =
             PyDict_GetItemString(py_policy, "partition_filter");
@@ -133,7 +176,15 @@ PyObject *AerospikeQuery_Results(AerospikeQuery *self, PyObject *args,
     }
     as_error_reset(&err);
 
-    py_results = PyList_New(0);
+    aerospike_query_foreach_callback callback = each_result;
+    if (numpy_output) {
+        column_builder_init(&columns, 1024, COLUMN_FORMAT_NUMPY);
+        data.columns = &columns;
+        callback = each_result_to_columns;
+    }
+    else {
+        py_results = PyList_New(0);
+    }
     data.py_results = py_results;
 
     Py_BEGIN_ALLOW_THREADS
@@ -145,7 +196,7 @@ PyObject *AerospikeQuery_Results(AerospikeQuery *self, PyObject *args,
 
         aerospike_query_partitions(self->client->as, &err, query_policy_p,
                                    &self->query, partition_filter_p,
-                                   each_result, &data);
+                                   callback, &data);
 
         if (ps) {
             as_partitions_status_release(ps);
@@ -153,11 +204,21 @@ PyObject *AerospikeQuery_Results(AerospikeQuery *self, PyObject *args,
     }
     else {
         aerospike_query_foreach(self->client->as, &err, query_policy_p,
-                                &self->query, each_result, &data);
+                                &self->query, callback, &data);
     }
 
     Py_END_ALLOW_THREADS
 
+    if (numpy_output) {
+        if (columns.err.code != AEROSPIKE_OK) {
+            as_error_copy(&err, &columns.err);
+        }
+        if (err.code == AEROSPIKE_OK) {
+            py_results = column_builder_to_pyobject(&columns, &err);
+        }
+        column_builder_destroy(&columns);
+    }
+
 CLEANUP: /*??trace()*/
     if (exp_list_p) {
         as_exp_destroy(exp_list_p);
@@ -0,0 +1,61 @@
+/*******************************************************************************
+ * Copyright 2013-2022 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+
+#include <aerospike/as_error.h>
+#include <aerospike/as_query.h>
+
+#include "client.h"
+#include "conversions.h"
+#include "exceptions.h"
+#include "query.h"
+
+PyObject *AerospikeQuery_Split(AerospikeQuery *self, PyObject *args,
+                               PyObject *kwds)
+{
+    return call_helper_with_source("aerospike_helpers.parallel", "split",
+                                   (PyObject *)self, args, kwds);
+}
+
+PyObject *AerospikeQuery_Parallel_Results(AerospikeQuery *self, PyObject *args,
+                                          PyObject *kwds)
+{
+    return call_helper_with_source("aerospike_helpers.parallel",
+                                   "parallel_results", (PyObject *)self, args,
+                                   kwds);
+}
+
+PyObject *AerospikeQuery_To_Bytes(AerospikeQuery *self,
+                                  PyObject *Py_UNUSED(args))
+{
+    uint8_t *bytes = NULL;
+    uint32_t bytes_size = 0;
+
+    if (!as_query_to_bytes(&self->query, &bytes, &bytes_size)) {
+        as_error err;
+        as_error_init(&err);
+        as_error_update(&err, AEROSPIKE_ERR_CLIENT,
+                        "Failed to serialize query");
+        raise_exception(&err);
+        return NULL;
+    }
+
+    PyObject *py_bytes =
+        PyBytes_FromStringAndSize((const char *)bytes, (Py_ssize_t)bytes_size);
+    cf_free(bytes);
+    return py_bytes;
+}
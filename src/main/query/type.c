@@ -44,9 +44,10 @@ Add a list of write ops to the query. \
 When used with :meth:`Query.execute_background` the query will perform the write ops on any records found. \
 If no predicate is attached to the Query it will apply ops to all the records in the specified set.");
 
-PyDoc_STRVAR(foreach_doc, "foreach(callback[, policy])\n\
+PyDoc_STRVAR(foreach_doc, "foreach(callback[, policy[, options]], chunk_size=0)\n\
 \n\
-Invoke the callback function for each of the records streaming back from the query.");
+Invoke the callback function for each of the records streaming back from the query. \
+If chunk_size is greater than 0, the callback is invoked with lists of up to chunk_size records.");
 
 PyDoc_STRVAR(results_doc, "results([policy]) -> list of (key, meta, bins)\n\
 \n\
@@ -68,6 +69,21 @@ PyDoc_STRVAR(execute_background_doc,
 \n\
 Buffer the records resulting from the query, and return them as a list of records.");
 
+PyDoc_STRVAR(aiter_doc, "aiter([policy [, options]] [, buffer_size]) -> aerospike_helpers.aio.RecordIterator\n\
+\n\
+Return an asynchronous iterator over the records resulting from the query. \
+At most buffer_size records are buffered ahead of the consumer.");
+
+PyDoc_STRVAR(stream_doc, "stream([policy [, options]] [, buffer_size]) -> aerospike_helpers.stream.RecordStream\n\
+\n\
+Return an iterator that yields the records resulting from the query while they are being received. \
+At most buffer_size records are buffered ahead of the consumer.");
+
+PyDoc_STRVAR(results_future_doc, "results_future(...) -> concurrent.futures.Future\n\
+\n\
+Run results() with the same arguments on a native worker thread, \
+and return a future that is completed with the list of records or the exception.");
+
 PyDoc_STRVAR(paginate_doc, "paginate()\n\
 \n\
 Set pagination filter to receive records in bunch (max_records or page_size).");
@@ -83,6 +99,20 @@ PyDoc_STRVAR(get_parts_doc,
 Gets the complete partition status of the query. \
 Returns a dictionary of the form {id:(id, init, done, digest), ...}.");
 
+PyDoc_STRVAR(to_arrow_doc, "to_arrow([policy [, options]] [, schema] [, batch_size] [, buffer_size]) -> aerospike_helpers.arrow.RecordBatchStream\n\
+\n\
+Return an iterator that yields the records resulting from the query as pyarrow.RecordBatch objects of up to batch_size rows.");
+
+PyDoc_STRVAR(split_doc, "split(n) -> list of aerospike_helpers.parallel.PartitionWorkUnit\n\
+\n\
+Split the query into n picklable work units that each cover a contiguous range of partitions.");
+
+PyDoc_STRVAR(parallel_results_doc, "parallel_results(n_procs, config[, policy]) -> list of (key, meta, bins)\n\
+\n\
+Run the query in n_procs worker processes, each with its own client, and return all of the records.\n\
+Every record is pickled back to the calling process. Use aerospike_helpers.parallel.parallel_map() to process \
+the records in the worker processes instead.");
+
 /*******************************************************************************
  * PYTHON TYPE METHODS
  ******************************************************************************/
@@ -98,6 +128,15 @@ static PyMethodDef AerospikeQuery_Type_Methods[] = {
     {"results", (PyCFunction)AerospikeQuery_Results,
      METH_VARARGS | METH_KEYWORDS, results_doc},
 
+    {"aiter", (PyCFunction)AerospikeQuery_Aiter, METH_VARARGS | METH_KEYWORDS,
+     aiter_doc},
+
+    {"stream", (PyCFunction)AerospikeQuery_Stream, METH_VARARGS | METH_KEYWORDS,
+     stream_doc},
+
+    {"results_future", (PyCFunction)AerospikeQuery_Results_Future,
+     METH_VARARGS | METH_KEYWORDS, results_future_doc},
+
     {"select", (PyCFunction)AerospikeQuery_Select, METH_VARARGS | METH_KEYWORDS,
      select_doc},
 
@@ -121,6 +160,20 @@ static PyMethodDef AerospikeQuery_Type_Methods[] = {
     {"get_partitions_status", (PyCFunction)AerospikeQuery_Get_Partitions_status,
      METH_NOARGS, get_parts_doc},
 
+    {"split", (PyCFunction)AerospikeQuery_Split, METH_VARARGS | METH_KEYWORDS,
+     split_doc},
+
+    {"parallel_results", (PyCFunction)AerospikeQuery_Parallel_Results,
+     METH_VARARGS | METH_KEYWORDS, parallel_results_doc},
+
+    {"to_arrow", (PyCFunction)AerospikeQuery_To_Arrow,
+     METH_VARARGS | METH_KEYWORDS, to_arrow_doc},
+
+    {"_to_bytes", (PyCFunction)AerospikeQuery_To_Bytes, METH_NOARGS, NULL},
+
+    {"_foreach_columns", (PyCFunction)AerospikeQuery_Foreach_Columns,
+     METH_VARARGS | METH_KEYWORDS, NULL},
+
     {NULL}};
 
 /*******************************************************************************
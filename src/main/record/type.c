@@ -0,0 +1,413 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+
+#include <aerospike/as_error.h>
+#include <aerospike/as_record.h>
+
+#include "conversions.h"
+#include "exceptions.h"
+#include "record.h"
+#include "string_cache.h"
+
+/*******************************************************************************
+ * BIN CONVERSION
+ ******************************************************************************/
+
+// Returns a new reference to the converted bin, or NULL with KeyError set if
+// the record has no bin with that name
+static PyObject *AerospikeRecord_Get_Bin(AerospikeRecord *self,
+                                         PyObject *py_name)
+{
+    PyObject *py_value = PyDict_GetItemWithError(self->py_bins, py_name);
+    if (py_value) {
+        Py_INCREF(py_value);
+        return py_value;
+    }
+    if (PyErr_Occurred()) {
+        return NULL;
+    }
+
+    if (!PyUnicode_Check(py_name)) {
+        PyErr_SetObject(PyExc_KeyError, py_name);
+        return NULL;
+    }
+    const char *name = PyUnicode_AsUTF8(py_name);
+    if (!name) {
+        return NULL;
+    }
+
+    as_bin_value *value = as_record_get(self->rec, name);
+    if (!value) {
+        PyErr_SetObject(PyExc_KeyError, py_name);
+        return NULL;
+    }
+
+    as_error err;
+    as_error_init(&err);
+    val_to_pyobject(self->client, &err, (as_val *)value, &py_value);
+    if (err.code != AEROSPIKE_OK) {
+        raise_exception(&err);
+        return NULL;
+    }
+
+    if (PyDict_SetItem(self->py_bins, py_name, py_value) == -1) {
+        Py_DECREF(py_value);
+        return NULL;
+    }
+    return py_value;
+}
+
+// Builds a list with one item per bin. Each item is returned by item_fn
+typedef PyObject *(*bin_item_fn)(AerospikeRecord *self, PyObject *py_name);
+
+static PyObject *bin_name(AerospikeRecord *self, PyObject *py_name)
+{
+    Py_INCREF(py_name);
+    return py_name;
+}
+
+static PyObject *bin_item(AerospikeRecord *self, PyObject *py_name)
+{
+    PyObject *py_value = AerospikeRecord_Get_Bin(self, py_name);
+    if (!py_value) {
+        return NULL;
+    }
+    PyObject *py_item = PyTuple_Pack(2, py_name, py_value);
+    Py_DECREF(py_value);
+    return py_item;
+}
+
+static PyObject *AerospikeRecord_Bins_To_List(AerospikeRecord *self,
+                                              bin_item_fn item_fn)
+{
+    uint16_t n_bins = self->rec->bins.size;
+    PyObject *py_list = PyList_New(n_bins);
+    if (!py_list) {
+        return NULL;
+    }
+
+    for (uint16_t i = 0; i < n_bins; i++) {
+        PyObject *py_name =
+            string_cache_get(self->client ? self->client->strings : NULL,
+                             self->rec->bins.entries[i].name);
+        if (!py_name) {
+            Py_DECREF(py_list);
+            return NULL;
+        }
+        PyObject *py_item = item_fn(self, py_name);
+        Py_DECREF(py_name);
+        if (!py_item) {
+            Py_DECREF(py_list);
+            return NULL;
+        }
+        PyList_SET_ITEM(py_list, i, py_item);
+    }
+    return py_list;
+}
+
+/*******************************************************************************
+ * PYTHON TYPE METHODS
+ ******************************************************************************/
+
+static PyObject *AerospikeRecord_Keys(AerospikeRecord *self,
+                                      PyObject *Py_UNUSED(args))
+{
+    return AerospikeRecord_Bins_To_List(self, bin_name);
+}
+
+static PyObject *AerospikeRecord_Values(AerospikeRecord *self,
+                                        PyObject *Py_UNUSED(args))
+{
+    return AerospikeRecord_Bins_To_List(self, AerospikeRecord_Get_Bin);
+}
+
+static PyObject *AerospikeRecord_Items(AerospikeRecord *self,
+                                       PyObject *Py_UNUSED(args))
+{
+    return AerospikeRecord_Bins_To_List(self, bin_item);
+}
+
+static PyObject *AerospikeRecord_To_Dict(AerospikeRecord *self,
+                                         PyObject *Py_UNUSED(args))
+{
+    PyObject *py_items = AerospikeRecord_Bins_To_List(self, bin_item);
+    if (!py_items) {
+        return NULL;
+    }
+    PyObject *py_dict = PyDict_New();
+    if (py_dict && PyDict_MergeFromSeq2(py_dict, py_items, 1) == -1) {
+        Py_CLEAR(py_dict);
+    }
+    Py_DECREF(py_items);
+    return py_dict;
+}
+
+static PyObject *AerospikeRecord_Get(AerospikeRecord *self, PyObject *args,
+                                     PyObject *kwds)
+{
+    PyObject *py_name = NULL;
+    PyObject *py_default = Py_None;
+    static char *kwlist[] = {"bin", "default", NULL};
+
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|O:get", kwlist, &py_name,
+                                    &py_default) == false) {
+        return NULL;
+    }
+
+    PyObject *py_value = AerospikeRecord_Get_Bin(self, py_name);
+    if (!py_value && PyErr_ExceptionMatches(PyExc_KeyError)) {
+        PyErr_Clear();
+        Py_INCREF(py_default);
+        return py_default;
+    }
+    return py_value;
+}
+
+// Unpickles as a dict, because the bin values are only held by this process
+static PyObject *AerospikeRecord_Reduce(AerospikeRecord *self,
+                                        PyObject *Py_UNUSED(args))
+{
+    PyObject *py_dict = AerospikeRecord_To_Dict(self, NULL);
+    if (!py_dict) {
+        return NULL;
+    }
+    return Py_BuildValue("(O(N))", (PyObject *)&PyDict_Type, py_dict);
+}
+
+PyDoc_STRVAR(keys_doc, "keys() -> list\n\
+\n\
+Return the names of the bins.");
+
+PyDoc_STRVAR(values_doc, "values() -> list\n\
+\n\
+Return the values of the bins. This converts all of the bins.");
+
+PyDoc_STRVAR(items_doc, "items() -> list of (name, value)\n\
+\n\
+Return the names and values of the bins. This converts all of the bins.");
+
+PyDoc_STRVAR(get_doc, "get(bin[, default]) -> value\n\
+\n\
+Return the value of bin, or default if the record has no bin with that name.");
+
+PyDoc_STRVAR(to_dict_doc, "to_dict() -> dict\n\
+\n\
+Return the bins as a dict. This converts all of the bins.");
+
+static PyMethodDef AerospikeRecord_Type_Methods[] = {
+    {"keys", (PyCFunction)AerospikeRecord_Keys, METH_NOARGS, keys_doc},
+    {"values", (PyCFunction)AerospikeRecord_Values, METH_NOARGS, values_doc},
+    {"items", (PyCFunction)AerospikeRecord_Items, METH_NOARGS, items_doc},
+    {"get", (PyCFunction)AerospikeRecord_Get, METH_VARARGS | METH_KEYWORDS,
+     get_doc},
+    {"to_dict", (PyCFunction)AerospikeRecord_To_Dict, METH_NOARGS,
+     to_dict_doc},
+    {"__reduce__", (PyCFunction)AerospikeRecord_Reduce, METH_NOARGS, NULL},
+    {NULL}};
+
+/*******************************************************************************
+ * PYTHON MAPPING PROTOCOL
+ ******************************************************************************/
+
+static Py_ssize_t AerospikeRecord_Length(AerospikeRecord *self)
+{
+    return (Py_ssize_t)self->rec->bins.size;
+}
+
+static int AerospikeRecord_Contains(AerospikeRecord *self, PyObject *py_name)
+{
+    if (!PyUnicode_Check(py_name)) {
+        return 0;
+    }
+    const char *name = PyUnicode_AsUTF8(py_name);
+    if (!name) {
+        return -1;
+    }
+    return as_record_get(self->rec, name) != NULL;
+}
+
+static PyMappingMethods AerospikeRecord_Mapping_Methods = {
+    .mp_length = (lenfunc)AerospikeRecord_Length,
+    .mp_subscript = (binaryfunc)AerospikeRecord_Get_Bin,
+};
+
+static PySequenceMethods AerospikeRecord_Sequence_Methods = {
+    .sq_contains = (objobjproc)AerospikeRecord_Contains,
+};
+
+/*******************************************************************************
+ * PYTHON TYPE HOOKS
+ ******************************************************************************/
+
+static PyObject *AerospikeRecord_Iter(AerospikeRecord *self)
+{
+    PyObject *py_names = AerospikeRecord_Keys(self, NULL);
+    if (!py_names) {
+        return NULL;
+    }
+    PyObject *py_iter = PyObject_GetIter(py_names);
+    Py_DECREF(py_names);
+    return py_iter;
+}
+
+static PyObject *AerospikeRecord_Repr(AerospikeRecord *self)
+{
+    PyObject *py_dict = AerospikeRecord_To_Dict(self, NULL);
+    if (!py_dict) {
+        return NULL;
+    }
+    PyObject *py_repr = PyUnicode_FromFormat(
+        "%s(%R)", FULLY_QUALIFIED_TYPE_NAME("Record"), py_dict);
+    Py_DECREF(py_dict);
+    return py_repr;
+}
+
+static PyObject *AerospikeRecord_RichCompare(AerospikeRecord *self,
+                                             PyObject *py_other, int op)
+{
+    if ((op != Py_EQ && op != Py_NE) || !PyMapping_Check(py_other)) {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+
+    PyObject *py_dict = AerospikeRecord_To_Dict(self, NULL);
+    if (!py_dict) {
+        return NULL;
+    }
+    PyObject *py_other_dict = NULL;
+    if (PyObject_TypeCheck(py_other, Py_TYPE(self))) {
+        py_other_dict = AerospikeRecord_To_Dict((AerospikeRecord *)py_other,
+                                                NULL);
+    }
+    else if (PyDict_Check(py_other)) {
+        Py_INCREF(py_other);
+        py_other_dict = py_other;
+    }
+    else {
+        Py_DECREF(py_dict);
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+    if (!py_other_dict) {
+        Py_DECREF(py_dict);
+        return NULL;
+    }
+
+    PyObject *py_result = PyObject_RichCompare(py_dict, py_other_dict, op);
+    Py_DECREF(py_dict);
+    Py_DECREF(py_other_dict);
+    return py_result;
+}
+
+static int AerospikeRecord_Traverse(AerospikeRecord *self, visitproc visit,
+                                    void *arg)
+{
+    Py_VISIT(self->client);
+    Py_VISIT(self->py_bins);
+    return 0;
+}
+
+static int AerospikeRecord_Clear(AerospikeRecord *self)
+{
+    Py_CLEAR(self->client);
+    Py_CLEAR(self->py_bins);
+    return 0;
+}
+
+static void AerospikeRecord_Type_Dealloc(AerospikeRecord *self)
+{
+    PyObject_GC_UnTrack(self);
+    AerospikeRecord_Clear(self);
+    if (self->rec) {
+        as_record_destroy(self->rec);
+    }
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+/*******************************************************************************
+ * PYTHON TYPE DESCRIPTOR
+ ******************************************************************************/
+
+static PyTypeObject AerospikeRecord_Type = {
+    PyVarObject_HEAD_INIT(NULL, 0).tp_name =
+        FULLY_QUALIFIED_TYPE_NAME("Record"),
+    .tp_basicsize = sizeof(AerospikeRecord),
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_GC,
+    .tp_doc = "The bins of a record that was read with the lazy_records policy.\n"
+              "Each bin is converted to a Python object the first time it is "
+              "read.\n",
+    .tp_methods = AerospikeRecord_Type_Methods,
+    .tp_as_mapping = &AerospikeRecord_Mapping_Methods,
+    .tp_as_sequence = &AerospikeRecord_Sequence_Methods,
+    .tp_iter = (getiterfunc)AerospikeRecord_Iter,
+    .tp_repr = (reprfunc)AerospikeRecord_Repr,
+    .tp_richcompare = (richcmpfunc)AerospikeRecord_RichCompare,
+    .tp_traverse = (traverseproc)AerospikeRecord_Traverse,
+    .tp_clear = (inquiry)AerospikeRecord_Clear,
+    .tp_dealloc = (destructor)AerospikeRecord_Type_Dealloc,
+    // Records are only created by the client
+    .tp_new = NULL,
+};
+
+PyTypeObject *AerospikeRecord_Ready()
+{
+    return PyType_Ready(&AerospikeRecord_Type) == 0 ? &AerospikeRecord_Type
+                                                     : NULL;
+}
+
+PyObject *AerospikeRecord_New(AerospikeClient *client, as_error *err,
+                              const as_record *rec)
+{
+    AerospikeRecord *self =
+        PyObject_GC_New(AerospikeRecord, &AerospikeRecord_Type);
+    if (!self) {
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Failed to create aerospike.Record");
+        return NULL;
+    }
+    self->client = client;
+    Py_XINCREF(client);
+    self->py_bins = PyDict_New();
+    self->rec = as_record_new(rec->bins.size);
+    PyObject_GC_Track(self);
+
+    if (!self->py_bins || !self->rec) {
+        PyErr_Clear();
+        Py_DECREF(self);
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Failed to create aerospike.Record");
+        return NULL;
+    }
+
+    for (uint16_t i = 0; i < rec->bins.size; i++) {
+        const as_bin *bin = &rec->bins.entries[i];
+        if (!bin->valuep) {
+            continue;
+        }
+        // Scalar values are parsed into the source record, which is
+        // destroyed after the command returns
+        as_val *value = copy_parsed_val((as_val *)bin->valuep);
+        if (!value) {
+            Py_DECREF(self);
+            as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                            "Failed to copy bin %s", bin->name);
+            return NULL;
+        }
+        as_record_set(self->rec, bin->name, (as_bin_value *)value);
+    }
+
+    return (PyObject *)self;
+}
@@ -16,17 +16,20 @@
 
 #include <Python.h>
 #include <stdbool.h>
+#include <pthread.h>
 
 #include <aerospike/aerospike_scan.h>
 #include <aerospike/as_error.h>
 #include <aerospike/as_scan.h>
 #include <aerospike/as_partition.h>
+#include <aerospike/as_vector.h>
 
 #include "client.h"
 #include "conversions.h"
 #include "exceptions.h"
 #include "scan.h"
 #include "policy.h"
+#include "columns.h"
 
 // Struct for Python User-Data for the Callback
 typedef struct {
@@ -34,6 +37,17 @@ typedef struct {
     PyObject *callback;
     AerospikeClient *client;
     int partition_scan;
+    // When chunk_size > 0, records are copied into chunk without the GIL
+    // and passed to the callback chunk_size at a time
+    uint32_t chunk_size;
+    as_vector chunk;
+    pthread_mutex_t chunk_mutex;
+    bool aborted;
+    // RECORD_* options of the record tuples
+    int record_options;
+    // Set if records are stored in columns, which are passed to the callback
+    // chunk_size rows at a time
+    column_builder *columns;
 } LocalData;
 
 static bool each_result(const as_val *val, void *udata)
@@ -68,7 +82,8 @@ static bool each_result(const as_val *val, void *udata)
     gstate = PyGILState_Ensure();
 
     // Convert as_val to a Python Object
-    val_to_pyobject(data->client, err, val, &py_result);
+    query_result_to_pyobject(data->client, err, val, data->record_options,
+                             &py_result);
 
     if (!py_result) {
         PyGILState_Release(gstate);
@@ -120,16 +135,217 @@ static bool each_result(const as_val *val, void *udata)
     return rval;
 }
 
-PyObject *AerospikeScan_Foreach(AerospikeScan *self, PyObject *args,
-                                PyObject *kwds)
+// Converts the records and passes them to the callback as a single list.
+// The GIL must be held. The records are destroyed.
+static bool invoke_callback_with_chunk(LocalData *data, as_error *err,
+                                       as_record **records, uint32_t size)
 {
-    // Python Function Arguments
-    PyObject *py_callback = NULL;
-    PyObject *py_policy = NULL;
-    PyObject *py_options = NULL;
-    PyObject *py_nodename = NULL;
+    bool rval = true;
+    PyObject *py_records = PyList_New(0);
+    if (!py_records) {
+        as_error_update(err, AEROSPIKE_ERR_CLIENT, "Unable to create list");
+    }
+
+    for (uint32_t i = 0; i < size; i++) {
+        as_record *rec = records[i];
+        PyObject *py_result = NULL;
+
+        if (err->code == AEROSPIKE_OK) {
+            query_result_to_pyobject(data->client, err, (as_val *)rec,
+                                     data->record_options, &py_result);
+        }
+
+        if (py_result && data->partition_scan) {
+            uint32_t part_id = 0;
+            if (rec->key.digest.init) {
+                part_id = as_partition_getid(rec->key.digest.value,
+                                             CLUSTER_NPARTITIONS);
+            }
+            PyObject *py_tuple = PyTuple_New(2);
+            PyTuple_SetItem(py_tuple, 0, PyLong_FromUnsignedLong(part_id));
+            PyTuple_SetItem(py_tuple, 1, py_result);
+            py_result = py_tuple;
+        }
+
+        if (py_result) {
+            PyList_Append(py_records, py_result);
+            Py_DECREF(py_result);
+        }
+
+        as_record_destroy(rec);
+    }
+
+    if (err->code != AEROSPIKE_OK) {
+        Py_XDECREF(py_records);
+        return false;
+    }
+
+    PyObject *py_return =
+        PyObject_CallFunctionObjArgs(data->callback, py_records, NULL);
+    Py_DECREF(py_records);
+
+    if (!py_return) {
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Callback function raised an exception");
+        rval = false;
+    }
+    else if (py_return == Py_False) {
+        rval = false;
+    }
+    Py_XDECREF(py_return);
+
+    return rval;
+}
+
+static bool each_result_chunked(const as_val *val, void *udata)
+{
+    if (!val) {
+        return false;
+    }
+
+    LocalData *data = (LocalData *)udata;
+    as_error thread_err_local;
+    as_error_init(&thread_err_local);
+
+    // The C client frees the record when this returns, so keep a copy
+    as_record *rec = copy_parsed_record(as_record_fromval(val));
+    if (!rec) {
+        as_error_update(&thread_err_local, AEROSPIKE_ERR_CLIENT,
+                        "Unable to copy record");
+        goto ABORT;
+    }
+
+    as_record **records = NULL;
+    uint32_t size = 0;
+
+    pthread_mutex_lock(&data->chunk_mutex);
+    if (data->aborted) {
+        pthread_mutex_unlock(&data->chunk_mutex);
+        as_record_destroy(rec);
+        return false;
+    }
+    as_vector_append(&data->chunk, &rec);
+    if (data->chunk.size >= data->chunk_size) {
+        records = (as_record **)as_vector_to_array(&data->chunk, &size);
+        as_vector_clear(&data->chunk);
+    }
+    pthread_mutex_unlock(&data->chunk_mutex);
+
+    if (!records) {
+        return true;
+    }
+
+    PyGILState_STATE gstate;
+    gstate = PyGILState_Ensure();
+    bool rval =
+        invoke_callback_with_chunk(data, &thread_err_local, records, size);
+    PyGILState_Release(gstate);
+
+    cf_free(records);
+
+    if (rval) {
+        return true;
+    }
+
+ABORT:
+    pthread_mutex_lock(&data->chunk_mutex);
+    data->aborted = true;
+    if (thread_err_local.code != AEROSPIKE_OK &&
+        data->error.code == AEROSPIKE_OK) {
+        as_error_copy(&data->error, &thread_err_local);
+    }
+    pthread_mutex_unlock(&data->chunk_mutex);
+
+    return false;
+}
+
+// Passes the columns of batch to the callback as (n_rows, buffers).
+// The GIL must be held. The batch is destroyed.
+static bool invoke_callback_with_columns(LocalData *data, as_error *err,
+                                         column_builder *batch)
+{
+    bool rval = true;
+    PyObject *py_buffers = column_builder_to_buffers(batch, err);
+    uint32_t n_rows = batch->n_rows;
+    column_builder_destroy(batch);
+    if (!py_buffers) {
+        return false;
+    }
+
+    PyObject *py_return = PyObject_CallFunction(data->callback, "(IO)",
+                                                n_rows, py_buffers);
+    Py_DECREF(py_buffers);
+
+    if (!py_return) {
+        as_error_update(err, AEROSPIKE_ERR_CLIENT,
+                        "Callback function raised an exception");
+        rval = false;
+    }
+    else if (py_return == Py_False) {
+        rval = false;
+    }
+    Py_XDECREF(py_return);
+
+    return rval;
+}
+
+// Fills the columns without the GIL, and only takes it every chunk_size rows
+static bool each_result_to_columns(const as_val *val, void *udata)
+{
+    if (!val) {
+        return false;
+    }
+
+    LocalData *data = (LocalData *)udata;
+    as_error thread_err_local;
+    as_error_init(&thread_err_local);
+
+    pthread_mutex_lock(&data->chunk_mutex);
+    bool aborted = data->aborted;
+    pthread_mutex_unlock(&data->chunk_mutex);
+    if (aborted) {
+        return false;
+    }
+
+    if (!column_builder_append(data->columns, as_record_fromval(val))) {
+        as_error_copy(&thread_err_local, &data->columns->err);
+        goto ABORT;
+    }
+
+    column_builder batch;
+    if (!column_builder_take(data->columns, data->chunk_size, &batch)) {
+        return true;
+    }
+
+    PyGILState_STATE gstate;
+    gstate = PyGILState_Ensure();
+    bool rval =
+        invoke_callback_with_columns(data, &thread_err_local, &batch);
+    PyGILState_Release(gstate);
+
+    if (rval) {
+        return true;
+    }
+
+ABORT:
+    pthread_mutex_lock(&data->chunk_mutex);
+    data->aborted = true;
+    if (thread_err_local.code != AEROSPIKE_OK &&
+        data->error.code == AEROSPIKE_OK) {
+        as_error_copy(&data->error, &thread_err_local);
+    }
+    pthread_mutex_unlock(&data->chunk_mutex);
 
+    return false;
+}
+
+static PyObject *scan_foreach(AerospikeScan *self, PyObject *py_callback,
+                              PyObject *py_policy, PyObject *py_options,
+                              PyObject *py_nodename, int chunk_size,
+                              bool to_columns)
+{
     char *nodename = NULL;
+    column_builder columns;
 
     as_policy_scan scan_policy;
     as_policy_scan *scan_policy_p = NULL;
@@ -141,24 +357,41 @@ PyObject *AerospikeScan_Foreach(AerospikeScan *self, PyObject *args,
     as_partition_filter *partition_filter_p = NULL;
     as_partitions_status *ps = NULL;
 
-    // Python Function Keyword Arguments
-    static char *kwlist[] = {"callback", "policy", "options", "nodename", NULL};
-
-    // Python Function Argument Parsing
-    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|OOO:foreach", kwlist,
-                                    &py_callback, &py_policy, &py_options,
-                                    &py_nodename) == false) {
-        return NULL;
-    }
-
     // Create and initialize callback user-data
     LocalData data;
     data.callback = py_callback;
     data.client = self->client;
     data.partition_scan = 0;
+    data.chunk_size = chunk_size > 0 ? (uint32_t)chunk_size : 0;
+    data.aborted = false;
+    data.record_options = 0;
+    data.columns = NULL;
+    as_vector_init(&data.chunk, sizeof(as_record *),
+                   data.chunk_size && !to_columns ? data.chunk_size : 1);
+    pthread_mutex_init(&data.chunk_mutex, NULL);
+
+    aerospike_scan_foreach_callback callback =
+        data.chunk_size ? each_result_chunked : each_result;
+    if (to_columns) {
+        column_builder_init(&columns, data.chunk_size, COLUMN_FORMAT_ARROW);
+        data.columns = &columns;
+        callback = each_result_to_columns;
+    }
 
     as_error_init(&data.error);
 
+    if (chunk_size < 0) {
+        as_error_update(&data.error, AEROSPIKE_ERR_PARAM,
+                        "chunk_size must not be negative");
+        goto CLEANUP;
+    }
+
+    if (to_columns && chunk_size < 1) {
+        as_error_update(&data.error, AEROSPIKE_ERR_PARAM,
+                        "batch_size must be greater than 0");
+        goto CLEANUP;
+    }
+
     if (!self || !self->client->as) {
         as_error_update(&data.error, AEROSPIKE_ERR_PARAM,
                         "Invalid aerospike object");
@@ -180,6 +413,11 @@ PyObject *AerospikeScan_Foreach(AerospikeScan *self, PyObject *args,
         goto CLEANUP;
     }
 
+    if (get_record_options(&data.error, py_policy, &data.record_options) !=
+        AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+
     if (py_policy) {
         PyObject *py_partition_filter =
             PyDict_GetItemString(py_policy, "partition_filter");
@@ -220,7 +458,7 @@ PyObject *AerospikeScan_Foreach(AerospikeScan *self, PyObject *args,
             as_partition_filter_set_partitions(partition_filter_p, ps);
         }
         aerospike_scan_partitions(self->client->as, &data.error, scan_policy_p,
-                                  &self->scan, partition_filter_p, each_result,
+                                  &self->scan, partition_filter_p, callback,
                                   &data);
         if (ps) {
             as_partitions_status_release(ps);
@@ -228,11 +466,11 @@ PyObject *AerospikeScan_Foreach(AerospikeScan *self, PyObject *args,
     }
     else if (nodename) {
         aerospike_scan_node(self->client->as, &data.error, scan_policy_p,
-                            &self->scan, nodename, each_result, &data);
+                            &self->scan, nodename, callback, &data);
     }
     else {
         aerospike_scan_foreach(self->client->as, &data.error, scan_policy_p,
-                               &self->scan, each_result, &data);
+                               &self->scan, callback, &data);
     }
     // We are done using multiple threads
     Py_END_ALLOW_THREADS
@@ -241,6 +479,23 @@ PyObject *AerospikeScan_Foreach(AerospikeScan *self, PyObject *args,
         goto CLEANUP;
     }
 
+    // Pass the last partial batch of columns to the callback
+    column_builder batch;
+    if (to_columns && !data.aborted &&
+        column_builder_take(&columns, 1, &batch)) {
+        invoke_callback_with_columns(&data, &data.error, &batch);
+    }
+
+    // Pass the last partial chunk to the callback
+    if (!data.aborted && data.chunk.size > 0) {
+        uint32_t size = 0;
+        as_record **records =
+            (as_record **)as_vector_to_array(&data.chunk, &size);
+        as_vector_clear(&data.chunk);
+        invoke_callback_with_chunk(&data, &data.error, records, size);
+        cf_free(records);
+    }
+
 CLEANUP:
 
     if (exp_list_p) {
@@ -248,6 +503,17 @@ CLEANUP:
         ;
     }
 
+    // Records left over after an error or after the callback stopped the scan
+    for (uint32_t i = 0; i < data.chunk.size; ++i) {
+        as_record_destroy(*(as_record **)as_vector_get(&data.chunk, i));
+    }
+    as_vector_destroy(&data.chunk);
+    pthread_mutex_destroy(&data.chunk_mutex);
+
+    if (to_columns) {
+        column_builder_destroy(&columns);
+    }
+
     if (data.error.code != AEROSPIKE_OK) {
         raise_exception(&data.error);
         return NULL;
@@ -256,3 +522,50 @@ CLEANUP:
     Py_INCREF(Py_None);
     return Py_None;
 }
+
+PyObject *AerospikeScan_Foreach(AerospikeScan *self, PyObject *args,
+                                PyObject *kwds)
+{
+    // Python Function Arguments
+    PyObject *py_callback = NULL;
+    PyObject *py_policy = NULL;
+    PyObject *py_options = NULL;
+    PyObject *py_nodename = NULL;
+    int chunk_size = 0;
+
+    // Python Function Keyword Arguments
+    static char *kwlist[] = {"callback", "policy",     "options",
+                             "nodename", "chunk_size", NULL};
+
+    // Python Function Argument Parsing
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "O|OOO$i:foreach", kwlist,
+                                    &py_callback, &py_policy, &py_options,
+                                    &py_nodename, &chunk_size) == false) {
+        return NULL;
+    }
+
+    return scan_foreach(self, py_callback, py_policy, py_options, py_nodename,
+                        chunk_size, false);
+}
+
+PyObject *AerospikeScan_Foreach_Columns(AerospikeScan *self, PyObject *args,
+                                        PyObject *kwds)
+{
+    PyObject *py_callback = NULL;
+    PyObject *py_policy = NULL;
+    PyObject *py_options = NULL;
+    PyObject *py_nodename = NULL;
+    int batch_size = 0;
+    static char *kwlist[] = {"callback", "batch_size", "policy",
+                             "options",  "nodename",   NULL};
+
+    if (PyArg_ParseTupleAndKeywords(args, kwds, "Oi|OOO:_foreach_columns",
+                                    kwlist, &py_callback, &batch_size,
+                                    &py_policy, &py_options,
+                                    &py_nodename) == false) {
+        return NULL;
+    }
+
+    return scan_foreach(self, py_callback, py_policy, py_options, py_nodename,
+                        batch_size, true);
+}
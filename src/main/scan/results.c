@@ -35,6 +35,8 @@
 typedef struct {
     PyObject *py_results;
     AerospikeClient *client;
+    // RECORD_* options of the record tuples
+    int record_options;
 } LocalData;
 
 static bool each_result(const as_val *val, void *udata)
@@ -53,7 +55,8 @@ static bool each_result(const as_val *val, void *udata)
     PyGILState_STATE gstate;
     gstate = PyGILState_Ensure();
 
-    val_to_pyobject(data->client, &err, val, &py_result);
+    query_result_to_pyobject(data->client, &err, val, data->record_options,
+                             &py_result);
 
     if (py_result) {
         PyList_Append(py_results, py_result);
@@ -81,6 +84,7 @@ PyObject *AerospikeScan_Results(AerospikeScan *self, PyObject *args,
     char *nodename = NULL;
     LocalData data;
     data.client = self->client;
+    data.record_options = 0;
     static char *kwlist[] = {"policy", "nodename", NULL};
 
     // For converting expressions.
@@ -117,6 +121,11 @@ PyObject *AerospikeScan_Results(AerospikeScan *self, PyObject *args,
         goto CLEANUP;
     }
 
+    if (get_record_options(&err, py_policy, &data.record_options) !=
+        AEROSPIKE_OK) {
+        goto CLEANUP;
+    }
+
     if (py_policy) {
         PyObject *py_partition_filter =
             PyDict_GetItemString(py_policy, "partition_filter");
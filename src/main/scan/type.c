@@ -34,10 +34,11 @@
  * PYTHON DOC METHODS
  ******************************************************************************/
 
-PyDoc_STRVAR(foreach_doc, "foreach(callback[, policy[, options [, nodename]])\n\
+PyDoc_STRVAR(foreach_doc, "foreach(callback[, policy[, options [, nodename]]], chunk_size=0)\n\
 \n\
 Invoke the callback function for each of the records streaming back from the scan. If provided \
-nodename should be the Node ID of a node to limit the scan to.");
+nodename should be the Node ID of a node to limit the scan to. \
+If chunk_size is greater than 0, the callback is invoked with lists of up to chunk_size records.");
 
 PyDoc_STRVAR(select_doc, "select(bin1[, bin2[, bin3..]])\n\
 \n\
@@ -50,6 +51,21 @@ PyDoc_STRVAR(results_doc,
 Buffer the records resulting from the scan, and return them as a list of records.If provided \
 nodename should be the Node ID of a node to limit the scan to.");
 
+PyDoc_STRVAR(aiter_doc, "aiter([policy [, options [, nodename]]] [, buffer_size]) -> aerospike_helpers.aio.RecordIterator\n\
+\n\
+Return an asynchronous iterator over the records resulting from the scan. \
+At most buffer_size records are buffered ahead of the consumer.");
+
+PyDoc_STRVAR(stream_doc, "stream([policy [, options [, nodename]]] [, buffer_size]) -> aerospike_helpers.stream.RecordStream\n\
+\n\
+Return an iterator that yields the records resulting from the scan while they are being received. \
+At most buffer_size records are buffered ahead of the consumer.");
+
+PyDoc_STRVAR(results_future_doc, "results_future(...) -> concurrent.futures.Future\n\
+\n\
+Run results() with the same arguments on a native worker thread, \
+and return a future that is completed with the list of records or the exception.");
+
 PyDoc_STRVAR(paginate_doc, "paginate()\n\
 \n\
 Set pagination filter to receive records in bunch (max_records or page_size).");
@@ -64,6 +80,20 @@ PyDoc_STRVAR(get_parts_doc,
 Gets the complete partition status of the scan. \
 Returns a dictionary of the form {id:(id, init, done, digest), ...}.");
 
+PyDoc_STRVAR(to_arrow_doc, "to_arrow([policy [, options]] [, schema] [, batch_size] [, buffer_size]) -> aerospike_helpers.arrow.RecordBatchStream\n\
+\n\
+Return an iterator that yields the records resulting from the scan as pyarrow.RecordBatch objects of up to batch_size rows.");
+
+PyDoc_STRVAR(split_doc, "split(n) -> list of aerospike_helpers.parallel.PartitionWorkUnit\n\
+\n\
+Split the scan into n picklable work units that each cover a contiguous range of partitions.");
+
+PyDoc_STRVAR(parallel_results_doc, "parallel_results(n_procs, config[, policy]) -> list of (key, meta, bins)\n\
+\n\
+Run the scan in n_procs worker processes, each with its own client, and return all of the records.\n\
+Every record is pickled back to the calling process. Use aerospike_helpers.parallel.parallel_map() to process \
+the records in the worker processes instead.");
+
 /*******************************************************************************
  * PYTHON TYPE METHODS
  ******************************************************************************/
@@ -79,6 +109,15 @@ static PyMethodDef AerospikeScan_Type_Methods[] = {
     {"results", (PyCFunction)AerospikeScan_Results,
      METH_VARARGS | METH_KEYWORDS, results_doc},
 
+    {"aiter", (PyCFunction)AerospikeScan_Aiter, METH_VARARGS | METH_KEYWORDS,
+     aiter_doc},
+
+    {"stream", (PyCFunction)AerospikeScan_Stream, METH_VARARGS | METH_KEYWORDS,
+     stream_doc},
+
+    {"results_future", (PyCFunction)AerospikeScan_Results_Future,
+     METH_VARARGS | METH_KEYWORDS, results_future_doc},
+
     {"execute_background", (PyCFunction)AerospikeScan_ExecuteBackground,
      METH_VARARGS | METH_KEYWORDS, results_doc},
 
@@ -97,6 +136,20 @@ static PyMethodDef AerospikeScan_Type_Methods[] = {
     {"get_partitions_status", (PyCFunction)AerospikeScan_Get_Partitions_status,
      METH_NOARGS, get_parts_doc},
 
+    {"split", (PyCFunction)AerospikeScan_Split, METH_VARARGS | METH_KEYWORDS,
+     split_doc},
+
+    {"parallel_results", (PyCFunction)AerospikeScan_Parallel_Results,
+     METH_VARARGS | METH_KEYWORDS, parallel_results_doc},
+
+    {"to_arrow", (PyCFunction)AerospikeScan_To_Arrow,
+     METH_VARARGS | METH_KEYWORDS, to_arrow_doc},
+
+    {"_to_bytes", (PyCFunction)AerospikeScan_To_Bytes, METH_NOARGS, NULL},
+
+    {"_foreach_columns", (PyCFunction)AerospikeScan_Foreach_Columns,
+     METH_VARARGS | METH_KEYWORDS, NULL},
+
     {NULL}};
 
 static PyMemberDef AerospikeScan_Type_custom_members[] = {
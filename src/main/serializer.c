@@ -15,15 +15,18 @@
  ******************************************************************************/
 #include <Python.h>
 #include <stdbool.h>
+#include <string.h>
 
 #include <aerospike/aerospike_key.h>
 #include <aerospike/as_key.h>
 #include <aerospike/as_error.h>
 #include <aerospike/as_record.h>
+#include <aerospike/as_bytes.h>
 
 #include "client.h"
 #include "conversions.h"
 #include "exceptions.h"
+#include "helper_types.h"
 #include "policy.h"
 #include "serializer.h"
 
@@ -477,18 +480,8 @@ extern as_status deserialize_based_on_as_bytes_type(AerospikeClient *self,
         }
     } break;
     case AS_BYTES_HLL: {
-        // Convert bytes to Python bytes object
-        PyObject *py_bytes = PyBytes_FromStringAndSize(
-            (const char *)bytes->value, (Py_ssize_t)bytes->size);
-        if (py_bytes == NULL) {
-            as_error_update(
-                error_p, AEROSPIKE_ERR_CLIENT,
-                "Unable to convert C client's as_bytes to Python bytes");
-            goto CLEANUP;
-        }
-        PyObject *py_hll = create_class_instance_from_module(
-            error_p, "aerospike_helpers", "HyperLogLog", py_bytes);
-        Py_DECREF(py_bytes);
+        PyObject *py_hll = new_hyperloglog(error_p, (const char *)bytes->value,
+                                           (Py_ssize_t)bytes->size);
         if (!py_hll) {
             goto CLEANUP;
         }
@@ -521,6 +514,92 @@ CLEANUP:
     PyErr_Clear();
     return error_p->code;
 }
+/*
+ * Owns the buffer of a blob that is returned as a memoryview.
+ * The buffer is freed when the last memoryview of it is released.
+ */
+typedef struct {
+    PyObject_HEAD as_bytes *bytes;
+} BlobBuffer;
+
+static int BlobBuffer_GetBuffer(BlobBuffer *self, Py_buffer *view, int flags)
+{
+    return PyBuffer_FillInfo(view, (PyObject *)self,
+                             (void *)as_bytes_get(self->bytes),
+                             (Py_ssize_t)as_bytes_size(self->bytes), 1, flags);
+}
+
+static void BlobBuffer_Dealloc(BlobBuffer *self)
+{
+    as_bytes_destroy(self->bytes);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static PyBufferProcs BlobBuffer_BufferProcs = {
+    .bf_getbuffer = (getbufferproc)BlobBuffer_GetBuffer,
+};
+
+static PyTypeObject BlobBuffer_Type = {
+    PyVarObject_HEAD_INIT(NULL, 0).tp_name =
+        FULLY_QUALIFIED_TYPE_NAME("BlobBuffer"),
+    .tp_basicsize = sizeof(BlobBuffer),
+    .tp_dealloc = (destructor)BlobBuffer_Dealloc,
+    .tp_as_buffer = &BlobBuffer_BufferProcs,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+};
+
+as_status deserialize_blob_as_memoryview(AerospikeClient *self,
+                                         as_bytes *bytes, PyObject **retval,
+                                         as_error *error_p)
+{
+    // User deserializers and other bytes types get the usual Python objects
+    if (as_bytes_get_type(bytes) != AS_BYTES_BLOB ||
+        self->user_deserializer_call_info.callback ||
+        is_user_deserializer_registered) {
+        return deserialize_based_on_as_bytes_type(self, bytes, retval,
+                                                  error_p);
+    }
+
+    if (!(BlobBuffer_Type.tp_flags & Py_TPFLAGS_READY) &&
+        PyType_Ready(&BlobBuffer_Type) < 0) {
+        PyErr_Clear();
+        return as_error_update(error_p, AEROSPIKE_ERR_CLIENT,
+                               "Unable to create memoryview of bytes");
+    }
+
+    uint8_t *value = as_bytes_get(bytes);
+    uint32_t size = as_bytes_size(bytes);
+    if (bytes->free) {
+        // Take the buffer from the record, so it is not copied or freed with
+        // the record
+        bytes->free = false;
+    }
+    else {
+        // The record does not own the buffer, so it may not outlive it
+        uint8_t *copy = (uint8_t *)cf_malloc(size ? size : 1);
+        memcpy(copy, value, size);
+        value = copy;
+    }
+
+    BlobBuffer *py_buffer = PyObject_New(BlobBuffer, &BlobBuffer_Type);
+    if (!py_buffer) {
+        cf_free(value);
+        PyErr_Clear();
+        return as_error_update(error_p, AEROSPIKE_ERR_CLIENT,
+                               "Unable to create memoryview of bytes");
+    }
+    py_buffer->bytes = as_bytes_new_wrap(value, size, true);
+
+    *retval = PyMemoryView_FromObject((PyObject *)py_buffer);
+    Py_DECREF(py_buffer);
+    if (!*retval) {
+        PyErr_Clear();
+        return as_error_update(error_p, AEROSPIKE_ERR_CLIENT,
+                               "Unable to create memoryview of bytes");
+    }
+    return AEROSPIKE_OK;
+}
+
 PyObject *AerospikeClient_Unset_Serializers(AerospikeClient *self,
                                             PyObject *args, PyObject *kwds)
 {
@@ -0,0 +1,78 @@
+/*******************************************************************************
+ * Copyright 2013-2024 Aerospike, Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ ******************************************************************************/
+
+#include <Python.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include <string.h>
+
+#include "string_cache.h"
+
+struct string_cache_s {
+    PyObject *entries[STRING_CACHE_SIZE];
+};
+
+string_cache *string_cache_create(void)
+{
+    return (string_cache *)calloc(1, sizeof(string_cache));
+}
+
+void string_cache_destroy(string_cache *cache)
+{
+    if (!cache) {
+        return;
+    }
+    for (uint32_t i = 0; i < STRING_CACHE_SIZE; i++) {
+        Py_XDECREF(cache->entries[i]);
+    }
+    free(cache);
+}
+
+PyObject *string_cache_get(string_cache *cache, const char *str)
+{
+    size_t len = strlen(str);
+    if (!cache || len > STRING_CACHE_MAX_LEN) {
+        return PyUnicode_FromStringAndSize(str, (Py_ssize_t)len);
+    }
+
+    // FNV-1a
+    uint32_t hash = 2166136261u;
+    for (size_t i = 0; i < len; i++) {
+        hash = (hash ^ (uint8_t)str[i]) * 16777619u;
+    }
+    PyObject **entry = &cache->entries[hash & (STRING_CACHE_SIZE - 1)];
+
+    if (*entry) {
+        // The UTF-8 form of a str is kept by the str after the first call
+        Py_ssize_t entry_len = 0;
+        const char *entry_str = PyUnicode_AsUTF8AndSize(*entry, &entry_len);
+        if (entry_str && (size_t)entry_len == len &&
+            memcmp(entry_str, str, len) == 0) {
+            Py_INCREF(*entry);
+            return *entry;
+        }
+        PyErr_Clear();
+    }
+
+    PyObject *py_str = PyUnicode_FromStringAndSize(str, (Py_ssize_t)len);
+    if (!py_str) {
+        return NULL;
+    }
+    Py_XDECREF(*entry);
+    Py_INCREF(py_str);
+    *entry = py_str;
+    return py_str;
+}
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+from aerospike import exception as e
+
+from .test_base_class import TestBaseClass
+
+
+class TestAioRecordIterator(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        self.test_set = "aio-iter"
+        self.record_count = 50
+        self.keys = [("test", self.test_set, i) for i in range(self.record_count)]
+        for i, key in enumerate(self.keys):
+            as_connection.put(key, {"i": i})
+
+        def teardown():
+            for key in self.keys:
+                as_connection.remove(key)
+
+        request.addfinalizer(teardown)
+
+    @staticmethod
+    async def collect(records):
+        return [bins["i"] async for _, _, bins in records]
+
+    def test_query_aiter(self):
+        query = self.as_connection.query("test", self.test_set)
+        values = asyncio.run(self.collect(query.aiter()))
+        assert sorted(values) == list(range(self.record_count))
+
+    def test_scan_aiter(self):
+        scan = self.as_connection.scan("test", self.test_set)
+        values = asyncio.run(self.collect(scan.aiter()))
+        assert sorted(values) == list(range(self.record_count))
+
+    def test_aiter_with_small_buffer(self):
+        query = self.as_connection.query("test", self.test_set)
+        values = asyncio.run(self.collect(query.aiter(buffer_size=1)))
+        assert sorted(values) == list(range(self.record_count))
+
+    def test_aiter_with_partition_filter(self):
+        query = self.as_connection.query("test", self.test_set)
+        policy = {"partition_filter": {"begin": 0, "count": 4096}}
+        values = asyncio.run(self.collect(query.aiter(policy)))
+        assert sorted(values) == list(range(self.record_count))
+
+    def test_aiter_aclose_stops_early(self):
+        async def main():
+            query = self.as_connection.query("test", self.test_set)
+            async with query.aiter(buffer_size=1) as records:
+                async for record in records:
+                    return record
+
+        _, _, bins = asyncio.run(main())
+        assert "i" in bins
+
+    def test_aiter_invalid_buffer_size(self):
+        query = self.as_connection.query("test", self.test_set)
+        with pytest.raises(ValueError):
+            query.aiter(buffer_size=0)
+
+    def test_aiter_error_is_raised_in_caller(self):
+        query = self.as_connection.query("test", self.test_set)
+        with pytest.raises(e.ParamError):
+            asyncio.run(self.collect(query.aiter({}, {"nobins": "False"})))
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from aerospike import exception as e
+
+from .test_base_class import TestBaseClass
+
+pa = pytest.importorskip("pyarrow")
+
+
+class TestToArrow(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        self.test_set = "arrow"
+        self.record_count = 50
+        self.keys = [("test", self.test_set, i) for i in range(self.record_count)]
+        for i, key in enumerate(self.keys):
+            as_connection.put(key, {"i": i, "f": i / 2, "s": str(i), "l": [i, i], "m": {"i": i}})
+
+        def teardown():
+            for key in self.keys:
+                as_connection.remove(key)
+
+        request.addfinalizer(teardown)
+
+    @pytest.mark.parametrize("source_type", ["query", "scan"])
+    def test_to_arrow(self, source_type):
+        source = getattr(self.as_connection, source_type)("test", self.test_set)
+        table = source.to_arrow().read_all()
+        assert table.num_rows == self.record_count
+        assert table.schema.field("i").type == pa.int64()
+        assert table.schema.field("f").type == pa.float64()
+        assert table.schema.field("s").type == pa.string()
+        rows = sorted(table.to_pylist(), key=lambda row: row["i"])
+        assert rows[3] == {"i": 3, "f": 1.5, "s": "3", "l": [3, 3], "m": [("i", 3)]}
+
+    def test_to_arrow_with_batch_size(self):
+        query = self.as_connection.query("test", self.test_set)
+        batches = list(query.to_arrow(batch_size=8))
+        assert all(batch.num_rows <= 8 for batch in batches)
+        assert sum(batch.num_rows for batch in batches) == self.record_count
+
+    def test_to_arrow_with_schema(self):
+        schema = pa.schema([("i", pa.int32()), ("missing", pa.string())])
+        scan = self.as_connection.scan("test", self.test_set)
+        with scan.to_arrow(schema=schema) as stream:
+            table = stream.read_all()
+        assert table.schema == schema
+        assert sorted(table.column("i").to_pylist()) == list(range(self.record_count))
+        assert table.column("missing").null_count == self.record_count
+
+    def test_to_arrow_nested_values(self):
+        key = ("test", self.test_set, "nested")
+        self.as_connection.put(
+            key, {"i": -1, "l": [1, 2.5, None], "m": {"a": [1, 2], "b": []}, "nm": {1: {"x": True}}, "e": []}
+        )
+        self.keys.append(key)
+
+        query = self.as_connection.query("test", self.test_set)
+        table = query.to_arrow().read_all()
+        assert table.schema.field("l").type == pa.list_(pa.float64())
+        assert table.schema.field("m").type == pa.map_(pa.string(), pa.list_(pa.int64()))
+        assert table.schema.field("nm").type == pa.map_(pa.int64(), pa.map_(pa.string(), pa.bool_()))
+        assert table.schema.field("e").type == pa.list_(pa.null())
+        row = next(row for row in table.to_pylist() if row["i"] == -1)
+        assert row["l"] == [1.0, 2.5, None]
+        assert row["m"] == [("a", [1, 2]), ("b", [])]
+        assert row["nm"] == [(1, [("x", True)])]
+        assert row["e"] == []
+
+    def test_to_arrow_nested_values_of_different_types(self):
+        key = ("test", self.test_set, "mixed")
+        self.as_connection.put(key, {"l": [1, "a"]})
+        self.keys.append(key)
+
+        query = self.as_connection.query("test", self.test_set)
+        with pytest.raises(e.ClientError):
+            query.to_arrow().read_all()
+
+    @pytest.mark.parametrize("batch_size", [0, "1", True])
+    def test_to_arrow_with_invalid_batch_size(self, batch_size):
+        query = self.as_connection.query("test", self.test_set)
+        with pytest.raises(e.ParamError):
+            query.to_arrow(batch_size=batch_size)
+
+    def test_to_arrow_with_invalid_schema(self):
+        query = self.as_connection.query("test", self.test_set)
+        with pytest.raises(e.ParamError):
+            query.to_arrow(schema={"i": "int64"})
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+
+from .test_base_class import TestBaseClass
+
+
+class TestAutoBatch:
+    @pytest.fixture(autouse=True)
+    def setup(self, request):
+        config = TestBaseClass.get_connection_config()
+        config["auto_batch"] = {"window_us": 1000, "max_keys": 8}
+        self.client = aerospike.client(config)
+        self.keys = [("test", "demo", "auto-batch-{}".format(i)) for i in range(20)]
+        for i, key in enumerate(self.keys):
+            self.client.put(key, {"i": i, "name": "name{}".format(i)})
+
+        def teardown():
+            for key in self.keys:
+                self.client.remove(key)
+            self.client.close()
+
+        request.addfinalizer(teardown)
+
+    def test_concurrent_gets(self):
+        with ThreadPoolExecutor(max_workers=len(self.keys)) as executor:
+            records = list(executor.map(self.client.get, self.keys))
+
+        for i, (key, meta, bins) in enumerate(records):
+            assert key[:3] == ("test", "demo", None)
+            assert meta["gen"] == 1
+            assert bins == {"i": i, "name": "name{}".format(i)}
+
+    def test_concurrent_selects(self):
+        with ThreadPoolExecutor(max_workers=len(self.keys)) as executor:
+            records = list(executor.map(lambda key: self.client.select(key, ["i"]), self.keys))
+
+        assert [bins for _, _, bins in records] == [{"i": i} for i in range(len(self.keys))]
+
+    def test_get_with_policy(self):
+        _, _, bins = self.client.get(self.keys[0], {"total_timeout": 1000})
+        assert bins["i"] == 0
+
+    def test_missing_record_raises_only_in_its_caller(self):
+        keys = self.keys[:4] + [("test", "demo", "auto-batch-non-existent-key")]
+
+        def get(key):
+            try:
+                return self.client.get(key)[2]
+            except e.RecordNotFound:
+                return None
+
+        with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+            results = list(executor.map(get, keys))
+
+        assert results[-1] is None
+        assert [bins["i"] for bins in results[:-1]] == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize(
+    "auto_batch",
+    [
+        {"window_us": -1},
+        {"window_us": "200"},
+        {"max_keys": 0},
+        {"max_keys": True},
+    ],
+)
+def test_invalid_auto_batch_config(auto_batch):
+    config = TestBaseClass.get_connection_config()
+    config["auto_batch"] = auto_batch
+    with pytest.raises(e.ParamError):
+        aerospike.client(config)
@@ -288,6 +288,41 @@ class TestBatchOperate(TestBaseClass):
         with pytest.raises(exp_res):
             self.as_connection.batch_operate(keys, ops, policy_batch, policy_batch_write)
 
+    @pytest.mark.parametrize("max_inflight_batches", [None, 1, 3])
+    def test_batch_operate_in_chunks(self, max_inflight_batches):
+        ops = [op.increment("count", 10), op.read("count")]
+
+        chunks = list(
+            self.as_connection.batch_operate(
+                self.keys, ops, max_batch_size=2, max_inflight_batches=max_inflight_batches
+            )
+        )
+
+        assert [len(chunk.batch_records) for chunk in chunks] == [2, 2, 1]
+        records = [batch_record for chunk in chunks for batch_record in chunk.batch_records]
+        assert [record.key[2] for record in records] == list(range(self.batch_size))
+        assert [record.record[2]["count"] for record in records] == [i + 10 for i in range(self.batch_size)]
+        for chunk in chunks:
+            assert chunk.result == AerospikeStatus.AEROSPIKE_OK
+
+    @pytest.mark.parametrize(
+        "max_batch_size, max_inflight_batches",
+        [
+            (0, None),
+            ("2", None),
+            (2, 0),
+            (None, 2),
+        ],
+    )
+    def test_batch_operate_in_chunks_invalid_options(self, max_batch_size, max_inflight_batches):
+        with pytest.raises(e.ParamError):
+            self.as_connection.batch_operate(
+                self.keys,
+                [op.read("count")],
+                max_batch_size=max_batch_size,
+                max_inflight_batches=max_inflight_batches,
+            )
+
     def test_batch_operate_neg_connection(self):
         """
         Test batch_operate negative with bad connection.
@@ -1,6 +1,6 @@
 import pytest
 
-from aerospike_helpers.batch.records import BatchRecords
+from aerospike_helpers.batch.records import BatchRecord, BatchRecords
 from aerospike_helpers.expressions import base as exp
 from aerospike import exception as e
 
@@ -74,6 +74,16 @@ class TestBatchRead(TestBaseClass):
             assert batch_rec.record[0][:3] == self.keys[i]  # checking key in record
             assert batch_rec.record[2] == self.keys_to_expected_bins[self.keys[i]]
 
+    def test_batch_read_returns_batch_record_instances(self):
+        for _ in range(2):
+            res = self.as_connection.batch_read(self.keys)
+            assert type(res) is BatchRecords
+            for batch_rec in res.batch_records:
+                assert type(batch_rec) is BatchRecord
+                assert batch_rec.in_doubt is False
+                # Created in C with the same attributes as BatchRecord(key)
+                assert vars(batch_rec).keys() == vars(BatchRecord(batch_rec.key)).keys()
+
     @pytest.mark.parametrize(
         "bins",
         [
@@ -535,6 +535,34 @@ class TestBatchWrite(TestBaseClass):
         with pytest.raises(exp_res):
             self.as_connection.batch_write(batch_records, policy)
 
+    def test_batch_write_in_chunks(self):
+        batch_records = br.BatchRecords(
+            [br.Write(key=key, ops=[op.write("new", i), op.read("new")]) for i, key in enumerate(self.keys)]
+        )
+
+        chunks = list(self.as_connection.batch_write(batch_records, max_batch_size=2, max_inflight_batches=2))
+
+        assert [len(chunk.batch_records) for chunk in chunks] == [2, 2, 1]
+        for chunk in chunks:
+            assert chunk.result == AerospikeStatus.AEROSPIKE_OK
+        # The results are set on the BatchRecord objects that were passed in
+        for i, batch_record in enumerate(batch_records.batch_records):
+            assert batch_record.result == AerospikeStatus.AEROSPIKE_OK
+            assert batch_record.record[2] == {"new": i}
+
+    def test_batch_write_in_chunks_stops_on_close(self):
+        batch_records = br.BatchRecords([br.Write(key=key, ops=[op.write("new", 1)]) for key in self.keys])
+
+        with self.as_connection.batch_write(batch_records, max_batch_size=1) as chunks:
+            next(chunks)
+
+        _, _, bins = self.as_connection.get(self.keys[-1])
+        assert "new" not in bins
+
+    def test_batch_write_in_chunks_invalid_batch_records(self):
+        with pytest.raises(e.ParamError):
+            self.as_connection.batch_write([], max_batch_size=2)
+
     def test_batch_write_neg_connection(self):
         """
         Test batch_write negative with bad connection.
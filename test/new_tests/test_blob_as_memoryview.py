@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from aerospike import exception as e
+
+from .test_base_class import TestBaseClass
+
+POLICY = {"blob_as_memoryview": True}
+
+
+class TestBlobAsMemoryview(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        self.key = ("test", "demo", "blob_as_memoryview")
+        self.blob = bytes(range(256)) * 1024
+        as_connection.put(self.key, {"blob": self.blob, "i": 1, "l": [b"ab"]})
+
+        def teardown():
+            as_connection.remove(self.key)
+
+        request.addfinalizer(teardown)
+
+    def test_get(self):
+        _, _, bins = self.as_connection.get(self.key, policy=POLICY)
+        assert isinstance(bins["blob"], memoryview)
+        assert bins["blob"].readonly
+        assert bins["blob"] == self.blob
+        assert bins["i"] == 1
+        # Only blob bins are returned as memoryviews
+        assert bins["l"] == [b"ab"]
+
+    def test_select(self):
+        _, _, bins = self.as_connection.select(self.key, ["blob"], policy=POLICY)
+        assert isinstance(bins["blob"], memoryview)
+        assert bins["blob"].tobytes() == self.blob
+
+    def test_memoryview_outlives_record(self):
+        _, _, bins = self.as_connection.get(self.key, policy=POLICY)
+        view = bins["blob"][1024:2048]
+        del bins
+        assert view.tobytes() == self.blob[1024:2048]
+        with pytest.raises(TypeError):
+            view[0] = 0
+
+    @pytest.mark.parametrize("command", ["query", "scan", "batch_read"])
+    def test_other_commands_with_validated_keys(self, command):
+        client = TestBaseClass.get_new_connection({"validate_keys": True})
+        try:
+            if command == "batch_read":
+                batch_records = client.batch_read([self.key], policy=POLICY).batch_records
+                records = [batch_record.record for batch_record in batch_records]
+            else:
+                records = getattr(client, command)("test", "demo").results(POLICY)
+        finally:
+            client.close()
+        blobs = [bins["blob"] for _, _, bins in records if bins.get("blob") == self.blob]
+        assert len(blobs) == 1
+        assert isinstance(blobs[0], memoryview)
+
+    def test_get_without_blob_as_memoryview(self):
+        _, _, bins = self.as_connection.get(self.key, policy={"blob_as_memoryview": False})
+        assert isinstance(bins["blob"], bytes)
+
+    def test_invalid_blob_as_memoryview(self):
+        with pytest.raises(e.ParamError):
+            self.as_connection.get(self.key, policy={"blob_as_memoryview": 1})
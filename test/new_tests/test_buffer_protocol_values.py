@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import array
+import mmap
+
+import pytest
+
+from aerospike import exception as e
+from aerospike_helpers.operations import operations
+
+from .test_base_class import TestBaseClass
+
+
+class TestBufferProtocolValues(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        self.key = ("test", "demo", "buffer_protocol_values")
+
+        def teardown():
+            try:
+                as_connection.remove(self.key)
+            except Exception:
+                pass
+
+        request.addfinalizer(teardown)
+
+    def test_put_memoryview(self):
+        data = bytes(range(256)) * 16
+        self.as_connection.put(self.key, {"blob": memoryview(data)[16:1040]})
+        _, _, bins = self.as_connection.get(self.key)
+        assert bins["blob"] == data[16:1040]
+
+    def test_put_non_contiguous_memoryview(self):
+        data = bytes(range(256))
+        self.as_connection.put(self.key, {"blob": memoryview(data)[::2]})
+        _, _, bins = self.as_connection.get(self.key)
+        assert bins["blob"] == data[::2]
+
+    def test_put_array(self):
+        values = array.array("q", range(100))
+        self.as_connection.put(self.key, {"blob": values})
+        _, _, bins = self.as_connection.get(self.key)
+        assert bins["blob"] == values.tobytes()
+
+    def test_put_mmap(self):
+        data = b"x" * mmap.PAGESIZE
+        with mmap.mmap(-1, len(data)) as mapped:
+            mapped.write(data)
+            self.as_connection.put(self.key, {"blob": mapped})
+        _, _, bins = self.as_connection.get(self.key)
+        assert bins["blob"] == data
+
+    def test_put_numpy_array(self):
+        np = pytest.importorskip("numpy")
+        values = np.arange(1000, dtype=np.float64)
+        self.as_connection.put(self.key, {"blob": values})
+        _, _, bins = self.as_connection.get(self.key)
+        assert np.array_equal(np.frombuffer(bins["blob"], dtype=np.float64), values)
+
+    @pytest.mark.parametrize("type_name", ["int64", "bool_", "float32"])
+    def test_put_numpy_scalar_is_not_a_blob(self, type_name):
+        np = pytest.importorskip("numpy")
+        # NumPy scalars support the buffer protocol, but are numbers
+        with pytest.raises(e.ClientError):
+            self.as_connection.put(self.key, {"scalar": getattr(np, type_name)(1)})
+
+    def test_operate_write_memoryview(self):
+        data = b"abcdef" * 100
+        ops = [operations.write("blob", memoryview(data)), operations.read("blob")]
+        _, _, bins = self.as_connection.operate(self.key, ops)
+        assert bins["blob"] == data
+
+    def test_buffer_in_list(self):
+        self.as_connection.put(self.key, {"list": [memoryview(b"ab"), 1]})
+        _, _, bins = self.as_connection.get(self.key)
+        assert bins["list"] == [b"ab", 1]
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers import expressions as exp
+
+from .test_base_class import TestBaseClass
+
+
+class TestCompileExpression(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        self.test_set = "compile_expression"
+        self.keys = [("test", self.test_set, i) for i in range(5)]
+        for i, key in enumerate(self.keys):
+            as_connection.put(key, {"i": i})
+        self.expr = exp.GE(exp.IntBin("i"), 3).compile()
+        self.compiled = aerospike.compile_expression(self.expr)
+
+        def teardown():
+            for key in self.keys:
+                as_connection.remove(key)
+
+        request.addfinalizer(teardown)
+
+    def test_compiled_expression(self):
+        assert isinstance(self.compiled, aerospike.CompiledExpression)
+        assert self.compiled.size > 0
+        assert aerospike.compile_expression(self.compiled) is self.compiled
+
+    def test_same_expression_as_list(self):
+        assert self.as_connection.get_expression_base64(self.compiled) == self.as_connection.get_expression_base64(
+            self.expr
+        )
+
+    def test_get(self):
+        policy = {"expressions": self.compiled}
+        _, _, bins = self.as_connection.get(self.keys[4], policy)
+        assert bins == {"i": 4}
+        with pytest.raises(e.FilteredOut):
+            self.as_connection.get(self.keys[0], policy)
+
+    def test_reused_by_many_commands(self):
+        policy = {"expressions": self.compiled}
+        for _ in range(3):
+            records = self.as_connection.batch_read(self.keys, policy=policy).batch_records
+            assert [record.record[2]["i"] for record in records if record.result == 0] == [3, 4]
+
+    def test_query(self):
+        query = self.as_connection.query("test", self.test_set)
+        records = query.results({"expressions": self.compiled})
+        assert sorted(bins["i"] for _, _, bins in records) == [3, 4]
+
+    def test_cannot_be_created_directly(self):
+        with pytest.raises(TypeError):
+            aerospike.CompiledExpression()
+
+    @pytest.mark.parametrize("expr", [None, [], [1, 2], "not an expression", {"expressions": 1}])
+    def test_compile_invalid_expression(self, expr):
+        with pytest.raises(e.ParamError):
+            aerospike.compile_expression(expr)
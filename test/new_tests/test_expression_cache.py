@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers import expressions as exp
+from aerospike_helpers.cdt_ctx import cdt_ctx_list_index
+
+from .test_base_class import TestBaseClass
+
+
+def build_filter(value=18, ctx_index=0):
+    nested = exp.ListGetByIndex(
+        [cdt_ctx_list_index(ctx_index)], aerospike.LIST_RETURN_VALUE, exp.ResultType.INTEGER, 0, exp.ListBin("l")
+    )
+    return exp.And(exp.GE(exp.IntBin("age"), value), exp.Eq(nested, 1))
+
+
+class TestExpressionCache(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        self.key = ("test", "expression_cache", 1)
+        as_connection.put(self.key, {"age": 20, "l": [[1]]})
+
+        def teardown():
+            as_connection.remove(self.key)
+
+        request.addfinalizer(teardown)
+
+    def test_same_structure_is_equal(self):
+        first, second = build_filter(), build_filter()
+        assert first is not second
+        assert first == second
+        assert hash(first) == hash(second)
+
+    @pytest.mark.parametrize("value", [19, 18.0, True, "18"])
+    def test_different_values_are_not_equal(self, value):
+        assert build_filter() != build_filter(value)
+
+    def test_different_ctx_is_not_equal(self):
+        assert build_filter() != build_filter(ctx_index=1)
+
+    def test_compile_returns_new_list(self):
+        expr = exp.GE(exp.IntBin("age"), 18)
+        compiled = expr.compile()
+        compiled.clear()
+        assert expr.compile() == exp.GE(exp.IntBin("age"), 18).compile()
+
+    def test_immutable_after_precompile(self):
+        expr = build_filter()
+        expr.precompile()
+        with pytest.raises(AttributeError):
+            expr._op = 0
+
+    def test_immutable_after_hash(self):
+        expr = build_filter()
+        hash(expr)
+        with pytest.raises(AttributeError):
+            expr._op = 0
+
+    @pytest.mark.parametrize("value", [19, 18.0, -0.0, True, "18", b"18", [18]])
+    def test_precompile_different_values_are_not_shared(self, value):
+        assert build_filter().precompile() is not build_filter(value).precompile()
+
+    def test_precompile_different_ctx_is_not_shared(self):
+        assert build_filter().precompile() is not build_filter(ctx_index=1).precompile()
+
+    def test_precompile_is_shared(self):
+        compiled = build_filter().precompile()
+        assert isinstance(compiled, aerospike.CompiledExpression)
+        assert build_filter().precompile() is compiled
+
+    def test_precompile_filters_records(self):
+        _, _, bins = self.as_connection.get(self.key, policy={"expressions": build_filter().precompile()})
+        assert bins["age"] == 20
+        with pytest.raises(e.FilteredOut):
+            self.as_connection.get(self.key, policy={"expressions": build_filter(21).precompile()})
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers import expressions as exp
+
+from .test_base_class import TestBaseClass
+
+
+class TestExpressionParams(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        self.keys = [("test", "expression_params", i) for i in range(5)]
+        for i, key in enumerate(self.keys):
+            as_connection.put(key, {"age": i * 10, "name": "n%d" % i})
+        self.older = aerospike.compile_expression(exp.GT(exp.IntBin("age"), exp.Param("cutoff")).compile())
+
+        def teardown():
+            for key in self.keys:
+                as_connection.remove(key)
+
+        request.addfinalizer(teardown)
+
+    def get_filtered(self, expr, params=None):
+        policy = {"expressions": expr}
+        if params is not None:
+            policy["expression_params"] = params
+        found = []
+        for key in self.keys:
+            try:
+                _, _, bins = self.as_connection.get(key, policy=policy)
+                found.append(bins["age"])
+            except e.FilteredOut:
+                pass
+        return found
+
+    def test_params(self):
+        assert self.older.params == ("cutoff",)
+        assert aerospike.compile_expression(exp.GT(exp.IntBin("age"), 1).compile()).params == ()
+
+    @pytest.mark.parametrize("cutoff", [-1, 15, 20, 40])
+    def test_same_result_as_literal(self, cutoff):
+        literal = exp.GT(exp.IntBin("age"), cutoff).compile()
+        assert self.get_filtered(self.older, {"cutoff": cutoff}) == self.get_filtered(literal)
+
+    def test_expression_list(self):
+        expr = exp.GT(exp.IntBin("age"), exp.Param("cutoff")).compile()
+        assert self.get_filtered(expr, {"cutoff": 25}) == [30, 40]
+
+    def test_precompile(self):
+        expr = exp.Eq(exp.StrBin("name"), exp.Param("name")).precompile()
+        assert self.get_filtered(expr, {"name": "n2"}) == [20]
+        assert self.get_filtered(expr, {"name": "n3"}) == [30]
+
+    def test_param_used_twice(self):
+        expr = exp.And(
+            exp.GE(exp.IntBin("age"), exp.Param("age")), exp.LE(exp.IntBin("age"), exp.Param("age"))
+        ).compile()
+        assert self.get_filtered(expr, {"age": 10}) == [10]
+
+    def test_several_params(self):
+        expr = exp.And(
+            exp.GE(exp.IntBin("age"), exp.Param("low")), exp.LT(exp.IntBin("age"), exp.Param("high"))
+        ).compile()
+        assert self.get_filtered(expr, {"low": 10, "high": 30}) == [10, 20]
+
+    def test_params_in_nested_expressions(self):
+        expr = exp.Let(
+            exp.Def("low", exp.Param("low")),
+            exp.Cond(
+                exp.Eq(exp.StrBin("name"), exp.Param("name")),
+                True,
+                exp.And(exp.GE(exp.IntBin("age"), exp.Var("low")), exp.LT(exp.IntBin("age"), exp.Param("high"))),
+            ),
+        ).compile()
+        assert self.get_filtered(expr, {"name": "n4", "low": 10, "high": 30}) == [10, 20, 40]
+
+    @pytest.mark.parametrize("params", [None, {}, {"other": 1}, [1], {"cutoff": 1, "other": 1}])
+    def test_invalid_params(self, params):
+        policy = {"expressions": self.older}
+        if params is not None:
+            policy["expression_params"] = params
+        with pytest.raises(e.ParamError):
+            self.as_connection.get(self.keys[0], policy=policy)
+
+    def test_invalid_param_name(self):
+        with pytest.raises(e.ParamError):
+            aerospike.compile_expression(exp.GT(exp.IntBin("age"), exp.Param(1)).compile())
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers.batch.records import BatchRecords, Read
+
+from .test_base_class import TestBaseClass
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="os.fork() is not available on Windows")
+
+
+def run_in_child(func):
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            result = repr(func()).encode()
+        except Exception as exc:
+            result = repr(exc).encode()
+        os.write(write_fd, result)
+        os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as reader:
+        result = reader.read().decode()
+    os.waitpid(pid, 0)
+    return result
+
+
+class TestForkSafe:
+    @pytest.fixture(autouse=True)
+    def setup(self, request):
+        config = TestBaseClass.get_connection_config()
+        config["fork_safe"] = True
+        self.client = aerospike.client(config)
+        self.key = ("test", "demo", "fork-safe")
+        self.client.put(self.key, {"a": 1})
+
+        def teardown():
+            self.client.remove(self.key)
+            self.client.close()
+
+        request.addfinalizer(teardown)
+
+    def test_client_is_usable_in_child(self):
+        result = run_in_child(lambda: (self.client.is_connected(), self.client.get(self.key)[2]))
+        assert result == repr((True, {"a": 1}))
+
+    def test_parent_is_still_usable_after_fork(self):
+        run_in_child(lambda: self.client.get(self.key)[2])
+        _, _, bins = self.client.get(self.key)
+        assert bins == {"a": 1}
+
+    def test_closed_client_stays_closed_in_child(self):
+        config = TestBaseClass.get_connection_config()
+        config["fork_safe"] = True
+        client = aerospike.client(config)
+        client.close()
+
+        assert run_in_child(client.is_connected) == repr(False)
+
+    def test_init_called_again(self):
+        config = TestBaseClass.get_connection_config()
+        config["fork_safe"] = True
+        self.client.__init__(config)
+        result = run_in_child(lambda: (self.client.is_connected(), self.client.get(self.key)[2]))
+        assert result == repr((True, {"a": 1}))
+
+    def test_init_called_again_without_fork_safe(self):
+        config = TestBaseClass.get_connection_config()
+        config["fork_safe"] = True
+        client = aerospike.client(config)
+        client.__init__(TestBaseClass.get_connection_config())
+        client.close()
+        del client
+        # The deleted client is no longer rebuilt in the child
+        assert run_in_child(lambda: self.client.get(self.key)[2]) == repr({"a": 1})
+
+    def test_batch_future_in_child(self):
+        def get_with_future():
+            batch_records = BatchRecords([Read(self.key, ops=None, read_all_bins=True)])
+            future = self.client.batch_write_future(batch_records)
+            return future.result(timeout=10).batch_records[0].record[2]
+
+        assert get_with_future() == {"a": 1}
+        assert run_in_child(get_with_future) == repr({"a": 1})
+
+
+@pytest.mark.parametrize(
+    "config_update",
+    [
+        {"fork_safe": 1},
+        {"fork_safe": True, "use_shared_connection": True},
+    ],
+)
+def test_invalid_fork_safe_config(config_update):
+    config = TestBaseClass.get_connection_config()
+    config.update(config_update)
+    with pytest.raises(e.ParamError):
+        aerospike.client(config)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import Future, wait
+
+import pytest
+
+from aerospike import exception as e
+from aerospike_helpers.batch import records as br
+from aerospike_helpers.operations import operations
+
+from .test_base_class import TestBaseClass
+
+
+class TestFutures(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        if self.server_version < [6, 0]:
+            pytest.skip("Servers older than 6.0 do not support batch writes.")
+
+        self.test_set = "futures"
+        self.keys = [("test", self.test_set, i) for i in range(20)]
+        for i, key in enumerate(self.keys):
+            as_connection.put(key, {"i": i})
+
+        def teardown():
+            for key in self.keys:
+                try:
+                    as_connection.remove(key)
+                except e.RecordNotFound:
+                    pass
+
+        request.addfinalizer(teardown)
+
+    def test_batch_read_future(self):
+        future = self.as_connection.batch_read_future(self.keys, ["i"])
+        assert isinstance(future, Future)
+
+        res = future.result(timeout=10)
+        assert res.result == 0
+        assert [batch_record.record[2]["i"] for batch_record in res.batch_records] == list(range(len(self.keys)))
+
+    def test_many_batch_read_futures(self):
+        futures = [self.as_connection.batch_read_future([key]) for key in self.keys]
+        wait(futures, timeout=10)
+
+        values = [future.result().batch_records[0].record[2]["i"] for future in futures]
+        assert values == list(range(len(self.keys)))
+
+    def test_batch_operate_future(self):
+        ops = [operations.increment("i", 100)]
+        res = self.as_connection.batch_operate_future(self.keys, ops).result(timeout=10)
+        assert res.result == 0
+
+        _, _, bins = self.as_connection.get(self.keys[1])
+        assert bins["i"] == 101
+
+    def test_batch_write_future(self):
+        batch_records = br.BatchRecords([br.Write(self.keys[0], [operations.write("j", 1)])])
+        res = self.as_connection.batch_write_future(batch_records).result(timeout=10)
+        assert res.result == 0
+
+        _, _, bins = self.as_connection.get(self.keys[0])
+        assert bins["j"] == 1
+
+    def test_batch_remove_future(self):
+        res = self.as_connection.batch_remove_future(self.keys[:2]).result(timeout=10)
+        assert res.result == 0
+
+        with pytest.raises(e.RecordNotFound):
+            self.as_connection.get(self.keys[0])
+
+    @pytest.mark.parametrize("source_type", ["query", "scan"])
+    def test_results_future(self, source_type):
+        source = getattr(self.as_connection, source_type)("test", self.test_set)
+        records = source.results_future().result(timeout=10)
+        assert sorted(bins["i"] for _, _, bins in records) == list(range(len(self.keys)))
+
+    def test_future_exception(self):
+        future = self.as_connection.batch_read_future("not a list")
+        with pytest.raises(e.ParamError):
+            future.result(timeout=10)
+
+    @pytest.mark.parametrize("source_type", ["query", "scan"])
+    def test_futures_wait_for_free_thread(self, source_type):
+        # Queries need a thread of the pool for each node while the futures run on it
+        client = TestBaseClass.get_new_connection({"thread_pool_size": 2})
+        try:
+            futures = [getattr(client, source_type)("test", self.test_set).results_future() for _ in range(5)]
+            for future in futures:
+                assert len(future.result(timeout=10)) == len(self.keys)
+        finally:
+            client.close()
+
+    def test_future_thread_pool_too_small(self):
+        client = TestBaseClass.get_new_connection({"thread_pool_size": 1})
+        try:
+            with pytest.raises(e.ParamError):
+                client.batch_read_future(self.keys)
+        finally:
+            client.close()
@@ -635,6 +635,32 @@ class TestGeospatial(object):
         obj = aerospike.geojson(geojson_str)
         assert obj.unwrap() == geo_object.unwrap()
 
+    def test_geospatial_get_reuses_server_string(self):
+        """
+        Verify that a GeoJSON read from the server is written back as is,
+        and that changes to its unwrapped data are not lost
+        """
+        key = ("test", "demo", "geo_server_string")
+        self.as_connection.put(key, {"loc": aerospike.GeoJSON({"type": "Point", "coordinates": [42.34, 58.62]})})
+        _, _, bins = self.as_connection.get(key)
+        geojson_str = bins["loc"].dumps()
+        assert str(bins["loc"]) == geojson_str
+
+        self.as_connection.put(key, {"loc": bins["loc"]})
+        _, _, bins = self.as_connection.get(key)
+        assert bins["loc"].dumps() == geojson_str
+
+        geo_data = bins["loc"].unwrap()
+        assert geo_data == {"type": "Point", "coordinates": [42.34, 58.62]}
+        assert bins["loc"].geo_data is geo_data
+
+        geo_data["coordinates"] = [56.34, 69.62]
+        self.as_connection.put(key, {"loc": bins["loc"]})
+        _, _, bins = self.as_connection.get(key)
+        assert bins["loc"].unwrap() == {"type": "Point", "coordinates": [56.34, 69.62]}
+
+        self.as_connection.remove(key)
+
     def test_geospatial_put_get_positive_with_geodata(self):
         """
         Perform a get and put with multiple bins including geospatial bin
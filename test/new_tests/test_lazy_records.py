@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import pickle
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+
+from .test_base_class import TestBaseClass
+
+LAZY_POLICY = {"lazy_records": True}
+
+
+class TestLazyRecords(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        self.test_set = "lazy"
+        self.record_count = 5
+        self.keys = [("test", self.test_set, i) for i in range(self.record_count)]
+        self.bins = [
+            {"i": i, "name": "name%d" % i, "list": list(range(i)), "map": {"a": i}} for i in range(self.record_count)
+        ]
+        for key, bins in zip(self.keys, self.bins):
+            as_connection.put(key, bins)
+
+        def teardown():
+            for key in self.keys:
+                as_connection.remove(key)
+
+        request.addfinalizer(teardown)
+
+    def test_get(self):
+        _, meta, bins = self.as_connection.get(self.keys[3], policy=LAZY_POLICY)
+        assert isinstance(bins, aerospike.Record)
+        assert meta["gen"] == 1
+        assert len(bins) == 4
+        assert "list" in bins
+        assert "missing" not in bins
+        assert bins["list"] == [0, 1, 2]
+        assert bins["list"] is bins["list"]
+        assert sorted(bins) == ["i", "list", "map", "name"]
+        assert bins == self.bins[3]
+        assert bins.to_dict() == self.bins[3]
+        assert dict(bins.items()) == self.bins[3]
+        assert sorted(bins.keys()) == sorted(self.bins[3].keys())
+
+    @pytest.mark.parametrize("source_type", ["get", "query"])
+    def test_scalar_bins_outlive_command(self, source_type):
+        # No bin is converted until the command that read the record has returned
+        # and its response has been freed
+        if source_type == "get":
+            records = [self.as_connection.get(key, policy=LAZY_POLICY) for key in self.keys]
+        else:
+            records = self.as_connection.query("test", self.test_set).results(LAZY_POLICY)
+        for key in self.keys:
+            self.as_connection.get(key)
+        assert sorted((bins["i"], bins["name"]) for _, _, bins in records) == [
+            (i, "name%d" % i) for i in range(self.record_count)
+        ]
+
+    def test_get_missing_bin(self):
+        _, _, bins = self.as_connection.get(self.keys[0], policy=LAZY_POLICY)
+        with pytest.raises(KeyError):
+            bins["missing"]
+        assert bins.get("missing") is None
+        assert bins.get("missing", 1) == 1
+        assert bins.get("i") == 0
+
+    def test_select(self):
+        _, _, bins = self.as_connection.select(self.keys[2], ["name", "i"], policy=LAZY_POLICY)
+        assert isinstance(bins, aerospike.Record)
+        assert bins == {"name": "name2", "i": 2}
+
+    def test_get_without_lazy_records(self):
+        _, _, bins = self.as_connection.get(self.keys[0], policy={"lazy_records": False})
+        assert type(bins) is dict
+
+    def test_batch_read(self):
+        batch_records = self.as_connection.batch_read(self.keys, policy=LAZY_POLICY)
+        for batch_record, expected in zip(batch_records.batch_records, self.bins):
+            bins = batch_record.record[2]
+            assert isinstance(bins, aerospike.Record)
+            assert bins == expected
+
+    @pytest.mark.parametrize("source_type", ["query", "scan"])
+    def test_results(self, source_type):
+        source = getattr(self.as_connection, source_type)("test", self.test_set)
+        records = source.results(LAZY_POLICY)
+        assert all(isinstance(bins, aerospike.Record) for _, _, bins in records)
+        assert sorted(bins["i"] for _, _, bins in records) == list(range(self.record_count))
+
+    @pytest.mark.parametrize("source_type", ["query", "scan"])
+    def test_foreach(self, source_type):
+        source = getattr(self.as_connection, source_type)("test", self.test_set)
+        records = []
+        source.foreach(records.append, LAZY_POLICY)
+        assert all(isinstance(bins, aerospike.Record) for _, _, bins in records)
+        assert sorted(bins["name"] for _, _, bins in records) == ["name%d" % i for i in range(self.record_count)]
+
+    def test_pickle(self):
+        _, _, bins = self.as_connection.get(self.keys[1], policy=LAZY_POLICY)
+        unpickled = pickle.loads(pickle.dumps(bins))
+        assert type(unpickled) is dict
+        assert unpickled == self.bins[1]
+
+    def test_record_cannot_be_created(self):
+        with pytest.raises(TypeError):
+            aerospike.Record()
+
+    def test_invalid_lazy_records(self):
+        with pytest.raises(e.ParamError):
+            self.as_connection.get(self.keys[0], policy={"lazy_records": 1})
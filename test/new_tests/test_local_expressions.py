@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers import HyperLogLog
+from aerospike_helpers import expressions as exp
+from aerospike_helpers.cdt_ctx import cdt_ctx_list_index, cdt_ctx_map_key
+from aerospike_helpers.expressions.local import LocalExpression
+
+NOW = 1_700_000_000 * 10**9
+
+RECORD = (
+    ("test", "demo", 1, None),
+    {"ttl": 100, "gen": 1, "last_update_time": NOW - 5000 * 10**6},
+    {
+        "i": 7,
+        "f": 2.5,
+        "s": "abc",
+        "b": True,
+        "blob": b"\x01\x02",
+        "l": [4, 1, 3, 1, "x"],
+        "m": {"c": 3, "a": 1, "b": 2},
+        "nested": {"k": [[1, 2], [3]]},
+    },
+)
+
+
+def hll(registers, n_index_bits=4):
+    # Packs 6 bit registers after the flags, index bits and min hash bits
+    packed = 0
+    for register in registers:
+        packed = (packed << 6) | register
+    n_bits = len(registers) * 6
+    size = (n_bits + 7) // 8
+    packed <<= size * 8 - n_bits
+    return HyperLogLog(bytes([0, n_index_bits, 0]) + packed.to_bytes(size, "big"))
+
+
+def evaluate(expr, record=RECORD, **kwargs):
+    return LocalExpression(expr).evaluate(record, now=NOW, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "expr, expected",
+    [
+        (exp.IntBin("i"), 7),
+        (exp.FloatBin("f"), 2.5),
+        (exp.BoolBin("b"), True),
+        (exp.BinExists("s"), True),
+        (exp.BinExists("missing"), False),
+        (exp.BinType("l"), aerospike.AS_BYTES_LIST),
+        (exp.KeyInt(), 1),
+        (exp.KeyExists(), True),
+        (exp.SetName(), "demo"),
+        (exp.TTL(), 100),
+        (exp.SinceUpdateTime(), 5000),
+        (exp.LastUpdateTime(), NOW - 5000 * 10**6),
+        (exp.Eq(exp.StrBin("s"), "abc"), True),
+        (exp.GT(exp.BlobBin("blob"), b"\x01"), True),
+        (exp.CmpRegex(aerospike.REGEX_ICASE, "^A", exp.StrBin("s")), True),
+        (exp.Cond(exp.GT(exp.IntBin("i"), 10), 1, exp.LT(exp.IntBin("i"), 10), 2, 3), 2),
+        (exp.Let(exp.Def("x", exp.IntBin("i")), exp.Mul(exp.Var("x"), exp.Var("x"))), 49),
+    ],
+)
+def test_values(expr, expected):
+    assert evaluate(expr) == expected
+
+
+@pytest.mark.parametrize(
+    "expr, expected",
+    [
+        (exp.IntBin("i") + 3, 10),
+        (exp.Sub(exp.IntBin("i")), -7),
+        (exp.Div(-7, 2), -3),
+        (exp.Mod(-7, 3), -1),
+        (exp.Add(2**63 - 1, 1), -(2**63)),
+        (exp.Pow(exp.FloatBin("f"), 2.0), 6.25),
+        (exp.Floor(exp.FloatBin("f")), 2.0),
+        (exp.ToInt(exp.FloatBin("f")), 2),
+        (exp.Max(1, exp.IntBin("i"), 3), 7),
+        (exp.IntRightShift(-1, 60), 15),
+        (exp.IntArithmeticRightShift(-16, 2), -4),
+        (exp.IntCount(exp.IntBin("i")), 3),
+        (exp.IntLeftScan(1, True), 63),
+        (exp.IntRightScan(6, True), 62),
+    ],
+)
+def test_arithmetic(expr, expected):
+    assert evaluate(expr) == expected
+
+
+@pytest.mark.parametrize(
+    "expr, expected",
+    [
+        (exp.ListSize(None, exp.ListBin("l")), 5),
+        (exp.ListGetByIndex(None, aerospike.LIST_RETURN_VALUE, exp.ResultType.INTEGER, -2, exp.ListBin("l")), 1),
+        (exp.ListGetByValue(None, aerospike.LIST_RETURN_INDEX, 1, exp.ListBin("l")), [1, 3]),
+        (exp.ListGetByValue(None, aerospike.LIST_RETURN_COUNT, 1, exp.ListBin("l"), inverted=True), 3),
+        (exp.ListGetByValueRange(None, aerospike.LIST_RETURN_VALUE, 2, 5, exp.ListBin("l")), [4, 3]),
+        (exp.ListGetByRank(None, aerospike.LIST_RETURN_VALUE, exp.ResultType.STRING, -1, exp.ListBin("l")), "x"),
+        (exp.ListGetByRankRange(None, aerospike.LIST_RETURN_INDEX, 0, 2, exp.ListBin("l")), [1, 3]),
+        (exp.ListGetByIndexRangeToEnd(None, aerospike.LIST_RETURN_RANK, 3, exp.ListBin("l")), [1, 4]),
+        (exp.ListGetByValueRelRankRange(None, aerospike.LIST_RETURN_VALUE, 2, 1, 1, exp.ListBin("l")), [4]),
+        (exp.MapSize(None, exp.MapBin("m")), 3),
+        (exp.MapGetByKey(None, aerospike.MAP_RETURN_VALUE, exp.ResultType.INTEGER, "b", exp.MapBin("m")), 2),
+        (exp.MapGetByKeyRange(None, aerospike.MAP_RETURN_KEY, "b", None, exp.MapBin("m")), ["b", "c"]),
+        (exp.MapGetByIndex(None, aerospike.MAP_RETURN_KEY, exp.ResultType.STRING, 0, exp.MapBin("m")), "a"),
+        (exp.MapGetByValueRange(None, aerospike.MAP_RETURN_KEY_VALUE, 2, 4, exp.MapBin("m")), {"b": 2, "c": 3}),
+        (exp.MapGetByRank(None, aerospike.MAP_RETURN_INDEX, exp.ResultType.INTEGER, -1, exp.MapBin("m")), 2),
+        (
+            exp.ListGetByIndex(
+                [cdt_ctx_map_key("k"), cdt_ctx_list_index(0)],
+                aerospike.LIST_RETURN_VALUE,
+                exp.ResultType.INTEGER,
+                1,
+                exp.MapBin("nested"),
+            ),
+            2,
+        ),
+    ],
+)
+def test_cdt_reads(expr, expected):
+    assert evaluate(expr) == expected
+
+
+def test_hll():
+    a = hll([1] * 8 + [0] * 8)
+    b = hll([0] * 8 + [1] * 8)
+    record = (None, {}, {"a": a})
+    assert evaluate(exp.HLLDescribe(exp.HLLBin("a")), record) == [4, 0]
+    assert evaluate(exp.HLLGetCount(exp.HLLBin("a")), record) > 0
+    union = evaluate(exp.HLLGetUnion([b], exp.HLLBin("a")), record)
+    assert union == hll([1] * 16)
+    assert evaluate(exp.HLLGetUnionCount([b], exp.HLLBin("a")), record) == evaluate(
+        exp.HLLGetCount(exp.HLLBin("u")), (None, {}, {"u": union})
+    )
+    assert evaluate(exp.HLLGetIntersectCount([a], exp.HLLBin("a")), record) == evaluate(
+        exp.HLLGetCount(exp.HLLBin("a")), record
+    )
+
+
+@pytest.mark.parametrize(
+    "expr, expected",
+    [
+        (exp.IntBin("s"), False),
+        (exp.Eq(exp.IntBin("missing"), 1), False),
+        (exp.Not(exp.Eq(exp.IntBin("missing"), 1)), False),
+        (exp.Or(exp.Eq(exp.IntBin("missing"), 1), exp.BoolBin("b")), True),
+        (exp.And(exp.Eq(exp.IntBin("missing"), 1), exp.Not(exp.BoolBin("b"))), False),
+        (exp.Eq(exp.IntBin("i"), 7.0), False),
+        (exp.Eq(exp.IntBin("i"), 7), True),
+    ],
+)
+def test_matches(expr, expected):
+    assert LocalExpression(expr).matches(RECORD) is expected
+
+
+def test_unknown():
+    with pytest.raises(e.OpNotApplicable):
+        evaluate(exp.And(exp.Eq(exp.IntBin("missing"), 1), exp.BoolBin("b")))
+    with pytest.raises(e.OpNotApplicable):
+        evaluate(exp.Div(exp.IntBin("i"), 0))
+
+
+def test_filter():
+    records = [(None, {"ttl": -1}, {"age": age}) for age in range(10)]
+    adults = LocalExpression(exp.GE(exp.IntBin("age"), exp.Param("min")))
+    assert adults.params == {"min"}
+    assert [bins["age"] for _, _, bins in adults.filter(records, {"min": 7})] == [7, 8, 9]
+
+
+@pytest.mark.parametrize("params", [None, {}, {"min": 1, "other": 1}, [1]])
+def test_invalid_params(params):
+    with pytest.raises(e.ParamError):
+        LocalExpression(exp.GE(exp.IntBin("age"), exp.Param("min"))).matches(RECORD, params)
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        exp.ListAppend(None, None, 1, exp.ListBin("l")),
+        exp.HLLMayContain(["a"], exp.HLLBin("h")),
+        exp.RecordSize(),
+        exp.Var("undefined"),
+        exp.GE(exp.IntBin("i"), 1).compile(),
+    ],
+)
+def test_unsupported(expr):
+    with pytest.raises(e.ParamError):
+        LocalExpression(expr)
+
+
+def test_missing_metadata():
+    with pytest.raises(e.ParamError):
+        LocalExpression(exp.LastUpdateTime()).evaluate((None, {"ttl": 1}, {}))
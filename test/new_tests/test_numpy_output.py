@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from aerospike import exception as e
+
+from .test_base_class import TestBaseClass
+
+numpy = pytest.importorskip("numpy")
+
+
+class TestNumpyOutput(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        self.test_set = "numpy_output"
+        self.keys = [("test", self.test_set, i) for i in range(5)]
+        for i, key in enumerate(self.keys):
+            bins = {"i": i, "f": i / 2, "b": i % 2 == 0}
+            if i == 3:
+                del bins["f"]
+            as_connection.put(key, bins)
+
+        def teardown():
+            for key in self.keys:
+                as_connection.remove(key)
+
+        request.addfinalizer(teardown)
+
+    def test_batch_read_numpy(self):
+        missing_key = ("test", self.test_set, "missing")
+        columns = self.as_connection.batch_read(self.keys + [missing_key], ["i", "f", "b"], output="numpy")
+
+        assert columns.n_rows == 6
+        assert columns["i"].dtype == numpy.int64
+        assert columns["f"].dtype == numpy.float64
+        assert columns["b"].dtype == numpy.bool_
+        assert columns["i"].tolist() == [0, 1, 2, 3, 4, 0]
+        assert columns.valid["i"].tolist() == [True] * 5 + [False]
+        assert columns.valid["f"].tolist() == [True, True, True, False, True, False]
+        assert columns.masked("f").sum() == (0 + 1 + 2 + 4) / 2
+        assert columns["b"][:5].tolist() == [True, False, True, False, True]
+
+    def test_batch_read_numpy_ints_and_floats(self):
+        self.as_connection.put(self.keys[0], {"i": 0.5})
+        columns = self.as_connection.batch_read(self.keys, ["i"], output="numpy")
+        assert columns["i"].dtype == numpy.float64
+        assert columns["i"].tolist() == [0.5, 1.0, 2.0, 3.0, 4.0]
+
+    def test_query_results_numpy(self):
+        query = self.as_connection.query("test", self.test_set)
+        columns = query.results(output="numpy")
+        assert columns.n_rows == len(self.keys)
+        assert sorted(columns["i"].tolist()) == list(range(len(self.keys)))
+        assert columns.valid["f"].sum() == len(self.keys) - 1
+
+    def test_numpy_output_with_unsupported_bin(self):
+        self.as_connection.put(self.keys[0], {"s": "string"})
+        with pytest.raises(e.ClientError):
+            self.as_connection.batch_read(self.keys, ["s"], output="numpy")
+
+    def test_numpy_output_with_invalid_output(self):
+        with pytest.raises(e.ParamError):
+            self.as_connection.batch_read(self.keys, output="pandas")
+
+    def test_batch_read_numpy_with_empty_bins(self):
+        with pytest.raises(e.ParamError):
+            self.as_connection.batch_read(self.keys, [], output="numpy")
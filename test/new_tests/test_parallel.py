@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import pickle
+
+import pytest
+
+from aerospike import exception as e
+from aerospike_helpers.parallel import parallel_map
+
+from .test_base_class import TestBaseClass
+
+
+class TestParallel(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        self.test_set = "parallel"
+        self.record_count = 50
+        self.keys = [("test", self.test_set, i) for i in range(self.record_count)]
+        for i, key in enumerate(self.keys):
+            as_connection.put(key, {"i": i})
+
+        def teardown():
+            for key in self.keys:
+                as_connection.remove(key)
+
+        request.addfinalizer(teardown)
+
+    @pytest.mark.parametrize("source_type", ["query", "scan"])
+    def test_split_covers_all_partitions(self, source_type):
+        source = getattr(self.as_connection, source_type)("test", self.test_set)
+        units = source.split(3)
+        assert [(unit.begin, unit.count) for unit in units] == [(0, 1366), (1366, 1365), (2731, 1365)]
+        assert all(unit.kind == source_type for unit in units)
+
+    @pytest.mark.parametrize("source_type", ["query", "scan"])
+    def test_split_units_return_all_records(self, source_type):
+        source = getattr(self.as_connection, source_type)("test", self.test_set)
+        values = []
+        for unit in source.split(4):
+            unit = pickle.loads(pickle.dumps(unit))
+            values.extend(bins["i"] for _, _, bins in unit.results(self.as_connection))
+            assert unit.is_done()
+        assert sorted(values) == list(range(self.record_count))
+
+    def test_split_keeps_selected_bins(self):
+        self.as_connection.put(self.keys[0], {"i": 0, "j": 1})
+        query = self.as_connection.query("test", self.test_set)
+        query.select("j")
+        records = [bins for unit in query.split(2) for _, _, bins in unit.results(self.as_connection)]
+        assert {"j": 1} in records
+        assert all("i" not in bins for bins in records)
+
+    def test_split_unit_resume(self):
+        scan = self.as_connection.scan("test", self.test_set)
+        (unit,) = scan.split(1)
+        seen = []
+
+        def callback(part_id, record):
+            if len(seen) == 10:
+                return False
+            seen.append(record[2]["i"])
+
+        unit.foreach(self.as_connection, callback)
+        assert not unit.is_done()
+
+        unit = pickle.loads(pickle.dumps(unit))
+        unit.foreach(self.as_connection, lambda part_id, record: seen.append(record[2]["i"]))
+        assert unit.is_done()
+        assert sorted(seen) == list(range(self.record_count))
+
+    @pytest.mark.parametrize("source_type", ["query", "scan"])
+    def test_parallel_results(self, source_type):
+        source = getattr(self.as_connection, source_type)("test", self.test_set)
+        records = source.parallel_results(2, TestBaseClass.get_connection_config())
+        assert sorted(bins["i"] for _, _, bins in records) == list(range(self.record_count))
+
+    def test_parallel_map(self):
+        units = self.as_connection.scan("test", self.test_set).split(8)
+        counts = list(parallel_map(units, 3, TestBaseClass.get_connection_config(), len))
+        assert sorted(unit.begin for unit, _ in counts) == [unit.begin for unit in units]
+        assert sum(count for _, count in counts) == self.record_count
+        assert all(unit.is_done() for unit in units)
+
+    def test_parallel_map_without_function(self):
+        units = self.as_connection.query("test", self.test_set).split(2)
+        results = parallel_map(units, 2, TestBaseClass.get_connection_config())
+        values = [bins["i"] for _, records in results for _, _, bins in records]
+        assert sorted(values) == list(range(self.record_count))
+
+    def test_parallel_map_resume(self):
+        config = TestBaseClass.get_connection_config()
+        units = self.as_connection.scan("test", self.test_set).split(4)
+        results = parallel_map(units, 2, config, len)
+        total = next(results)[1]
+        results.close()
+        assert sum(unit.is_done() for unit in units) == 1
+
+        remaining = [unit for unit in units if not unit.is_done()]
+        total += sum(count for _, count in parallel_map(remaining, 2, config, len))
+        assert total == self.record_count
+        assert all(unit.is_done() for unit in units)
+
+    def test_parallel_map_error(self):
+        units = self.as_connection.scan("missing", self.test_set).split(2)
+        with pytest.raises(e.AerospikeError):
+            list(parallel_map(units, 2, TestBaseClass.get_connection_config()))
+
+    def test_parallel_map_with_invalid_config(self):
+        units = self.as_connection.scan("test", self.test_set).split(2)
+        with pytest.raises(e.ParamError):
+            parallel_map(units, 2, None)
+
+    @pytest.mark.parametrize("n", [0, 4097, "2", True])
+    def test_split_with_invalid_n(self, n):
+        scan = self.as_connection.scan("test", self.test_set)
+        with pytest.raises(e.ParamError):
+            scan.split(n)
+
+    def test_parallel_results_with_invalid_config(self):
+        query = self.as_connection.query("test", self.test_set)
+        with pytest.raises(e.ParamError):
+            query.parallel_results(2, None)
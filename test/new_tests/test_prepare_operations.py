@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers.operations import operations as op
+from aerospike_helpers.operations import list_operations as list_ops
+
+from .test_base_class import TestBaseClass
+
+
+class TestPrepareOperations(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        self.key = ("test", "prepare_operations", 1)
+        as_connection.put(self.key, {"hits": 1, "name": "a", "items": [1]})
+        self.counters = as_connection.prepare_operations(
+            [
+                op.increment("hits", aerospike.Placeholder(0)),
+                op.write("last", aerospike.Placeholder(1)),
+                op.append("name", "b"),
+                op.read("hits"),
+                op.read("last"),
+            ]
+        )
+
+        def teardown():
+            as_connection.remove(self.key)
+
+        request.addfinalizer(teardown)
+
+    def test_prepared_operations(self):
+        assert isinstance(self.counters, aerospike.PreparedOperations)
+        assert self.counters.values == 2
+
+    def test_operate(self):
+        _, _, bins = self.as_connection.operate(self.key, self.counters, values=(2, "x"))
+        assert bins == {"hits": 3, "last": "x"}
+        _, _, bins = self.as_connection.operate(self.key, self.counters, values=(-1, [1, 2]))
+        assert bins == {"hits": 2, "last": [1, 2]}
+        _, _, bins = self.as_connection.get(self.key)
+        assert bins["name"] == "abb"
+
+    def test_same_result_as_list(self):
+        self.as_connection.operate(self.key, self.counters, values=(5, b"\x01"))
+        _, _, prepared_bins = self.as_connection.get(self.key)
+        self.as_connection.put(self.key, {"hits": 1, "name": "a", "items": [1]})
+        self.as_connection.operate(
+            self.key, [op.increment("hits", 5), op.write("last", b"\x01"), op.append("name", "b")]
+        )
+        _, _, bins = self.as_connection.get(self.key)
+        assert prepared_bins == bins
+
+    def test_float_increment(self):
+        prepared = self.as_connection.prepare_operations([op.increment("f", aerospike.Placeholder(0)), op.read("f")])
+        self.as_connection.operate(self.key, prepared, values=(1.5,))
+        _, _, bins = self.as_connection.operate(self.key, prepared, values=[1.0])
+        assert bins == {"f": 2.5}
+
+    def test_placeholder_in_other_operations(self):
+        prepared = self.as_connection.prepare_operations(
+            [
+                list_ops.list_append(aerospike.Placeholder(0), aerospike.Placeholder(1)),
+                op.read(aerospike.Placeholder(0)),
+            ]
+        )
+        _, _, bins = self.as_connection.operate(self.key, prepared, values=("items", 2))
+        assert bins == {"items": [1, 2]}
+
+    def test_value_used_twice(self):
+        prepared = self.as_connection.prepare_operations(
+            [op.write("a", aerospike.Placeholder(0)), op.write("b", aerospike.Placeholder(0))]
+        )
+        self.as_connection.operate(self.key, prepared, values=(7,))
+        _, _, bins = self.as_connection.get(self.key)
+        assert bins["a"] == bins["b"] == 7
+
+    def test_no_placeholders(self):
+        prepared = self.as_connection.prepare_operations([op.increment("hits", 1), op.read("hits")])
+        assert prepared.values == 0
+        self.as_connection.operate(self.key, prepared)
+        _, _, bins = self.as_connection.operate(self.key, prepared, values=())
+        assert bins == {"hits": 3}
+
+    @pytest.mark.parametrize("values", [None, (), (1,), (1, "x", 2), 1])
+    def test_wrong_number_of_values(self, values):
+        with pytest.raises(e.ParamError):
+            self.as_connection.operate(self.key, self.counters, values=values)
+
+    def test_invalid_value(self):
+        with pytest.raises(e.ParamError):
+            self.as_connection.operate(self.key, self.counters, values=("x", 1))
+
+    def test_values_with_list(self):
+        with pytest.raises(e.ParamError):
+            self.as_connection.operate(self.key, [op.read("hits")], values=(1,))
+
+    @pytest.mark.parametrize(
+        "ops",
+        [
+            None,
+            [1],
+            [{"op": aerospike.OPERATOR_WRITE, "val": 1}],
+            [op.write("a_very_long_bin_name", aerospike.Placeholder(0))],
+        ],
+    )
+    def test_prepare_invalid_operations(self, ops):
+        with pytest.raises(e.ParamError):
+            self.as_connection.prepare_operations(ops)
+
+    def test_other_client(self):
+        config = TestBaseClass.get_connection_config()
+        if config["user"] is None and config["password"] is None:
+            client = aerospike.client(config).connect()
+        else:
+            client = aerospike.client(config).connect(config["user"], config["password"])
+        try:
+            with pytest.raises(e.ParamError):
+                client.operate(self.key, self.counters, values=(1, 1))
+        finally:
+            client.close()
+
+    def test_placeholder(self):
+        assert aerospike.Placeholder(3).index == 3
+        with pytest.raises(e.ParamError):
+            aerospike.Placeholder(-1)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import copy
+import pickle
+
+import pytest
+
+import aerospike
+from aerospike import exception as e
+from aerospike_helpers import expressions as exp
+
+from .test_base_class import TestBaseClass
+
+
+class TestPreparedPolicy(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        self.test_set = "prepared_policy"
+        self.keys = [("test", self.test_set, i) for i in range(5)]
+        for i, key in enumerate(self.keys):
+            as_connection.put(key, {"i": i})
+
+        def teardown():
+            for key in self.keys:
+                try:
+                    as_connection.remove(key)
+                except e.RecordNotFound:
+                    pass
+
+        request.addfinalizer(teardown)
+
+    def test_is_immutable_dict(self):
+        policy = aerospike.ReadPolicy(total_timeout=1000)
+        assert isinstance(policy, dict)
+        assert policy == {"total_timeout": 1000}
+        with pytest.raises(TypeError):
+            policy["total_timeout"] = 10
+        with pytest.raises(TypeError):
+            del policy["total_timeout"]
+        with pytest.raises(TypeError):
+            policy.update(max_retries=1)
+        with pytest.raises(TypeError):
+            policy.__init__(max_retries=1)
+        assert policy == {"total_timeout": 1000}
+
+    def test_copy_and_pickle(self):
+        policy = aerospike.WritePolicy({"key": aerospike.POLICY_KEY_SEND})
+        for other in (copy.copy(policy), pickle.loads(pickle.dumps(policy))):
+            assert type(other) is aerospike.WritePolicy
+            assert other == policy
+
+    def test_read_policy_with_expressions(self):
+        policy = aerospike.ReadPolicy(expressions=exp.GE(exp.IntBin("i"), 3).compile())
+        assert isinstance(policy["expressions"], aerospike.CompiledExpression)
+        # The cached conversion is reused by later commands
+        for _ in range(3):
+            _, _, bins = self.as_connection.get(self.keys[4], policy=policy)
+            assert bins == {"i": 4}
+            with pytest.raises(e.FilteredOut):
+                self.as_connection.get(self.keys[0], policy=policy)
+
+    def test_client_side_keys(self):
+        policy = aerospike.ReadPolicy(return_key=False)
+        key, _, _ = self.as_connection.get(self.keys[0], policy=policy)
+        assert key is None
+
+    def test_write_and_remove_policies(self):
+        write_policy = aerospike.WritePolicy(exists=aerospike.POLICY_EXISTS_UPDATE)
+        self.as_connection.put(self.keys[0], {"i": 10}, policy=write_policy)
+        with pytest.raises(e.RecordNotFound):
+            self.as_connection.put(("test", self.test_set, "missing"), {"i": 0}, policy=write_policy)
+        self.as_connection.remove(self.keys[0], policy=aerospike.RemovePolicy(durable_delete=False))
+        _, meta = self.as_connection.exists(self.keys[0])
+        assert meta is None
+
+    def test_batch_and_query_policies(self):
+        batch_policy = aerospike.BatchPolicy(expressions=exp.LT(exp.IntBin("i"), 2).compile())
+        records = self.as_connection.batch_read(self.keys, policy=batch_policy).batch_records
+        assert [record.record[2]["i"] for record in records if record.result == 0] == [0, 1]
+
+        query = self.as_connection.query("test", self.test_set)
+        records = query.results(aerospike.QueryPolicy(expressions=exp.LT(exp.IntBin("i"), 2).compile()))
+        assert sorted(bins["i"] for _, _, bins in records) == [0, 1]
+
+    def test_used_with_another_kind_of_command(self):
+        # The conversion is cached per kind of policy
+        policy = aerospike.ReadPolicy(total_timeout=1000)
+        self.as_connection.get(self.keys[0], policy=policy)
+        self.as_connection.operate(self.keys[0], [], policy=policy)
+        self.as_connection.get(self.keys[0], policy=policy)
+
+    @pytest.mark.parametrize(
+        "policy_type, kwargs",
+        [
+            (aerospike.ReadPolicy, {"invalid": 1}),
+            (aerospike.ReadPolicy, {"total_timeout": "1000"}),
+            (aerospike.WritePolicy, {"deserialize": True}),
+            (aerospike.QueryPolicy, {"expressions": [1]}),
+            (aerospike.ScanPolicy, {"max_records": None}),
+        ],
+    )
+    def test_invalid_policy(self, policy_type, kwargs):
+        with pytest.raises(e.ParamError):
+            policy_type(**kwargs)
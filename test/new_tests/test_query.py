@@ -566,6 +566,58 @@ class TestQuery(TestBaseClass):
         query.foreach(callback)
         assert len(records) == 2
 
+    @pytest.mark.parametrize("chunk_size", [1, 2, 100])
+    def test_query_foreach_with_chunk_size(self, chunk_size):
+        """
+        Invoke query.foreach() with the callback receiving lists of records
+        """
+        query = self.as_connection.query("test", "demo")
+        query.select("name", "test_age")
+        query.where(p.between("test_age", 1, 4))
+
+        chunks = []
+
+        def callback(records):
+            chunks.append(records)
+
+        query.foreach(callback, chunk_size=chunk_size)
+        assert all(0 < len(chunk) <= chunk_size for chunk in chunks)
+        ages = sorted(bins["test_age"] for chunk in chunks for _, _, bins in chunk)
+        assert ages == [1, 2, 3, 4]
+
+    def test_query_foreach_with_chunk_size_and_partition_filter(self):
+        query = self.as_connection.query("test", "demo")
+        query.where(p.between("test_age", 1, 4))
+
+        records = []
+
+        def callback(chunk):
+            records.extend(chunk)
+
+        query.foreach(callback, {"partition_filter": {"begin": 0, "count": 4096}}, chunk_size=3)
+        assert len(records) == 4
+        for part_id, (key, _, _) in records:
+            assert 0 <= part_id < 4096
+
+    def test_query_foreach_with_chunk_size_callback_returning_false(self):
+        query = self.as_connection.query("test", "demo")
+        query.where(p.between("test_age", 1, 4))
+
+        chunks = []
+
+        def callback(records):
+            chunks.append(records)
+            return False
+
+        query.foreach(callback, chunk_size=1)
+        assert len(chunks) == 1
+
+    def test_query_foreach_with_negative_chunk_size(self):
+        query = self.as_connection.query("test", "demo")
+
+        with pytest.raises(e.ParamError):
+            query.foreach(lambda records: None, chunk_size=-1)
+
     def test_query_with_results_method(self):
         """
         Invoke query() with correct arguments
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import aerospike
+from aerospike import exception as e
+
+from .test_base_class import TestBaseClass
+
+SCHEMA = {"i": int, "f": float, "s": str, "b": bytes, "ba": bytearray, "l": list, "m": dict}
+
+
+class TestRegisterSchema(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        self.test_set = "register_schema"
+        self.key = ("test", self.test_set, 1)
+        as_connection.register_schema("test", self.test_set, SCHEMA)
+
+        def teardown():
+            as_connection.register_schema("test", self.test_set, None)
+            try:
+                as_connection.remove(self.key)
+            except e.RecordNotFound:
+                pass
+
+        request.addfinalizer(teardown)
+
+    def test_put_with_schema(self):
+        bins = {
+            "i": 1,
+            "f": 1.5,
+            "s": "abc",
+            "b": b"\x00\x01",
+            "ba": bytearray(b"\x02"),
+            "l": [1, "a", [2]],
+            "m": {"a": 1, "b": {"c": 2}},
+            "other": "not in schema",
+        }
+        self.as_connection.put(self.key, bins)
+        _, _, record = self.as_connection.get(self.key)
+        assert record == bins
+
+    @pytest.mark.parametrize(
+        "bins",
+        [
+            {"i": "not an int"},
+            {"i": True},
+            {"s": 1},
+            {"l": {"a": 1}},
+        ],
+    )
+    def test_put_other_types_falls_back(self, bins):
+        self.as_connection.put(self.key, bins)
+        _, _, record = self.as_connection.get(self.key)
+        assert record == bins
+
+    def test_put_int_overflow(self):
+        with pytest.raises(e.ParamError):
+            self.as_connection.put(self.key, {"i": 2**64})
+
+    def test_serializer_replaces_schema_during_put(self):
+        clients = []
+
+        def serialize(value):
+            # Frees the schema that put() is using
+            clients[0].register_schema("test", self.test_set, {"i": str})
+            return b"serialized"
+
+        client = TestBaseClass.get_new_connection({"serialization": (serialize, lambda value: value)})
+        clients.append(client)
+        try:
+            client.register_schema("test", self.test_set, SCHEMA)
+            client.put(self.key, {"o": object(), "i": 1, "s": "abc", "ba": bytearray(b"\x02")})
+        finally:
+            client.close()
+        _, _, record = self.as_connection.select(self.key, ["i", "s", "ba"])
+        assert record == {"i": 1, "s": "abc", "ba": bytearray(b"\x02")}
+
+    def test_replace_and_remove_schema(self):
+        self.as_connection.register_schema("test", self.test_set, {"i": str})
+        self.as_connection.put(self.key, {"i": 1})
+        self.as_connection.register_schema("test", self.test_set, None)
+        # Removing a schema that is not registered does nothing
+        self.as_connection.register_schema("test", self.test_set, None)
+        _, _, record = self.as_connection.get(self.key)
+        assert record == {"i": 1}
+
+    @pytest.mark.parametrize(
+        "namespace, set_name, schema",
+        [
+            (1, "demo", {}),
+            ("test", None, {}),
+            ("n" * 32, "demo", {}),
+            ("test", "s" * 64, {}),
+            ("test", "demo", [("i", int)]),
+            ("test", "demo", {1: int}),
+            ("test", "demo", {"b" * 16: int}),
+            ("test", "demo", {"i": bool}),
+            ("test", "demo", {"i": "int"}),
+            ("test", "demo", {"i": aerospike.Geospatial}),
+        ],
+    )
+    def test_register_schema_with_invalid_args(self, namespace, set_name, schema):
+        with pytest.raises(e.ParamError):
+            self.as_connection.register_schema(namespace, set_name, schema)
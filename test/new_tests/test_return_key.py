@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import aerospike
+from aerospike import exception as e
+
+from .test_base_class import TestBaseClass
+
+NO_KEY_POLICY = {"return_key": False}
+
+
+class TestReturnKey(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        self.test_set = "return_key"
+        self.record_count = 5
+        self.keys = [("test", self.test_set, i) for i in range(self.record_count)]
+        for i, key in enumerate(self.keys):
+            as_connection.put(key, {"i": i})
+
+        def teardown():
+            for key in self.keys:
+                as_connection.remove(key)
+
+        request.addfinalizer(teardown)
+
+    def test_get(self):
+        key, meta, bins = self.as_connection.get(self.keys[2], policy=NO_KEY_POLICY)
+        assert key is None
+        assert meta["gen"] == 1
+        assert bins == {"i": 2}
+
+    def test_get_with_return_key(self):
+        key, _, _ = self.as_connection.get(self.keys[2], policy={"return_key": True})
+        assert key[:2] == ("test", self.test_set)
+
+    def test_select(self):
+        key, _, bins = self.as_connection.select(self.keys[2], ["i"], policy=NO_KEY_POLICY)
+        assert key is None
+        assert bins == {"i": 2}
+
+    def test_batch_read(self):
+        records = self.as_connection.batch_read(self.keys, policy=NO_KEY_POLICY).batch_records
+        assert [record.key for record in records] == [None] * self.record_count
+        assert [record.record[0] for record in records] == [None] * self.record_count
+        assert [record.record[2]["i"] for record in records] == list(range(self.record_count))
+
+    @pytest.mark.parametrize("source_type", ["query", "scan"])
+    def test_results(self, source_type):
+        source = getattr(self.as_connection, source_type)("test", self.test_set)
+        records = source.results(NO_KEY_POLICY)
+        assert all(key is None for key, _, _ in records)
+        assert sorted(bins["i"] for _, _, bins in records) == list(range(self.record_count))
+
+    def test_foreach(self):
+        records = []
+        self.as_connection.query("test", self.test_set).foreach(records.append, NO_KEY_POLICY)
+        assert all(key is None for key, _, _ in records)
+        assert len(records) == self.record_count
+
+    def test_with_lazy_records(self):
+        policy = {"return_key": False, "lazy_records": True}
+        key, _, bins = self.as_connection.get(self.keys[2], policy=policy)
+        assert key is None
+        assert isinstance(bins, aerospike.Record)
+
+    def test_invalid_return_key(self):
+        with pytest.raises(e.ParamError):
+            self.as_connection.get(self.keys[0], policy={"return_key": 0})
@@ -51,6 +51,63 @@ class TestScan(TestBaseClass):
 
         assert len(records) == self.record_count
 
+    @pytest.mark.parametrize("chunk_size", [1, 7, 100])
+    def test_scan_foreach_with_chunk_size(self, chunk_size):
+        chunks = []
+
+        def callback(records):
+            chunks.append(records)
+
+        scan_obj = self.as_connection.scan(self.test_ns, self.test_set)
+        scan_obj.foreach(callback, chunk_size=chunk_size)
+
+        assert all(0 < len(chunk) <= chunk_size for chunk in chunks)
+        assert sum(len(chunk) for chunk in chunks) == self.record_count
+
+    def test_scan_foreach_with_chunk_size_and_partition_filter(self):
+        records = []
+
+        def callback(chunk):
+            records.extend(chunk)
+
+        scan_obj = self.as_connection.scan(self.test_ns, self.test_set)
+        scan_obj.foreach(callback, {"partition_filter": {"begin": 0, "count": 4096}}, chunk_size=5)
+
+        assert len(records) == self.record_count
+        for part_id, (key, _, _) in records:
+            assert 0 <= part_id < 4096
+
+    def test_scan_foreach_with_chunk_size_record_values(self):
+        records = {}
+
+        def callback(chunk):
+            for _, _, bins in chunk:
+                if "age" in bins:
+                    records[bins["age"]] = bins["name"]
+
+        scan_obj = self.as_connection.scan(self.test_ns, self.test_set)
+        scan_obj.foreach(callback, chunk_size=3)
+
+        assert records == {i: "name%s" % i for i in range(19)}
+
+    def test_scan_foreach_with_chunk_size_callback_returning_false(self):
+        chunks = []
+
+        def callback(records):
+            chunks.append(records)
+            return False
+
+        scan_obj = self.as_connection.scan(self.test_ns, self.test_set)
+        scan_obj.foreach(callback, chunk_size=2)
+
+        assert len(chunks) == 1
+
+    def test_scan_foreach_with_negative_chunk_size(self):
+        scan_obj = self.as_connection.scan(self.test_ns, self.test_set)
+
+        with pytest.raises(e.ParamError):
+            scan_obj.foreach(lambda records: None, chunk_size=-1)
+
     def test_scan_with_existent_ns_and_none_set(self):
 
         records = []
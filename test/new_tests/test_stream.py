@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from aerospike import exception as e
+
+from .test_base_class import TestBaseClass
+
+
+class TestRecordStream(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        self.test_set = "stream"
+        self.record_count = 50
+        self.keys = [("test", self.test_set, i) for i in range(self.record_count)]
+        for i, key in enumerate(self.keys):
+            as_connection.put(key, {"i": i})
+
+        def teardown():
+            for key in self.keys:
+                as_connection.remove(key)
+
+        request.addfinalizer(teardown)
+
+    @pytest.mark.parametrize("source_type", ["query", "scan"])
+    def test_stream(self, source_type):
+        source = getattr(self.as_connection, source_type)("test", self.test_set)
+        values = [bins["i"] for _, _, bins in source.stream()]
+        assert sorted(values) == list(range(self.record_count))
+
+    def test_stream_with_small_buffer(self):
+        query = self.as_connection.query("test", self.test_set)
+        values = [bins["i"] for _, _, bins in query.stream(buffer_size=1)]
+        assert sorted(values) == list(range(self.record_count))
+
+    def test_stream_with_partition_filter(self):
+        scan = self.as_connection.scan("test", self.test_set)
+        policy = {"partition_filter": {"begin": 0, "count": 4096}}
+        values = [bins["i"] for _, _, bins in scan.stream(policy)]
+        assert sorted(values) == list(range(self.record_count))
+
+    def test_stream_partitions_status_when_done(self):
+        query = self.as_connection.query("test", self.test_set)
+        records = query.stream()
+        list(records)
+        status = records.get_partitions_status()
+        assert status["done"]
+        assert all(not part_status[2] for part_id, part_status in status.items() if isinstance(part_id, int))
+
+    @pytest.mark.parametrize("source_type", ["query", "scan"])
+    def test_stream_resume_after_close(self, source_type):
+        source = getattr(self.as_connection, source_type)("test", self.test_set)
+        seen = set()
+        with source.stream(buffer_size=1) as records:
+            for _, _, bins in records:
+                seen.add(bins["i"])
+                if len(seen) == 10:
+                    break
+            status = records.get_partitions_status()
+
+        assert not status["done"]
+        policy = {"partition_filter": {"partition_status": status}}
+        source = getattr(self.as_connection, source_type)("test", self.test_set)
+        for _, _, bins in source.stream(policy):
+            seen.add(bins["i"])
+
+        assert seen == set(range(self.record_count))
+
+    @pytest.mark.parametrize("source_type", ["query", "scan"])
+    def test_stream_without_keys(self, source_type):
+        source = getattr(self.as_connection, source_type)("test", self.test_set)
+        seen = set()
+        with source.stream({"return_key": False}, buffer_size=1) as records:
+            for key, _, bins in records:
+                assert key is None
+                seen.add(bins["i"])
+                if len(seen) == 10:
+                    break
+            status = records.get_partitions_status()
+
+        assert not status["done"]
+        policy = {"return_key": False, "partition_filter": {"partition_status": status}}
+        source = getattr(self.as_connection, source_type)("test", self.test_set)
+        for _, _, bins in source.stream(policy):
+            seen.add(bins["i"])
+
+        assert seen == set(range(self.record_count))
+
+    def test_stream_invalid_buffer_size(self):
+        query = self.as_connection.query("test", self.test_set)
+        with pytest.raises(ValueError):
+            query.stream(buffer_size=0)
+
+    def test_stream_error_is_raised_in_caller(self):
+        query = self.as_connection.query("test", self.test_set)
+        with pytest.raises(e.ParamError):
+            list(query.stream({}, {"nobins": "False"}))
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from .test_base_class import TestBaseClass
+
+
+class TestStringCache(TestBaseClass):
+    @pytest.fixture(autouse=True)
+    def setup(self, request, as_connection):
+        self.keys = [("test", "string_cache", i) for i in range(2)]
+        for i, key in enumerate(self.keys):
+            as_connection.put(key, {"bin_name": i})
+
+        def teardown():
+            for key in self.keys:
+                as_connection.remove(key)
+
+        request.addfinalizer(teardown)
+
+    def test_records_share_strings(self):
+        records = self.as_connection.batch_read(self.keys).batch_records
+        (key1, _, bins1), (key2, _, bins2) = (record.record for record in records)
+        assert key1[0] is key2[0]
+        assert key1[1] is key2[1]
+        assert next(iter(bins1)) is next(iter(bins2))
+
+    def test_query_records_share_strings(self):
+        records = self.as_connection.query("test", "string_cache").results()
+        assert len(records) == 2
+        assert records[0][0][1] is records[1][0][1] == "string_cache"